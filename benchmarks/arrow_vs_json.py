@@ -0,0 +1,61 @@
+"""Compare Arrow IPC and JSON responses for /comparison-data.
+
+Loads a synthetic snapshot into main, then times producing and parsing
+the monthly comparison rows as JSON (format=columnar) and as an Arrow
+stream. The HTTP layer is skipped on purpose.
+
+    python benchmarks/arrow_vs_json.py --rows 100000 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+from benchmarks.synthetic import make_denials_frame  # noqa: E402
+
+
+def best_of(repeat, func):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--period", default="monthly", choices=["daily", "biweekly", "monthly"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'format':<7} {'produce ms':>11} {'parse ms':>9} {'bytes':>13}")
+    for rows in args.rows:
+        frame = make_denials_frame(rows)
+        main.load_denials_from_db = lambda: frame.copy()
+        main.refresh_denials_snapshot()
+
+        def produce_json():
+            data = main.get_comparison_data_by_period(args.period, table_format="columnar")
+            return json.dumps(data).encode()
+
+        def produce_arrow():
+            data = main.get_comparison_data_by_period(args.period, table_format="arrow")
+            return bytes(main.arrow_tables_response(data["table_data"], data["table_cursors"]).body)
+
+        json_time, json_body = best_of(args.repeat, produce_json)
+        json_parse, _ = best_of(args.repeat, lambda: json.loads(json_body))
+        arrow_time, arrow_body = best_of(args.repeat, produce_arrow)
+        arrow_parse, _ = best_of(args.repeat, lambda: pa.ipc.open_stream(arrow_body).read_all())
+        print(f"{rows:>9} {'json':<7} {json_time * 1000:>11.1f} {json_parse * 1000:>9.1f} {len(json_body):>13,}")
+        print(f"{rows:>9} {'arrow':<7} {arrow_time * 1000:>11.1f} {arrow_parse * 1000:>9.1f} {len(arrow_body):>13,}")
+
+
+if __name__ == "__main__":
+    main_()
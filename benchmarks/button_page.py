@@ -0,0 +1,69 @@
+"""Time-to-first-byte and peak memory of the /button page.
+
+Calls the /button handler in-process against a synthetic snapshot and
+consumes its body the way the ASGI server would. Reports TTFB, total
+time, bytes sent, the largest single chunk, and tracemalloc peak.
+
+    python benchmarks/button_page.py --rows 10000 100000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from starlette.requests import Request  # noqa: E402
+
+import main  # noqa: E402
+from benchmarks.synthetic import make_denials_frame  # noqa: E402
+
+
+def authenticated_request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/button", "headers": [], "query_string": b"",
+                    "session": {"authenticated": True}})
+
+
+async def consume(response):
+    """Yield body chunks of a streaming or buffered response."""
+    if hasattr(response, "body_iterator"):
+        async for chunk in response.body_iterator:
+            yield chunk.encode() if isinstance(chunk, str) else chunk
+    else:
+        yield response.body
+
+
+async def measure():
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = main.button(authenticated_request())
+    first_byte = None
+    total_bytes = largest_chunk = 0
+    async for chunk in consume(response):
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        total_bytes += len(chunk)
+        largest_chunk = max(largest_chunk, len(chunk))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_byte, elapsed, total_bytes, largest_chunk, peak
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'ttfb ms':>9} {'total ms':>9} {'bytes':>12} {'max chunk':>12} {'peak MB':>8}")
+    for rows in args.rows:
+        frame = make_denials_frame(rows)
+        main.load_denials_from_db = lambda: frame.copy()
+        main.refresh_denials_snapshot()
+        ttfb, total, size, largest, peak = asyncio.run(measure())
+        print(f"{rows:>8} {ttfb * 1000:>9.1f} {total * 1000:>9.1f} {size:>12,} {largest:>12,} {peak / 2**20:>8.1f}")
+
+
+if __name__ == "__main__":
+    main_()
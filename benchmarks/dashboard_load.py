@@ -0,0 +1,79 @@
+"""Modelled time-to-interactive of the /dashboard shell.
+
+The page is interactive once its HTML, stylesheet and render-blocking
+scripts have arrived and been parsed. This script renders /dashboard
+in-process, resolves each asset against the static registry and reports
+the bytes on that critical path, gzip-encoded as the server sends them,
+plus the modelled time at the given bandwidth and round-trip time.
+--eager counts the Plotly and xlsx bundles as blocking, which is how the
+page loaded them before they were lazy-loaded.
+
+    python benchmarks/dashboard_load.py --mbps 10 50 --rtt-ms 40
+    python benchmarks/dashboard_load.py --eager
+
+In a browser, the dashboard logs "dashboard interactive after N ms" and
+sets performance marks (dashboard-interactive, plotly-loaded,
+xlsx-loaded) that can be compared between builds.
+"""
+import argparse
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from starlette.requests import Request  # noqa: E402
+
+import main  # noqa: E402
+
+
+def authenticated_request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/dashboard", "headers": [], "query_string": b"",
+                    "session": {"authenticated": True}})
+
+
+def asset_size(url: str):
+    """Bytes sent for a /static URL, or None for an external URL."""
+    if not url.startswith("/static/"):
+        return None
+    asset = main._static_assets[url[len("/static/"):]]
+    return len(asset["gzip"] or asset["body"])
+
+
+def critical_path(html: str, eager: bool):
+    """(label, bytes) for every resource fetched before the page is interactive."""
+    resources = [("document", len(main.gzip.compress(html.encode())))]
+    for href in re.findall(r'<link rel="stylesheet" href="([^"]+)"', html):
+        resources.append((href, asset_size(href)))
+    for tag in re.findall(r"<script\b[^>]*>", html):
+        src = re.search(r'\bsrc="([^"]+)"', tag)
+        if src and " async" not in tag and " defer" not in tag:
+            resources.append((src.group(1), asset_size(src.group(1))))
+        if eager:
+            for lazy in re.findall(r'\bdata-(?:plotly|xlsx)="([^"]+)"', tag):
+                resources.append((lazy, asset_size(lazy)))
+    return resources
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mbps", type=float, nargs="+", default=[5.0, 50.0])
+    parser.add_argument("--rtt-ms", type=float, default=50.0)
+    parser.add_argument("--eager", action="store_true", help="count Plotly/xlsx as render-blocking")
+    args = parser.parse_args()
+
+    html = main.dashboard(authenticated_request()).body.decode()
+    resources = critical_path(html, args.eager)
+    for label, size in resources:
+        print(f"{label:<60} {'external' if size is None else f'{size:,} B':>14}")
+    total = sum(size for _, size in resources if size)
+    print(f"{'critical path total':<60} {total:>12,} B")
+    # The document, then stylesheet and scripts discovered from it: two round trips
+    for mbps in args.mbps:
+        modelled = 2 * args.rtt_ms + total * 8 / (mbps * 1e6) * 1000
+        print(f"first load at {mbps:g} Mbit/s, {args.rtt_ms:g} ms RTT: {modelled:,.0f} ms")
+    print("repeat load (immutable assets cached): "
+          f"{args.rtt_ms + resources[0][1] * 8 / (max(args.mbps) * 1e6) * 1000:,.0f} ms")
+
+
+if __name__ == "__main__":
+    main_()
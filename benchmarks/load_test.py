@@ -0,0 +1,216 @@
+"""HTTP load test replaying a dashboard traffic mix at rising concurrency.
+
+Each virtual user logs in with its own session and then sends requests
+drawn from TRAFFIC_MIX without think time (or with --think-ms), so the
+run measures how far the server's threadpool scales. For every
+concurrency step the script reports throughput, error rate and
+p50/p95/p99 latency per route, and marks the step with peak throughput.
+
+Against a server that is already running:
+
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --username bench --password benchpass
+
+Or let the script start uvicorn on a synthetic SQLite table (built as in
+benchmarks/suite.py) and create the login itself:
+
+    python benchmarks/load_test.py --serve --rows 100000 --concurrency 1 4 16 64 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import main  # noqa: E402
+from benchmarks.suite import use_sqlite  # noqa: E402
+from benchmarks.synthetic import CATEGORIES, USERS, zipf_weights  # noqa: E402
+
+EXPORT_CATEGORY = main.CLASSIFICATION_MAP[CATEGORIES[0]]
+
+# (route label, weight, path); {user} is replaced by a user drawn with the
+# same skew as the synthetic data
+TRAFFIC_MIX = [
+    ("/dashboard", 5, "/dashboard"),
+    ("/data-version", 10, "/data-version"),
+    ("/button-data", 10, "/button-data"),
+    ("/denials-comparison-data", 8, "/denials-comparison-data"),
+    ("/clarification-type-data", 5, "/clarification-type-data"),
+    ("/clarification-grouping-data", 5, "/clarification-grouping-data"),
+    ("/latest-denial", 3, "/latest-denial"),
+    ("/comparison-data?period=daily", 8, "/comparison-data?period=daily"),
+    ("/comparison-data?period=biweekly", 5, "/comparison-data?period=biweekly"),
+    ("/comparison-data?period=monthly", 5, "/comparison-data?period=monthly"),
+    ("/denials-biweekly-comparison-data", 4, "/denials-biweekly-comparison-data"),
+    ("/denials-monthly-comparison-data", 4, "/denials-monthly-comparison-data"),
+    ("/biweekly-comparison-data", 3, "/biweekly-comparison-data"),
+    ("/monthly-comparison-data", 3, "/monthly-comparison-data"),
+    ("/performance-users", 4, "/performance-users"),
+    ("/user-denials-data", 6, "/user-denials-data?username={user}"),
+    ("/biweekly-user-comparison-data", 3, "/biweekly-user-comparison-data?username={user}"),
+    ("/monthly-user-comparison-data", 3, "/monthly-user-comparison-data?username={user}"),
+    ("/export-table", 1, f"/export-table?source=button-data&category={EXPORT_CATEGORY}"),
+]
+USER_WEIGHTS = zipf_weights(len(USERS), 0.8)
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str):
+    response = await client.post("/login", data={"username": username, "password": password})
+    if response.status_code != 302 or response.headers.get("location") != "/dashboard":
+        raise SystemExit(f"login as {username!r} failed (HTTP {response.status_code})")
+
+
+async def virtual_user(args, rng: random.Random, deadline: float, samples: list):
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        await login(client, args.username, args.password)
+        weights = [weight for _, weight, _ in TRAFFIC_MIX]
+        while time.perf_counter() < deadline:
+            label, _, path = rng.choices(TRAFFIC_MIX, weights)[0]
+            path = path.format(user=rng.choices(USERS, USER_WEIGHTS)[0])
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                await response.aread()
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            samples.append((label, ok, time.perf_counter() - started))
+            if args.think_ms:
+                await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+
+
+async def warm_up(args):
+    """Request every route once, so the snapshot load and payload builds are not measured."""
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        await login(client, args.username, args.password)
+        for label, _, path in TRAFFIC_MIX:
+            response = await client.get(path.format(user=USERS[0]))
+            if response.status_code >= 400:
+                print(f"warning: {label} returned HTTP {response.status_code}")
+
+
+def percentiles(latencies):
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {"p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1)}
+
+
+def summarize(samples, elapsed: float):
+    by_route = defaultdict(list)
+    for label, ok, latency in samples:
+        by_route[label].append((ok, latency))
+    routes = {}
+    for label, results in sorted(by_route.items()):
+        routes[label] = {
+            "requests": len(results),
+            "error_rate": round(sum(not ok for ok, _ in results) / len(results), 4),
+            **percentiles([latency for _, latency in results]),
+        }
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2),
+        "error_rate": round(sum(not ok for _, ok, _ in samples) / len(samples), 4) if samples else None,
+        **(percentiles([latency for _, _, latency in samples]) if samples else {}),
+        "routes": routes,
+    }
+
+
+async def run_step(args, concurrency: int):
+    samples = []
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        virtual_user(args, random.Random(args.seed * 1000 + index), deadline, samples)
+        for index in range(concurrency)
+    ))
+    return summarize(samples, time.perf_counter() - started)
+
+
+def print_step(concurrency: int, step: dict, per_route: bool):
+    print(f"{concurrency:>5} {step['requests']:>8} {step['throughput_rps']:>9.1f} {step['error_rate'] or 0:>7.2%} "
+          f"{step.get('p50_ms', 0):>9.1f} {step.get('p95_ms', 0):>9.1f} {step.get('p99_ms', 0):>9.1f}")
+    if per_route:
+        for label, route in step["routes"].items():
+            print(f"{'':>5} {label:<44} {route['requests']:>6} {route['error_rate']:>7.2%} "
+                  f"{route['p50_ms']:>9.1f} {route['p95_ms']:>9.1f} {route['p99_ms']:>9.1f}")
+
+
+def start_server(args):
+    """Start uvicorn on a synthetic SQLite table with a login for the run."""
+    path = use_sqlite(args.db_dir, args.rows, args.seed)
+    try:
+        main.data_source.add_user(args.username, main.hash_password(args.password))
+    except ValueError:
+        pass  # created by an earlier run
+    env = dict(os.environ, DATA_SOURCE="sqlite", SQLITE_PATH=path, STAGE_TIMING_ENABLED="0")
+    port = args.url.rsplit(":", 1)[1].split("/")[0]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", port, "--workers", str(args.workers),
+         "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"{args.url}/test", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("server did not start")
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--username", default="loadtest")
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per concurrency step")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between a user's requests")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--per-route", action="store_true", help="print per-route latencies for every step")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--serve", action="store_true", help="start uvicorn on a synthetic SQLite table")
+    parser.add_argument("--rows", type=int, default=100000, help="synthetic rows for --serve")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --serve")
+    parser.add_argument("--db-dir", default=os.path.join(tempfile.gettempdir(), "dashboard-bench"))
+    args = parser.parse_args()
+
+    server = start_server(args) if args.serve else None
+    try:
+        asyncio.run(warm_up(args))
+        print(f"{'conc':>5} {'requests':>8} {'req/s':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        steps = {}
+        for concurrency in args.concurrency:
+            steps[concurrency] = asyncio.run(run_step(args, concurrency))
+            print_step(concurrency, steps[concurrency], args.per_route)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    peak = max(steps, key=lambda concurrency: steps[concurrency]["throughput_rps"])
+    print(f"peak throughput {steps[peak]['throughput_rps']:.1f} req/s at concurrency {peak}")
+    if peak == max(steps):
+        print("throughput was still rising at the highest concurrency; add higher --concurrency steps")
+    if not args.per_route:
+        print(f"\nper-route latency at concurrency {peak}:")
+        print_step(peak, steps[peak], True)
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"settings": {key: value for key, value in vars(args).items() if key != "password"},
+                       "peak_concurrency": peak, "steps": steps}, handle, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,133 @@
+"""Login throughput under a burst, and what the burst does to other requests.
+
+For each concurrency step, that many clients log in back to back for
+--duration seconds with fresh sessions. Meanwhile a probe requests /test
+every --probe-ms, so a login path that blocks the event loop shows up as
+probe latency rather than only as slow logins. Before the HTTP steps, the
+cost of one password check is timed in-process for the current scrypt
+settings and for the legacy SHA256 hashes.
+
+    python benchmarks/login_burst.py --serve --concurrency 1 4 16 32
+    python benchmarks/login_burst.py --url http://127.0.0.1:8000 --username bench --password benchpass
+
+With --serve the server runs with the environment's SCRYPT_* and
+AUTH_WORKERS settings, so different values can be compared run by run.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+from benchmarks.load_test import login, percentiles, start_server  # noqa: E402
+
+
+def hash_costs(password: str, repeat: int = 5):
+    """Best time in ms of one verify_password() per stored-hash scheme."""
+    schemes = {
+        "scrypt": main.hash_password(password),
+        "sha256 (legacy)": hashlib.sha256(password.encode()).hexdigest(),
+    }
+    costs = {}
+    for name, stored_hash in schemes.items():
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            main.verify_password(stored_hash, password)
+            best = min(best, time.perf_counter() - started)
+        costs[name] = round(best * 1000, 3)
+    return costs
+
+
+async def login_client(args, deadline: float, latencies: list, failures: list):
+    while time.perf_counter() < deadline:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            started = time.perf_counter()
+            try:
+                await login(client, args.username, args.password)
+                latencies.append(time.perf_counter() - started)
+            except (SystemExit, httpx.HTTPError):
+                failures.append(time.perf_counter() - started)
+
+
+async def probe(args, stop: asyncio.Event, latencies: list):
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            await client.get("/test")
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(args.probe_ms / 1000)
+
+
+async def run_step(args, concurrency: int):
+    logins, failures, probes = [], [], []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(args, stop, probes))
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(login_client(args, deadline, logins, failures) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+    return {
+        "logins": len(logins),
+        "failed": len(failures),
+        "logins_per_s": round(len(logins) / elapsed, 2),
+        "login": percentiles(logins) if logins else {},
+        "probe": percentiles(probes) if probes else {},
+    }
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--username", default="loadtest")
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency step")
+    parser.add_argument("--probe-ms", type=float, default=50.0, help="pause between /test probes")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--serve", action="store_true", help="start uvicorn on a synthetic SQLite table")
+    parser.add_argument("--rows", type=int, default=10000, help="synthetic rows for --serve")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --serve")
+    parser.add_argument("--db-dir", default=os.path.join(tempfile.gettempdir(), "dashboard-bench"))
+    args = parser.parse_args()
+
+    costs = hash_costs(args.password)
+    print(f"password check (scrypt n={main.SCRYPT_N} r={main.SCRYPT_R} p={main.SCRYPT_P}, "
+          f"AUTH_WORKERS={main.AUTH_WORKERS}): "
+          + ", ".join(f"{name} {ms:.1f} ms" for name, ms in costs.items()))
+
+    server = start_server(args) if args.serve else None
+    try:
+        print(f"{'conc':>5} {'logins':>7} {'failed':>7} {'login/s':>8} {'login p50':>10} {'login p99':>10} "
+              f"{'probe p50':>10} {'probe p99':>10}")
+        steps = {}
+        for concurrency in args.concurrency:
+            step = steps[concurrency] = asyncio.run(run_step(args, concurrency))
+            print(f"{concurrency:>5} {step['logins']:>7} {step['failed']:>7} {step['logins_per_s']:>8.1f} "
+                  f"{step['login'].get('p50_ms', 0):>10.1f} {step['login'].get('p99_ms', 0):>10.1f} "
+                  f"{step['probe'].get('p50_ms', 0):>10.1f} {step['probe'].get('p99_ms', 0):>10.1f}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"settings": {key: value for key, value in vars(args).items() if key != "password"},
+                       "hash_costs_ms": costs, "steps": steps}, handle, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main_()
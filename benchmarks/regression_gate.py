@@ -0,0 +1,223 @@
+"""Fail when data functions or endpoints get slower or hungrier than the baseline.
+
+Times the snapshot load, get_denials_dataframe, every data function from
+benchmarks/suite.py and the main data endpoints (through TestClient, with
+the payload cache cleared so the builders run) against a synthetic SQLite
+table, and records tracemalloc peak memory for each. The results are
+compared with benchmarks/baseline.json; the script exits with status 1
+and lists every check that exceeds its threshold.
+
+    python benchmarks/regression_gate.py
+    python benchmarks/regression_gate.py --max-slowdown 1.5 --max-memory-growth 1.3
+    python benchmarks/regression_gate.py --update-baseline   # after an intended change
+
+Timings are process CPU time, which other load on the machine disturbs
+less than wall time. Each check is paired with a fixed pandas calibration
+workload timed just before it, and baseline times are scaled by the
+ratio of the two calibrations, so a baseline recorded on one machine is
+usable on another and a machine that slows down mid-run is accounted for.
+Differences under --min-ms / --min-kb are treated as noise, and a check
+that looks slower is measured again (--retries) before it is reported,
+so a burst of load on the machine does not fail the gate.
+
+The synthetic rows and the app's date windows both count back from
+DASHBOARD_TODAY, which the gate pins to GATE_TODAY (a Wednesday, so the
+daily view covers a regular business day). Every run therefore measures
+the same rows, whatever day it runs on.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("REFRESH_SCHEDULER_ENABLED", "0")
+os.environ.setdefault("STAGE_TIMING_ENABLED", "0")
+GATE_TODAY = "2026-10-21"
+os.environ.setdefault("DASHBOARD_TODAY", GATE_TODAY)
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from benchmarks.suite import BENCH_USER, DATA_FUNCTIONS, environment, use_sqlite  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+ENDPOINTS = [
+    "/dashboard",
+    "/button-data",
+    "/comparison-data?period=daily",
+    "/comparison-data?period=monthly",
+    "/denials-comparison-data",
+    f"/user-denials-data?username={BENCH_USER}",
+    f"/monthly-user-comparison-data?username={BENCH_USER}",
+]
+GATE_USERNAME = "regression-gate"
+GATE_PASSWORD = "regression-gate-password"
+
+
+_calibration_frame = pd.DataFrame({
+    "key": np.random.default_rng(0).choice([f"k{i}" for i in range(500)], 200000),
+    "value": np.random.default_rng(1).random(200000),
+})
+
+
+def calibration_ms(repeat: int = 3) -> float:
+    """Best CPU time of a fixed pandas workload, as a measure of machine speed."""
+    frame = _calibration_frame
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        frame.groupby("key")["value"].agg(["sum", "mean"])
+        frame.sort_values("value")
+        frame["key"].astype(str).str.upper()
+        best = min(best, time.process_time() - started)
+    return best * 1000
+
+
+def measure(func, repeat: int):
+    """Calibration, best CPU time over `repeat` calls, then one call under tracemalloc.
+
+    The garbage collector is paused while timing so that collections of
+    earlier checks' garbage are not charged to this one.
+    """
+    calibration = calibration_ms()
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.process_time()
+            func()
+            best = min(best, time.process_time() - started)
+        finally:
+            gc.enable()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"min_ms": round(best * 1000, 3), "calibration_ms": round(calibration, 3), "peak_kb": round(peak / 1024, 1)}
+
+
+def endpoint_check(client: TestClient, path: str):
+    def call():
+        with main._payload_cache_lock:
+            main._payload_cache.clear()
+        response = client.get(path)
+        if response.status_code != 200:
+            raise SystemExit(f"{path} returned HTTP {response.status_code}: {response.text[:200]}")
+    return call
+
+
+def build_checks(args):
+    """Return {check name: zero-argument callable} with the snapshot loaded."""
+    use_sqlite(args.db_dir, args.rows, args.seed)
+    try:
+        main.data_source.add_user(GATE_USERNAME, main.hash_password(GATE_PASSWORD))
+    except ValueError:
+        pass  # created by an earlier run
+    checks = {
+        "load_denials_from_db": main.load_denials_from_db,
+        "get_denials_dataframe": main.get_denials_dataframe,
+    }
+    checks.update(DATA_FUNCTIONS)
+    client = TestClient(main.app)
+    client.post("/login", data={"username": GATE_USERNAME, "password": GATE_PASSWORD}, follow_redirects=False)
+    for path in ENDPOINTS:
+        checks[f"GET {path}"] = endpoint_check(client, path)
+
+    main.refresh_denials_snapshot()
+    return checks
+
+
+def compare(baseline: dict, current: dict, args):
+    """Return (report lines, {check name: failed flags})."""
+    lines = [
+        "base ms: baseline CPU time scaled to this machine's speed at the time of the check",
+        f"{'check':<58} {'base ms':>9} {'now ms':>9} {'ratio':>6} {'base KiB':>10} {'now KiB':>10} {'ratio':>6}",
+    ]
+    failures = {}
+    for name, now in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            lines.append(f"{name:<58} {'(not in baseline)':>9}")
+            continue
+        base_ms = base["min_ms"] * now["calibration_ms"] / base["calibration_ms"]
+        time_ratio = now["min_ms"] / base_ms if base_ms else float("inf")
+        memory_ratio = now["peak_kb"] / base["peak_kb"] if base["peak_kb"] else float("inf")
+        slower = now["min_ms"] > max(base_ms * args.max_slowdown, base_ms + args.min_ms)
+        bigger = now["peak_kb"] > max(base["peak_kb"] * args.max_memory_growth, base["peak_kb"] + args.min_kb)
+        flags = [flag for flag, failed in (("SLOWER", slower), ("MORE MEMORY", bigger)) if failed]
+        if flags:
+            failures[name] = flags
+        lines.append(f"{name:<58} {base_ms:>9.1f} {now['min_ms']:>9.1f} {time_ratio:>5.2f}x "
+                     f"{base['peak_kb']:>10,.0f} {now['peak_kb']:>10,.0f} {memory_ratio:>5.2f}x  {' '.join(flags)}")
+    return lines, failures
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the new baseline")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-slowdown", type=float, default=float(os.getenv("REGRESSION_MAX_SLOWDOWN", "1.3")))
+    parser.add_argument("--max-memory-growth", type=float,
+                        default=float(os.getenv("REGRESSION_MAX_MEMORY_GROWTH", "1.2")))
+    parser.add_argument("--min-ms", type=float, default=5.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--min-kb", type=float, default=1024.0, help="ignore memory growth smaller than this")
+    parser.add_argument("--retries", type=int, default=3, help="re-measurements of a check that looks slower")
+    parser.add_argument("--db-dir", default=os.path.join(tempfile.gettempdir(), "dashboard-bench"))
+    args = parser.parse_args()
+
+    checks = build_checks(args)
+    current = {
+        "environment": environment(),
+        "settings": {"rows": args.rows, "seed": args.seed, "repeat": args.repeat, "today": main.DASHBOARD_TODAY},
+        "results": {name: measure(func, args.repeat) for name, func in checks.items()},
+    }
+    if args.update_baseline:
+        with open(args.baseline, "w") as handle:
+            json.dump(current, handle, indent=2)
+            handle.write("\n")
+        print(f"wrote {args.baseline} ({len(current['results'])} checks)")
+        return
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    if baseline["settings"]["rows"] != args.rows or baseline["settings"]["seed"] != args.seed:
+        raise SystemExit(f"baseline was recorded with {baseline['settings']}; run with the same --rows and --seed")
+    if baseline["settings"].get("today") != main.DASHBOARD_TODAY:
+        raise SystemExit(f"baseline was recorded for DASHBOARD_TODAY={baseline['settings'].get('today')}; "
+                         f"this run uses {main.DASHBOARD_TODAY}")
+    lines, failures = compare(baseline, current, args)
+    for _ in range(args.retries):
+        slower = [name for name, flags in failures.items() if "SLOWER" in flags]
+        if not slower:
+            break
+        for name in slower:
+            retry = measure(checks[name], args.repeat)
+            previous = current["results"][name]
+            if retry["min_ms"] / retry["calibration_ms"] < previous["min_ms"] / previous["calibration_ms"]:
+                current["results"][name] = retry
+        lines, failures = compare(baseline, current, args)
+    print("\n".join(lines))
+    if failures:
+        print(f"\nFAILED: {len(failures)} check(s) over the thresholds "
+              f"(time x{args.max_slowdown}, memory x{args.max_memory_growth}).")
+        print("If the change is intended, re-record with --update-baseline and commit benchmarks/baseline.json.")
+        sys.exit(1)
+    print(f"\nOK: {len(current['results'])} checks within thresholds.")
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,225 @@
+"""Benchmark every data function against a synthetic DAILY_DENIALS table.
+
+The table is generated with benchmarks/synthetic.py and loaded into a
+local stand-in database: SQLite by default, or a scratch MySQL database
+with --backend mysql (DB_HOST/DB_USER/DB_PASSWORD from the environment,
+the database from --mysql-database, which must not be DB_DATABASE).
+main.data_source is pointed at it, so the snapshot load runs the real
+query. Each data function is then timed against that snapshot and the
+results are written as JSON for before/after comparison.
+
+    python benchmarks/suite.py --rows 10000 100000 1000000 --output before.json
+    python benchmarks/suite.py --rows 10000 100000 1000000 --output after.json --compare before.json
+
+SQLite files are kept in --db-dir and reused for the same row count,
+seed and day, so only the first run pays for generating 10M rows.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+from benchmarks.synthetic import iter_denials_frames, zipf_weights, USERS  # noqa: E402
+
+# DAILY_DENIALS column and type for each load_denials_from_db() column
+TABLE_COLUMNS = {
+    "Clinic": ("CLINIC_NAME", "VARCHAR(255)"),
+    "Pt Name": ("PATIENT_NAME", "VARCHAR(255)"),
+    "MRN": ("MRN", "VARCHAR(32)"),
+    "DOB": ("DOB", "DATE"),
+    "DOS": ("DOS", "DATE"),
+    "Payer": ("PAYER_NAME", "VARCHAR(255)"),
+    "CPT": ("PROCEDURE_CODE", "VARCHAR(32)"),
+    "Reason": ("REASON", "VARCHAR(255)"),
+    "CATEGORY": ("CATEGORY", "VARCHAR(255)"),
+    "Denial Date": ("DENIAL_DATE", "DATE"),
+    "User": ("USER_NAME", "VARCHAR(255)"),
+    "ROLE_ID": ("ROLE_ID", "INT"),
+}
+# The busiest synthetic user, for the per-user functions
+BENCH_USER = USERS[int(np.argmax(zipf_weights(len(USERS), 0.8)))]
+
+DATA_FUNCTIONS = {
+    "get_chart_data": lambda: main.get_chart_data(),
+    "get_comparison_data_by_period[daily]": lambda: main.get_comparison_data_by_period("daily"),
+    "get_comparison_data_by_period[biweekly]": lambda: main.get_comparison_data_by_period("biweekly"),
+    "get_comparison_data_by_period[monthly]": lambda: main.get_comparison_data_by_period("monthly"),
+    "get_clarification_grouping_data": lambda: main.get_clarification_grouping_data(),
+    "get_clarification_type_data": lambda: main.get_clarification_type_data(),
+    "get_latest_denial_record": lambda: main.get_latest_denial_record(),
+    "get_denials_comparison_data": lambda: main.get_denials_comparison_data(),
+    "get_denials_biweekly_comparison_data": lambda: main.get_denials_biweekly_comparison_data(),
+    "get_denials_monthly_comparison_data": lambda: main.get_denials_monthly_comparison_data(),
+    "get_users_by_role": lambda: main.get_users_by_role(),
+    "get_user_denials_data": lambda: main.get_user_denials_data(BENCH_USER),
+    "get_biweekly_comparison_data": lambda: main.get_biweekly_comparison_data(),
+    "get_monthly_comparison_data": lambda: main.get_monthly_comparison_data(),
+    "get_biweekly_user_comparison_data": lambda: main.get_biweekly_user_comparison_data(BENCH_USER),
+    "get_monthly_user_comparison_data": lambda: main.get_monthly_user_comparison_data(BENCH_USER),
+}
+
+
+def table_rows(frame: pd.DataFrame):
+    """Rows of a synthetic frame as Python values, in TABLE_COLUMNS order."""
+    values = []
+    for column in TABLE_COLUMNS:
+        series = frame[column]
+        if column == "Denial Date":
+            series = series.dt.date
+        values.append(series.astype(object).tolist())
+    return list(zip(*values))
+
+
+def create_table_sql(text_type=None) -> str:
+    columns = ", ".join(f"{name} {text_type if text_type and sql_type.startswith('VARCHAR') else sql_type}"
+                        for name, sql_type in TABLE_COLUMNS.values())
+    return f"CREATE TABLE DAILY_DENIALS ({columns})"
+
+
+def build_sqlite(path: str, rows: int, seed: int):
+    sqlite3.register_adapter(date, date.isoformat)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute(create_table_sql("TEXT"))
+        placeholders = ", ".join("?" * len(TABLE_COLUMNS))
+        for frame in iter_denials_frames(rows, seed=seed):
+            conn.executemany(f"INSERT INTO DAILY_DENIALS VALUES ({placeholders})", table_rows(frame))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+def use_sqlite(db_dir: str, rows: int, seed: int) -> str:
+    """Point main.data_source at a SQLite copy of the synthetic table."""
+    os.makedirs(db_dir, exist_ok=True)
+    path = os.path.join(db_dir, f"denials-{rows}-{seed}-{main.dashboard_now().date().isoformat()}.sqlite")
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        build_sqlite(path, rows, seed)
+        print(f"built {path} in {time.perf_counter() - started:.1f} s")
+    main.data_source = main.SQLiteDataSource(path)
+    return path
+
+
+def use_mysql(database: str, rows: int, seed: int) -> str:
+    """Load the synthetic table into a scratch MySQL database and use it."""
+    if database == os.getenv("DB_DATABASE"):
+        raise SystemExit("--mysql-database must be a scratch database, not DB_DATABASE")
+    os.environ["DB_DATABASE"] = database
+    main.data_source = main.MySQLDataSource()
+    conn = main.data_source.connect()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DROP TABLE IF EXISTS DAILY_DENIALS")
+        cursor.execute(create_table_sql())
+        placeholders = ", ".join(["%s"] * len(TABLE_COLUMNS))
+        for frame in iter_denials_frames(rows, seed=seed):
+            cursor.executemany(f"INSERT INTO DAILY_DENIALS VALUES ({placeholders})", table_rows(frame))
+            conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+    return f"mysql:{database}"
+
+
+def time_calls(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"min_ms": round(min(timings), 3), "median_ms": round(statistics.median(timings), 3), "repeat": repeat}
+
+
+def run_rows(args, rows: int):
+    if args.backend == "mysql":
+        source = use_mysql(args.mysql_database, rows, args.seed)
+    else:
+        source = use_sqlite(args.db_dir, rows, args.seed)
+    results = {"load_denials_from_db": time_calls(main.load_denials_from_db, args.load_repeat)}
+    main.refresh_denials_snapshot()
+    for name, func in DATA_FUNCTIONS.items():
+        if args.only and not any(pattern in name for pattern in args.only):
+            continue
+        results[name] = time_calls(func, args.repeat)
+    for name, timing in results.items():
+        print(f"{rows:>9} {name:<44} {timing['min_ms']:>11.1f} {timing['median_ms']:>11.1f}")
+    return {"rows": rows, "source": source, "functions": results}
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "commit": commit or None,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def compare(before_path: str, after: dict):
+    """Print median time ratios of `after` against a previous results file."""
+    with open(before_path) as handle:
+        before = json.load(handle)
+    previous = {(run["rows"], name): timing for run in before["runs"] for name, timing in run["functions"].items()}
+    print(f"\n{'rows':>9} {'function':<44} {'before ms':>11} {'after ms':>11} {'ratio':>7}")
+    for run in after["runs"]:
+        for name, timing in run["functions"].items():
+            old = previous.get((run["rows"], name))
+            if old is None:
+                continue
+            ratio = timing["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+            print(f"{run['rows']:>9} {name:<44} {old['median_ms']:>11.1f} {timing['median_ms']:>11.1f} {ratio:>6.2f}x")
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--load-repeat", type=int, default=1, help="repeats of the snapshot load")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", help="time only functions whose name contains one of these")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--db-dir", default=os.path.join(tempfile.gettempdir(), "dashboard-bench"))
+    parser.add_argument("--mysql-database", help="scratch database for --backend mysql")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="earlier --output file to compare against")
+    args = parser.parse_args()
+    if args.backend == "mysql" and not args.mysql_database:
+        parser.error("--backend mysql needs --mysql-database")
+
+    print(f"{'rows':>9} {'function':<44} {'min ms':>11} {'median ms':>11}")
+    results = {
+        "environment": environment(),
+        "settings": {"seed": args.seed, "repeat": args.repeat, "backend": args.backend},
+        "runs": [run_rows(args, rows) for rows in args.rows],
+    }
+    with open(args.output, "w") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"wrote {args.output}")
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,75 @@
+"""Synthetic DAILY_DENIALS rows for benchmarks.
+
+make_denials_frame returns a frame shaped like load_denials_from_db()
+output (same column names, CATEGORY already renamed). The distributions
+follow the production table: a few categories, payers and users account
+for most denials, about half the users are billers (ROLE_ID 6), denials
+are posted on business days, and recent days are busier than old ones.
+
+iter_denials_frames yields the same data in chunks, for row counts that
+do not fit in memory as one frame.
+"""
+import numpy as np
+import pandas as pd
+
+from main import CLASSIFICATION_MAP, dashboard_now
+
+CATEGORIES = sorted(CLASSIFICATION_MAP)
+CLINICS = [f"Clinic {i:03d}" for i in range(60)]
+PAYERS = [f"Payer {i:03d}" for i in range(120)]
+USERS = [f"user.{i:02d}" for i in range(40)]
+CPT_CODES = ["99213", "99214", "93000", "36415", "97110"]
+REASONS = ["CO-16", "CO-97", "PR-1", "CO-22", "CO-29"]
+# Share of denials posted on Monday..Sunday
+WEEKDAY_WEIGHTS = np.array([0.22, 0.21, 0.2, 0.19, 0.16, 0.015, 0.005])
+# Denial volume halves every RECENCY_HALF_LIFE_DAYS going back in time
+RECENCY_HALF_LIFE_DAYS = 180
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def user_roles(seed: int = 0) -> dict:
+    """ROLE_ID per user: 6 for billers, 14 or 7 for the A R team."""
+    rng = np.random.default_rng(seed)
+    return dict(zip(USERS, rng.choice([6, 14, 7], len(USERS), p=[0.5, 0.4, 0.1]).tolist()))
+
+
+def denial_dates(rng, rows: int, days: int, today: pd.Timestamp) -> pd.DatetimeIndex:
+    offsets = np.arange(days)
+    dates = today - pd.to_timedelta(offsets, unit="D")
+    weights = WEEKDAY_WEIGHTS[dates.dayofweek] * 0.5 ** (offsets / RECENCY_HALF_LIFE_DAYS)
+    return dates[rng.choice(days, rows, p=weights / weights.sum())]
+
+
+def make_denials_frame(rows: int, seed: int = 0, days: int = 400, today=None, first_patient: int = 0) -> pd.DataFrame:
+    """Return `rows` denials spread over the `days` days up to today (main.dashboard_now())."""
+    rng = np.random.default_rng(seed)
+    today = (today or dashboard_now()).normalize()
+    roles = user_roles()
+    user = rng.choice(USERS, rows, p=zipf_weights(len(USERS), 0.8))
+    denial_date = denial_dates(rng, rows, days, today)
+    patients = first_patient + rng.integers(0, max(rows // 3, 1), rows)
+    return pd.DataFrame({
+        "Clinic": rng.choice(CLINICS, rows, p=zipf_weights(len(CLINICS), 0.7)),
+        "Pt Name": np.char.add("Patient ", patients.astype(str)),
+        "MRN": (100000 + patients % 900000).astype(str),
+        "DOB": (pd.Timestamp("1940-01-01") + pd.to_timedelta(rng.integers(0, 25000, rows), unit="D")).date,
+        "DOS": (denial_date - pd.to_timedelta(rng.integers(5, 60, rows), unit="D")).date,
+        "Payer": rng.choice(PAYERS, rows, p=zipf_weights(len(PAYERS))),
+        "CPT": rng.choice(CPT_CODES, rows, p=[0.35, 0.3, 0.15, 0.12, 0.08]),
+        "Reason": rng.choice(REASONS, rows, p=[0.3, 0.25, 0.2, 0.15, 0.1]),
+        "CATEGORY": rng.choice(CATEGORIES, rows, p=zipf_weights(len(CATEGORIES), 1.3)),
+        "Denial Date": denial_date,
+        "User": user,
+        "ROLE_ID": pd.Series(user).map(roles).to_numpy(),
+    })
+
+
+def iter_denials_frames(rows: int, chunk_rows: int = 500000, seed: int = 0, days: int = 400, today=None):
+    """Yield make_denials_frame chunks totalling `rows` rows."""
+    for index, start in enumerate(range(0, rows, chunk_rows)):
+        yield make_denials_frame(min(chunk_rows, rows - start), seed=seed + index, days=days, today=today,
+                                 first_patient=start // 3)
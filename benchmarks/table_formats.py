@@ -0,0 +1,89 @@
+"""Compare the HTML and columnar popup table payloads.
+
+Builds a synthetic popup table (the columns get_chart_data renders) and
+reports server time and JSON payload size, raw and gzipped, for
+format=html and format=columnar.
+
+    python benchmarks/table_formats.py --rows 1000 10000 50000
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import build_columnar_table, render_table_html  # noqa: E402
+
+
+def make_popup_table(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Return a popup-shaped frame with realistic cardinalities."""
+    rng = np.random.default_rng(seed)
+    clinics = [f"Clinic {i:03d}" for i in range(60)]
+    payers = [f"Payer {i:03d}" for i in range(120)]
+    users = [f"user.{i:02d}" for i in range(40)]
+    categories = ["Wrong insurance", "No active coverage", "Invalid DOS", "Duplicate claim", "Missing EOB"]
+    denial_dates = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+    frame = pd.DataFrame({
+        "Clinic": rng.choice(clinics, rows),
+        "Pt Name": [f"Patient {i}" for i in rng.integers(0, rows, rows)],
+        "MRN": rng.integers(100000, 999999, rows).astype(str),
+        "DOB": pd.Timestamp("1940-01-01") + pd.to_timedelta(rng.integers(0, 25000, rows), unit="D"),
+        "DOS": denial_dates - pd.to_timedelta(rng.integers(5, 60, rows), unit="D"),
+        "Payer": rng.choice(payers, rows),
+        "CPT": rng.choice(["99213", "99214", "93000", "36415"], rows),
+        "Reason": rng.choice(["CO-16", "CO-97", "PR-1", "CO-22"], rows),
+        "Category": rng.choice(categories, rows),
+        "Denial Date": denial_dates,
+        "User": rng.choice(users, rows),
+        "Biller Role Type": rng.choice(["Biller", "AR Biller", ""], rows),
+    })
+    return frame.sort_values("Clinic")
+
+
+def html_payload(frame: pd.DataFrame) -> str:
+    formatted = frame.copy()
+    for col in ["DOB", "DOS", "Denial Date"]:
+        formatted[col] = formatted[col].dt.strftime("%m/%d/%Y").fillna("")
+    return json.dumps({"table_data": {"cls": render_table_html(formatted)}})
+
+
+def columnar_payload(frame: pd.DataFrame, date_format: str) -> str:
+    return json.dumps({"table_data": {"cls": build_columnar_table(frame, date_format)}})
+
+
+def measure(builder, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = builder()
+        best = min(best, time.perf_counter() - started)
+    raw = body.encode()
+    return best, len(raw), len(gzip.compress(raw))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'format':<16} {'ms':>9} {'bytes':>12} {'gzip':>10}")
+    for rows in args.rows:
+        frame = make_popup_table(rows)
+        variants = [
+            ("html", lambda: html_payload(frame)),
+            ("columnar/iso", lambda: columnar_payload(frame, "iso")),
+            ("columnar/epoch", lambda: columnar_payload(frame, "epoch")),
+        ]
+        for name, builder in variants:
+            seconds, size, gz_size = measure(builder, args.repeat)
+            print(f"{rows:>8} {name:<16} {seconds * 1000:>9.1f} {size:>12,} {gz_size:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,86 +1,1187 @@
-from fastapi import FastAPI, Request, Form, status
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi import FastAPI, Request, Form, File, UploadFile, status
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response, StreamingResponse
 from starlette.middleware.sessions import SessionMiddleware
 import pandas as pd
+import numpy as np
 import os
 import json
 import hashlib
-from datetime import datetime
+import hmac
+import gzip
+import io
+import base64
+import binascii
+import bisect
+import asyncio
+import queue
+import random
+import re
+import sqlite3
+import stat
+import threading
+import time
+import tracemalloc
+import contextvars
+import functools
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from cachetools import LRUCache
+from concurrent.futures import ThreadPoolExecutor
+from pandas.io.formats.format import format_array
 import mysql.connector
 from mysql.connector import Error
 from dotenv import load_dotenv
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Arrow responses are optional; JSON works without pyarrow
+    pa = None
+    pc = None
+
+try:
+    from openpyxl import load_workbook
+    from openpyxl.utils import get_column_letter
+except ImportError:  # only /export-table and XLSX uploads need openpyxl
+    load_workbook = None
+    get_column_letter = None
+
 app = FastAPI()
 load_dotenv()
 app.add_middleware(SessionMiddleware, secret_key="xxxx")
 USERS_TABLE = os.getenv("USERS_TABLE", "users")
+# The dashboard's date windows (yesterday, the current biweekly half, last
+# month) are computed from dashboard_now(). DASHBOARD_TODAY=YYYY-MM-DD pins
+# that date, so benchmarks see the same windows whichever day they run.
+DASHBOARD_TODAY = os.getenv("DASHBOARD_TODAY")
+
+def dashboard_now() -> pd.Timestamp:
+    """Current time, or midnight of DASHBOARD_TODAY when that is set."""
+    if DASHBOARD_TODAY:
+        return pd.Timestamp(DASHBOARD_TODAY)
+    return pd.Timestamp.now()
+
+# --------------------------------------------------------------------
+# Stage timing
+# Code wrapped in `with stage("name"):` (or decorated with @timed_stage)
+# records its duration on the current request. StageTimingMiddleware
+# sends the totals as a Server-Timing header; with STAGE_TIMING_LOG=1 it
+# also prints one JSON log line per request. Outside a request, or with
+# STAGE_TIMING_ENABLED=0, the middleware is not installed and stage()
+# only does ContextVar lookups.
+# Stages also delimit memory accounting (see Memory profiling below).
+STAGE_TIMING_ENABLED = os.getenv("STAGE_TIMING_ENABLED", "1") == "1"
+STAGE_TIMING_LOG = os.getenv("STAGE_TIMING_LOG", "0") == "1"
+_request_stages = contextvars.ContextVar("request_stages", default=None)
+
+@contextmanager
+def stage(name: str):
+    stages = _request_stages.get()
+    memory = _request_memory.get()
+    if stages is None and memory is None:
+        yield
+        return
+    started = time.perf_counter()
+    if memory is not None:
+        enter_memory_stage(memory, name)
+    try:
+        yield
+    finally:
+        if stages is not None:
+            stages.append((name, time.perf_counter() - started))
+        if memory is not None:
+            exit_memory_stage(memory)
+
+def timed_stage(name: str):
+    """Decorator form of stage()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def summarize_stages(stages):
+    """Total milliseconds per stage name, in first-seen order."""
+    totals = {}
+    for name, seconds in stages:
+        totals[name] = totals.get(name, 0.0) + seconds * 1000
+    return totals
+
+class StageTimingMiddleware:
+    """ASGI middleware that reports the stages recorded during a request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stages = []
+        token = _request_stages.set(stages)
+        started = time.perf_counter()
+        response_status = []
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                response_status.append(message["status"])
+                totals = summarize_stages(stages)
+                totals["total"] = (time.perf_counter() - started) * 1000
+                header = ", ".join(f"{name};dur={ms:.2f}" for name, ms in totals.items())
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stages.reset(token)
+            if STAGE_TIMING_LOG and stages:
+                print(json.dumps({
+                    "event": "request_timing",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": response_status[0] if response_status else None,
+                    "total_ms": round((time.perf_counter() - started) * 1000, 2),
+                    "stages_ms": {name: round(ms, 2) for name, ms in summarize_stages(stages).items()},
+                }))
+
+if STAGE_TIMING_ENABLED:
+    app.add_middleware(StageTimingMiddleware)
+
+# --------------------------------------------------------------------
+# Metrics
+# A small in-process registry of counters, gauges and histograms, served
+# at /metrics in the Prometheus text format. Updates are a dict lookup
+# and a bisect under one lock; gauges that describe current state (such
+# as snapshot age) are computed when /metrics is scraped.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Bearer token for scrapers; without it /metrics is only served to admin sessions
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+ROWS_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+def _format_labels(names, values, extra=""):
+    pairs = [
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), chr(92) + "n")}"'
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _Metric:
+    def __init__(self, name, help_text, labels=(), collect=None):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        # collect() returns [(label values tuple, value), ...] at scrape time,
+        # for values that are already tracked elsewhere
+        self._collect = collect
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def samples(self):
+        if self._collect is not None:
+            items = self._collect()
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return [(self.name, _format_labels(self.labels, key), value) for key, value in items]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1.0, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # one slot per bucket, one for +Inf, then the sum
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts)) for key, counts in self._values.items()]
+        result = []
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                result.append((f"{self.name}_bucket", _format_labels(self.labels, key, f'le="{le}"'), cumulative))
+            result.append((f"{self.name}_sum", _format_labels(self.labels, key), counts[-1]))
+            result.append((f"{self.name}_count", _format_labels(self.labels, key), cumulative))
+        return result
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+REQUEST_LATENCY = metrics.register(Histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("route", "method", "status")))
+RESPONSE_BYTES = metrics.register(Histogram(
+    "http_response_bytes", "Response body size by route.", ("route",), BYTES_BUCKETS))
+DB_QUERY_LATENCY = metrics.register(Histogram(
+    "db_query_duration_seconds", "Database query time, including fetching rows.", ("query",)))
+DB_ROWS_FETCHED = metrics.register(Histogram(
+    "db_rows_fetched", "Rows fetched per database query.", ("query",), ROWS_BUCKETS))
+DB_CONNECTION_WAIT = metrics.register(Histogram(
+    "db_connection_wait_seconds", "Time to obtain a database connection."))
+PAYLOAD_CACHE_REQUESTS = metrics.register(Counter(
+    "payload_cache_requests_total", "Payload cache lookups by payload and result.", ("payload", "result")))
+
+def request_route(scope) -> str:
+    """Route template for a request, so labels do not grow with path parameters."""
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and response size per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        response = {"status": 500, "bytes": 0}
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            route = request_route(scope)
+            REQUEST_LATENCY.observe(time.perf_counter() - started, route=route, method=scope["method"], status=str(response["status"]))
+            RESPONSE_BYTES.observe(response["bytes"], route=route)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# --------------------------------------------------------------------
+# Memory profiling
+# With MEMORY_PROFILING_ENABLED=1, a sample of requests (one at a time,
+# MEMORY_PROFILING_SAMPLE_RATE of them) runs under tracemalloc. The peak
+# allocation of the request and of each stage() inside it, plus the
+# process RSS before and after, go to a "request_memory" log line and to
+# /metrics. tracemalloc slows every thread while it traces and also sees
+# allocations of requests running at the same time, so keep the sample
+# rate low in production and read the numbers as upper bounds.
+MEMORY_PROFILING_ENABLED = os.getenv("MEMORY_PROFILING_ENABLED", "0") == "1"
+MEMORY_PROFILING_SAMPLE_RATE = float(os.getenv("MEMORY_PROFILING_SAMPLE_RATE", "0.1"))
+MEMORY_BUCKETS = tuple(2 ** power for power in range(20, 33))  # 1 MiB .. 4 GiB
+_request_memory = contextvars.ContextVar("request_memory", default=None)
+_memory_profile_lock = threading.Lock()
+
+try:
+    import resource
+except ImportError:  # Windows: no high-water mark
+    resource = None
+
+REQUEST_PEAK_MEMORY = metrics.register(Histogram(
+    "http_request_peak_memory_bytes", "Peak traced allocation of profiled requests.", ("route",), MEMORY_BUCKETS))
+STAGE_PEAK_MEMORY = metrics.register(Histogram(
+    "stage_peak_memory_bytes", "Peak traced allocation of stages in profiled requests.", ("stage",), MEMORY_BUCKETS))
+
+def current_rss_bytes():
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def max_rss_bytes():
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _rss_samples(read):
+    value = read()
+    return [] if value is None else [((), value)]
+
+metrics.register(Gauge("process_resident_memory_bytes", "Resident set size of this worker.",
+                       collect=lambda: _rss_samples(current_rss_bytes)))
+metrics.register(Gauge("process_max_resident_memory_bytes", "High-water resident set size of this worker.",
+                       collect=lambda: _rss_samples(max_rss_bytes)))
+
+def _fold_memory_peak(memory):
+    """Credit the traced peak so far to the request and every open stage; return current bytes."""
+    current, peak = tracemalloc.get_traced_memory()
+    memory["peak"] = max(memory["peak"], peak - memory["start"])
+    for entry in memory["open"]:
+        entry[2] = max(entry[2], peak)
+    return current
+
+def enter_memory_stage(memory, name: str):
+    current = _fold_memory_peak(memory)
+    tracemalloc.reset_peak()
+    memory["open"].append([name, current, current])
+
+def exit_memory_stage(memory):
+    _fold_memory_peak(memory)
+    name, start, peak = memory["open"].pop()
+    memory["stages"][name] = max(memory["stages"].get(name, 0), peak - start)
+
+class MemoryProfilingMiddleware:
+    """ASGI middleware running sampled requests under tracemalloc."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or random.random() >= MEMORY_PROFILING_SAMPLE_RATE
+            or not _memory_profile_lock.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+        response_status = []
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                response_status.append(message["status"])
+            await send(message)
+
+        rss_before, max_rss_before = current_rss_bytes(), max_rss_bytes()
+        tracemalloc.start()
+        memory = {"start": tracemalloc.get_traced_memory()[0], "peak": 0, "open": [], "stages": {}}
+        token = _request_memory.set(memory)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_memory.reset(token)
+            _fold_memory_peak(memory)
+            tracemalloc.stop()
+            _memory_profile_lock.release()
+            route = request_route(scope)
+            REQUEST_PEAK_MEMORY.observe(memory["peak"], route=route)
+            for name, peak in memory["stages"].items():
+                STAGE_PEAK_MEMORY.observe(peak, stage=name)
+            rss_after, max_rss_after = current_rss_bytes(), max_rss_bytes()
+            print(json.dumps({
+                "event": "request_memory",
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route,
+                "status": response_status[0] if response_status else None,
+                "peak_bytes": memory["peak"],
+                "stages_peak_bytes": memory["stages"],
+                "rss_before_bytes": rss_before,
+                "rss_after_bytes": rss_after,
+                # Non-zero when this request raised the worker's memory high-water mark
+                "max_rss_growth_bytes": (
+                    max_rss_after - max_rss_before if max_rss_before is not None else None
+                ),
+            }))
+
+if MEMORY_PROFILING_ENABLED:
+    app.add_middleware(MemoryProfilingMiddleware)
 
-def get_connection():
+def get_connection(autocommit: bool = False):
     """Create a new MySQL connection using environment variables."""
+    started = time.perf_counter()
     try:
         conn = mysql.connector.connect(
             host=os.getenv("DB_HOST"),
             user=os.getenv("DB_USER"),
             password=os.getenv("DB_PASSWORD"),
             database=os.getenv("DB_DATABASE"),
+            autocommit=autocommit,
         )
+        DB_CONNECTION_WAIT.observe(time.perf_counter() - started)
         return conn
     except Error as err:
         raise Exception(f"Database connection failed: {err}")
 
-def ensure_users_table(conn):
-    """Create the users table if it does not exist."""
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            f"""
-            CREATE TABLE IF NOT EXISTS `{USERS_TABLE}` (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                username VARCHAR(255) UNIQUE NOT NULL,
-                password_hash VARCHAR(255) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+# --------------------------------------------------------------------
+# Connection pool
+# Short statements on the auth path (login, registration) reuse open
+# connections instead of paying a connect handshake per request. Time
+# spent waiting for a free connection goes into
+# db_connection_wait_seconds; idle connections older than
+# DB_POOL_RECYCLE_SECONDS are closed rather than reused, so connections
+# the server has dropped (MySQL wait_timeout) are not handed out.
+# Each SqlDataSource keeps a second pool of autocommit connections for
+# single-statement reads: every SELECT sees the latest committed data
+# and leaves no transaction open, so a lookup is one round trip.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+DB_POOL_RECYCLE_SECONDS = float(os.getenv("DB_POOL_RECYCLE_SECONDS", "3600"))
+
+class ConnectionPool:
+    """At most `size` connections from connect(), handed out one caller at a time."""
+
+    def __init__(self, connect, size: int = DB_POOL_SIZE):
+        self._connect = connect
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+
+    @contextmanager
+    def connection(self):
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=DB_POOL_TIMEOUT_SECONDS):
+            raise Exception(f"No database connection free after {DB_POOL_TIMEOUT_SECONDS:g} s")
+        conn = None
+        try:
+            while conn is None:
+                try:
+                    conn, opened_at = self._idle.get_nowait()
+                except queue.Empty:
+                    # connect() records its own time in db_connection_wait_seconds
+                    conn, opened_at = self._connect(), time.monotonic()
+                    break
+                if time.monotonic() - opened_at > DB_POOL_RECYCLE_SECONDS:
+                    self._close(conn)
+                    conn = None
+                else:
+                    DB_CONNECTION_WAIT.observe(time.perf_counter() - started)
+            try:
+                yield conn
+            except Exception:
+                # Leave no open transaction behind; drop the connection if even that fails
+                try:
+                    conn.rollback()
+                except Exception:
+                    self._close(conn)
+                    conn = None
+                raise
+        finally:
+            if conn is not None:
+                self._idle.put((conn, opened_at))
+            self._slots.release()
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+# --------------------------------------------------------------------
+# Slow query log
+# Every SQL statement runs through SqlDataSource.query(), which times it.
+# Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with their row
+# count and EXPLAIN plan and aggregated by fingerprint (the statement with
+# literals and placeholders replaced by ?) for the /slow-queries endpoint.
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "1") == "1"
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+# Comma-separated usernames allowed on admin endpoints; empty means no admins
+ADMIN_USERS = {name.strip() for name in os.getenv("ADMIN_USERS", "").split(",") if name.strip()}
+EXPLAINABLE_STATEMENTS = ("select", "insert", "update", "delete", "replace")
+
+_slow_queries = LRUCache(maxsize=SLOW_QUERY_LOG_SIZE)
+_slow_queries_lock = threading.Lock()
+SLOW_QUERIES = metrics.register(Counter(
+    "db_slow_queries_total", "Statements slower than SLOW_QUERY_THRESHOLD_MS.", ("query",)))
+
+def query_fingerprint(sql: str) -> str:
+    """Normalize a statement so that executions differing only in values group together."""
+    text = re.sub(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"", "?", sql)
+    text = re.sub(r"%s|\b\d+(?:\.\d+)?\b", "?", text)
+    text = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?+)", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def record_slow_query(name: str, sql: str, seconds: float, rows, explain):
+    fingerprint = query_fingerprint(sql)
+    query_id = hashlib.sha1(fingerprint.encode()).hexdigest()[:12]
+    elapsed_ms = round(seconds * 1000, 2)
+    SLOW_QUERIES.inc(query=name)
+    with _slow_queries_lock:
+        entry = _slow_queries.get(query_id) or {
+            "id": query_id, "name": name, "fingerprint": fingerprint, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+        }
+        entry["count"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + elapsed_ms, 2)
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry.update({"last_ms": elapsed_ms, "last_rows": rows, "last_seen": datetime.now().isoformat(timespec="seconds")})
+        if explain is not None:
+            entry["explain"] = explain
+        _slow_queries[query_id] = entry
+    print(json.dumps({
+        "event": "slow_query", "id": query_id, "name": name, "ms": elapsed_ms, "rows": rows,
+        "fingerprint": fingerprint, "explain": explain,
+    }, default=str))
+
+def is_admin(request: Request) -> bool:
+    if not request.session.get("authenticated"):
+        return False
+    return request.session.get("username") in ADMIN_USERS
+
+def admin_error_response(request: Request):
+    """401 for anonymous requests, 403 for users not in ADMIN_USERS, None for admins."""
+    if not request.session.get("authenticated"):
+        return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
+    if not is_admin(request):
+        return JSONResponse(content={"error": "Forbidden"}, status_code=403)
+    return None
+
+# --------------------------------------------------------------------
+# Data sources
+# All database access goes through `data_source`, chosen by DATA_SOURCE:
+# "mysql" (the default, using the DB_* variables), "sqlite" (SQLITE_PATH)
+# or "parquet" (one <table>.parquet file per table in PARQUET_DIR). The
+# local backends let the app run, be benchmarked and be load-tested
+# without a live MySQL server.
+DATA_SOURCE = os.getenv("DATA_SOURCE", "mysql")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "dashboard.sqlite")
+PARQUET_DIR = os.getenv("PARQUET_DIR", "data")
+
+# DAILY_DENIALS column -> column name used by the data functions
+DENIALS_COLUMNS = {
+    "CLINIC_NAME": "Clinic",
+    "PATIENT_NAME": "Pt Name",
+    "MRN": "MRN",
+    "DOB": "DOB",
+    "DOS": "DOS",
+    "PAYER_NAME": "Payer",
+    "PROCEDURE_CODE": "CPT",
+    "REASON": "Reason",
+    "CATEGORY": "Category",
+    "DENIAL_DATE": "Denial Date",
+    "USER_NAME": "User",
+    "ROLE_ID": "ROLE_ID",
+}
+# Backtick-quoted aliases are accepted by both MySQL and SQLite
+DENIALS_QUERY = "SELECT " + ", ".join(f"{column} AS `{alias}`" for column, alias in DENIALS_COLUMNS.items()) + " FROM DAILY_DENIALS"
+
+class SqlDataSource:
+    """Data source over a DB-API connection. Subclasses provide connect()
+    and the dialect-specific SQL; queries are written with %s placeholders."""
+
+    placeholder = "%s"
+    explain_prefix = "EXPLAIN "
+    users_table_ddl = ""
+
+    def __init__(self):
+        self._pool = None
+        self._read_pool = None
+        self._pool_lock = threading.Lock()
+        self._schema_verified = False
+        self._schema_lock = threading.Lock()
+
+    def connect(self, autocommit: bool = False):
+        raise NotImplementedError
+
+    def pooled_connection(self):
+        """Context manager lending a connection from this source's ConnectionPool."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(self.connect)
+        return self._pool.connection()
+
+    def pooled_read_connection(self):
+        """Like pooled_connection(), but the connection is in autocommit mode. For single reads only."""
+        if self._read_pool is None:
+            with self._pool_lock:
+                if self._read_pool is None:
+                    self._read_pool = ConnectionPool(functools.partial(self.connect, autocommit=True))
+        return self._read_pool.connection()
+
+    def sql(self, query: str) -> str:
+        return query.replace("%s", self.placeholder)
+
+    def query(self, conn, name: str, sql: str, params=(), fetch="all"):
+        """Execute one statement and return fetchall() / fetchone() / None for fetch="all" / "one" / None.
+
+        The statement is timed into db_query_duration_seconds{query=name}
+        and recorded in the slow query log when over the threshold.
+        """
+        cursor = conn.cursor()
+        try:
+            started = time.perf_counter()
+            cursor.execute(sql, params)
+            if fetch == "all":
+                result = cursor.fetchall()
+                rows = len(result)
+            elif fetch == "one":
+                result = cursor.fetchone()
+                rows = int(result is not None)
+            else:
+                result, rows = None, cursor.rowcount
+            elapsed = time.perf_counter() - started
+        finally:
+            cursor.close()
+        DB_QUERY_LATENCY.observe(elapsed, query=name)
+        if fetch == "all":
+            DB_ROWS_FETCHED.observe(rows, query=name)
+        if elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+            record_slow_query(name, sql, elapsed, rows, self.explain(conn, sql, params) if SLOW_QUERY_EXPLAIN else None)
+        return result
+
+    def execute_many(self, conn, name: str, sql: str, rows):
+        """executemany() one statement over rows and return the affected row count, timed like query()."""
+        cursor = conn.cursor()
+        try:
+            started = time.perf_counter()
+            cursor.executemany(sql, rows)
+            affected = cursor.rowcount
+            elapsed = time.perf_counter() - started
+        finally:
+            cursor.close()
+        DB_QUERY_LATENCY.observe(elapsed, query=name)
+        if elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+            record_slow_query(name, sql, elapsed, affected, None)
+        return affected
+
+    def explain(self, conn, sql: str, params=()):
+        """EXPLAIN plan rows as dicts, or None for statements that cannot be explained."""
+        if not sql.lstrip().lower().startswith(EXPLAINABLE_STATEMENTS):
+            return None
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.explain_prefix + sql, params)
+                columns = [column[0] for column in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+        except Exception as exc:
+            return [{"error": str(exc)}]
+
+    def load_denials(self):
+        """Return the DAILY_DENIALS rows as a DataFrame with DENIALS_COLUMNS names."""
+        with stage("db_connect"):
+            conn = self.connect()
+        try:
+            # Same steps as pd.read_sql, split so database time and DataFrame
+            # materialization are timed separately
+            with stage("db_query"):
+                rows = self.query(conn, "denials_snapshot", DENIALS_QUERY)
+        finally:
+            conn.close()
+        with stage("materialize"):
+            return pd.DataFrame.from_records(rows, columns=list(DENIALS_COLUMNS.values()), coerce_float=True)
+
+    def ensure_users_table(self, conn):
+        """Create the users table if it does not exist."""
+        self.query(conn, "users_ddl", self.users_table_ddl, fetch=None)
+
+    def bootstrap_schema(self):
+        """Create the tables the app owns, once per process.
+
+        Runs at startup (and from `python main.py bootstrap-schema`); the
+        auth methods call it too, so a database that was down at startup
+        is bootstrapped by the first login, but after that it is only a
+        flag check and no DDL runs on the request path.
+        """
+        if self._schema_verified:
+            return
+        with self._schema_lock:
+            if self._schema_verified:
+                return
+            with self.pooled_connection() as conn:
+                self.ensure_users_table(conn)
+                conn.commit()
+            self._schema_verified = True
+
+    def index_columns(self, conn, table: str):
+        """Return {index name: tuple of columns} for the indexes on table."""
+        raise NotImplementedError
+
+    def create_index(self, conn, name: str, table: str, columns):
+        self.query(conn, "create_index", f"CREATE INDEX `{name}` ON `{table}` ({', '.join(columns)})", fetch=None)
+
+    def plan_indexes(self, plan):
+        """Names of the indexes an EXPLAIN plan reads."""
+        raise NotImplementedError
+
+    def get_password_hash(self, username: str):
+        """Return the stored password hash for username, or None."""
+        self.bootstrap_schema()
+        # username is UNIQUE, so this is a single index lookup
+        with self.pooled_read_connection() as conn:
+            result = self.query(
+                conn, "user_lookup", self.sql(f"SELECT password_hash FROM `{USERS_TABLE}` WHERE username = %s"),
+                (username,), fetch="one",
+            )
+        return result[0] if result else None
+
+    def add_user(self, username: str, password_hash: str):
+        """Insert a user; raise ValueError if the username is taken.
+
+        A single INSERT: the UNIQUE constraint on username decides, so two
+        concurrent registrations of the same name cannot both succeed.
+        """
+        self.bootstrap_schema()
+        with self.pooled_connection() as conn:
+            try:
+                self.query(
+                    conn, "user_insert",
+                    self.sql(f"INSERT INTO `{USERS_TABLE}` (username, password_hash) VALUES (%s, %s)"),
+                    (username, password_hash), fetch=None,
+                )
+            except Exception as exc:
+                if self.is_duplicate_key(exc):
+                    raise ValueError("Username already exists.")
+                raise
+            conn.commit()
+
+    def add_users(self, users):
+        """Insert (username, password_hash) pairs in USER_IMPORT_BATCH_SIZE batches.
+
+        Usernames that already exist are skipped, not overwritten. Returns
+        the usernames that were skipped. Each batch is one executemany in
+        its own transaction.
+        """
+        self.bootstrap_schema()
+        skipped = []
+        insert = self.sql(f"{self.insert_ignore} INTO `{USERS_TABLE}` (username, password_hash) VALUES (%s, %s)")
+        with self.pooled_connection() as conn:
+            for start in range(0, len(users), USER_IMPORT_BATCH_SIZE):
+                batch = users[start:start + USER_IMPORT_BATCH_SIZE]
+                inserted = self.execute_many(conn, "user_bulk_insert", insert, batch)
+                if inserted < len(batch):
+                    # Hashes are salted, so a row whose stored hash differs from
+                    # ours belonged to an existing account
+                    ours = dict(batch)
+                    placeholders = ", ".join(["%s"] * len(batch))
+                    stored = self.query(
+                        conn, "user_bulk_existing",
+                        self.sql(f"SELECT username, password_hash FROM `{USERS_TABLE}` "
+                                 f"WHERE username IN ({placeholders})"),
+                        tuple(ours),
+                    )
+                    skipped.extend(username for username, password_hash in stored if ours[username] != password_hash)
+                conn.commit()
+        return skipped
+
+    def is_duplicate_key(self, exc) -> bool:
+        raise NotImplementedError
+
+    def insert_denials(self, frame):
+        """Insert a frame with DENIALS_COLUMNS columns into DAILY_DENIALS in one transaction."""
+        columns = list(DENIALS_COLUMNS)
+        insert = self.sql(f"INSERT INTO DAILY_DENIALS ({', '.join(columns)}) "
+                          f"VALUES ({', '.join(['%s'] * len(columns))})")
+        rows = list(zip(*(frame[column].tolist() for column in columns)))
+        with self.pooled_connection() as conn:
+            self.execute_many(conn, "denials_insert", insert, rows)
+            conn.commit()
+
+    def update_password_hash(self, username: str, password_hash: str):
+        self.bootstrap_schema()
+        with self.pooled_connection() as conn:
+            self.query(
+                conn, "user_rehash",
+                self.sql(f"UPDATE `{USERS_TABLE}` SET password_hash = %s WHERE username = %s"),
+                (password_hash, username), fetch=None,
             )
+            conn.commit()
+
+    def table_columns(self, table: str):
+        """Return (name, data_type, is_nullable, default) for each column of table."""
+        raise NotImplementedError
+
+class MySQLDataSource(SqlDataSource):
+    insert_ignore = "INSERT IGNORE"
+    users_table_ddl = f"""
+        CREATE TABLE IF NOT EXISTS `{USERS_TABLE}` (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            username VARCHAR(255) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+
+    def connect(self, autocommit: bool = False):
+        return get_connection(autocommit)
+
+    def is_duplicate_key(self, exc) -> bool:
+        # ER_DUP_ENTRY
+        return isinstance(exc, mysql.connector.IntegrityError) and exc.errno == 1062
+
+    def index_columns(self, conn, table: str):
+        rows = self.query(
+            conn, "index_columns",
             """
+            SELECT INDEX_NAME, COLUMN_NAME
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+            ORDER BY INDEX_NAME, SEQ_IN_INDEX
+            """,
+            (os.getenv("DB_DATABASE"), table),
         )
-    finally:
-        cursor.close()
+        indexes = {}
+        for index_name, column in rows:
+            indexes.setdefault(index_name, []).append(column.upper())
+        return {name: tuple(columns) for name, columns in indexes.items()}
 
-def create_user(username: str, password: str):
-    """Register a new user with hashed password."""
+    def plan_indexes(self, plan):
+        # EXPLAIN has one row per table read; "key" is the index it uses
+        return {row.get("key") for row in plan if row.get("key")}
+
+    def table_columns(self, table: str):
+        conn = self.connect()
+        try:
+            return self.query(
+                conn, "table_columns",
+                """
+                SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+                FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                ORDER BY ORDINAL_POSITION
+                """,
+                (os.getenv("DB_DATABASE"), table),
+            )
+        finally:
+            conn.close()
+
+def _sqlite_date(value: bytes):
+    # DATE columns are stored as ISO text; return datetime.date like MySQL does
+    return datetime.fromisoformat(value.decode()).date()
+
+class SQLiteDataSource(SqlDataSource):
+    placeholder = "?"
+    explain_prefix = "EXPLAIN QUERY PLAN "
+    insert_ignore = "INSERT OR IGNORE"
+    users_table_ddl = f"""
+        CREATE TABLE IF NOT EXISTS `{USERS_TABLE}` (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username VARCHAR(255) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        sqlite3.register_converter("DATE", _sqlite_date)
+        sqlite3.register_adapter(date, date.isoformat)
+
+    def connect(self, autocommit: bool = False):
+        started = time.perf_counter()
+        # Pooled connections move between threadpool threads, one at a time
+        conn = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                               isolation_level=None if autocommit else "")
+        DB_CONNECTION_WAIT.observe(time.perf_counter() - started)
+        return conn
+
+    def is_duplicate_key(self, exc) -> bool:
+        return isinstance(exc, sqlite3.IntegrityError) and "UNIQUE" in str(exc)
+
+    def index_columns(self, conn, table: str):
+        indexes = {}
+        # PRAGMA index_list rows: seq, name, unique, origin, partial
+        for row in self.query(conn, "index_columns", f"PRAGMA index_list(`{table}`)"):
+            info = self.query(conn, "index_columns", f"PRAGMA index_info(`{row[1]}`)")
+            # PRAGMA index_info rows: seqno, cid, name
+            indexes[row[1]] = tuple(column[2].upper() for column in sorted(info))
+        return indexes
+
+    def plan_indexes(self, plan):
+        # EXPLAIN QUERY PLAN details read "SEARCH t USING [COVERING] INDEX name (...)"
+        return {match.group(1) for row in plan for match in [re.search(r"USING (?:COVERING )?INDEX (\S+)", row["detail"])] if match}
+
+    def table_columns(self, table: str):
+        conn = self.connect()
+        try:
+            rows = self.query(conn, "table_columns", f"PRAGMA table_info(`{table}`)")
+        finally:
+            conn.close()
+        # PRAGMA table_info rows: cid, name, type, notnull, dflt_value, pk
+        return [(row[1], row[2], "NO" if row[3] else "YES", row[4]) for row in rows]
+
+class ParquetDataSource:
+    """Read-mostly data source over <table>.parquet files in a directory.
+
+    DAILY_DENIALS.parquet holds the DAILY_DENIALS columns. The users table
+    is rewritten as a whole when a user is added, which is fine for the
+    handful of accounts a local setup has.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._users_lock = threading.Lock()
+        self._denials_lock = threading.Lock()
+
+    def table_path(self, table: str) -> str:
+        return os.path.join(self.directory, f"{table}.parquet")
+
+    def load_denials(self):
+        with stage("db_query"):
+            started = time.perf_counter()
+            df = pd.read_parquet(self.table_path("DAILY_DENIALS"), columns=list(DENIALS_COLUMNS))
+            DB_QUERY_LATENCY.observe(time.perf_counter() - started, query="denials_snapshot")
+            DB_ROWS_FETCHED.observe(len(df), query="denials_snapshot")
+        return df.rename(columns=DENIALS_COLUMNS)
+
+    def _read_users(self):
+        try:
+            return pd.read_parquet(self.table_path(USERS_TABLE))
+        except FileNotFoundError:
+            return pd.DataFrame({"username": pd.Series(dtype=str), "password_hash": pd.Series(dtype=str)})
+
+    def bootstrap_schema(self):
+        pass  # the users file is created by the first add_user()
+
+    def get_password_hash(self, username: str):
+        users = self._read_users()
+        match = users.loc[users["username"] == username, "password_hash"]
+        return match.iloc[0] if len(match) else None
+
+    def add_user(self, username: str, password_hash: str):
+        with self._users_lock:
+            users = self._read_users()
+            if (users["username"] == username).any():
+                raise ValueError("Username already exists.")
+            users = pd.concat([users, pd.DataFrame({"username": [username], "password_hash": [password_hash]})],
+                              ignore_index=True)
+            self._write_users(users)
+
+    def add_users(self, users):
+        with self._users_lock:
+            existing = self._read_users()
+            new = pd.DataFrame(users, columns=["username", "password_hash"])
+            taken = new["username"].isin(existing["username"])
+            self._write_users(pd.concat([existing, new[~taken]], ignore_index=True))
+        return new.loc[taken, "username"].tolist()
+
+    def update_password_hash(self, username: str, password_hash: str):
+        with self._users_lock:
+            users = self._read_users()
+            users.loc[users["username"] == username, "password_hash"] = password_hash
+            self._write_users(users)
+
+    def _read_denials(self):
+        try:
+            return pd.read_parquet(self.table_path("DAILY_DENIALS"))
+        except FileNotFoundError:
+            return pd.DataFrame(columns=list(DENIALS_COLUMNS))
+
+    def insert_denials(self, frame):
+        with self._denials_lock:
+            existing = self._read_denials()
+            table = pd.concat([existing, frame], ignore_index=True) if len(existing) else frame.reset_index(drop=True)
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.table_path("DAILY_DENIALS")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            table.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+    def _write_users(self, users):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.table_path(USERS_TABLE)}.{os.getpid()}.tmp"
+        users.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.table_path(USERS_TABLE))
+
+    def table_columns(self, table: str):
+        if pa is None:
+            raise Exception("The parquet data source requires pyarrow")
+        import pyarrow.parquet as pq
+        try:
+            schema = pq.read_schema(self.table_path(table))
+        except FileNotFoundError:
+            return []
+        return [(field.name, str(field.type), "YES" if field.nullable else "NO", None) for field in schema]
+
+def make_data_source(kind: str):
+    if kind == "mysql":
+        return MySQLDataSource()
+    if kind == "sqlite":
+        return SQLiteDataSource(SQLITE_PATH)
+    if kind == "parquet":
+        return ParquetDataSource(PARQUET_DIR)
+    raise ValueError(f"Unknown DATA_SOURCE {kind!r}; expected mysql, sqlite or parquet")
+
+data_source = make_data_source(DATA_SOURCE)
+
+# Indexes for the common ways of querying DAILY_DENIALS directly: a date
+# window, one user's denials in a window and one category in a window.
+# The dashboard itself does not use them. It loads the whole table into
+# the in-memory snapshot (DENIALS_QUERY has no WHERE clause) and filters
+# there. They speed up reports, exports and ad-hoc queries run against
+# the database. The queries below are representative, not ones the app
+# sends. migrate_denials_indexes() creates each index and checks with
+# EXPLAIN that its query reads it.
+DENIALS_INDEXES = {
+    "idx_denials_date": ("DENIAL_DATE",),
+    "idx_denials_user_date": ("USER_NAME", "DENIAL_DATE"),
+    "idx_denials_category_date": ("CATEGORY", "DENIAL_DATE"),
+}
+DENIALS_ACCESS_PATHS = {
+    "idx_denials_date": (
+        "SELECT * FROM DAILY_DENIALS WHERE DENIAL_DATE >= %s AND DENIAL_DATE < %s",
+        ("date_from", "date_to"),
+    ),
+    "idx_denials_user_date": (
+        "SELECT * FROM DAILY_DENIALS WHERE USER_NAME = %s AND DENIAL_DATE >= %s AND DENIAL_DATE < %s",
+        ("user", "date_from", "date_to"),
+    ),
+    "idx_denials_category_date": (
+        "SELECT * FROM DAILY_DENIALS WHERE CATEGORY = %s AND DENIAL_DATE >= %s AND DENIAL_DATE < %s",
+        ("category", "date_from", "date_to"),
+    ),
+}
+
+def migrate_denials_indexes(apply: bool = True):
+    """Create missing DAILY_DENIALS indexes (unless apply is False) and verify their use.
+
+    Returns one dict per index: its status ("present", "created",
+    "missing" or "different columns") and whether EXPLAIN of its sample
+    query in DENIALS_ACCESS_PATHS reads it. The sample queries stand in
+    for external and ad-hoc queries. The dashboard's own snapshot load
+    reads the full table and does not use these indexes.
+    """
+    if not isinstance(data_source, SqlDataSource):
+        raise Exception("Index migrations apply to SQL data sources only")
+    today = datetime.now().date()
+    sample_values = {
+        "date_from": (today - timedelta(days=1)).isoformat(),
+        "date_to": today.isoformat(),
+        "user": "migration-check",
+        "category": next(iter(CLASSIFICATION_MAP)),
+    }
+    with data_source.pooled_connection() as conn:
+        existing = data_source.index_columns(conn, "DAILY_DENIALS")
+        report = []
+        for name, columns in DENIALS_INDEXES.items():
+            if name not in existing:
+                status = "missing"
+                if apply:
+                    data_source.create_index(conn, name, "DAILY_DENIALS", columns)
+                    status = "created"
+            elif existing[name] != columns:
+                status = "different columns"
+            else:
+                status = "present"
+            query, params = DENIALS_ACCESS_PATHS[name]
+            plan = data_source.explain(conn, data_source.sql(query), tuple(sample_values[key] for key in params))
+            used = data_source.plan_indexes(plan)
+            report.append({
+                "index": name,
+                "columns": list(columns),
+                "status": status,
+                "used_by_query": name in used,
+                "plan_indexes": sorted(used),
+            })
+        conn.commit()
+        return report
+
+USER_IMPORT_BATCH_SIZE = int(os.getenv("USER_IMPORT_BATCH_SIZE", "500"))
+# Imports hash on their own executor so a large import never queues in
+# front of logins on _auth_executor; at most USER_IMPORT_WORKERS of their
+# hashes run at once. /users/import refuses files over USER_IMPORT_MAX_ROWS.
+USER_IMPORT_WORKERS = int(os.getenv("USER_IMPORT_WORKERS", "1"))
+USER_IMPORT_MAX_ROWS = int(os.getenv("USER_IMPORT_MAX_ROWS", "1000"))
+
+_import_executor = ThreadPoolExecutor(max_workers=USER_IMPORT_WORKERS, thread_name_prefix="user-import")
+
+def validate_new_user(username: str, password: str) -> str:
+    """Return the stripped username, or raise ValueError if the account is not acceptable."""
     username = (username or "").strip()
     if len(username) < 3:
         raise ValueError("Username must be at least 3 characters long.")
-    if len(password) < 6:
+    if len(password or "") < 6:
         raise ValueError("Password must be at least 6 characters long.")
+    return username
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        ensure_users_table(conn)
-        cursor.execute(f"SELECT 1 FROM `{USERS_TABLE}` WHERE username = %s", (username,))
-        if cursor.fetchone():
-            raise ValueError("Username already exists.")
-
-        password_hash = hash_password(password)
-        cursor.execute(
-            f"INSERT INTO `{USERS_TABLE}` (username, password_hash) VALUES (%s, %s)",
-            (username, password_hash),
-        )
-        conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
+def create_user(username: str, password: str):
+    """Register a new user with hashed password."""
+    username = validate_new_user(username, password)
+    data_source.add_user(username, hash_password(password))
 
-def get_denials_dataframe():
-    """Fetch denials data using the provided SQL query."""
-    conn = get_connection()
+def import_users(accounts):
+    """Create many users from (username, password) pairs, e.g. a billing team.
+
+    Invalid rows and repeated usernames are reported, not imported; the
+    rest are hashed on _import_executor and inserted with batched
+    executemany. Returns {"created": [...], "existing": [...],
+    "invalid": [{"username", "error"}]}.
+    """
+    valid, invalid, seen = [], [], set()
+    for username, password in accounts:
+        try:
+            username = validate_new_user(username, password)
+            if username in seen:
+                raise ValueError("Username appears more than once.")
+        except ValueError as exc:
+            invalid.append({"username": (username or "").strip(), "error": str(exc)})
+            continue
+        seen.add(username)
+        valid.append((username, password))
+    hashes = list(_import_executor.map(hash_password, [password for _, password in valid]))
+    existing = set(data_source.add_users([(username, password_hash)
+                                          for (username, _), password_hash in zip(valid, hashes)]))
+    return {
+        "created": [username for username, _ in valid if username not in existing],
+        "existing": sorted(existing),
+        "invalid": invalid,
+    }
+
+def read_user_import(content: bytes, max_rows=None):
+    """(username, password) pairs from a CSV with username and password columns.
+
+    Raises ValueError when the file has more than max_rows accounts.
+    """
+    nrows = max_rows + 1 if max_rows is not None else None
+    frame = pd.read_csv(io.BytesIO(content), dtype=str, keep_default_na=False, nrows=nrows)
+    if max_rows is not None and len(frame) > max_rows:
+        raise ValueError(f"CSV has more than {max_rows} accounts; split it into smaller files")
+    frame.columns = [str(column).strip().lower() for column in frame.columns]
+    missing = {"username", "password"} - set(frame.columns)
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+    return list(zip(frame["username"], frame["password"]))
+
+def load_denials_from_db():
+    """Fetch denials data from the configured data source."""
     try:
-        query = ("SELECT CLINIC_NAME as Clinic, PATIENT_NAME as 'Pt Name',MRN as MRN, DOB as DOB,DOS as DOS, PAYER_NAME as Payer, PROCEDURE_CODE as CPT,REASON as Reason, CATEGORY as Category, DENIAL_DATE as  'Denial Date',USER_NAME as User, ROLE_ID FROM DAILY_DENIALS")
-        df = pd.read_sql(query, conn)
+        df = data_source.load_denials()
     except Exception as exc:
         raise Exception(f"Error reading denials data: {exc}")
-    finally:
-        conn.close()
     
     if df.empty:
         raise Exception("No data returned from denials query")
@@ -91,43 +1192,895 @@ def get_denials_dataframe():
     df.rename(columns={"Category": "CATEGORY"}, inplace=True)
     return df
 
-def hash_password(password: str) -> str:
-    """Hash password using SHA256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+# --------------------------------------------------------------------
+# Denials snapshot
+# The DAILY_DENIALS table is loaded once into memory and shared by all
+# data functions. The background scheduler (bottom of this file) keeps it
+# fresh; SNAPSHOT_TTL_SECONDS bounds staleness if the scheduler is off.
+SNAPSHOT_TTL_SECONDS = int(os.getenv("SNAPSHOT_TTL_SECONDS", "900"))
+# Shared by the workers of one deployment, so it must be private to the
+# user they run as: ensure_snapshot_dir() creates it with mode 0700 and
+# refuses a directory someone else owns or can write to.
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(os.path.expanduser("~"), ".cache", "dashboard-snapshot"))
+SNAPSHOT_FILE = os.path.join(SNAPSHOT_DIR, "denials.parquet")
+PAYLOAD_CACHE_SIZE = int(os.getenv("PAYLOAD_CACHE_SIZE", "256"))
 
-def verify_user(username: str, password: str) -> bool:
-    """Validate user credentials against the users table."""
-    username = (username or "").strip()
-    if not username or not password:
-        return False
+_denials_snapshot = {"df": None, "version": None, "loaded_at": 0.0}
+_snapshot_lock = threading.Lock()
+# Serializes writes to SNAPSHOT_FILE; held instead of _snapshot_lock while
+# a snapshot is written, so requests are never blocked on the disk
+_publish_lock = threading.Lock()
+_payload_cache = LRUCache(maxsize=PAYLOAD_CACHE_SIZE)
+_payload_cache_lock = threading.Lock()
+
+def snapshot_content_version(df) -> str:
+    """Version string derived from the snapshot's contents.
+
+    Reloading unchanged data gives the same version, so ETags, X-Data-Version
+    and the dashboard's persisted datasets stay valid across refreshes. Row
+    hashes are sorted first because the table is read without ORDER BY.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).sort_values()
+    digest = hashlib.sha1(",".join(map(str, df.columns)).encode())
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+def _set_denials_snapshot(df, version, loaded_at=None):
+    """Swap in a new snapshot and drop payloads built from the old one."""
+    _denials_snapshot.update({"df": df, "version": version, "loaded_at": loaded_at or time.time()})
+    with _payload_cache_lock:
+        _payload_cache.clear()
+
+def ensure_snapshot_dir():
+    """Create SNAPSHOT_DIR (mode 0700) and check that only this user can write to it."""
+    os.makedirs(SNAPSHOT_DIR, mode=0o700, exist_ok=True)
+    info = os.lstat(SNAPSHOT_DIR)
+    if not stat.S_ISDIR(info.st_mode):
+        raise Exception(f"SNAPSHOT_DIR {SNAPSHOT_DIR} is not a directory")
+    if hasattr(os, "geteuid") and info.st_uid != os.geteuid():
+        raise Exception(f"SNAPSHOT_DIR {SNAPSHOT_DIR} is owned by uid {info.st_uid}, not this user")
+    if info.st_mode & 0o077:
+        raise Exception(f"SNAPSHOT_DIR {SNAPSHOT_DIR} is accessible to other users "
+                        f"(mode {stat.S_IMODE(info.st_mode):o}); expected 0700")
+
+def publish_snapshot(df, version):
+    """Write a snapshot to SNAPSHOT_FILE for the other workers to adopt.
+
+    Parquet, with the version in the schema metadata: unlike a pickle,
+    reading it back cannot run code.
+    """
+    import pyarrow.parquet as pq
+    ensure_snapshot_dir()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, b"snapshot_version": version.encode()})
+    tmp_path = f"{SNAPSHOT_FILE}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, SNAPSHOT_FILE)
+
+def refresh_denials_snapshot(publish: bool = False):
+    """Reload the denials snapshot from the database.
+
+    When publish is True the snapshot is also written to SNAPSHOT_FILE so
+    that other workers can pick it up without querying MySQL themselves.
+    Unchanged data keeps the current snapshot and its cached payloads;
+    only loaded_at is renewed.
+    """
+    df = load_denials_from_db()
+    version = snapshot_content_version(df)
+    if publish:
+        with _publish_lock:
+            if published_snapshot_version() != version:
+                publish_snapshot(df, version)
+    with _snapshot_lock:
+        if version == _denials_snapshot["version"]:
+            _denials_snapshot["loaded_at"] = time.time()
+        else:
+            _set_denials_snapshot(df, version)
+    return version
 
-    conn = None
-    cursor = None
+def published_snapshot_version():
+    """Version of the snapshot in SNAPSHOT_FILE, or None when nothing is published."""
+    import pyarrow.parquet as pq
     try:
-        conn = get_connection()
-        ensure_users_table(conn)
-        cursor = conn.cursor()
-        cursor.execute(
-            f"SELECT password_hash FROM `{USERS_TABLE}` WHERE username = %s",
-            (username,),
-        )
-        result = cursor.fetchone()
-        if not result:
-            return False
-        stored_hash = result[0]
-        return stored_hash == hash_password(password)
-    except Exception as exc:
-        print(f"verify_user error: {exc}")
+        return pq.read_schema(SNAPSHOT_FILE).metadata[b"snapshot_version"].decode()
+    except FileNotFoundError:
+        return None
+
+def load_published_snapshot() -> bool:
+    """Adopt the snapshot published by the leader worker, if it is newer."""
+    import pyarrow.parquet as pq
+    ensure_snapshot_dir()
+    version = published_snapshot_version()
+    if version is None or version == _denials_snapshot["version"]:
         return False
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+    try:
+        table = pq.read_table(SNAPSHOT_FILE)
+    except FileNotFoundError:
+        return False
+    # The leader may have replaced the file between the two reads
+    version = table.schema.metadata[b"snapshot_version"].decode()
+    if version == _denials_snapshot["version"]:
+        return False
+    df = table.to_pandas()
+    with _snapshot_lock:
+        _set_denials_snapshot(df, version)
+    return True
 
-@app.get("/test")
-def test():
-    """Simple test endpoint to verify server is running"""
+def get_snapshot_version():
+    """Return the version string of the current denials snapshot."""
+    return _denials_snapshot["version"]
+
+def ensure_denials_snapshot():
+    """Load the denials snapshot when missing or stale; return its version."""
+    if (
+        _denials_snapshot["df"] is None
+        or time.time() - _denials_snapshot["loaded_at"] > SNAPSHOT_TTL_SECONDS
+    ):
+        with _snapshot_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if (
+                _denials_snapshot["df"] is None
+                or time.time() - _denials_snapshot["loaded_at"] > SNAPSHOT_TTL_SECONDS
+            ):
+                with stage("snapshot_load"):
+                    df = load_denials_from_db()
+                    version = snapshot_content_version(df)
+                    if version == _denials_snapshot["version"]:
+                        _denials_snapshot["loaded_at"] = time.time()
+                    else:
+                        _set_denials_snapshot(df, version)
+    return _denials_snapshot["version"]
+
+def get_denials_dataframe():
+    """Return a copy of the denials snapshot, reloading it when missing or stale."""
+    ensure_denials_snapshot()
+    with stage("snapshot_copy"):
+        return _denials_snapshot["df"].copy()
+
+def peek_cached_payload(name, *args):
+    """Return the cached payload for (name, args) if it is current, else None."""
+    key = (name, args, dashboard_now().date())
+    version = get_snapshot_version()
+    with _payload_cache_lock:
+        cached = _payload_cache.get(key)
+    if cached is not None and version is not None and cached[0] == version:
+        return cached[1]
+    return None
+
+def get_cached_payload(name, builder, *args):
+    """Return builder(*args), reusing the result while the snapshot and day are unchanged.
+
+    The current date is part of the key because most payloads depend on
+    "today" (yesterday, the current biweekly window, last month).
+    """
+    cached = peek_cached_payload(name, *args)
+    if cached is not None:
+        count_cache_event("payload_hits")
+        PAYLOAD_CACHE_REQUESTS.inc(payload=name, result="hit")
+        return cached
+    count_cache_event("payload_misses")
+    PAYLOAD_CACHE_REQUESTS.inc(payload=name, result="miss")
+    version = get_snapshot_version()
+    with stage(f"build_{name}"):
+        payload = builder(*args)
+    with _payload_cache_lock:
+        _payload_cache[(name, args, dashboard_now().date())] = (version or get_snapshot_version(), payload)
+    return payload
+
+# Cache effectiveness counters, reported by /cache-stats. The client_*
+# counters are sent by the dashboard's prefetcher.
+_cache_stats = {
+    "payload_hits": 0,
+    "payload_misses": 0,
+    "prefetch_served": 0,
+    "prefetch_deferred": 0,
+    "client_prefetch_issued": 0,
+    "client_prefetch_hits": 0,
+}
+_cache_stats_lock = threading.Lock()
+
+def count_cache_event(name: str, amount: int = 1):
+    with _cache_stats_lock:
+        _cache_stats[name] += amount
+
+def _snapshot_age():
+    if _denials_snapshot["df"] is None:
+        return []
+    return [((), round(time.time() - _denials_snapshot["loaded_at"], 3))]
+
+def _snapshot_rows():
+    df = _denials_snapshot["df"]
+    return [] if df is None else [((), len(df))]
+
+def _snapshot_info():
+    version = _denials_snapshot["version"]
+    return [] if version is None else [((version,), 1)]
+
+def _cache_events():
+    with _cache_stats_lock:
+        return [((name,), value) for name, value in _cache_stats.items()]
+
+metrics.register(Gauge("denials_snapshot_age_seconds", "Seconds since the denials snapshot was loaded.",
+                       collect=_snapshot_age))
+metrics.register(Gauge("denials_snapshot_rows", "Rows in the denials snapshot.", collect=_snapshot_rows))
+metrics.register(Gauge("denials_snapshot_info", "Version of the denials snapshot.", ("version",),
+                       collect=_snapshot_info))
+metrics.register(Gauge("payload_cache_entries", "Payloads held in the payload cache.",
+                       collect=lambda: [((), len(_payload_cache))]))
+# The /cache-stats counters, including the dashboard's prefetch reports
+metrics.register(Counter("cache_events_total", "Cache and prefetch events since startup.", ("event",),
+                         collect=_cache_events))
+
+# Speculative requests from the dashboard's prefetcher are answered from
+# the payload cache when it is warm. Otherwise the payload is built on a
+# single background thread and the request gets 204, so prefetches never
+# hold a worker thread that an interactive request could use.
+_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+_prefetch_pending = set()
+_prefetch_lock = threading.Lock()
+
+def is_prefetch_request(request: Request) -> bool:
+    purpose = request.headers.get("sec-purpose") or request.headers.get("purpose") or ""
+    return "prefetch" in purpose.lower() or request.headers.get("x-prefetch") == "1"
+
+def _warm_payload(key, name, builder, args):
+    try:
+        get_cached_payload(name, builder, *args)
+    except Exception as exc:
+        print(f"prefetch warm-up failed for {name}: {exc}")
+    finally:
+        with _prefetch_lock:
+            _prefetch_pending.discard(key)
+
+def serve_payload(request: Request, name, builder, *args):
+    """get_cached_payload for normal requests; for prefetches, the cached payload or None."""
+    if not is_prefetch_request(request):
+        return get_cached_payload(name, builder, *args)
+    payload = peek_cached_payload(name, *args)
+    if payload is not None:
+        count_cache_event("prefetch_served")
+        return payload
+    count_cache_event("prefetch_deferred")
+    key = (name, args)
+    with _prefetch_lock:
+        if key not in _prefetch_pending:
+            _prefetch_pending.add(key)
+            _prefetch_executor.submit(_warm_payload, key, name, builder, args)
+    return None
+
+# Snapshot-derived payloads only change with the data version (snapshot
+# version plus day), so their ETag is that version followed by a hash of
+# the request URL. The dashboard sends it back in If-None-Match and reuses
+# its copy on a 304; X-Data-Version lets it stamp persisted datasets.
+def data_version() -> str:
+    return f"{ensure_denials_snapshot()}-{dashboard_now().date().isoformat()}"
+
+def payload_etag(request: Request) -> str:
+    url_hash = hashlib.sha1(f"{request.url.path}?{request.url.query}".encode()).hexdigest()[:12]
+    return f'"{data_version()}.{url_hash}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    return etag in request.headers.get("if-none-match", "")
+
+def not_modified_response(etag: str):
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+def etag_json_response(content, etag: str):
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "X-Data-Version": etag[1:etag.rindex(".")]}
+    with stage("json_encode"):
+        return JSONResponse(content=content, headers=headers)
+
+# Maps each denial CATEGORY to the classification shown in the pie charts;
+# categories not listed fall under 'Other'.
+CLASSIFICATION_MAP = {
+    "Different insurance as primary": "Inactive or Wrong policy Information",
+    "No active coverage": "Inactive or Wrong policy Information",
+    "Wrong insurance": "Inactive or Wrong policy Information",
+    "Wrong patient info": "Inactive or Wrong policy Information",
+    "Wrong policy information": "Inactive or Wrong policy Information",
+    "Prior to coverage": "Inactive or Wrong policy Information",
+    "Missing/wrong Claim information": "Inactive or Wrong policy Information",
+    "Covered under HMO Plan": "Inactive or Wrong policy Information",
+    "Patient ineligible for this service": "Inactive or Wrong policy Information",
+    "MCR paid more than MCD allowed amt": "Medicare paid more than Medicaid",
+    "Medicare paid more than Medicaid": "Medicare paid more than Medicaid",
+    "Primary paid more than sec allowed amount": "Medicare paid more than Medicaid",
+    "Invalid DOS": "Incorrect/Invalid DOS",
+    "Incorrect DOS": "Incorrect/Invalid DOS",
+    "Timely filing limit exceeded": "TFL/Appeal time limit expired or not allowed",
+    "Appeal time limit exceeded": "TFL/Appeal time limit expired or not allowed",
+    "Appeal Not Allowed": "TFL/Appeal time limit expired or not allowed",
+    "Appeal allowed": "TFL/Appeal time limit expired or not allowed",
+    "Invalid CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
+    "Missing main CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
+    "Wrong/Incorrect ICD Code": "Missing or Invalid ICD/CPT code/Modifier/POS",
+    "CPT inconsistent with DX.code": "Missing or Invalid ICD/CPT code/Modifier/POS",
+    "CPT inconsistent with modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
+    "Wrong POS": "Missing or Invalid ICD/CPT code/Modifier/POS",
+    "Invalid number of units": "Missing or Invalid ICD/CPT code/Modifier/POS",
+    "CPT inconsistent with provider speciality": "Missing or Invalid ICD/CPT code/Modifier/POS",
+    "Missing Modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
+    "EFT enrollment pending": "Provider enrollment issue",
+    "Provider not eligible": "Provider enrollment issue",
+    "Provider not enrolled": "Provider enrollment issue",
+    "No Medicare credentialing": "Provider enrollment issue",
+    "No Medicaid credentialing": "Provider enrollment issue",
+    "Missing/invalid NPI of Billing provider in field 33a.": "Provider enrollment issue",
+    "Missing/invalid NPI of Rendering Provider in field 24J.": "Provider enrollment issue",
+    "Missing/invalid reffering Provider info": "Provider enrollment issue",
+    "Out of Network": "Out of network",
+    "Provider Out of Network": "Out of network",
+    "no authorization": "Out of network",
+    "Missing prior authorization": "Out of network",
+    "Missing referral information": "Out of network",
+    "Missing medical record": "Need additional information needed",
+    "COB missing": "Need additional information needed",
+    "Missing NDC code": "Need additional information needed",
+    "Missing documentation": "Need additional information needed",
+    "Missing EOB": "Need additional information needed",
+    "Need Add-on-code": "Need additional information needed",
+    "Need W9 form": "Need additional information needed",
+    "Accident Info required": "Need additional information needed",
+    "Missing illness information": "Need additional information needed",
+    "No Medical Necessity": "Need additional information needed",
+    "Pre-existing condition": "Need additional information needed",
+    "Itemized bill needed": "Need additional information needed",
+    "Clinical Review Determination": "Need additional information needed",
+    "Non covered service": "Non covered service",
+    "non covered submitted via paper": "Non covered service",
+    "Charges too high": "Other",
+    "Claim previously paid": "Other",
+    "Contractual obligation": "Other",
+    "Date of death precedes DOS": "Other",
+    "Duplicate claim": "Other",
+    "Exceeds clinical guidelines": "Other",
+    "Invalid redetermination": "Other",
+    "Managed care withholding": "Other",
+    "Not met residency requirement": "Other",
+    "Other": "Other",
+    "Participating Provider Discount": "Other",
+    "Patient in Hospice": "Other",
+    "Patient incarcerated": "Other",
+    "Payment made to another provider": "Other",
+    "The qualifying service has not been received": "Other",
+    "Claim Adjustment Due to Resubmission": "Incorrect Billing",
+    "Incorrect Patient Billing": "Incorrect Billing",
+    "Corrected Claim": "Incorrect Billing",
+    "Resubmit the claim": "Incorrect Billing",
+    "Invalid Taxpayer ID": "Incorrect Billing",
+    "Revised claim with new claim number": "Incorrect Billing",
+    "Invalid discharge date": "Incorrect Billing",
+    "Charges exceeded, maximum allowed": "Incorrect Billing",
+    "Negotiated discount": "Bundled service",
+    "Benefit limited": "Bundled service",
+    "Incidental Service": "Bundled service",
+    "Max benefit exceeded": "Bundled service"
+}
+
+@timed_stage("classify")
+def classify_categories(categories):
+    """CLASSIFICATION for each denial CATEGORY."""
+    return categories.map(CLASSIFICATION_MAP).fillna('Other')
+
+# --------------------------------------------------------------------
+# Denials ingestion
+# POST /denials/upload takes a CSV or XLSX file and reads it in
+# INGEST_CHUNK_ROWS chunks, so a large upload is never held in memory as
+# one frame. Each chunk is validated with column-wide checks, normalized
+# (dates to datetime.date, known categories to their CLASSIFICATION_MAP
+# spelling) and inserted with one executemany in its own transaction.
+# The inserted rows are then appended to the in-memory snapshot under a
+# new version and the precomputed payloads are rebuilt, so this worker
+# shows them without reloading the table. The new snapshot is published
+# to SNAPSHOT_FILE, where the snapshot watch (see the scheduler below)
+# brings it to the other workers.
+INGEST_CHUNK_ROWS = int(os.getenv("INGEST_CHUNK_ROWS", "5000"))
+INGEST_MAX_REPORTED_ERRORS = int(os.getenv("INGEST_MAX_REPORTED_ERRORS", "100"))
+INGEST_REQUIRED_COLUMNS = ("CATEGORY", "DENIAL_DATE", "USER_NAME", "ROLE_ID")
+INGEST_DATE_COLUMNS = ("DOB", "DOS", "DENIAL_DATE")
+# Upload headers may use the table's column names or the dashboard's labels
+INGEST_COLUMN_NAMES = {
+    **{alias.lower(): column for column, alias in DENIALS_COLUMNS.items()},
+    **{column.lower(): column for column in DENIALS_COLUMNS},
+}
+_CATEGORY_SPELLINGS = {category.lower(): category for category in CLASSIFICATION_MAP}
+
+def iter_upload_chunks(file, filename: str):
+    """Yield DataFrames of at most INGEST_CHUNK_ROWS rows from an uploaded CSV or XLSX file."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        yield from pd.read_csv(file, chunksize=INGEST_CHUNK_ROWS, dtype=str, keep_default_na=False)
+    elif extension == ".xlsx":
+        if load_workbook is None:
+            raise ValueError("XLSX uploads require openpyxl")
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(value) if value is not None else "" for value in next(rows, ())]
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == INGEST_CHUNK_ROWS:
+                    yield pd.DataFrame(chunk, columns=header, dtype=object)
+                    chunk = []
+            if chunk:
+                yield pd.DataFrame(chunk, columns=header, dtype=object)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError("Upload a .csv or .xlsx file")
+
+def normalize_denials_chunk(chunk, first_row: int):
+    """Validate and normalize one uploaded chunk.
+
+    Returns (frame with DENIALS_COLUMNS columns holding the valid rows,
+    list of {"row", "problems"} for the invalid ones). first_row is the
+    file row number of the chunk's first data row.
+    """
+    chunk = chunk.rename(columns=lambda column: INGEST_COLUMN_NAMES.get(str(column).strip().lower(), column))
+    missing = [column for column in INGEST_REQUIRED_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Upload is missing column(s): {', '.join(missing)}")
+    frame = pd.DataFrame(index=chunk.index)
+    for column in DENIALS_COLUMNS:
+        values = chunk[column] if column in chunk.columns else pd.Series(pd.NA, index=chunk.index)
+        frame[column] = values.astype("string").str.strip().replace("", pd.NA)
+
+    problems = {}
+    dates = {}
+    for column in INGEST_DATE_COLUMNS:
+        dates[column] = pd.to_datetime(frame[column], errors="coerce", format="mixed").dt.normalize()
+        problems[f"{column} is not a date"] = frame[column].notna() & dates[column].isna()
+    problems["DENIAL_DATE is missing"] = frame["DENIAL_DATE"].isna()
+    problems["DENIAL_DATE is in the future"] = dates["DENIAL_DATE"] > dashboard_now().normalize()
+    role_id = pd.to_numeric(frame["ROLE_ID"], errors="coerce")
+    problems["ROLE_ID is not an integer"] = role_id.isna() | (role_id % 1 != 0)
+    problems["USER_NAME is missing"] = frame["USER_NAME"].isna()
+    category = frame["CATEGORY"].str.replace(r"\s+", " ", regex=True)
+    problems["CATEGORY is missing"] = category.isna()
+
+    invalid_mask = pd.concat(problems, axis=1).fillna(False).astype(bool)
+    bad = invalid_mask.any(axis=1)
+    invalid = [
+        {"row": first_row + int(position), "problems": [name for name, failed in flags.items() if failed]}
+        for position, flags in zip(bad.to_numpy().nonzero()[0], invalid_mask[bad].to_dict("records"))
+    ]
+
+    good = ~bad
+    valid = frame[good].astype(object).where(frame[good].notna(), None)
+    for column in INGEST_DATE_COLUMNS:
+        valid[column] = [None if pd.isna(value) else value.date() for value in dates[column][good]]
+    valid["ROLE_ID"] = role_id[good].astype("int64").tolist()
+    # Known categories take their canonical spelling; others are kept as sent and classify as Other
+    lowered = category[good].str.lower()
+    valid["CATEGORY"] = lowered.map(_CATEGORY_SPELLINGS).fillna(category[good]).astype(object)
+    return valid.reset_index(drop=True), invalid
+
+def append_to_denials_snapshot(frame):
+    """Add already-inserted DAILY_DENIALS rows to the in-memory snapshot.
+
+    Returns the new snapshot version, or None when no snapshot is loaded
+    (the next load reads the rows from the database). The snapshot keeps
+    its loaded_at, so the regular refresh still picks up changes made
+    outside this worker. The merged frame is swapped in under
+    _snapshot_lock and published to SNAPSHOT_FILE after the lock is
+    released; other workers adopt it within SNAPSHOT_WATCH_SECONDS.
+    """
+    rows = frame.rename(columns=DENIALS_COLUMNS).rename(columns={"Category": "CATEGORY"})
+    with _snapshot_lock:
+        current = _denials_snapshot["df"]
+        if current is None:
+            return None
+        merged = pd.concat([current, rows[current.columns]], ignore_index=True)
+        # Keep the snapshot's dtypes (text columns would fall back to object)
+        merged = merged.astype({column: dtype for column, dtype in current.dtypes.items()
+                                if merged[column].dtype != dtype})
+        version = snapshot_content_version(merged)
+        _set_denials_snapshot(merged, version, loaded_at=_denials_snapshot["loaded_at"])
+    if SNAPSHOT_PUBLISHING:
+        with _publish_lock:
+            # A refresh that swapped in a newer snapshot meanwhile has published that one
+            if _denials_snapshot["version"] == version:
+                publish_snapshot(merged, version)
+    return version
+
+def update_snapshot_after_ingest(inserted):
+    """Append the inserted frames to the snapshot and rebuild the chart payloads.
+
+    _set_denials_snapshot() has dropped every cached payload, including
+    the precomputed rollups, so they are rebuilt here before the upload
+    returns. Errors are logged, not raised: the rows are committed either
+    way and the next refresh reads them from the database.
+    """
+    try:
+        with stage("ingest_snapshot"):
+            version = append_to_denials_snapshot(pd.concat(inserted, ignore_index=True))
+        if version is not None:
+            with stage("ingest_rollups"):
+                precompute_payloads()
+        return version
+    except Exception as exc:
+        print(f"ingest_denials snapshot update error: {exc}")
+        return None
+
+def ingest_denials(file, filename: str):
+    """Insert the rows of an uploaded CSV/XLSX file into DAILY_DENIALS and the snapshot."""
+    rows_read, inserted, invalid_count, errors = 0, [], 0, []
+    try:
+        for chunk in iter_upload_chunks(file, filename):
+            # +2: row 1 of the file is the header and rows are counted from 1
+            with stage("ingest_validate"):
+                valid, invalid = normalize_denials_chunk(chunk, rows_read + 2)
+            rows_read += len(chunk)
+            invalid_count += len(invalid)
+            errors.extend(invalid[:max(0, INGEST_MAX_REPORTED_ERRORS - len(errors))])
+            if len(valid):
+                with stage("ingest_insert"):
+                    data_source.insert_denials(valid)
+                inserted.append(valid)
+    except Exception as exc:
+        if inserted:
+            # Committed chunks stay in the table, so they still go into the snapshot
+            print(f"ingest_denials error after {sum(len(frame) for frame in inserted)} rows were inserted: {exc}")
+            update_snapshot_after_ingest(inserted)
+        raise
+    version = update_snapshot_after_ingest(inserted) if inserted else None
+    return {
+        "rows_read": rows_read,
+        "rows_inserted": sum(len(frame) for frame in inserted),
+        "rows_invalid": invalid_count,
+        "errors": errors,
+        "snapshot_version": version or get_snapshot_version(),
+    }
+
+# --------------------------------------------------------------------
+# Popup table rendering
+# render_table_html produces the same markup as
+# DataFrame.to_html(index=False, border=1) but formats whole columns at
+# once and escapes each column with a single pass over the joined text.
+_HTML_CELL_SEPARATOR = "\x00"
+_ROW_START = "    <tr>\n      <td>"
+_CELL_JOIN = "</td>\n      <td>"
+_ROW_END = "</td>\n    </tr>"
+
+def _escape_html_cells(cells):
+    """Escape &, < and > and strip whitespace, as to_html does per cell."""
+    joined = _HTML_CELL_SEPARATOR.join(cells)
+    if joined.count(_HTML_CELL_SEPARATOR) != len(cells) - 1:
+        # A value contains the separator itself; escape cell by cell
+        return [
+            c.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").strip()
+            for c in cells
+        ]
+    joined = joined.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return [c.strip() for c in joined.split(_HTML_CELL_SEPARATOR)]
+
+def _format_html_column(values):
+    """Format one column to display strings the way to_html would."""
+    if pd.api.types.infer_dtype(values, skipna=False) == "string" and not values.hasnans:
+        # Plain strings only need to_html's control-character escaping
+        joined = _HTML_CELL_SEPARATOR.join(values.tolist())
+        if joined.count(_HTML_CELL_SEPARATOR) == len(values) - 1:
+            joined = joined.replace("\t", "\\t").replace("\r", "\\r").replace("\n", "\\n")
+            return joined.split(_HTML_CELL_SEPARATOR) if len(values) else []
+    return format_array(values._values, None, leading_space=False)
+
+def render_table_html(frame, start: int = 0, max_rows: int = None) -> str:
+    """Render rows [start, start + max_rows) of frame as an HTML table.
+
+    Without start/max_rows the output is identical to
+    frame.to_html(index=False, border=1).
+    """
+    if start or max_rows is not None:
+        stop = None if max_rows is None else start + max_rows
+        frame = frame.iloc[start:stop]
+    table_class = "dataframe" if pd.get_option("display.html.use_mathjax") else "dataframe tex2jax_ignore"
+    header_style = pd.get_option("display.colheader_justify")
+    headers = _escape_html_cells([str(col) for col in frame.columns])
+    columns = [_escape_html_cells(_format_html_column(frame[col])) for col in frame.columns]
+    parts = [
+        f'<table border="1" class="{table_class}">',
+        "  <thead>",
+        f'    <tr style="text-align: {header_style};">',
+    ]
+    parts.extend(f"      <th>{h}</th>" for h in headers)
+    parts.extend(["    </tr>", "  </thead>", "  <tbody>"])
+    if len(frame):
+        parts.append("\n".join(_ROW_START + _CELL_JOIN.join(row) + _ROW_END for row in zip(*columns)))
+    parts.extend(["  </tbody>", "</table>"])
+    return "\n".join(parts)
+
+def encode_table_cursor(table_key, start: int) -> str:
+    """Encode a continuation token pointing at row `start` of one popup table."""
+    return base64.urlsafe_b64encode(json.dumps([table_key, start]).encode()).decode()
+
+def decode_table_cursor(cursor):
+    """Decode a continuation token into (table_key, start); (None, 0) if absent."""
+    if not cursor:
+        return None, 0
+    try:
+        table_key, start = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return table_key, int(start)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid table cursor")
+
+def _encode_date_column(values, date_format: str):
+    """Encode a datetime column as ISO strings or epoch milliseconds (None for NaT)."""
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, errors="coerce")
+    # Straight from the datetime64 values: no per-column strftime or Series copies
+    stamps = values.to_numpy(dtype="datetime64[ms]")
+    missing = np.isnat(stamps)
+    if date_format == "epoch":
+        encoded = stamps.view("int64").astype(object)
+    else:
+        days = stamps.astype("datetime64[D]")
+        unit = "D" if (days == stamps)[~missing].all() else "s"
+        encoded = np.datetime_as_string(days if unit == "D" else stamps, unit=unit).astype(object)
+    if missing.any():
+        encoded[missing] = None
+    return {"type": "date", "unit": "ms" if date_format == "epoch" else "iso", "data": encoded.tolist()}
+
+def _column_values(values):
+    """values.tolist() with None for missing values."""
+    if not values.hasnans:
+        return values.tolist()
+    return values.astype(object).where(values.notna(), None).tolist()
+
+def build_columnar_table(frame, date_format: str = "iso") -> dict:
+    """Encode frame as compact columnar JSON for client-side rendering.
+
+    Low-cardinality text columns (clinic, payer, user, category...) are
+    dictionary encoded as a values array plus integer codes (-1 for
+    missing); dates are ISO strings or epoch milliseconds.
+    """
+    columns = []
+    for name, values in frame.items():
+        # Only object columns need inspecting (MySQL DATE values arrive as datetime.date)
+        if pd.api.types.is_datetime64_any_dtype(values) or (
+            values.dtype == object
+            and pd.api.types.infer_dtype(values, skipna=True) in ("date", "datetime", "datetime64")
+        ):
+            column = _encode_date_column(values, date_format)
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            column = {"type": "number", "data": _column_values(values)}
+        else:
+            if values.dtype == object:
+                values = values.where(values.isna(), values.astype(str))
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+            if len(uniques) * 2 <= len(values):
+                column = {"type": "dict", "values": uniques.tolist(), "codes": codes.tolist()}
+            else:
+                # Rebuild the strings from the factorization instead of another pass over the column
+                lookup = uniques.tolist() + [None]
+                column = {"type": "string", "data": [lookup[code] for code in codes.tolist()]}
+        column["name"] = str(name)
+        columns.append(column)
+    return {"format": "columnar", "row_count": len(frame), "columns": columns}
+
+TABLE_FORMATS = ("html", "columnar")
+DATE_FORMATS = ("iso", "epoch")
+
+@timed_stage("render_table")
+def render_table_page(frame, table_key, start: int = 0, max_rows: int = None, table_format: str = "html", date_format: str = "iso"):
+    """Render one page of a popup table and the cursor for the next page, if any.
+
+    table_format "arrow" returns the page as a DataFrame, for
+    arrow_tables_response().
+    """
+    if table_format not in TABLE_FORMATS + ("arrow",):
+        raise ValueError(f"Invalid table format: {table_format}")
+    if date_format not in DATE_FORMATS:
+        raise ValueError(f"Invalid date format: {date_format}")
+    if table_format == "arrow":
+        stop = None if max_rows is None else start + max_rows
+        table = frame.iloc[start:stop]
+    elif table_format == "columnar":
+        stop = None if max_rows is None else start + max_rows
+        table = build_columnar_table(frame.iloc[start:stop], date_format)
+    else:
+        table = render_table_html(frame, start, max_rows)
+    if max_rows is not None and start + max_rows < len(frame):
+        return table, encode_table_cursor(table_key, start + max_rows)
+    return table, None
+
+# --------------------------------------------------------------------
+# Arrow IPC responses
+# Data endpoints answer "Accept: application/vnd.apache.arrow.stream" (or
+# format=arrow) with the rows of their popup tables as Arrow record
+# batches: the builders run with table_format "arrow", so the rows, the
+# date window and the cursor pages are the same as in the JSON formats.
+# The tables are concatenated with a CLASSIFICATION column, and the next
+# page cursors travel in the schema metadata as "table_cursors".
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_BATCH_ROWS = int(os.getenv("ARROW_BATCH_ROWS", "65536"))
+ARROW_DICTIONARY_COLUMNS = ["Clinic", "Payer", "CPT", "Reason", "Category", "CLASSIFICATION", "User", "Biller Role Type"]
+
+def wants_arrow(request: Request) -> bool:
+    """True when the client asked for an Arrow IPC stream."""
+    return (ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", "")
+            or request.query_params.get("format") == "arrow")
+
+def arrow_tables_response(table_data, table_cursors, metadata=None):
+    """Arrow stream of a builder's popup table pages (built with table_format "arrow")."""
+    frames = [frame.assign(CLASSIFICATION=cls) for cls, frame in table_data.items()]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame({"CLASSIFICATION": []}, dtype=str)
+    for col in df.columns:
+        # Arrow needs one type per column; MySQL text columns can mix str and int
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for col in ARROW_DICTIONARY_COLUMNS:
+        index = table.schema.get_field_index(col)
+        if index >= 0:
+            table = table.set_column(index, col, pc.dictionary_encode(table[col]))
+    return arrow_response(table, {
+        **(metadata or {}),
+        "table_cursors": json.dumps(table_cursors),
+        "snapshot_version": get_snapshot_version(),
+    })
+
+def arrow_response(table, metadata=None):
+    """Serialize table as an Arrow IPC stream of record batches."""
+    if metadata:
+        table = table.replace_schema_metadata({k: str(v) for k, v in metadata.items()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=ARROW_BATCH_ROWS):
+            writer.write_batch(batch)
+    return Response(content=memoryview(sink.getvalue()), media_type=ARROW_STREAM_MEDIA_TYPE)
+
+def arrow_unavailable_response():
+    return JSONResponse(content={"error": "Arrow responses require pyarrow on the server."}, status_code=406)
+
+# --------------------------------------------------------------------
+# Static assets
+# Everything under static/ is read once at import, hashed and
+# gzip-compressed, then served from /static/<name>.<hash>.<ext> with an
+# immutable one-year Cache-Control. A deploy that changes a file changes
+# its URL, so browsers never have to revalidate scripts or styles.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+STATIC_MEDIA_TYPES = {
+    ".js": "application/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+}
+# Third-party bundles vendored under static/vendor, with the upstream URL
+# each file was taken from. A bundle missing from the deploy is reported
+# at startup and loaded from that URL until it is vendored.
+VENDOR_BUNDLES = {
+    "plotly": ("vendor/plotly-2.26.0.min.js", "https://cdn.plot.ly/plotly-2.26.0.min.js"),
+    "xlsx": ("vendor/xlsx-0.18.5.full.min.js", "https://cdnjs.cloudflare.com/ajax/libs/xlsx/0.18.5/xlsx.full.min.js"),
+}
+
+_static_assets = {}  # hashed file name -> body, gzip body, etag, media type
+_static_urls = {}    # path relative to static/ -> hashed URL
+
+def load_static_assets():
+    """Hash and precompress every servable file under STATIC_DIR."""
+    _static_assets.clear()
+    _static_urls.clear()
+    for root, _, files in os.walk(STATIC_DIR):
+        for file_name in files:
+            base, ext = os.path.splitext(file_name)
+            if ext not in STATIC_MEDIA_TYPES:
+                continue
+            path = os.path.join(root, file_name)
+            with open(path, "rb") as fh:
+                body = fh.read()
+            digest = hashlib.sha256(body).hexdigest()[:12]
+            rel_dir = os.path.relpath(root, STATIC_DIR).replace(os.sep, "/")
+            rel_path = file_name if rel_dir == "." else f"{rel_dir}/{file_name}"
+            hashed_path = f"{base}.{digest}{ext}" if rel_dir == "." else f"{rel_dir}/{base}.{digest}{ext}"
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            _static_assets[hashed_path] = {
+                "body": body,
+                "gzip": compressed if len(compressed) < len(body) else None,
+                "etag": f'"{digest}"',
+                "media_type": STATIC_MEDIA_TYPES[ext],
+            }
+            _static_urls[rel_path] = f"/static/{hashed_path}"
+
+def asset_url(rel_path: str) -> str:
+    """Hashed URL for a file under static/."""
+    return _static_urls[rel_path]
+
+def vendor_url(name: str) -> str:
+    """URL for a vendored bundle, falling back to its upstream URL when not vendored."""
+    rel_path, source_url = VENDOR_BUNDLES[name]
+    return _static_urls.get(rel_path, source_url)
+
+def report_missing_vendor_bundles():
+    for name, (rel_path, source_url) in VENDOR_BUNDLES.items():
+        if rel_path not in _static_urls:
+            print(f"Vendored bundle '{name}' is missing: add static/{rel_path}; "
+                  f"pages load it from {source_url} until then")
+
+load_static_assets()
+report_missing_vendor_bundles()
+
+# --------------------------------------------------------------------
+# Password hashing
+# Passwords are stored as "scrypt$<n>$<r>$<p>$<salt>$<hash>" (base64 salt
+# and hash). Accounts created before scrypt still hold an unsalted SHA256
+# hex digest; verify_user_async() accepts those and rewrites them as
+# scrypt on the next successful login. Hashing is deliberately slow
+# (~50-100 ms), so login and registration run only hash_password() and
+# verify_password() on _auth_executor: AUTH_WORKERS bounds how many hashes
+# (each needs 128 * r * n bytes) run at once, and the event loop stays
+# free for other requests during a login burst. Their database lookups
+# and writes run on the default threadpool so they never hold a hashing
+# slot.
+SCRYPT_N = int(os.getenv("SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+AUTH_WORKERS = int(os.getenv("AUTH_WORKERS", "2"))
+
+_auth_executor = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="auth")
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n, dklen=32)
+
+def hash_password(password: str) -> str:
+    """Hash password with scrypt and a random salt."""
+    salt = os.urandom(16)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return "$".join([
+        "scrypt", str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P),
+        base64.b64encode(salt).decode(), base64.b64encode(digest).decode(),
+    ])
+
+def verify_password(stored_hash: str, password: str):
+    """Return (matches, needs_rehash) for password against a stored hash.
+
+    A scrypt hash that cannot be parsed never matches.
+    """
+    if stored_hash.startswith("scrypt$"):
+        try:
+            _, n, r, p, salt, digest = stored_hash.split("$")
+            n, r, p = int(n), int(r), int(p)
+            computed = _scrypt(password, base64.b64decode(salt, validate=True), n, r, p)
+            expected = base64.b64decode(digest, validate=True)
+        except (ValueError, binascii.Error) as exc:
+            print(f"unreadable password hash ({type(exc).__name__})")
+            return False, False
+        matches = hmac.compare_digest(computed, expected)
+        return matches, matches and (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    # Legacy unsalted SHA256 hex digest
+    matches = hmac.compare_digest(stored_hash, hashlib.sha256(password.encode()).hexdigest())
+    return matches, matches
+
+# Checked for unknown usernames so they take as long as wrong passwords
+_DUMMY_PASSWORD_HASH = hash_password(base64.b64encode(os.urandom(12)).decode())
+
+async def verify_user_async(username: str, password: str) -> bool:
+    """Validate user credentials against the users table."""
+    username = (username or "").strip()
+    if not username or not password:
+        return False
+
+    loop = asyncio.get_running_loop()
+    try:
+        stored_hash = await asyncio.to_thread(data_source.get_password_hash, username)
+    except Exception as exc:
+        print(f"verify_user error: {exc}")
+        return False
+    if stored_hash is None:
+        await loop.run_in_executor(_auth_executor, verify_password, _DUMMY_PASSWORD_HASH, password)
+        return False
+    matches, needs_rehash = await loop.run_in_executor(_auth_executor, verify_password, stored_hash, password)
+    if needs_rehash:
+        try:
+            new_hash = await loop.run_in_executor(_auth_executor, hash_password, password)
+            await asyncio.to_thread(data_source.update_password_hash, username, new_hash)
+        except Exception as exc:
+            # The login still succeeds; the upgrade is retried next time
+            print(f"password rehash error for {username}: {exc}")
+    return matches
+
+@app.get("/test")
+def test():
+    """Simple test endpoint to verify server is running"""
     return {"status": "ok", "message": "Server is running"}
 
 @app.get("/", response_class=HTMLResponse)
@@ -261,7 +2214,7 @@ def homepage(request: Request):
 @app.post("/login")
 async def login(request: Request, username: str = Form(...), password: str = Form(...)):
     """Handle login form submission"""
-    if verify_user(username, password):
+    if await verify_user_async(username, password):
         request.session["authenticated"] = True
         request.session["username"] = username
         return RedirectResponse(url="/dashboard", status_code=status.HTTP_302_FOUND)
@@ -525,7 +2478,9 @@ async def register_user(
             status_code=status.HTTP_400_BAD_REQUEST,
         )
     try:
-        create_user(username, password)
+        username = validate_new_user(username, password)
+        password_hash = await asyncio.get_running_loop().run_in_executor(_auth_executor, hash_password, password)
+        await asyncio.to_thread(data_source.add_user, username, password_hash)
     except ValueError as exc:
         return HTMLResponse(
             content=render_register_form(str(exc), username),
@@ -551,252 +2506,7 @@ def dashboard(request: Request):
     <html>
     <head>
         <title>Dashboard</title>
-        <style>
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            body {
-                font-family: Arial, sans-serif;
-                background-color: #1e3a5f;
-                height: 100vh;
-                display: flex;
-            }
-            .sidebar {
-                width: 25%;
-                background: linear-gradient(135deg, #1e3a5f 0%, #2c5282 100%);
-                color: white;
-                padding: 20px;
-                overflow-y: auto;
-                transition: transform 0.3s ease, width 0.3s ease;
-                position: relative;
-            }
-            .sidebar.collapsed {
-                transform: translateX(-100%);
-                width: 0;
-                padding: 0;
-                overflow: hidden;
-            }
-            .menu-toggle-btn {
-                display: none;
-                position: fixed;
-                left: 20px;
-                top: 50%;
-                transform: translateY(-50%);
-                z-index: 1000;
-                background: linear-gradient(135deg, #1e3a5f 0%, #2c5282 100%);
-                color: white;
-                border: none;
-                padding: 15px 20px;
-                border-radius: 0 8px 8px 0;
-                cursor: pointer;
-                font-size: 18px;
-                font-weight: bold;
-                box-shadow: 2px 0 8px rgba(0,0,0,0.2);
-                transition: all 0.3s ease;
-            }
-            .menu-toggle-btn:hover {
-                background: linear-gradient(135deg, #2c5282 0%, #1e3a5f 100%);
-                padding-left: 25px;
-            }
-            .menu-toggle-btn.visible {
-                display: block;
-            }
-            .sidebar h2 {
-                margin-bottom: 30px;
-                font-size: 24px;
-            }
-            .menu-item {
-                margin-bottom: 10px;
-            }
-            .menu-header {
-                padding: 15px;
-                background: rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                cursor: pointer;
-                font-weight: bold;
-                font-size: 18px;
-                transition: background 0.3s;
-            }
-            .menu-header:hover {
-                background: rgba(255, 255, 255, 0.2);
-            }
-            .menu-header.active {
-                background: rgba(255, 255, 255, 0.3);
-            }
-            .submenu {
-                display: none;
-                margin-top: 10px;
-                padding-left: 10px;
-            }
-            .submenu.active {
-                display: block;
-            }
-            .submenu-item {
-                padding: 12px 15px;
-                background: rgba(255, 255, 255, 0.1);
-                border-radius: 6px;
-                margin-bottom: 8px;
-                cursor: pointer;
-                transition: background 0.3s;
-            }
-            .submenu-item:hover {
-                background: rgba(255, 255, 255, 0.2);
-            }
-            .submenu-item.active {
-                background: rgba(255, 255, 255, 0.3);
-            }
-            .logout-link {
-                margin-top: 30px;
-                padding: 15px;
-                text-align: center;
-                background: rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                cursor: pointer;
-                font-weight: bold;
-                font-size: 18px;
-                transition: background 0.3s;
-            }
-            .logout-link a {
-                color: white;
-                text-decoration: none;
-                font-size: 18px;
-                font-weight: bold;
-            }
-            .logout-link:hover {
-                background: rgba(255, 255, 255, 0.2);
-            }
-            .logout-link a:hover {
-                text-decoration: none;
-            }
-            .content-area {
-                width: 75%;
-                padding: 20px;
-                overflow-y: auto;
-                background-color: #f0f4f8;
-                transition: width 0.3s ease;
-            }
-            .content-area.expanded {
-                width: 100%;
-            }
-            .content-placeholder {
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                height: 100%;
-                color: #2c5282;
-                font-size: 18px;
-            }
-            #chart-container {
-                display: none;
-            }
-            #chart-container.active {
-                display: block;
-            }
-            #chart-container #chart {
-                width: 100%;
-                margin: auto;
-                min-height: 600px;
-            }
-            .content-area.expanded #chart-container #chart {
-                width: 100%;
-            }
-            #chart-container #popup {
-                display: none;
-                position: fixed;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                background: white;
-                z-index: 1000;
-                overflow: hidden;
-            }
-            #chart-container #popup-header {
-                position: sticky;
-                top: 0;
-                background: white;
-                padding: 15px 20px;
-                border-bottom: 2px solid #2c5282;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                z-index: 1001;
-                box-shadow: 0px 2px 5px rgba(0,0,0,0.1);
-            }
-            #chart-container #popup-header h3 {
-                margin: 0;
-                color: #1e3a5f;
-                font-size: 24px;
-            }
-            #chart-container #popup-buttons {
-                display: flex;
-                gap: 10px;
-            }
-            #chart-container #close, #chart-container #download {
-                background-color: #ff4d4d;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                cursor: pointer;
-                font-size: 14px;
-                font-weight: bold;
-                transition: background-color 0.3s;
-            }
-            #chart-container #close:hover {
-                background-color: #ff3333;
-            }
-            #chart-container #download {
-                background-color: #28a745;
-            }
-            #chart-container #download:hover {
-                background-color: #218838;
-            }
-            #chart-container #popup-content {
-                padding: 20px;
-                overflow-y: auto;
-                height: calc(100% - 80px);
-            }
-            #chart-container table {
-                margin-top: 10px;
-                border-collapse: collapse;
-                width: 100%;
-            }
-            #chart-container th, #chart-container td {
-                border: 1px solid #ddd;
-                padding: 8px;
-                text-align: left;
-            }
-            #chart-container th {
-                background-color: #f2f2f2;
-                text-align: left;
-            }
-            .loading-spinner {
-                display: inline-block;
-                width: 40px;
-                height: 40px;
-                border: 4px solid #f3f3f3;
-                border-top: 4px solid #1e3a5f;
-                border-radius: 50%;
-                animation: spin 1s linear infinite;
-                margin: 20px auto;
-            }
-            @keyframes spin {
-                0% { transform: rotate(0deg); }
-                100% { transform: rotate(360deg); }
-            }
-            .loading-container {
-                text-align: center;
-                padding: 40px;
-            }
-            .loading-container p {
-                color: #2c5282;
-                font-size: 16px;
-                margin-top: 15px;
-            }
-        </style>
+        <link rel="stylesheet" href="{{DASHBOARD_CSS}}">
     </head>
     <body>
         <button id="menuToggleBtn" class="menu-toggle-btn" onclick="toggleMenu()">☰ Menu</button>
@@ -845,3036 +2555,308 @@ def dashboard(request: Request):
             </div>
             <div id="chart-container"></div>
         </div>
-        <script src="https://cdn.plot.ly/plotly-2.26.0.min.js"></script>
-        <script src="https://cdnjs.cloudflare.com/ajax/libs/xlsx/0.18.5/xlsx.full.min.js"></script>
-        <script>
-            // Menu collapse/expand functionality
-            function toggleMenu() {
-                var sidebar = document.getElementById('sidebar');
-                var contentArea = document.querySelector('.content-area');
-                var menuToggleBtn = document.getElementById('menuToggleBtn');
-                
-                if (sidebar.classList.contains('collapsed')) {
-                    // Expand menu
-                    sidebar.classList.remove('collapsed');
-                    contentArea.classList.remove('expanded');
-                    menuToggleBtn.classList.remove('visible');
-                } else {
-                    // Collapse menu
-                    sidebar.classList.add('collapsed');
-                    contentArea.classList.add('expanded');
-                    menuToggleBtn.classList.add('visible');
-                }
-                
-                // Resize charts if any are active
-                setTimeout(function() {
-                    var chartDiv = document.getElementById('chart');
-                    if (chartDiv && chartDiv.data) {
-                        Plotly.Plots.resize(chartDiv);
-                    }
-                }, 350);
-            }
-            
-            function collapseMenu() {
-                var sidebar = document.getElementById('sidebar');
-                var contentArea = document.querySelector('.content-area');
-                var menuToggleBtn = document.getElementById('menuToggleBtn');
-                
-                if (!sidebar.classList.contains('collapsed')) {
-                    sidebar.classList.add('collapsed');
-                    contentArea.classList.add('expanded');
-                    menuToggleBtn.classList.add('visible');
-                    
-                    // Resize charts after collapse
-                    setTimeout(function() {
-                        var chartDiv = document.getElementById('chart');
-                        if (chartDiv && chartDiv.data) {
-                            Plotly.Plots.resize(chartDiv);
-                        }
-                    }, 350);
-                }
-            }
-            
-            // Define menu toggle functions first
-            function toggleSubmenu() {
-                var submenu = document.getElementById('denialsSubmenu');
-                if (submenu) {
-                submenu.classList.toggle('active');
-                }
-            }
-            
-            function toggleComparisonSubmenu() {
-                var submenu = document.getElementById('comparisonSubmenu');
-                if (submenu) {
-                submenu.classList.toggle('active');
-                }
-            }
-            
-            function toggleClarificationSubmenu() {
-                var submenu = document.getElementById('clarificationSubmenu');
-                if (submenu) {
-                    submenu.classList.toggle('active');
-                }
-            }
-            
-            function togglePerformanceSubmenu() {
-                var submenu = document.getElementById('performanceSubmenu');
-                if (submenu) {
-                    submenu.classList.toggle('active');
-                }
-            }
-            
-            function loadComparison(period) {
-                // Remove active class from all submenu items and menu headers
-                var items = document.querySelectorAll('.submenu-item, .menu-header');
-                items.forEach(item => item.classList.remove('active'));
-                // Add active class to clicked item
-                event.target.classList.add('active');
-                // Add active class to Comparison menu header
-                event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
-                
-                // Collapse menu
-                collapseMenu();
-                
-                // Hide placeholder and show chart container
-                document.getElementById('placeholder').style.display = 'none';
-                var chartContainer = document.getElementById('chart-container');
-                chartContainer.classList.add('active');
-                
-                // Show selector UI
-                showComparisonSelector(period, chartContainer);
-            }
-            
-            function showComparisonSelector(period, chartContainer) {
-                var periodLabel = period.charAt(0).toUpperCase() + period.slice(1);
-                var selectorHtml = '';
-                
-                if (period === 'daily') {
-                    // Daily shows yesterday's data - no selector needed, just load button
-                    selectorHtml = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">' + periodLabel + ' Comparison</h2><p style="color: #2c5282; font-size: 16px; margin-bottom: 20px;">Showing yesterdays denial data</p><button id="loadDailyBtn" data-period="' + period + '" style="padding: 10px 20px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer;">Load Chart</button></div>';
-                } else if (period === 'biweekly') {
-                    // Biweekly shows data for the other half of current month
-                    selectorHtml = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">' + periodLabel + ' Comparison</h2><p style="color: #2c5282; font-size: 16px; margin-bottom: 20px;">Showing data for the other half of current month</p><button id="loadBiweeklyBtn" data-period="' + period + '" style="padding: 10px 20px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer;">Load Chart</button></div>';
-                } else if (period === 'monthly') {
-                    // Monthly shows last month's data - no selector needed, just load button
-                    selectorHtml = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">' + periodLabel + ' Comparison</h2><p style="color: #2c5282; font-size: 16px; margin-bottom: 20px;">Showing last months denial data</p><button id="loadMonthlyBtn" data-period="' + period + '" style="padding: 10px 20px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer;">Load Chart</button></div>';
-                }
-                chartContainer.innerHTML = selectorHtml + '<div id="chart"></div><div id="popup"><div id="popup-header"><h3 id="popup-title"></h3><div id="popup-buttons"><button id="download">Download Excel</button><button id="close">Close</button></div></div><div id="popup-content"></div></div>';
-                
-                // Attach event listeners to buttons
-                setTimeout(function() {
-                    var btn = document.getElementById('loadDailyBtn') || document.getElementById('loadMonthlyBtn') || document.getElementById('loadBiweeklyBtn');
-                    if (btn) {
-                        btn.addEventListener('click', function() {
-                            fetchComparisonData(period);
-                        });
-                    }
-                }, 100);
-            }
-            
-            function fetchComparisonData(period) {
-                var chartContainer = document.getElementById('chart-container');
-                if (!chartContainer) {
-                    console.error('Chart container not found');
-                    return;
-                }
-                
-                // Disable the load button
-                var btn = document.getElementById('loadDailyBtn') || document.getElementById('loadMonthlyBtn') || document.getElementById('loadBiweeklyBtn');
-                if (btn) {
-                    btn.disabled = true;
-                    btn.style.opacity = '0.6';
-                    btn.style.cursor = 'not-allowed';
-                }
-                
-                // Show loading spinner in chart div
-                var chartDiv = document.getElementById('chart');
-                if (chartDiv) {
-                    chartDiv.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading chart data...</p></div>';
-                } else {
-                    // If chart div doesn't exist yet, preserve existing structure and add loading
-                    var selectorDiv = chartContainer.querySelector('div[style*="text-align"]');
-                    if (selectorDiv) {
-                        chartContainer.innerHTML = selectorDiv.outerHTML + '<div id="chart"><div class="loading-container"><div class="loading-spinner"></div><p>Loading chart data...</p></div></div><div id="popup"><div id="popup-header"><h3 id="popup-title"></h3><div id="popup-buttons"><button id="download">Download Excel</button><button id="close">Close</button></div></div><div id="popup-content"></div></div>';
-                    }
-                }
-                
-                var url = '/comparison-data?period=' + encodeURIComponent(period);
-                fetch(url)
-                    .then(function(response) {
-                        if (!response.ok) {
-                            throw new Error('Network response was not ok');
-                        }
-                        return response.json();
-                    })
-                    .then(function(data) {
-                        // Re-enable the button
-                        if (btn) {
-                            btn.disabled = false;
-                            btn.style.opacity = '1';
-                            btn.style.cursor = 'pointer';
-                        }
-                        
-                        if (data.error) {
-                            var errorDiv = document.getElementById('chart');
-                            if (errorDiv) {
-                                errorDiv.innerHTML = '<p style="color: red; text-align: center; padding: 20px;">Error: ' + data.error + '</p>';
-                            } else {
-                                chartContainer.innerHTML = '<p style="color: red; text-align: center; padding: 20px;">Error: ' + data.error + '</p>';
-                            }
-                        } else {
-                            renderComparisonChart(data, period);
-                        }
-                    })
-                    .catch(function(error) {
-                        // Re-enable the button
-                        if (btn) {
-                            btn.disabled = false;
-                            btn.style.opacity = '1';
-                            btn.style.cursor = 'pointer';
-                        }
-                        
-                        console.error('Error loading comparison chart:', error);
-                        var errorDiv = document.getElementById('chart');
-                        if (errorDiv) {
-                            errorDiv.innerHTML = '<p style="color: red; text-align: center; padding: 20px;">Error loading comparison chart data: ' + error.message + '</p>';
-                        } else {
-                            chartContainer.innerHTML = '<p style="color: red; text-align: center; padding: 20px;">Error loading comparison chart data: ' + error.message + '</p>';
-                        }
-                });
-            }
-            
-            function loadDenialChart() {
-                // Remove active class from all submenu items and menu headers
-                var items = document.querySelectorAll('.submenu-item, .menu-header');
-                items.forEach(item => item.classList.remove('active'));
-                // Add active class to clicked item
-                event.target.classList.add('active');
-                
-                // Collapse menu
-                collapseMenu();
-                
-                // Hide placeholder and show chart container
-                document.getElementById('placeholder').style.display = 'none';
-                var chartContainer = document.getElementById('chart-container');
-                chartContainer.classList.add('active');
-                
-                // Show loading spinner
-                chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading denial chart data...</p></div>';
-                
-                // Always reload the chart
-                fetch('/button-data')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderChart(data);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading chart:', error);
-                        chartContainer.innerHTML = '<p style="color: red;">Error loading chart data</p>';
-                    });
-            }
-            
-            function loadDenialsComparison() {
-                // Remove active class from all submenu items and menu headers
-                var items = document.querySelectorAll('.submenu-item, .menu-header');
-                items.forEach(item => item.classList.remove('active'));
-                // Add active class to clicked item
-                event.target.classList.add('active');
-                // Add active class to Denials menu header
-                event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
-                
-                // Collapse menu
-                collapseMenu();
-                
-                // Hide placeholder and show chart container
-                document.getElementById('placeholder').style.display = 'none';
-                var chartContainer = document.getElementById('chart-container');
-                chartContainer.classList.add('active');
-                
-                // Show buttons for different comparison options
-                chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 20px; font-weight: 600;">Denials Comparison</h2><div style="display: flex; gap: 15px; justify-content: center; margin-bottom: 20px;"><button id="denialsCurrentPrevBtn" style="background-color: #2c5282; color: white; border: none; padding: 12px 24px; border-radius: 8px; cursor: pointer; font-size: 16px; font-weight: bold; transition: background-color 0.3s;">Current vs Previous Month</button><button id="denialsBiweeklyBtn" style="background-color: #2c5282; color: white; border: none; padding: 12px 24px; border-radius: 8px; cursor: pointer; font-size: 16px; font-weight: bold; transition: background-color 0.3s;">Biweekly for 3 Months</button><button id="denialsMonthlyBtn" style="background-color: #2c5282; color: white; border: none; padding: 12px 24px; border-radius: 8px; cursor: pointer; font-size: 16px; font-weight: bold; transition: background-color 0.3s;">Monthly for 6 Months</button></div><div id="chart"></div></div>';
-                
-                // Add event listeners
-                var currentPrevBtn = document.getElementById('denialsCurrentPrevBtn');
-                var biweeklyBtn = document.getElementById('denialsBiweeklyBtn');
-                var monthlyBtn = document.getElementById('denialsMonthlyBtn');
-                
-                if (currentPrevBtn) {
-                    currentPrevBtn.onclick = function() {
-                        loadDenialsCurrentPreviousComparison();
-                    };
-                    currentPrevBtn.onmouseover = function() {
-                        this.style.backgroundColor = '#1e3a5f';
-                    };
-                    currentPrevBtn.onmouseout = function() {
-                        this.style.backgroundColor = '#2c5282';
-                    };
-                }
-                
-                if (biweeklyBtn) {
-                    biweeklyBtn.onclick = function() {
-                        loadDenialsBiweeklyComparison();
-                    };
-                    biweeklyBtn.onmouseover = function() {
-                        this.style.backgroundColor = '#1e3a5f';
-                    };
-                    biweeklyBtn.onmouseout = function() {
-                        this.style.backgroundColor = '#2c5282';
-                    };
-                }
-                
-                if (monthlyBtn) {
-                    monthlyBtn.onclick = function() {
-                        loadDenialsMonthlyComparison();
-                    };
-                    monthlyBtn.onmouseover = function() {
-                        this.style.backgroundColor = '#1e3a5f';
-                    };
-                    monthlyBtn.onmouseout = function() {
-                        this.style.backgroundColor = '#2c5282';
-                    };
-                }
-            }
-            
-            function loadDenialsCurrentPreviousComparison() {
-                var chartContainer = document.getElementById('chart-container');
-                var chartDiv = document.getElementById('chart');
-                if (!chartDiv) {
-                    // If chart div doesn't exist, preserve the buttons structure
-                    var buttonsDiv = chartContainer.querySelector('div[style*="display: flex"]');
-                    chartContainer.innerHTML = (buttonsDiv ? buttonsDiv.outerHTML : '') + '<div id="chart"></div>';
-                    chartDiv = document.getElementById('chart');
-                }
-                chartDiv.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading denials comparison data...</p></div>';
-                
-                fetch('/denials-comparison-data')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderDenialsComparisonChart(data);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading denials comparison:', error);
-                        chartDiv.innerHTML = '<p style="color: red;">Error loading denials comparison data</p>';
-                    });
-            }
-            
-            function loadDenialsBiweeklyComparison() {
-                var chartContainer = document.getElementById('chart-container');
-                var chartDiv = document.getElementById('chart');
-                if (!chartDiv) {
-                    var buttonsDiv = chartContainer.querySelector('div[style*="display: flex"]');
-                    chartContainer.innerHTML = (buttonsDiv ? buttonsDiv.outerHTML : '') + '<div id="chart"></div>';
-                    chartDiv = document.getElementById('chart');
-                }
-                chartDiv.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading biweekly comparison data...</p></div>';
-                
-                fetch('/denials-biweekly-comparison-data')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderDenialsBiweeklyComparisonChart(data);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading biweekly comparison:', error);
-                        chartDiv.innerHTML = '<p style="color: red;">Error loading biweekly comparison data</p>';
-                    });
-            }
-            
-            function loadDenialsMonthlyComparison() {
-                var chartContainer = document.getElementById('chart-container');
-                var chartDiv = document.getElementById('chart');
-                if (!chartDiv) {
-                    var buttonsDiv = chartContainer.querySelector('div[style*="display: flex"]');
-                    chartContainer.innerHTML = (buttonsDiv ? buttonsDiv.outerHTML : '') + '<div id="chart"></div>';
-                    chartDiv = document.getElementById('chart');
-                }
-                chartDiv.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading monthly comparison data...</p></div>';
-                
-                fetch('/denials-monthly-comparison-data')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderDenialsMonthlyComparisonChart(data);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading monthly comparison:', error);
-                        chartDiv.innerHTML = '<p style="color: red;">Error loading monthly comparison data</p>';
-                    });
-            }
-            
-            function loadClarificationByAging() {
-                // Remove active class from all submenu items and menu headers
-                var items = document.querySelectorAll('.submenu-item, .menu-header');
-                items.forEach(item => item.classList.remove('active'));
-                // Add active class to clicked item
-                event.target.classList.add('active');
-                // Add active class to Clarification menu header
-                event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
-                
-                // Hide placeholder and show chart container
-                document.getElementById('placeholder').style.display = 'none';
-                var chartContainer = document.getElementById('chart-container');
-                chartContainer.classList.add('active');
-                
-                // Show loading spinner
-                chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading clarification grouping data...</p></div>';
-                
-                // Fetch clarification grouping data (same as Clarification Grouping button)
-                fetch('/clarification-grouping-data')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderClarificationChart(data);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading clarification grouping:', error);
-                        chartContainer.innerHTML = '<p style="color: red;">Error loading clarification grouping data</p>';
-                    });
-            }
-            
-            /*
-            // COMMENTED OUT - Original clarification by aging function
-            */
-            
-            function loadClarificationType() {
-                // Remove active class from all submenu items and menu headers
-                var items = document.querySelectorAll('.submenu-item, .menu-header');
-                items.forEach(item => item.classList.remove('active'));
-                // Add active class to clicked item
-                event.target.classList.add('active');
-                // Add active class to Clarification menu header
-                event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
-                
-                // Collapse menu
-                collapseMenu();
-                
-                // Hide placeholder and show chart container
-                document.getElementById('placeholder').style.display = 'none';
-                var chartContainer = document.getElementById('chart-container');
-                chartContainer.classList.add('active');
-                
-                // Show loading spinner
-                chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading clarification type data...</p></div>';
-                
-                // Fetch clarification type data
-                fetch('/clarification-type-data')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderClarificationTypeChart(data);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading clarification type:', error);
-                        chartContainer.innerHTML = '<p style="color: red;">Error loading clarification type data</p>';
-                    });
-            }
-            
-            function loadPerformanceAnalysis() {
-                // Remove active class from all submenu items and menu headers
-                var items = document.querySelectorAll('.submenu-item, .menu-header');
-                items.forEach(item => item.classList.remove('active'));
-                // Add active class to clicked item
-                event.target.classList.add('active');
-                // Add active class to Performance Analysis menu header
-                event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
-                
-                // Collapse menu
-                collapseMenu();
-                
-                // Hide placeholder and show chart container
-                document.getElementById('placeholder').style.display = 'none';
-                var chartContainer = document.getElementById('chart-container');
-                chartContainer.classList.add('active');
-                
-                // Show loading spinner
-                chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading performance analysis data...</p></div>';
-                
-                // Fetch users by role
-                fetch('/performance-users')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderPerformanceAnalysis(data, chartContainer);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading performance analysis:', error);
-                        chartContainer.innerHTML = '<p style="color: red;">Error loading performance analysis data</p>';
-                    });
-            }
-            
-            function renderPerformanceAnalysis(usersData, chartContainer) {
-                var billingTeam = usersData.billing_team || [];
-                var arTeam = usersData.ar_team || [];
-                
-                // Create HTML with two buttons and dropdowns
-                var html = '<div style="text-align: center; margin-bottom: 30px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 20px; font-weight: 600;">Performance Analysis</h2>';
-                html += '<div style="display: flex; gap: 30px; justify-content: center; margin-bottom: 30px;">';
-                
-                // Billing Team button and dropdown
-                html += '<div style="position: relative; display: inline-block;">';
-                html += '<button id="billingTeamBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">Billing Team ▼</button>';
-                html += '<div id="billingDropdown" style="display: none; position: absolute; background: white; min-width: 200px; box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2); z-index: 1000; border-radius: 5px; margin-top: 5px; max-height: 300px; overflow-y: auto;">';
-                if (billingTeam.length === 0) {
-                    html += '<div style="padding: 10px; color: #666;">No members found</div>';
-                } else {
-                    billingTeam.forEach(function(member) {
-                        html += '<div class="dropdown-item" data-team="billing" data-username="' + member.replace(/"/g, '&quot;') + '" style="padding: 12px 16px; cursor: pointer; border-bottom: 1px solid #eee; color: #1e3a5f;">' + member + '</div>';
-                    });
-                }
-                html += '</div></div>';
-                
-                // A R Team button and dropdown
-                html += '<div style="position: relative; display: inline-block;">';
-                html += '<button id="arTeamBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">A R Team ▼</button>';
-                html += '<div id="arDropdown" style="display: none; position: absolute; background: white; min-width: 200px; box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2); z-index: 1000; border-radius: 5px; margin-top: 5px; max-height: 300px; overflow-y: auto;">';
-                if (arTeam.length === 0) {
-                    html += '<div style="padding: 10px; color: #666;">No members found</div>';
-                } else {
-                    arTeam.forEach(function(member) {
-                        html += '<div class="dropdown-item" data-team="ar" data-username="' + member.replace(/"/g, '&quot;') + '" style="padding: 12px 16px; cursor: pointer; border-bottom: 1px solid #eee; color: #1e3a5f;">' + member + '</div>';
-                    });
-                }
-                html += '</div></div>';
-                
-                html += '</div></div>';
-                html += '<div id="chart"></div>';
-                html += '<div id="popup"><div id="popup-header"><h3 id="popup-title"></h3><div id="popup-buttons"><button id="download">Download Excel</button><button id="close">Close</button></div></div><div id="popup-content"></div></div>';
-                
-                chartContainer.innerHTML = html;
-                
-                // Setup dropdown toggle functionality
-                var billingBtn = document.getElementById('billingTeamBtn');
-                var arBtn = document.getElementById('arTeamBtn');
-                var billingDropdown = document.getElementById('billingDropdown');
-                var arDropdown = document.getElementById('arDropdown');
-                
-                billingBtn.onclick = function(e) {
-                    e.stopPropagation();
-                    arDropdown.style.display = 'none';
-                    billingDropdown.style.display = billingDropdown.style.display === 'none' ? 'block' : 'none';
-                };
-                
-                arBtn.onclick = function(e) {
-                    e.stopPropagation();
-                    billingDropdown.style.display = 'none';
-                    arDropdown.style.display = arDropdown.style.display === 'none' ? 'block' : 'none';
-                };
-                
-                // Close dropdowns when clicking outside
-                document.addEventListener('click', function(e) {
-                    if (!billingBtn.contains(e.target) && !billingDropdown.contains(e.target)) {
-                        billingDropdown.style.display = 'none';
-                    }
-                    if (!arBtn.contains(e.target) && !arDropdown.contains(e.target)) {
-                        arDropdown.style.display = 'none';
-                    }
-                });
-                
-                // Handle member selection
-                var dropdownItems = document.querySelectorAll('.dropdown-item');
-                dropdownItems.forEach(function(item) {
-                    item.onclick = function() {
-                        var username = this.getAttribute('data-username');
-                        billingDropdown.style.display = 'none';
-                        arDropdown.style.display = 'none';
-                        loadUserDenialsChart(username);
-                    };
-                    // Add hover effect using JavaScript instead of inline handlers
-                    item.onmouseover = function() {
-                        this.style.backgroundColor = '#f0f4f8';
-                    };
-                    item.onmouseout = function() {
-                        this.style.backgroundColor = 'white';
-                    };
-                });
-            }
-            
-            function loadUserDenialsChart(username) {
-                var chartContainer = document.getElementById('chart-container');
-                var chartDiv = document.getElementById('chart');
-                
-                // Show loading spinner
-                chartDiv.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading denial data for ' + username + '...</p></div>';
-                
-                // Fetch user denial data
-                fetch('/user-denials-data?username=' + encodeURIComponent(username))
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderUserDenialsChart(data, username);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading user denials:', error);
-                        chartDiv.innerHTML = '<p style="color: red;">Error loading user denial data</p>';
-                    });
-            }
-            
-            function renderUserDenialsChart(data, username) {
-                var chartContainer = document.getElementById('chart-container');
-                var chartDiv = document.getElementById('chart');
-                
-                // Wait for Plotly to be available
-                if (typeof Plotly === 'undefined') {
-                    setTimeout(function() {
-                        renderUserDenialsChart(data, username);
-                    }, 100);
-                    return;
-                }
-                
-                // Clear chart div
-                chartDiv.innerHTML = '';
-                
-                // Extract data
-                var categories = data.categories || [];
-                var counts = data.counts || [];
-                var labelsWithCounts = data.labels_with_counts || [];
-                var tableData = data.table_data || {};
-                
-                if (categories.length === 0) {
-                    chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No denial data available for ' + username + '.</p>';
-                    return;
-                }
-                
-                // Create color map (same as denials chart)
-                var colorMap = {
-                    "Inactive or Wrong policy Information": "#dd7e6b",
-                    "Medicare paid more than Medicaid": "#f9cb9c",
-                    "Incorrect/Invalid DOS": "#ffe599",
-                    "TFL/Appeal time limit expired or not allowed": "#e1cfca",
-                    "Missing or Invalid ICD/CPT code/Modifier/POS": "#a2c4c9",
-                    "Provider enrollment issue": "#a4c2f4",
-                    "Out of network": "#b4a7d6",
-                    "Need additional information needed": "#d5a6bd",
-                    "Non covered service": "#ea9999",
-                    "Incorrect Billing": "#dbe098",
-                    "Bundled service": "#bcc07b",
-                    "Other": "#808080"
-                };
-                
-                // Create color array based on classification order
-                var vibrantColors = categories.map(function(cat) {
-                    return colorMap[cat.trim()] || '#808080';
-                });
-                
-                var chartData = [{
-                    type: "pie",
-                    labels: labelsWithCounts,
-                    values: counts,
-                    textinfo: "label+percent",
-                    hoverinfo: "label+value",
-                    textposition: "outside",
-                    automargin: true,
-                    marker: { 
-                        colors: vibrantColors,
-                        line: { color: "#ffffff", width: 2 }
-                    },
-                    domain: { x: [0, 0.6], y: [0.3, 1] },
-                    name: ""
-                }];
-                
-                var layout = {
-                    height: 700,
-                    width: 1300,
-                    margin: { l: 0, r: 0, t: 80, b: 0 },
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: { 
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 14
-                    },
-                    showlegend: true,
-                    legend: {
-                        x: 0.75,
-                        y: 1,
-                        xanchor: "left",
-                        yanchor: "top",
-                        font: { 
-                            size: 16,
-                            color: '#1e3a5f',
-                            family: 'Arial, sans-serif'
-                        },
-                        traceorder: "normal",
-                        bgcolor: 'rgba(255,255,255,0.8)',
-                        bordercolor: '#2c5282',
-                        borderwidth: 1
-                    },
-                    title: {
-                        text: 'Denials by Category - ' + username,
-                        font: {
-                            size: 20,
-                            color: '#1e3a5f'
-                        }
-                    }
-                };
-                
-                // Render the chart
-                Plotly.newPlot("chart", chartData, layout);
-                
-                // Setup popup functionality (same as denials chart)
-                var popup = document.getElementById("popup");
-                var popupContent = document.getElementById("popup-content");
-                var popupTitle = document.getElementById("popup-title");
-                var closeBtn = document.getElementById("close");
-                var downloadBtn = document.getElementById("download");
-                var currentCategory = "";
-                
-                // Function to download table as Excel (same as denials chart)
-                // Function to download table as Excel (same as denials chart)
-function downloadTableAsExcel() {
-    var table = popupContent.querySelector('table');
-    if (!table) {
-        alert('No table found to download');
-        return;
-    }
-
-    var wb = XLSX.utils.book_new();
-    var ws = XLSX.utils.table_to_sheet(table);
-
-    // Convert ALL numbers and dates to strings, and left-align everything
-    var range = XLSX.utils.decode_range(ws['!ref']);
-
-    // Convert ALL cells to strings and left-align
-    for (var R = 0; R <= range.e.r; ++R) {
-        for (var C = range.s.c; C <= range.e.c; ++C) {
-            var cellAddress = XLSX.utils.encode_cell({ r: R, c: C });
-
-            if (!ws[cellAddress]) {
-                ws[cellAddress] = {};
-            }
-
-            var cell = ws[cellAddress];
-
-            if (cell && cell.v !== null && cell.v !== undefined) {
-
-                // ✅ FIX: format dates BEFORE converting to string
-                if (typeof cell.v === 'number' && cell.z && cell.z.toLowerCase().includes('d')) {
-                    var d = XLSX.SSF.parse_date_code(cell.v);
-                    cell.v =
-                        String(d.m).padStart(2, '0') + '/' +
-                        String(d.d).padStart(2, '0') + '/' +
-                        d.y;
-                } else {
-                    cell.v = String(cell.v);
-                }
-
-                cell.t = 's'; // string type
-                if (cell.z) delete cell.z; // remove any date format
-            }
-
-            // Left alignment for all cells
-            if (!cell.s) cell.s = {};
-            if (!cell.s.alignment) cell.s.alignment = {};
-            cell.s.alignment.horizontal = 'left';
-            cell.s.alignment.vertical = 'top';
-            cell.s.alignment.wrapText = false;
-        }
-    }
-
-    // Auto column width
-    if (!ws['!cols']) ws['!cols'] = [];
-
-    for (var C = range.s.c; C <= range.e.c; ++C) {
-        var maxWidth = 10;
-
-        var headerCell = XLSX.utils.encode_cell({ r: 0, c: C });
-        if (ws[headerCell] && ws[headerCell].v) {
-            maxWidth = Math.max(maxWidth, String(ws[headerCell].v).length);
-        }
-
-        for (var R = 1; R <= range.e.r; ++R) {
-            var cellAddress = XLSX.utils.encode_cell({ r: R, c: C });
-            if (ws[cellAddress] && ws[cellAddress].v !== null && ws[cellAddress].v !== undefined) {
-                maxWidth = Math.max(maxWidth, String(ws[cellAddress].v).length);
-            }
-        }
-
-        ws['!cols'][C] = { wch: maxWidth + 3 };
-    }
-
-    XLSX.utils.book_append_sheet(wb, ws, "Data");
-
-    var filename =
-        username.replace(/[^a-z0-9]/gi, '_') + '_' +
-        currentCategory.replace(/[^a-z0-9]/gi, '_') + '_' +
-        new Date().toISOString().split('T')[0] +
-        '.xlsx';
-
-    XLSX.writeFile(wb, filename);
-}
-
-                
-                // Click handler for pie chart slices
-                document.getElementById("chart").on('plotly_click', function(evt) {
-                    var pointIndex = evt.points[0].pointNumber;
-                    var category = categories[pointIndex];
-                    currentCategory = category;
-                    popupTitle.textContent = category + ' - ' + username;
-                    
-                    // Show popup with loading spinner
-                    popup.style.display = "block";
-                    popupContent.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading table data...</p></div>';
-                    
-                    // Load table data after a brief delay
-                    setTimeout(function() {
-                        popupContent.innerHTML = tableData[category] || '<p>No data available for this category</p>';
-                    }, 300);
-                });
-                
-                closeBtn.onclick = function() {
-                    popup.style.display = "none";
-                };
-                
-                downloadBtn.onclick = function() {
-                    downloadTableAsExcel();
-                };
-            }
-            
-            function loadCountComparison() {
-                // Remove active class from all submenu items and menu headers
-                var items = document.querySelectorAll('.submenu-item, .menu-header');
-                items.forEach(item => item.classList.remove('active'));
-                // Add active class to clicked item
-                event.target.classList.add('active');
-                // Add active class to Performance Analysis menu header
-                event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
-                
-                // Collapse menu
-                collapseMenu();
-                
-                // Hide placeholder and show chart container
-                document.getElementById('placeholder').style.display = 'none';
-                var chartContainer = document.getElementById('chart-container');
-                chartContainer.classList.add('active');
-                
-                // Show loading spinner
-                chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading count comparison data...</p></div>';
-                
-                // Fetch users by role
-                fetch('/performance-users')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderCountComparison(data, chartContainer);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading count comparison:', error);
-                        chartContainer.innerHTML = '<p style="color: red;">Error loading count comparison data</p>';
-                    });
-            }
-            
-            function renderCountComparison(usersData, chartContainer) {
-                var billingTeam = usersData.billing_team || [];
-                var arTeam = usersData.ar_team || [];
-                
-                // Create HTML with two buttons and dropdowns
-                var html = '<div style="text-align: center; margin-bottom: 30px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 20px; font-weight: 600;">Count Comparison</h2>';
-                html += '<div style="display: flex; gap: 30px; justify-content: center; margin-bottom: 30px;">';
-                
-                // Billing Team button and dropdown
-                html += '<div style="position: relative; display: inline-block;">';
-                html += '<button id="billingTeamBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">Billing Team ▼</button>';
-                html += '<div id="billingDropdown" style="display: none; position: absolute; background: white; min-width: 200px; box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2); z-index: 1000; border-radius: 5px; margin-top: 5px; max-height: 300px; overflow-y: auto;">';
-                if (billingTeam.length === 0) {
-                    html += '<div style="padding: 10px; color: #666;">No members found</div>';
-                } else {
-                    billingTeam.forEach(function(member) {
-                        html += '<div class="dropdown-item" data-team="billing" data-username="' + member.replace(/"/g, '&quot;') + '" style="padding: 12px 16px; cursor: pointer; border-bottom: 1px solid #eee; color: #1e3a5f;">' + member + '</div>';
-                    });
-                }
-                html += '</div></div>';
-                
-                // A R Team button and dropdown
-                html += '<div style="position: relative; display: inline-block;">';
-                html += '<button id="arTeamBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">A R Team ▼</button>';
-                html += '<div id="arDropdown" style="display: none; position: absolute; background: white; min-width: 200px; box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2); z-index: 1000; border-radius: 5px; margin-top: 5px; max-height: 300px; overflow-y: auto;">';
-                if (arTeam.length === 0) {
-                    html += '<div style="padding: 10px; color: #666;">No members found</div>';
-                } else {
-                    arTeam.forEach(function(member) {
-                        html += '<div class="dropdown-item" data-team="ar" data-username="' + member.replace(/"/g, '&quot;') + '" style="padding: 12px 16px; cursor: pointer; border-bottom: 1px solid #eee; color: #1e3a5f;">' + member + '</div>';
-                    });
-                }
-                html += '</div></div>';
-                
-                html += '</div></div>';
-                html += '<div id="periodButtons" style="display: none; gap: 30px; justify-content: center; margin-bottom: 30px;">';
-                html += '<button id="biweeklyBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">Biweekly for Last 3 Months</button>';
-                html += '<button id="monthlyBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">Last 6 Months</button>';
-                html += '</div>';
-                html += '<div id="chart"></div>';
-                
-                chartContainer.innerHTML = html;
-                
-                // Store selected user (single user selection)
-                window.selectedUser = null;
-                
-                // Setup dropdown toggle functionality
-                var billingBtn = document.getElementById('billingTeamBtn');
-                var arBtn = document.getElementById('arTeamBtn');
-                var billingDropdown = document.getElementById('billingDropdown');
-                var arDropdown = document.getElementById('arDropdown');
-                
-                billingBtn.onclick = function(e) {
-                    e.stopPropagation();
-                    arDropdown.style.display = 'none';
-                    billingDropdown.style.display = billingDropdown.style.display === 'none' ? 'block' : 'none';
-                };
-                
-                arBtn.onclick = function(e) {
-                    e.stopPropagation();
-                    billingDropdown.style.display = 'none';
-                    arDropdown.style.display = arDropdown.style.display === 'none' ? 'block' : 'none';
-                };
-                
-                // Close dropdowns when clicking outside
-                document.addEventListener('click', function(e) {
-                    if (!billingBtn.contains(e.target) && !billingDropdown.contains(e.target)) {
-                        billingDropdown.style.display = 'none';
-                    }
-                    if (!arBtn.contains(e.target) && !arDropdown.contains(e.target)) {
-                        arDropdown.style.display = 'none';
-                    }
-                });
-                
-                // Handle member selection (single user)
-                var dropdownItems = document.querySelectorAll('.dropdown-item');
-                var periodButtons = document.getElementById('periodButtons');
-                
-                dropdownItems.forEach(function(item) {
-                    item.onclick = function() {
-                        var username = this.getAttribute('data-username');
-                        billingDropdown.style.display = 'none';
-                        arDropdown.style.display = 'none';
-                        
-                        // Clear previous selection
-                        dropdownItems.forEach(function(i) {
-                            i.style.backgroundColor = 'white';
-                        });
-                        
-                        // Select this user
-                        window.selectedUser = username;
-                        this.style.backgroundColor = '#d4e6f1';
-                        
-                        // Show period buttons
-                        var periodButtonsDiv = document.getElementById('periodButtons');
-                        if (periodButtonsDiv) {
-                            periodButtonsDiv.style.display = 'flex';
-                        }
-                    };
-                    // Add hover effect
-                    item.onmouseover = function() {
-                        if (window.selectedUser !== this.getAttribute('data-username')) {
-                            this.style.backgroundColor = '#f0f4f8';
-                        }
-                    };
-                    item.onmouseout = function() {
-                        if (window.selectedUser !== this.getAttribute('data-username')) {
-                            this.style.backgroundColor = 'white';
-                        }
-                    };
-                });
-                
-                // Setup button handlers
-                document.getElementById('biweeklyBtn').onclick = function() {
-                    if (!window.selectedUser) {
-                        alert('Please select a user from the dropdowns');
-                        return;
-                    }
-                    loadBiweeklyUserComparison(window.selectedUser);
-                };
-                
-                document.getElementById('monthlyBtn').onclick = function() {
-                    if (!window.selectedUser) {
-                        alert('Please select a user from the dropdowns');
-                        return;
-                    }
-                    loadMonthlyUserComparison(window.selectedUser);
-                };
-            }
-            
-            function loadBiweeklyUserComparison(username) {
-                var chartDiv = document.getElementById('chart');
-                
-                // Show loading spinner
-                chartDiv.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading biweekly comparison data...</p></div>';
-                
-                // Fetch biweekly comparison data for selected user
-                fetch('/biweekly-user-comparison-data?username=' + encodeURIComponent(username))
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderBiweeklyUserComparisonChart(data);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading biweekly comparison:', error);
-                        chartDiv.innerHTML = '<p style="color: red;">Error loading biweekly comparison data</p>';
-                    });
-            }
-            
-            function loadMonthlyUserComparison(username) {
-                var chartDiv = document.getElementById('chart');
-                
-                // Show loading spinner
-                chartDiv.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading monthly comparison data...</p></div>';
-                
-                // Fetch monthly comparison data for selected user
-                fetch('/monthly-user-comparison-data?username=' + encodeURIComponent(username))
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderMonthlyUserComparisonChart(data);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading monthly comparison:', error);
-                        chartDiv.innerHTML = '<p style="color: red;">Error loading monthly comparison data</p>';
-                    });
-            }
-            
-            function renderBiweeklyUserComparisonChart(data) {
-                var chartDiv = document.getElementById('chart');
-                
-                if (typeof Plotly === 'undefined') {
-                    chartDiv.innerHTML = '<p style="color: red;">Plotly library not loaded. Please refresh the page.</p>';
-                    return;
-                }
-                
-                // Clear loading message
-                chartDiv.innerHTML = '';
-                
-                var categories = data.categories || [];
-                var periods = data.labels || [];
-                var periodData = data.data || {};
-                
-                if (categories.length === 0 || periods.length === 0) {
-                    chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for biweekly comparison.</p>';
-                    return;
-                }
-                
-                // Create abbreviated category names (first letter of each word) - same as denials comparison
-                function getAbbreviation(categoryName) {
-                    return categoryName.split(' ').map(function(word) {
-                        return word.charAt(0).toUpperCase();
-                    }).join('');
-                }
-                
-                var abbreviatedCategories = categories.map(getAbbreviation);
-                
-                // Convert counts from thousands to actual numbers for display (same format as denials comparison)
-                var expandedPeriodData = {};
-                periods.forEach(function(period) {
-                    var counts = periodData[period] || [];
-                    expandedPeriodData[period] = counts.map(function(count) {
-                        return count * 1000; // Convert back from thousands
-                    });
-                });
-                
-                // Create traces for each period
-                var traces = [];
-                var colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'];
-                
-                periods.forEach(function(period, index) {
-                    var counts = expandedPeriodData[period] || [];
-                    // Create text labels for count values on top of data points
-                    var textLabels = counts.map(function(count) {
-                        return count > 0 ? Math.round(count).toLocaleString() : '';
-                    });
-                    
-                    traces.push({
-                        x: abbreviatedCategories,
-                        y: counts,
-                        type: 'scatter',
-                        mode: 'lines+markers+text',
-                        name: period,
-                        text: textLabels,
-                        textposition: 'top',
-                        textfont: {
-                            size: 10,
-                            color: colors[index % colors.length]
-                        },
-                        line: {
-                            color: colors[index % colors.length],
-                            width: 2
-                        },
-                        marker: {
-                            size: 8,
-                            color: colors[index % colors.length]
-                        },
-                        hovertemplate: '<b>%{fullData.name}</b><br>' +
-                                       'Category: %{customdata}<br>' +
-                                       'Count: %{y:,.0f}<extra></extra>',
-                        customdata: categories
-                    });
-                });
-                
-                var layout = {
-                    xaxis: {
-                        title: 'Category',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        type: 'category'
-                    },
-                    yaxis: {
-                        title: 'Count',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        tickmode: 'linear',
-                        tickformat: ',.0f', // Expanded thousands format (1,000, 2,000, etc.) - same as denials comparison
-                        dtick: 1000, // Tick every 1000
-                        showticklabels: true, // Show y-axis values
-                        showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)',
-                        gridwidth: 1
-                    },
-                    xaxis: {
-                        showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)',
-                        gridwidth: 1
-                    },
-                    height: 600,
-                    width: null, // Auto width to fill container
-                    autosize: true,
-                    margin: { l: 80, r: 200, t: 50, b: 60 },
-                    showlegend: true,
-                    legend: {
-                        x: 1.05,
-                        y: 1,
-                        xanchor: 'left',
-                        yanchor: 'top',
-                        font: {
-                            size: 12,
-                            color: '#1e3a5f',
-                            family: 'Arial, sans-serif'
-                        }
-                    },
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: {
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 12
-                    }
-                };
-                
-                Plotly.newPlot('chart', traces, layout, {responsive: true});
-            }
-            
-            function renderMonthlyUserComparisonChart(data) {
-                var chartDiv = document.getElementById('chart');
-                
-                if (typeof Plotly === 'undefined') {
-                    chartDiv.innerHTML = '<p style="color: red;">Plotly library not loaded. Please refresh the page.</p>';
-                    return;
-                }
-                
-                // Clear loading message
-                chartDiv.innerHTML = '';
-                
-                var categories = data.categories || [];
-                var periods = data.labels || [];
-                var periodData = data.data || {};
-                
-                if (categories.length === 0 || periods.length === 0) {
-                    chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for monthly comparison.</p>';
-                    return;
-                }
-                
-                // Create abbreviated category names (first letter of each word) - same as denials comparison
-                function getAbbreviation(categoryName) {
-                    return categoryName.split(' ').map(function(word) {
-                        return word.charAt(0).toUpperCase();
-                    }).join('');
-                }
-                
-                var abbreviatedCategories = categories.map(getAbbreviation);
-                
-                // Convert counts from thousands to actual numbers for display (same format as denials comparison)
-                var expandedPeriodData = {};
-                periods.forEach(function(period) {
-                    var counts = periodData[period] || [];
-                    expandedPeriodData[period] = counts.map(function(count) {
-                        return count * 1000; // Convert back from thousands
-                    });
-                });
-                
-                // Create traces for each period
-                var traces = [];
-                var colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'];
-                
-                periods.forEach(function(period, index) {
-                    var counts = expandedPeriodData[period] || [];
-                    // Create text labels for count values on top of data points
-                    var textLabels = counts.map(function(count) {
-                        return count > 0 ? Math.round(count).toLocaleString() : '';
-                    });
-                    
-                    traces.push({
-                        x: abbreviatedCategories,
-                        y: counts,
-                        type: 'scatter',
-                        mode: 'lines+markers+text',
-                        name: period,
-                        text: textLabels,
-                        textposition: 'top',
-                        textfont: {
-                            size: 10,
-                            color: colors[index % colors.length]
-                        },
-                        line: {
-                            color: colors[index % colors.length],
-                            width: 2
-                        },
-                        marker: {
-                            size: 8,
-                            color: colors[index % colors.length]
-                        },
-                        hovertemplate: '<b>%{fullData.name}</b><br>' +
-                                       'Category: %{customdata}<br>' +
-                                       'Count: %{y:,.0f}<extra></extra>',
-                        customdata: categories
-                    });
-                });
-                
-                var layout = {
-                    xaxis: {
-                        title: 'Category',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        type: 'category'
-                    },
-                    yaxis: {
-                        title: 'Count',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        tickmode: 'linear',
-                        tickformat: ',.0f', // Expanded thousands format (1,000, 2,000, etc.) - same as denials comparison
-                        dtick: 1000, // Tick every 1000
-                        showticklabels: true, // Show y-axis values
-                        showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)',
-                        gridwidth: 1
-                    },
-                    xaxis: {
-                        showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)',
-                        gridwidth: 1
-                    },
-                    height: 600,
-                    width: null, // Auto width to fill container
-                    autosize: true,
-                    margin: { l: 80, r: 200, t: 50, b: 60 },
-                    showlegend: true,
-                    legend: {
-                        x: 1.05,
-                        y: 1,
-                        xanchor: 'left',
-                        yanchor: 'top',
-                        font: {
-                            size: 12,
-                            color: '#1e3a5f',
-                            family: 'Arial, sans-serif'
-                        }
-                    },
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: {
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 12
-                    }
-                };
-                
-                Plotly.newPlot('chart', traces, layout, {responsive: true});
-            }
-            
-            function renderDenialsBiweeklyComparisonChart(data) {
-                var chartDiv = document.getElementById('chart');
-                
-                if (typeof Plotly === 'undefined') {
-                    chartDiv.innerHTML = '<p style="color: red;">Plotly library not loaded. Please refresh the page.</p>';
-                    return;
-                }
-                
-                // Clear loading message
-                chartDiv.innerHTML = '';
-                
-                var categories = data.categories || [];
-                var periods = data.labels || [];
-                var periodData = data.data || {};
-                
-                if (categories.length === 0 || periods.length === 0) {
-                    chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for biweekly comparison.</p>';
-                    return;
-                }
-                
-                // Create abbreviated category names (first letter of each word)
-                function getAbbreviation(categoryName) {
-                    return categoryName.split(' ').map(function(word) {
-                        return word.charAt(0).toUpperCase();
-                    }).join('');
-                }
-                
-                var abbreviatedCategories = categories.map(getAbbreviation);
-                
-                // Convert counts from thousands to actual numbers for display
-                var expandedPeriodData = {};
-                periods.forEach(function(period) {
-                    var counts = periodData[period] || [];
-                    expandedPeriodData[period] = counts.map(function(count) {
-                        return count * 1000; // Convert back from thousands
-                    });
-                });
-                
-                // Create traces for each period
-                var traces = [];
-                var colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'];
-                
-                periods.forEach(function(period, index) {
-                    var counts = expandedPeriodData[period] || [];
-                    // Create text labels for count values on top of data points
-                    var textLabels = counts.map(function(count) {
-                        return count > 0 ? Math.round(count).toLocaleString() : '';
-                    });
-                    
-                    traces.push({
-                        x: abbreviatedCategories,
-                        y: counts,
-                        type: 'scatter',
-                        mode: 'lines+markers+text',
-                        name: period,
-                        text: textLabels,
-                        textposition: 'top',
-                        textfont: {
-                            size: 10,
-                            color: colors[index % colors.length]
-                        },
-                        line: {
-                            color: colors[index % colors.length],
-                            width: 2
-                        },
-                        marker: {
-                            size: 8,
-                            color: colors[index % colors.length]
-                        },
-                        hovertemplate: '<b>%{fullData.name}</b><br>' +
-                                       'Category: %{customdata}<br>' +
-                                       'Count: %{y:,.0f}<extra></extra>',
-                        customdata: categories
-                    });
-                });
-                
-                var layout = {
-                    xaxis: {
-                        title: 'Category',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        type: 'category'
-                    },
-                    yaxis: {
-                        title: 'Count',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        tickmode: 'linear',
-                        tickformat: ',.0f',
-                        dtick: 1000,
-                        showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)'
-                    },
-                    height: 600,
-                    width: null,
-                    autosize: true,
-                    margin: { l: 80, r: 200, t: 50, b: 60 },
-                    showlegend: true,
-                    legend: {
-                        x: 1.05,
-                        y: 1,
-                        xanchor: 'left',
-                        yanchor: 'top',
-                        font: {
-                            size: 12,
-                            color: '#1e3a5f',
-                            family: 'Arial, sans-serif'
-                        }
-                    },
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: {
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 12
-                    }
-                };
-                
-                Plotly.newPlot('chart', traces, layout, {responsive: true});
-            }
-            
-            function renderDenialsMonthlyComparisonChart(data) {
-                var chartDiv = document.getElementById('chart');
-                
-                if (typeof Plotly === 'undefined') {
-                    chartDiv.innerHTML = '<p style="color: red;">Plotly library not loaded. Please refresh the page.</p>';
-                    return;
-                }
-                
-                // Clear loading message
-                chartDiv.innerHTML = '';
-                
-                var categories = data.categories || [];
-                var periods = data.labels || [];
-                var periodData = data.data || {};
-                
-                if (categories.length === 0 || periods.length === 0) {
-                    chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for monthly comparison.</p>';
-                    return;
-                }
-                
-                // Create abbreviated category names (first letter of each word)
-                function getAbbreviation(categoryName) {
-                    return categoryName.split(' ').map(function(word) {
-                        return word.charAt(0).toUpperCase();
-                    }).join('');
-                }
-                
-                var abbreviatedCategories = categories.map(getAbbreviation);
-                
-                // Convert counts from thousands to actual numbers for display
-                var expandedPeriodData = {};
-                periods.forEach(function(period) {
-                    var counts = periodData[period] || [];
-                    expandedPeriodData[period] = counts.map(function(count) {
-                        return count * 1000; // Convert back from thousands
-                    });
-                });
-                
-                // Create traces for each period
-                var traces = [];
-                var colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'];
-                
-                periods.forEach(function(period, index) {
-                    var counts = expandedPeriodData[period] || [];
-                    // Create text labels for count values on top of data points
-                    var textLabels = counts.map(function(count) {
-                        return count > 0 ? Math.round(count).toLocaleString() : '';
-                    });
-                    
-                    traces.push({
-                        x: abbreviatedCategories,
-                        y: counts,
-                        type: 'scatter',
-                        mode: 'lines+markers+text',
-                        name: period,
-                        text: textLabels,
-                        textposition: 'top',
-                        textfont: {
-                            size: 10,
-                            color: colors[index % colors.length]
-                        },
-                        line: {
-                            color: colors[index % colors.length],
-                            width: 2
-                        },
-                        marker: {
-                            size: 8,
-                            color: colors[index % colors.length]
-                        },
-                        hovertemplate: '<b>%{fullData.name}</b><br>' +
-                                       'Category: %{customdata}<br>' +
-                                       'Count: %{y:,.0f}<extra></extra>',
-                        customdata: categories
-                    });
-                });
-                
-                var layout = {
-                    xaxis: {
-                        title: 'Category',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        type: 'category'
-                    },
-                    yaxis: {
-                        title: 'Count',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        tickmode: 'linear',
-                        tickformat: ',.0f',
-                        dtick: 1000,
-                        showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)'
-                    },
-                    height: 600,
-                    width: null,
-                    autosize: true,
-                    margin: { l: 80, r: 200, t: 50, b: 60 },
-                    showlegend: true,
-                    legend: {
-                        x: 1.05,
-                        y: 1,
-                        xanchor: 'left',
-                        yanchor: 'top',
-                        font: {
-                            size: 12,
-                            color: '#1e3a5f',
-                            family: 'Arial, sans-serif'
-                        }
-                    },
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: {
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 12
-                    }
-                };
-                
-                Plotly.newPlot('chart', traces, layout, {responsive: true});
-            }
-            
-            function loadClarificationGrouping() {
-                // Remove active class from all submenu items and menu headers
-                var items = document.querySelectorAll('.submenu-item, .menu-header');
-                items.forEach(item => item.classList.remove('active'));
-                // Add active class to clicked item
-                event.target.classList.add('active');
-                
-                // Hide placeholder and show chart container
-                document.getElementById('placeholder').style.display = 'none';
-                var chartContainer = document.getElementById('chart-container');
-                chartContainer.classList.add('active');
-                
-                // Show loading spinner
-                chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading clarification grouping data...</p></div>';
-                
-                // Fetch clarification grouping data
-                fetch('/clarification-grouping-data')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.error) {
-                            chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
-                        } else {
-                            renderClarificationChart(data);
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error loading clarification grouping:', error);
-                        chartContainer.innerHTML = '<p style="color: red;">Error loading clarification grouping data</p>';
-                    });
-            }
-            
-            
-            function renderChart(data) {
-                var chartContainer = document.getElementById('chart-container');
-                
-                // Wait for Plotly to be available
-                if (typeof Plotly === 'undefined') {
-                    setTimeout(function() {
-                        renderChart(data);
-                    }, 100);
-                    return;
-                }
-                
-                // Determine if this is for denials or rejections based on the active menu item
-                var activeItem = document.querySelector('.submenu-item.active');
-                var isRejection = activeItem && activeItem.textContent.trim() === 'Rejection';
-                var chartTitle = isRejection ? 'Rejections Category Pie Chart' : 'Denials Category Pie Chart';
-                var chartSubtitle = isRejection ? 'Click on a slice to view related rejection details' : 'Click on a slice to view related denial details';
-                
-                // Clear previous content and create chart HTML structure
-                chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">' + chartTitle + '</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">' + chartSubtitle + '</p></div><div id="chart"></div><div id="popup"><div id="popup-header"><h3 id="popup-title"></h3><div id="popup-buttons"><button id="download">Download Excel</button><button id="close">Close</button></div></div><div id="popup-content"></div></div>';
-                
-                // Extract data
-                var categories = data.categories;
-                var counts = data.counts;
-                var labelsWithCounts = data.labels_with_counts;
-                var tableData = data.table_data;
-                
-                // Create chart data with distinct vibrant colors
-                // Map specific colors to classifications
-                var colorMap = {
-                    "Inactive or Wrong policy Information": "#dd7e6b",
-                    "Medicare paid more than Medicaid": "#f9cb9c",
-                    "Incorrect/Invalid DOS": "#ffe599",
-                    "TFL/Appeal time limit expired or not allowed": "#e1cfca",
-                    "Missing or Invalid ICD/CPT code/Modifier/POS": "#a2c4c9",
-                    "Provider enrollment issue": "#a4c2f4",
-                    "Out of network": "#b4a7d6",
-                    "Need additional information needed": "#d5a6bd",
-                    "Non covered service": "#ea9999",
-                    "Incorrect Billing": "#dbe098",
-                    "Bundled service": "#bcc07b",
-                    "Other": "#808080"
-                };
-                
-                // Create color array based on classification order
-                var vibrantColors = categories.map(function(cat) {
-                    return colorMap[cat.trim()] || '#808080'; // Default gray if classification not in map
-                });
-                
-                var chartData = [{
-                    type: "pie",
-                    labels: labelsWithCounts,  // These labels (with counts) will appear in the legend
-                    values: counts,
-                    textinfo: "label+percent",
-                    hoverinfo: "label+value",
-                    textposition: "outside",
-                    automargin: true,
-                    marker: { 
-                        colors: vibrantColors,
-                        line: { color: "#ffffff", width: 2 }
-                    },
-                    domain: { x: [0, 0.6], y: [0.3, 1] },
-                    name: ""  // Empty name so legend shows the labels directly
-                }];
-                
-                // Create layout with dark blue formal theme
-                var layout = {
-                    height: 700,
-                    width: 1300,
-                    margin: { l: 0, r: 0, t: 80, b: 0 },
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: { 
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 14
-                    },
-                    showlegend: true,
-                    legend: {
-                        x: 0.75,
-                        y: 1,
-                        xanchor: "left",
-                        yanchor: "top",
-                        font: { 
-                            size: 16,
-                            color: '#1e3a5f',
-                            family: 'Arial, sans-serif'
-                        },
-                        traceorder: "normal",
-                        bgcolor: 'rgba(255,255,255,0.8)',
-                        bordercolor: '#2c5282',
-                        borderwidth: 1
-                    }
-                };
-                
-                // Render the chart
-                Plotly.newPlot("chart", chartData, layout);
-                
-                // Setup popup functionality
-                var popup = document.getElementById("popup");
-                var popupContent = document.getElementById("popup-content");
-                var popupTitle = document.getElementById("popup-title");
-                var closeBtn = document.getElementById("close");
-                var downloadBtn = document.getElementById("download");
-                var currentCategory = "";
-                
-                // Function to download table as Excel
-                function downloadTableAsExcel() {
-    var table = popupContent.querySelector('table');
-    if (!table) {
-        alert('No table found to download');
-        return;
-    }
+        <script src="{{COLUMNAR_JS}}"></script>
+        <script src="{{DASHBOARD_JS}}" data-plotly="{{PLOTLY_JS}}" data-xlsx="{{XLSX_JS}}" data-columnar="{{COLUMNAR_JS}}" data-excel-worker="{{EXCEL_WORKER_JS}}" data-export-max-rows="{{EXPORT_MAX_ROWS}}" data-dataset-owner="{{DATASET_OWNER}}"></script>
+    </body>
+    </html>
+    """
+    html = html.replace("{{DASHBOARD_CSS}}", asset_url("dashboard.css"))
+    html = html.replace("{{DASHBOARD_JS}}", asset_url("dashboard.js"))
+    html = html.replace("{{PLOTLY_JS}}", vendor_url("plotly"))
+    html = html.replace("{{XLSX_JS}}", vendor_url("xlsx"))
+    html = html.replace("{{COLUMNAR_JS}}", asset_url("columnar.js"))
+    html = html.replace("{{EXCEL_WORKER_JS}}", asset_url("excel-worker.js"))
+    html = html.replace("{{EXPORT_MAX_ROWS}}", str(EXPORT_WORKER_MAX_ROWS))
+    # Persisted datasets are stamped with this so the next analyst on a shared browser cannot read them
+    owner = hashlib.sha256(str(request.session.get("username", "")).encode("utf-8")).hexdigest()[:16]
+    html = html.replace("{{DATASET_OWNER}}", owner)
+    # The document itself stays revalidated so a deploy's new asset URLs are seen
+    return HTMLResponse(content=html, headers={"Cache-Control": "no-cache"})
 
-    var wb = XLSX.utils.book_new();
-    var ws = XLSX.utils.table_to_sheet(table);
 
-    // Convert ALL numbers and dates to strings, and left-align everything
-    var range = XLSX.utils.decode_range(ws['!ref']);
+@app.get("/data-version")
+def data_version_endpoint(request: Request):
+    """Current data version; the dashboard compares it with its persisted datasets."""
+    if not request.session.get("authenticated"):
+        return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
+    try:
+        return JSONResponse(content={"version": data_version()}, headers={"Cache-Control": "no-store"})
+    except Exception as e:
+        import traceback
+        return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
 
-    // Convert ALL cells to strings and left-align
-    for (var R = 0; R <= range.e.r; ++R) {
-        for (var C = range.s.c; C <= range.e.c; ++C) {
-            var cellAddress = XLSX.utils.encode_cell({ r: R, c: C });
+@app.get("/cache-stats")
+def cache_stats(request: Request):
+    """Server payload cache and dashboard prefetch counters, with hit rates."""
+    if not request.session.get("authenticated"):
+        return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
+    with _cache_stats_lock:
+        stats = dict(_cache_stats)
+    lookups = stats["payload_hits"] + stats["payload_misses"]
+    prefetches = stats["prefetch_served"] + stats["prefetch_deferred"]
+    stats["payload_hit_rate"] = stats["payload_hits"] / lookups if lookups else None
+    stats["prefetch_served_rate"] = stats["prefetch_served"] / prefetches if prefetches else None
+    stats["client_prefetch_hit_rate"] = (
+        stats["client_prefetch_hits"] / stats["client_prefetch_issued"] if stats["client_prefetch_issued"] else None
+    )
+    return JSONResponse(content=stats)
 
-            if (!ws[cellAddress]) {
-                ws[cellAddress] = {};
-            }
+@app.post("/cache-stats")
+async def report_cache_stats(request: Request):
+    """Accumulate prefetch counters sent by the dashboard when a page is hidden."""
+    if not request.session.get("authenticated"):
+        return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
+    try:
+        report = json.loads(await request.body())
+        issued = max(0, int(report.get("prefetch_issued", 0)))
+        hits = max(0, min(int(report.get("prefetch_hits", 0)), issued))
+    except (ValueError, TypeError, AttributeError):
+        return JSONResponse(content={"error": "Invalid cache stats report."}, status_code=400)
+    count_cache_event("client_prefetch_issued", issued)
+    count_cache_event("client_prefetch_hits", hits)
+    return Response(status_code=204)
 
-            var cell = ws[cellAddress];
+@app.get("/metrics")
+def metrics_endpoint(request: Request):
+    """Prometheus metrics for scrapers with "Authorization: Bearer $METRICS_TOKEN", or for admins."""
+    authorization = request.headers.get("authorization") or ""
+    token_ok = bool(METRICS_TOKEN) and hmac.compare_digest(authorization.encode(), f"Bearer {METRICS_TOKEN}".encode())
+    if not token_ok and not is_admin(request):
+        return Response(status_code=401)
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
-            if (cell && cell.v !== null && cell.v !== undefined) {
+@app.post("/denials/upload")
+def denials_upload(request: Request, file: UploadFile = File(...)):
+    """Insert the denials in an uploaded CSV or XLSX file. Admins only."""
+    denied = admin_error_response(request)
+    if denied is not None:
+        return denied
+    try:
+        result = ingest_denials(file.file, file.filename)
+    except ValueError as exc:
+        return JSONResponse(content={"error": str(exc)}, status_code=400)
+    except Exception as exc:
+        import traceback
+        return JSONResponse(content={"error": str(exc), "traceback": traceback.format_exc()}, status_code=500)
+    return JSONResponse(content=result)
 
-                // ✅ DATE FIX
-                if (typeof cell.v === 'number' && cell.z && cell.z.toLowerCase().includes('d')) {
-                    var d = XLSX.SSF.parse_date_code(cell.v);
-                    cell.v =
-                        String(d.m).padStart(2, '0') + '/' +
-                        String(d.d).padStart(2, '0') + '/' +
-                        d.y;
-                } else {
-                    cell.v = String(cell.v);
-                }
+@app.post("/users/import")
+async def users_import(request: Request, file: UploadFile = File(...)):
+    """Create the accounts in an uploaded username,password CSV. Admins only."""
+    denied = admin_error_response(request)
+    if denied is not None:
+        return denied
+    try:
+        accounts = read_user_import(await file.read(), max_rows=USER_IMPORT_MAX_ROWS)
+    except (ValueError, pd.errors.ParserError) as exc:
+        return JSONResponse(content={"error": str(exc)}, status_code=400)
+    try:
+        result = await asyncio.to_thread(import_users, accounts)
+    except Exception as exc:
+        import traceback
+        return JSONResponse(content={"error": str(exc), "traceback": traceback.format_exc()}, status_code=500)
+    return JSONResponse(content=result)
 
-                cell.t = 's'; // string type
-                if (cell.z) delete cell.z;
-            }
+@app.get("/slow-queries")
+def slow_queries(request: Request, limit: int = 20, sort: str = "total_ms"):
+    """Slowest statements by fingerprint, with their last EXPLAIN plan. Admins only."""
+    denied = admin_error_response(request)
+    if denied is not None:
+        return denied
+    if sort not in ("total_ms", "max_ms", "count"):
+        return JSONResponse(content={"error": "sort must be total_ms, max_ms or count"}, status_code=400)
+    with _slow_queries_lock:
+        entries = [dict(entry) for entry in _slow_queries.values()]
+    entries.sort(key=lambda entry: entry[sort], reverse=True)
+    return JSONResponse(content=json.loads(json.dumps({
+        "threshold_ms": SLOW_QUERY_THRESHOLD_MS,
+        "queries": entries[:max(0, limit)],
+    }, default=str)))
 
-            // Initialize style for left alignment
-            if (!cell.s) cell.s = {};
-            if (!cell.s.alignment) cell.s.alignment = {};
-            cell.s.alignment.horizontal = 'left';
-            cell.s.alignment.vertical = 'top';
-            cell.s.alignment.wrapText = false;
-        }
-    }
+@app.get("/static/{path:path}")
+def static_asset(request: Request, path: str):
+    """Serve a hashed static asset, gzip-encoded when the client accepts it."""
+    asset = _static_assets.get(path)
+    if asset is None:
+        return Response(status_code=404)
+    use_gzip = asset["gzip"] is not None and "gzip" in request.headers.get("accept-encoding", "")
+    etag = asset["etag"][:-1] + '-gz"' if use_gzip else asset["etag"]
+    headers = {"Cache-Control": STATIC_CACHE_CONTROL, "ETag": etag, "Vary": "Accept-Encoding"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=asset["gzip"], media_type=asset["media_type"], headers=headers)
+    return Response(content=asset["body"], media_type=asset["media_type"], headers=headers)
 
-    if (!ws['!cols']) ws['!cols'] = [];
+@app.get("/logout")
+async def logout(request: Request):
+    """Logout and clear session"""
+    request.session.clear()
+    return RedirectResponse(url="/", status_code=status.HTTP_302_FOUND)
 
-    for (var C = range.s.c; C <= range.e.c; ++C) {
-        var maxWidth = 10;
+@app.post("/logout")
+async def logout_post(request: Request):
+    """Logout and clear session (POST method)"""
+    request.session.clear()
+    return RedirectResponse(url="/", status_code=status.HTTP_302_FOUND)
 
-        var headerCell = XLSX.utils.encode_cell({ r: 0, c: C });
-        if (ws[headerCell] && ws[headerCell].v) {
-            maxWidth = Math.max(maxWidth, String(ws[headerCell].v).length);
-        }
+def get_chart_summary(df):
+    """Pie chart counts per CLASSIFICATION; df must already carry CLASSIFICATION."""
+    # Group by classification for pie chart
+    df_grouped = df.groupby("CLASSIFICATION", as_index=False).size().rename(columns={"size": "count"})
 
-        for (var R = 1; R <= range.e.r; ++R) {
-            var cellAddress = XLSX.utils.encode_cell({ r: R, c: C });
-            if (ws[cellAddress] && ws[cellAddress].v !== null && ws[cellAddress].v !== undefined) {
-                maxWidth = Math.max(maxWidth, String(ws[cellAddress].v).length);
-            }
-        }
+    # Create labels with counts in brackets for legend
+    labels_with_counts = [f"{cat} ({count})" for cat, count in zip(df_grouped["CLASSIFICATION"], df_grouped["count"])]
 
-        ws['!cols'][C] = { wch: maxWidth + 3 };
+    return {
+        "categories": list(df_grouped["CLASSIFICATION"]),
+        "counts": list(df_grouped["count"]),
+        "labels_with_counts": labels_with_counts
     }
 
-    XLSX.utils.book_append_sheet(wb, ws, "Data");
-
-    var filename =
-        currentCategory.replace(/[^a-z0-9]/gi, '_') + '_' +
-        new Date().toISOString().split('T')[0] +
-        '.xlsx';
-
-    XLSX.writeFile(wb, filename);
-}
-
-                
-                document.getElementById("chart").on('plotly_click', function(evt) {
-                    var pointIndex = evt.points[0].pointNumber;
-                    var category = categories[pointIndex];
-                    currentCategory = category;
-                    popupTitle.textContent = category;
-                    
-                    // Show popup with loading spinner
-                    popup.style.display = "block";
-                    popupContent.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading table data...</p></div>';
-                    
-                    // Load table data after a brief delay to show spinner
-                    setTimeout(function() {
-                        popupContent.innerHTML = tableData[category];
-                    }, 300);
-                });
-                
-                closeBtn.onclick = function() {
-                    popup.style.display = "none";
-                };
-                
-                downloadBtn.onclick = function() {
-                    downloadTableAsExcel();
-                };
-            }
-            
-            function renderComparisonChart(data, period) {
-                var chartContainer = document.getElementById('chart-container');
-                
-                // Wait for Plotly to be available
-                if (typeof Plotly === 'undefined') {
-                    setTimeout(function() {
-                        renderComparisonChart(data, period);
-                    }, 100);
-                    return;
-                }
-                
-                // Handle biweekly - now shows data
-                // (no early return, let it process normally)
-                
-                // Get chart div and update title
-                var chartDiv = document.getElementById('chart');
-                var selectorDiv = chartContainer.querySelector('div[style*="text-align"]');
-                    if (selectorDiv) {
-                    // Update title with date
-                    var titleElement = selectorDiv.querySelector('h2');
-                    if (titleElement && data.title) {
-                        titleElement.textContent = data.title;
-                    }
-                }
-                
-                if (!chartDiv) {
-                        chartDiv = document.createElement('div');
-                        chartDiv.id = 'chart';
-                        chartContainer.appendChild(chartDiv);
-                    } else {
-                    chartDiv.innerHTML = '';
-                }
-                
-                // Extract pie chart data
-                var categories = data.categories || [];
-                var counts = data.counts || [];
-                var labelsWithCounts = data.labels_with_counts || [];
-                var tableData = data.table_data || {};
-                
-                // Check if we have data to display
-                if (!categories || categories.length === 0 || !counts || counts.length === 0) {
-                    chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for the selected period.</p>';
-                    return;
-                }
-                
-                // Color mapping for classifications
-                var colorMap = {
-                    "Inactive or Wrong policy Information": "#dd7e6b",
-                    "Medicare paid more than Medicaid": "#f9cb9c",
-                    "Incorrect/Invalid DOS": "#ffe599",
-                    "TFL/Appeal time limit expired or not allowed": "#e1cfca",
-                    "Missing or Invalid ICD/CPT code/Modifier/POS": "#a2c4c9",
-                    "Provider enrollment issue": "#a4c2f4",
-                    "Out of network": "#b4a7d6",
-                    "Need additional information needed": "#d5a6bd",
-                    "Non covered service": "#ea9999",
-                    "Incorrect Billing": "#dbe098",
-                    "Bundled service": "#bcc07b",
-                    "Other": "#808080"
-                };
-                
-                // Create color array based on category order
-                var vibrantColors = categories.map(function(cat) {
-                    if (cat && typeof cat === 'string') {
-                        return colorMap[cat.trim()] || '#808080';
-                    }
-                    return '#808080';
-                });
-                
-                // Create pie chart data
-                var chartData = [{
-                    type: "pie",
-                    labels: labelsWithCounts,
-                    values: counts,
-                    textinfo: "label+percent",
-                    hoverinfo: "label+value",
-                    textposition: "outside",
-                    automargin: true,
-                    marker: { 
-                        colors: vibrantColors,
-                        line: { color: "#ffffff", width: 2 }
-                    },
-                    domain: { x: [0, 0.6], y: [0.3, 1] },
-                    name: ""
-                }];
-                
-                // Create layout
-                var layout = {
-                    height: 700,
-                    width: 1300,
-                    margin: { l: 0, r: 0, t: 80, b: 0 },
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: { 
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 14
-                    },
-                    showlegend: true,
-                    legend: {
-                        x: 0.75,
-                        y: 1,
-                        xanchor: "left",
-                        yanchor: "top",
-                        font: { 
-                            size: 16,
-                            color: '#1e3a5f',
-                            family: 'Arial, sans-serif'
-                        },
-                        traceorder: "normal",
-                        bgcolor: 'rgba(255,255,255,0.8)',
-                        bordercolor: '#2c5282',
-                        borderwidth: 1
-                    }
-                };
-                
-                // Render the chart
-                Plotly.newPlot("chart", chartData, layout);
-                
-                // Setup popup functionality
-                var popup = document.getElementById("popup");
-                var popupContent = document.getElementById("popup-content");
-                var popupTitle = document.getElementById("popup-title");
-                var closeBtn = document.getElementById("close");
-                var downloadBtn = document.getElementById("download");
-                var currentCategory = "";
-                
-                // Function to download table as Excel
-                function downloadTableAsExcel() {
-                    var table = popupContent.querySelector('table');
-                    if (!table) {
-                        alert('No table found to download');
-                        return;
-                    }
-                    
-                    var wb = XLSX.utils.book_new();
-                    var ws = XLSX.utils.table_to_sheet(table);
-                    
-                    // Get header row to identify date columns
-                    var range = XLSX.utils.decode_range(ws['!ref']);
-                    var dateColumnIndices = [];
-                    for (var C = range.s.c; C <= range.e.c; ++C) {
-                        var headerCell = XLSX.utils.encode_cell({r: 0, c: C});
-                        if (ws[headerCell] && ws[headerCell].v) {
-                            var headerText = String(ws[headerCell].v).toLowerCase();
-                            if (headerText === 'dob' || headerText === 'dos' || headerText === 'denial date') {
-                                dateColumnIndices.push(C);
-                            }
-                        }
-                    }
-                    
-                    // Convert ALL numbers and dates to strings, and left-align everything
-                    // Convert ALL cells to strings and left-align
-                    for (var R = 0; R <= range.e.r; ++R) {
-                    for (var C = range.s.c; C <= range.e.c; ++C) {
-                            var cellAddress = XLSX.utils.encode_cell({r: R, c: C});
-                            if (!ws[cellAddress]) {
-                                ws[cellAddress] = {};
-                            }
-                            
-                            var cell = ws[cellAddress];
-                            if (cell && cell.v !== null && cell.v !== undefined) {
-                                // For date columns, ensure mm/dd/yyyy format is preserved
-                                if (dateColumnIndices.indexOf(C) !== -1 && R > 0) {
-                                    // It's a date column data cell
-                                    var dateValue = String(cell.v);
-                                    // If it's already in mm/dd/yyyy format, keep it
-                                    // If it's a date number, convert to mm/dd/yyyy
-                                    if (typeof cell.v === 'number' && cell.z) {
-                                        try {
-                                            var d = XLSX.SSF.parse_date_code(cell.v);
-                                            dateValue = String(d.m).padStart(2, '0') + '/' + String(d.d).padStart(2, '0') + '/' + d.y;
-                                        } catch(e) {
-                                            dateValue = String(cell.v);
-                                        }
-                                    }
-                                    cell.v = dateValue;
-                                } else {
-                                    // Convert everything else to string
-                                    cell.v = String(cell.v);
-                                }
-                                cell.t = 's'; // string type
-                                // Remove any date format
-                                if (cell.z) {
-                                    delete cell.z;
-                                }
-                            }
-                            
-                            // Initialize style for left alignment
-                            if (!cell.s) cell.s = {};
-                            if (!cell.s.alignment) cell.s.alignment = {};
-                            cell.s.alignment.horizontal = 'left';
-                            cell.s.alignment.vertical = 'top';
-                            cell.s.alignment.wrapText = false;
-                        }
-                    }
-                    
-                    if (!ws['!cols']) ws['!cols'] = [];
-                    
-                        for (var C = range.s.c; C <= range.e.c; ++C) {
-                        var maxWidth = 10;
-                        var headerCell = XLSX.utils.encode_cell({r: 0, c: C});
-                        if (ws[headerCell] && ws[headerCell].v) {
-                            maxWidth = Math.max(maxWidth, String(ws[headerCell].v).length);
-                        }
-                        for (var R = 1; R <= range.e.r; ++R) {
-                            var cellAddress = XLSX.utils.encode_cell({r: R, c: C});
-                            if (ws[cellAddress] && ws[cellAddress].v !== null && ws[cellAddress].v !== undefined) {
-                                var cellValue = String(ws[cellAddress].v);
-                                    maxWidth = Math.max(maxWidth, cellValue.length);
-                                }
-                            }
-                        ws['!cols'][C] = { wch: maxWidth + 3 };
-                    }
-                    
-                    XLSX.utils.book_append_sheet(wb, ws, "Data");
-                    var filename = currentCategory.replace(/[^a-z0-9]/gi, '_') + '_' + new Date().toISOString().split('T')[0] + '.xlsx';
-                    XLSX.writeFile(wb, filename);
-                }
-                
-                // Click handler for pie chart slices
-                document.getElementById("chart").on('plotly_click', function(evt) {
-                    var pointIndex = evt.points[0].pointNumber;
-                    var category = categories[pointIndex];
-                    currentCategory = category;
-                    popupTitle.textContent = category;
-                    
-                    // Show popup with loading spinner
-                    popup.style.display = "block";
-                    popupContent.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading table data...</p></div>';
-                    
-                    // Load table data after a brief delay to show spinner
-                    setTimeout(function() {
-                        popupContent.innerHTML = tableData[category] || '<p>No data available for this category</p>';
-                    }, 300);
-                });
-                
-                if (closeBtn) {
-                    closeBtn.onclick = function() {
-                        popup.style.display = "none";
-                    };
-                }
-                
-                if (downloadBtn) {
-                    downloadBtn.onclick = function() {
-                        downloadTableAsExcel();
-                    };
-                }
-            }
-            
-            function renderDenialsComparisonChart(data) {
-                var chartContainer = document.getElementById('chart-container');
-                
-                // Wait for Plotly to be available
-                if (typeof Plotly === 'undefined') {
-                    setTimeout(function() {
-                        renderDenialsComparisonChart(data);
-                    }, 100);
-                    return;
-                }
-                
-                // Check if we have data to display
-                if (!data.categories || data.categories.length === 0) {
-                    var chartDiv = document.getElementById('chart');
-                    if (chartDiv) {
-                        chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for comparison.</p>';
-                    } else {
-                        chartContainer.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for comparison.</p>';
-                    }
-                    return;
-                }
-                
-                // Preserve buttons if they exist
-                var buttonsDiv = chartContainer.querySelector('div[style*="display: flex"]');
-                var headerDiv = chartContainer.querySelector('h2');
-                
-                // Get or create chart div
-                var chartDiv = document.getElementById('chart');
-                if (!chartDiv) {
-                    chartDiv = document.createElement('div');
-                    chartDiv.id = 'chart';
-                    chartContainer.appendChild(chartDiv);
-                }
-                
-                // Create hover tooltip div if it doesn't exist
-                var hoverPopup = document.getElementById('category-popup');
-                if (!hoverPopup) {
-                    hoverPopup = document.createElement('div');
-                    hoverPopup.id = 'category-popup';
-                    hoverPopup.style.cssText = 'display: none; position: fixed; background: white; padding: 15px 20px; border: 1px solid #ccc; border-radius: 5px; box-shadow: 0 2px 8px rgba(0,0,0,0.2); z-index: 10000; pointer-events: none;';
-                    hoverPopup.innerHTML = '<div id="category-full-name" style="color: black; font-size: 14px; font-weight: bold; margin: 0 0 5px 0;"></div><div id="current-month-count" style="color: black; font-size: 14px; margin: 0 0 3px 0;"></div><div id="previous-month-count" style="color: black; font-size: 14px; margin: 0;"></div>';
-                    document.body.appendChild(hoverPopup);
-                }
-                
-                // Clear only the chart div, preserve buttons
-                chartDiv.innerHTML = '';
-                
-                // Extract data
-                var categories = data.categories || [];
-                var currentCounts = data.current_month_counts || [];
-                var previousCounts = data.previous_month_counts || [];
-                var tableData = data.table_data || {};
-                var currentLabel = data.current_month_label || 'Current Month';
-                var previousLabel = data.previous_month_label || 'Previous Month';
-                
-                // Create abbreviated category names (first letter of each word) - same as clarification
-                function getAbbreviation(categoryName) {
-                    return categoryName.split(' ').map(function(word) {
-                        return word.charAt(0).toUpperCase();
-                    }).join('');
-                }
-                
-                var abbreviatedCategories = categories.map(getAbbreviation);
-                
-                // Convert counts from thousands back to actual numbers for display (in expanded 1000s format)
-                var currentCountsExpanded = currentCounts.map(function(count) {
-                    return count * 1000; // Convert back from thousands
-                });
-                var previousCountsExpanded = previousCounts.map(function(count) {
-                    return count * 1000; // Convert back from thousands
-                });
-                
-                // Create text labels for count values on top of data points
-                var currentTextLabels = currentCountsExpanded.map(function(count) {
-                    return count > 0 ? Math.round(count).toLocaleString() : '';
-                });
-                var previousTextLabels = previousCountsExpanded.map(function(count) {
-                    return count > 0 ? Math.round(count).toLocaleString() : '';
-                });
-                
-                // Create traces for line chart with text labels
-                var trace1 = {
-                    x: abbreviatedCategories,
-                    y: currentCountsExpanded,
-                    type: 'scatter',
-                    mode: 'lines+markers+text',
-                    name: currentLabel,
-                    text: currentTextLabels,
-                    textposition: 'top',
-                    textfont: {
-                        size: 10,
-                        color: '#FF0000'
-                    },
-                    line: {
-                        color: '#FF0000', // Red for current month
-                        width: 2
-                    },
-                    marker: {
-                        size: 8,
-                        color: '#FF0000'
-                    },
-                    hovertemplate: '<b>%{fullData.name}</b><br>' +
-                                   'Category: %{customdata}<br>' +
-                                   'Count: %{y:,.0f}<extra></extra>',
-                    customdata: categories
-                };
-                
-                var trace2 = {
-                    x: abbreviatedCategories,
-                    y: previousCountsExpanded,
-                    type: 'scatter',
-                    mode: 'lines+markers+text',
-                    name: previousLabel,
-                    text: previousTextLabels,
-                    textposition: 'top',
-                    textfont: {
-                        size: 10,
-                        color: '#0000FF'
-                    },
-                    line: {
-                        color: '#0000FF', // Blue for previous month
-                        width: 2
-                    },
-                    marker: {
-                        size: 8,
-                        color: '#0000FF'
-                    },
-                    hovertemplate: '<b>%{fullData.name}</b><br>' +
-                                   'Category: %{customdata}<br>' +
-                                   'Count: %{y:,.0f}<extra></extra>',
-                    customdata: categories
-                };
-                
-                var layout = {
-                    xaxis: {
-                        title: 'Category',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        type: 'category'
-                    },
-                    yaxis: {
-                        title: 'Count',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        tickmode: 'linear',
-                        tickformat: ',.0f', // Expanded thousands format (1,000, 2,000, etc.)
-                        dtick: 1000, // Tick every 1000
-                        showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)'
-                    },
-                    height: 600,
-                    width: null, // Auto width to fill container
-                    autosize: true,
-                    margin: { l: 80, r: 200, t: 50, b: 60 },
-                    showlegend: true,
-                    legend: {
-                        x: 1.05,
-                        y: 1,
-                        xanchor: 'left',
-                        yanchor: 'top',
-                        font: {
-                            size: 12,
-                            color: '#1e3a5f',
-                            family: 'Arial, sans-serif'
-                        }
-                    },
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: {
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 12
-                    }
-                };
-                
-                // Render the line chart
-                Plotly.newPlot("chart", [trace1, trace2], layout, {responsive: true});
-                
-                // Setup hover tooltip for points
-                setTimeout(function() {
-                    var chartDiv = document.getElementById('chart');
-                    var hoverPopup = document.getElementById('category-popup');
-                    var popupName = document.getElementById('category-full-name');
-                    var popupCount = document.getElementById('category-count');
-                    
-                    if (chartDiv && hoverPopup && popupName) {
-                        var currentMonthCountDiv = document.getElementById('current-month-count');
-                        var previousMonthCountDiv = document.getElementById('previous-month-count');
-                        
-                        // Listen for hover events on the chart
-                        chartDiv.on('plotly_hover', function(hoverData) {
-                            if (hoverData && hoverData.points && hoverData.points.length > 0) {
-                                var point = hoverData.points[0];
-                                var pointIndex = point.pointNumber;
-                                
-                                if (pointIndex >= 0 && pointIndex < categories.length) {
-                                    var fullCategoryName = categories[pointIndex];
-                                    
-                                    // Get counts for both months for this category
-                                    var currentCount = currentCountsExpanded[pointIndex] || 0;
-                                    var previousCount = previousCountsExpanded[pointIndex] || 0;
-                                    
-                                    // Update popup content
-                                    popupName.textContent = fullCategoryName;
-                                    currentMonthCountDiv.textContent = currentLabel + ' - ' + Math.round(currentCount).toLocaleString();
-                                    previousMonthCountDiv.textContent = previousLabel + ' - ' + Math.round(previousCount).toLocaleString();
-                                    
-                                    // Position popup near cursor
-                                    if (hoverData.event) {
-                                        var x = hoverData.event.clientX;
-                                        var y = hoverData.event.clientY;
-                                        hoverPopup.style.left = (x + 10) + 'px';
-                                        hoverPopup.style.top = (y - 10) + 'px';
-                                    }
-                                    hoverPopup.style.display = 'block';
-                                }
-                            }
-                        });
-                        
-                        // Hide popup when mouse leaves
-                        chartDiv.on('plotly_unhover', function() {
-                            if (hoverPopup) {
-                                hoverPopup.style.display = 'none';
-                            }
-                        });
-                    }
-                }, 500);
-            }
-            
-            function renderEmailComparisonChart(data, type) {
-                var chartContainer = document.getElementById('chart-container');
-                
-                // Wait for Plotly to be available
-                if (typeof Plotly === 'undefined') {
-                    setTimeout(function() {
-                        renderEmailComparisonChart(data, type);
-                    }, 100);
-                    return;
-                }
-                
-                // Capitalize first letter of type
-                var typeLabel = type.charAt(0).toUpperCase() + type.slice(1);
-                
-                // Clear previous content and create chart HTML structure
-                chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">Email Comparison - ' + typeLabel + '</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">Showing total ' + type + ' email counts</p></div><div id="chart"></div>';
-                
-                // Extract data and calculate total counts for each category
-                var categories = ['A', 'B', 'C', 'D', 'E'];
-                
-                // Calculate total count for each category (sum across all periods)
-                var categoryCounts = categories.map(function(cat) {
-                    var values = data[cat] || [];
-                    return values.reduce(function(sum, val) { return sum + (parseInt(val) || 0); }, 0);
-                });
-                
-                // Color mapping for categories
-                var colorMap = {
-                    'A': '#FF0000', // Bright Red
-                    'B': '#1e3a5f', // Dark Blue
-                    'C': '#FF8000', // Orange
-                    'D': '#FFFF00', // Yellow
-                    'E': '#006400', // Dark Green
-                };
-                
-                // Create bar chart trace
-                var trace = {
-                    x: categories,
-                    y: categoryCounts,
-                    type: 'bar',
-                    marker: {
-                        color: categories.map(function(cat) { return colorMap[cat]; }),
-                        line: {
-                            color: '#ffffff',
-                            width: 1
-                        }
-                    },
-                    text: categoryCounts,
-                    textposition: 'outside',
-                    textfont: {
-                        size: 12,
-                        color: '#1e3a5f'
-                    }
-                };
-                
-                var layout = {
-                        xaxis: {
-                        title: 'Category',
-                            titlefont: {
-                                size: 14,
-                                color: '#1e3a5f'
-                            },
-                            tickfont: {
-                                size: 12,
-                                color: '#1e3a5f'
-                            },
-                        type: 'category'
-                        },
-                        yaxis: {
-                            title: 'Count',
-                            titlefont: {
-                                size: 14,
-                                color: '#1e3a5f'
-                            },
-                            tickfont: {
-                                size: 12,
-                                color: '#1e3a5f'
-                            },
-                            tickmode: 'linear',
-                            tickformat: 'd',
-                        dtick: 10,
-                            showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)'
-                        },
-                        height: 600,
-                        width: 1000,
-                        margin: { l: 80, r: 40, t: 20, b: 60 },
-                    showlegend: false,
-                        paper_bgcolor: 'rgba(0,0,0,0)',
-                        plot_bgcolor: 'rgba(0,0,0,0)',
-                        font: {
-                            family: 'Arial, sans-serif',
-                            color: '#1e3a5f',
-                            size: 12
-                        }
-                    };
-                
-                // Render the bar chart
-                Plotly.newPlot("chart", [trace], layout);
-            }
-            
-            /*
-            // COMMENTED OUT - Original clarification chart render functions
-            function renderClarificationByAgingChart(data) {
-                var chartContainer = document.getElementById('chart-container');
-                
-                // Wait for Plotly to be available
-                if (typeof Plotly === 'undefined') {
-                    setTimeout(function() {
-                        renderClarificationByAgingChart(data);
-                    }, 100);
-                    return;
-                }
-                
-                // Clear previous content and create chart HTML structure
-                chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">Clarification type by Aging</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">Showing counts by category across time periods</p></div><div id="chart"></div>';
-                
-                // Extract data
-                var categories = data.categories || [];
-                var timePeriods = data.time_periods || ['0-6m', '6m-1y', '1-1.5y', '>1.5y'];
-                    var seriesData = data.series || {};
-                    
-                // Color palette for categories
-                var colors = ['#dd7e6b', '#f9cb9c', '#ffe599', '#b6d7a8', '#a2c4c9', '#a4c2f4', '#b4a7d6', '#d5a6bd', '#ea9999', '#808080'];
-                
-                // Create traces for each category
-                var traces = categories.map(function(cat, idx) {
-                    return {
-                        x: timePeriods,
-                        y: (seriesData[cat] || []).map(function(val) { return (val || 0) / 1000; }), // Convert to thousands
-                            type: 'scatter',
-                            mode: 'lines+markers',
-                        name: cat,
-                            line: {
-                            width: 2,
-                            color: colors[idx % colors.length]
-                            },
-                            marker: {
-                                size: 8,
-                            color: colors[idx % colors.length]
-                            }
-                    };
-                    });
-                    
-                var layout = {
-                        xaxis: {
-                        title: 'Time Period',
-                            titlefont: {
-                                size: 14,
-                                color: '#1e3a5f'
-                            },
-                            tickfont: {
-                                size: 12,
-                                color: '#1e3a5f'
-                            },
-                        type: 'category'
-                        },
-                        yaxis: {
-                        title: 'Count (in thousands)',
-                            titlefont: {
-                                size: 14,
-                                color: '#1e3a5f'
-                            },
-                            tickfont: {
-                                size: 12,
-                                color: '#1e3a5f'
-                            },
-                            tickmode: 'linear',
-                        tickformat: ',.1f',
-                            showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)'
-                        },
-                        height: 600,
-                        width: 1000,
-                        margin: { l: 80, r: 40, t: 20, b: 60 },
-                        showlegend: true,
-                        legend: {
-                            x: 1.05,
-                            y: 1,
-                            xanchor: 'left',
-                            yanchor: 'top',
-                            font: {
-                                size: 12,
-                                color: '#1e3a5f'
-                            }
-                        },
-                        paper_bgcolor: 'rgba(0,0,0,0)',
-                        plot_bgcolor: 'rgba(0,0,0,0)',
-                        font: {
-                            family: 'Arial, sans-serif',
-                            color: '#1e3a5f',
-                            size: 12
-                        }
-                    };
-                
-                // Render the line chart
-                Plotly.newPlot("chart", traces, layout);
-            }
-            */
-            
-            function renderClarificationTypeChart(data) {
-                var chartContainer = document.getElementById('chart-container');
-                
-                // Wait for Plotly to be available
-                if (typeof Plotly === 'undefined') {
-                    setTimeout(function() {
-                        renderClarificationTypeChart(data);
-                    }, 100);
-                    return;
-                }
-                
-                // Clear previous content and create chart HTML structure with hover tooltip
-                chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">Clarification Type</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">Showing counts by category</p></div><div id="chart"></div><div id="category-popup" style="display: none; position: fixed; background: white; padding: 15px 20px; border: 1px solid #ccc; border-radius: 5px; box-shadow: 0 2px 8px rgba(0,0,0,0.2); z-index: 10000; pointer-events: none;"><div id="category-full-name" style="color: black; font-size: 14px; font-weight: bold; margin: 0 0 5px 0;"></div><div id="category-count" style="color: black; font-size: 14px; margin: 0;"></div></div>';
-                
-                // Extract data (same structure as clarification grouping)
-                var categories = data.categories || [];
-                var counts = data.counts || [];
-                
-                // Create abbreviated category names (first letter of each word) - same as clarification grouping
-                function getAbbreviation(categoryName) {
-                    return categoryName.split(' ').map(function(word) {
-                        return word.charAt(0).toUpperCase();
-                    }).join('');
-                }
-                
-                var abbreviatedCategories = categories.map(getAbbreviation);
-                
-                // Create mapping for legend (abbreviation -> full name)
-                var categoryMapping = {};
-                categories.forEach(function(cat, index) {
-                    categoryMapping[abbreviatedCategories[index]] = cat;
-                });
-                
-                // Create bar chart trace (bar chart instead of line chart since no time ranges)
-                var trace = {
-                    x: abbreviatedCategories,
-                    y: counts,
-                    type: 'bar',
-                    marker: {
-                        color: '#1e3a5f',
-                        line: {
-                            color: '#ffffff',
-                            width: 1
-                        }
-                    },
-                    text: counts,
-                    textposition: 'outside',
-                    textfont: {
-                        size: 12,
-                        color: '#1e3a5f'
-                    },
-                    hoverinfo: 'none'
-                };
-                
-                var layout = {
-                    xaxis: {
-                        title: 'Category',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        type: 'category'
-                    },
-                    yaxis: {
-                        title: 'Count',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        tickmode: 'linear',
-                        tickformat: ',.0f',
-                        dtick: 1000,
-                        showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)'
-                    },
-                    height: 600,
-                    width: 1000,
-                    margin: { l: 80, r: 40, t: 20, b: 60 },
-                    showlegend: false,
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: {
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 12
-                    }
-                };
-                
-                // Render the bar chart
-                Plotly.newPlot("chart", [trace], layout);
-                
-                // Setup hover tooltip for bars
-                setTimeout(function() {
-                    var chartDiv = document.getElementById('chart');
-                    var popup = document.getElementById('category-popup');
-                    var popupName = document.getElementById('category-full-name');
-                    var popupCount = document.getElementById('category-count');
-                    
-                    if (chartDiv && popup && popupName && popupCount) {
-                        // Listen for hover events on the chart
-                        chartDiv.on('plotly_hover', function(hoverData) {
-                            if (hoverData && hoverData.points && hoverData.points.length > 0) {
-                                var point = hoverData.points[0];
-                                var pointIndex = point.pointNumber;
-                                if (pointIndex >= 0 && pointIndex < categories.length) {
-                                    var fullCategoryName = categories[pointIndex];
-                                    var count = counts[pointIndex];
-                                    // Remove commas from count
-                                    var countWithoutCommas = String(count).replace(/,/g, '');
-                                    
-                                    // Update popup content - category name first, then count below
-                                    popupName.textContent = fullCategoryName;
-                                    popupCount.textContent = countWithoutCommas;
-                                    
-                                    // Position popup near cursor
-                                    if (hoverData.event) {
-                                        var x = hoverData.event.clientX;
-                                        var y = hoverData.event.clientY;
-                                        popup.style.left = (x + 10) + 'px';
-                                        popup.style.top = (y - 10) + 'px';
-                                    }
-                                    popup.style.display = 'block';
-                                }
-                            }
-                        });
-                        
-                        // Hide popup when mouse leaves
-                        chartDiv.on('plotly_unhover', function() {
-                            if (popup) {
-                                popup.style.display = 'none';
-                            }
-                        });
-                    }
-                }, 500);
-            }
-            
-            function renderClarificationChart(data) {
-                var chartContainer = document.getElementById('chart-container');
-                
-                // Wait for Plotly to be available
-                if (typeof Plotly === 'undefined') {
-                    setTimeout(function() {
-                        renderClarificationChart(data);
-                    }, 100);
-                    return;
-                }
-                
-                // Clear previous content and create chart HTML structure
-                chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">Clarification by Time Range</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">Showing counts for different time ranges</p></div><div id="chart"></div><div id="category-popup" style="display: none; position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); background: white; padding: 20px; border: 2px solid #1e3a5f; border-radius: 8px; box-shadow: 0 4px 6px rgba(0,0,0,0.3); z-index: 10000;"><div style="text-align: center;"><h3 style="color: #1e3a5f; margin: 0 0 10px 0;">Category Name</h3><p id="category-full-name" style="color: #2c5282; font-size: 16px; margin: 0 0 15px 0;"></p><button id="close-category-popup" style="padding: 8px 20px; background: #1e3a5f; color: white; border: none; border-radius: 5px; cursor: pointer; font-size: 14px;">Close</button></div></div>';
-                
-                // Extract data
-                var categories = data.categories;
-                var timeRanges = ['<0.6months', '0.6month-1yr', '1-1.5yr', '>1.5yr'];
-                
-                // Create abbreviated category names (first letter of each word)
-                function getAbbreviation(categoryName) {
-                    return categoryName.split(' ').map(function(word) {
-                        return word.charAt(0).toUpperCase();
-                    }).join('');
-                }
-                
-                var abbreviatedCategories = categories.map(getAbbreviation);
-                
-                // Create mapping for legend (abbreviation -> full name)
-                var categoryMapping = {};
-                categories.forEach(function(cat, index) {
-                    categoryMapping[abbreviatedCategories[index]] = cat;
-                });
-                
-                // Color mapping for time ranges
-                var rangeColors = {
-                    '<0.6months': '#FF0000',      // Red
-                    '0.6month-1yr': '#1e3a5f',    // Dark Blue
-                    '1-1.5yr': '#FF8000',         // Orange
-                    '>1.5yr': '#006400'           // Dark Green
-                };
-                
-                // Create traces for each time range
-                var traces = timeRanges.map(function(range) {
-                    return {
-                        x: abbreviatedCategories,
-                        y: data[range] || [],
-                        type: 'scatter',
-                        mode: 'lines+markers',
-                        name: range,
-                        line: {
-                            color: rangeColors[range],
-                            width: 2
-                        },
-                        marker: {
-                            size: 8,
-                            color: rangeColors[range]
-                        }
-                    };
-                });
-                
-                var layout = {
-                    xaxis: {
-                        title: 'Category',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        type: 'category'
-                    },
-                    yaxis: {
-                        title: 'Count',
-                        titlefont: {
-                            size: 14,
-                            color: '#1e3a5f'
-                        },
-                        tickfont: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        },
-                        tickmode: 'linear',
-                        tickformat: ',.0f',
-                        dtick: 1000,
-                        showgrid: true,
-                        gridcolor: 'rgba(128, 128, 128, 0.2)'
-                    },
-                    height: 600,
-                    width: 1000,
-                    margin: { l: 80, r: 40, t: 20, b: 60 },
-                    showlegend: true,
-                    legend: {
-                        x: 1.05,
-                        y: 1,
-                        xanchor: 'left',
-                        yanchor: 'top',
-                        font: {
-                            size: 12,
-                            color: '#1e3a5f'
-                        }
-                    },
-                    paper_bgcolor: 'rgba(0,0,0,0)',
-                    plot_bgcolor: 'rgba(0,0,0,0)',
-                    font: {
-                        family: 'Arial, sans-serif',
-                        color: '#1e3a5f',
-                        size: 12
-                    }
-                };
-                
-                // Render the line chart
-                Plotly.newPlot("chart", traces, layout);
-                
-                // Setup close button for category popup
-                var closeCategoryPopupBtn = document.getElementById('close-category-popup');
-                if (closeCategoryPopupBtn) {
-                    closeCategoryPopupBtn.onclick = function() {
-                        document.getElementById('category-popup').style.display = 'none';
-                    };
-                }
-                
-                // Add click handler for x-axis labels to show popup with full category name
-                setTimeout(function() {
-                    var chartDiv = document.getElementById('chart');
-                    if (chartDiv) {
-                        // Listen for click events on the chart
-                        chartDiv.on('plotly_click', function(data) {
-                            if (data && data.points && data.points.length > 0) {
-                                var pointIndex = data.points[0].pointNumber;
-                                if (pointIndex >= 0 && pointIndex < categories.length) {
-                                    var fullCategoryName = categories[pointIndex];
-                                    var popup = document.getElementById('category-popup');
-                                    var popupText = document.getElementById('category-full-name');
-                                    if (popup && popupText) {
-                                        popupText.textContent = fullCategoryName;
-                                        popup.style.display = 'block';
-                                    }
-                                }
-                            }
-                        });
-                        
-                        // Also add click handler for x-axis tick labels
-                        var xAxisLabels = chartDiv.querySelectorAll('.xtick text');
-                        xAxisLabels.forEach(function(label, index) {
-                            if (index < abbreviatedCategories.length) {
-                                label.style.cursor = 'pointer';
-                                label.onclick = function(e) {
-                                    e.stopPropagation();
-                                    var fullCategoryName = categories[index];
-                                    var popup = document.getElementById('category-popup');
-                                    var popupText = document.getElementById('category-full-name');
-                                    if (popup && popupText) {
-                                        popupText.textContent = fullCategoryName;
-                                        popup.style.display = 'block';
-                                    }
-                                };
-                            }
-                        });
-                    }
-                }, 500);
-            }
-        </script>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html)
-
+def build_chart_table(df, cls, table_format="html"):
+    """Build the popup table for one CLASSIFICATION of the denials pie chart."""
+    # Include Category column and ROLE_ID, sort by Clinic name alphabetically
+    subset = df[df["CLASSIFICATION"] == cls][["Clinic","Pt Name","MRN","DOB","DOS","Payer", "CPT", "Reason", "CATEGORY", "Denial Date", "User", "ROLE_ID"]].copy()
+    
+    # Sort by Clinic name alphabetically
+    subset = subset.sort_values(by="Clinic", ascending=True)
+    
+    # Create Biller Role Type column based on ROLE_ID
+    def get_biller_role_type(role_id):
+        if pd.isna(role_id):
+            return ''
+        try:
+            role_id_int = int(role_id)
+            if role_id_int == 6:
+                return 'Biller'
+            elif role_id_int == 14:
+                return 'AR Biller'
+            else:
+                return ''
+        except (ValueError, TypeError):
+            return ''
+    
+    subset['Biller Role Type'] = subset['ROLE_ID'].apply(get_biller_role_type)
+    
+    # Rename CATEGORY to Category for display
+    subset.rename(columns={"CATEGORY": "Category"}, inplace=True)
+    
+    # Select final columns including Biller Role Type
+    subset = subset[["Clinic","Pt Name","MRN","DOB","DOS","Payer", "CPT", "Reason", "Category", "Denial Date", "User", "Biller Role Type"]]
+    
+    # Format date columns to mm/dd/yyyy
+    date_columns = ["DOB", "DOS", "Denial Date"]
+    for col in date_columns:
+        if col in subset.columns:
+            # Convert to datetime if not already, handling errors
+            subset[col] = pd.to_datetime(subset[col], errors='coerce')
+            # Format to mm/dd/yyyy, replacing NaT with empty string
+            if table_format == "html":
+                subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
+    
+    return subset
 
-@app.get("/logout")
-async def logout(request: Request):
-    """Logout and clear session"""
-    request.session.clear()
-    return RedirectResponse(url="/", status_code=status.HTTP_302_FOUND)
+def build_chart_tables(df, table_key, start, max_rows, table_format, date_format):
+    """One page of each CLASSIFICATION's popup table, and the cursors for the next pages."""
+    table_data = {}
+    table_cursors = {}
+    for cls in df["CLASSIFICATION"].unique():
+        if table_key is not None and cls != table_key:
+            continue
+        subset = build_chart_table(df, cls, table_format)
+        
+        table_data[cls], next_cursor = render_table_page(subset, cls, start, max_rows, table_format, date_format)
+        if next_cursor:
+            table_cursors[cls] = next_cursor
+    return table_data, table_cursors
 
-@app.post("/logout")
-async def logout_post(request: Request):
-    """Logout and clear session (POST method)"""
-    request.session.clear()
-    return RedirectResponse(url="/", status_code=status.HTTP_302_FOUND)
+def get_chart_arrow_tables(max_rows=None, cursor=None):
+    """get_chart_data's popup table pages as DataFrames, for Arrow responses."""
+    table_key, start = decode_table_cursor(cursor)
+    df = get_denials_dataframe()
+    df['CLASSIFICATION'] = classify_categories(df['CATEGORY'])
+    return build_chart_tables(df, table_key, start, max_rows, "arrow", "iso")
 
-def get_chart_data():
+def get_chart_data(max_rows=None, cursor=None, table_format="html", date_format="iso"):
     """Get chart data from CSV file and map categories to classifications for pie chart"""
+    table_key, start = decode_table_cursor(cursor)
     df = get_denials_dataframe()
     
-    # Define classification map
-    classification_map = {
-        "Different insurance as primary": "Inactive or Wrong policy Information",
-        "No active coverage": "Inactive or Wrong policy Information",
-        "Wrong insurance": "Inactive or Wrong policy Information",
-        "Wrong patient info": "Inactive or Wrong policy Information",
-        "Wrong policy information": "Inactive or Wrong policy Information",
-        "Prior to coverage": "Inactive or Wrong policy Information",
-        "Missing/wrong Claim information": "Inactive or Wrong policy Information",
-        "Covered under HMO Plan": "Inactive or Wrong policy Information",
-        "Patient ineligible for this service": "Inactive or Wrong policy Information",
-        "MCR paid more than MCD allowed amt": "Medicare paid more than Medicaid",
-        "Medicare paid more than Medicaid": "Medicare paid more than Medicaid",
-        "Primary paid more than sec allowed amount": "Medicare paid more than Medicaid",
-        "Invalid DOS": "Incorrect/Invalid DOS",
-        "Incorrect DOS": "Incorrect/Invalid DOS",
-        "Timely filing limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal time limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal Not Allowed": "TFL/Appeal time limit expired or not allowed",
-        "Appeal allowed": "TFL/Appeal time limit expired or not allowed",
-        "Invalid CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing main CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong/Incorrect ICD Code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with DX.code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong POS": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Invalid number of units": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with provider speciality": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing Modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "EFT enrollment pending": "Provider enrollment issue",
-        "Provider not eligible": "Provider enrollment issue",
-        "Provider not enrolled": "Provider enrollment issue",
-        "No Medicare credentialing": "Provider enrollment issue",
-        "No Medicaid credentialing": "Provider enrollment issue",
-        "Missing/invalid NPI of Billing provider in field 33a.": "Provider enrollment issue",
-        "Missing/invalid NPI of Rendering Provider in field 24J.": "Provider enrollment issue",
-        "Missing/invalid reffering Provider info": "Provider enrollment issue",
-        "Out of Network": "Out of network",
-        "Provider Out of Network": "Out of network",
-        "no authorization": "Out of network",
-        "Missing prior authorization": "Out of network",
-        "Missing referral information": "Out of network",
-        "Missing medical record": "Need additional information needed",
-        "COB missing": "Need additional information needed",
-        "Missing NDC code": "Need additional information needed",
-        "Missing documentation": "Need additional information needed",
-        "Missing EOB": "Need additional information needed",
-        "Need Add-on-code": "Need additional information needed",
-        "Need W9 form": "Need additional information needed",
-        "Accident Info required": "Need additional information needed",
-        "Missing illness information": "Need additional information needed",
-        "No Medical Necessity": "Need additional information needed",
-        "Pre-existing condition": "Need additional information needed",
-        "Itemized bill needed": "Need additional information needed",
-        "Clinical Review Determination": "Need additional information needed",
-        "Non covered service": "Non covered service",
-        "non covered submitted via paper": "Non covered service",
-        "Charges too high": "Other",
-        "Claim previously paid": "Other",
-        "Contractual obligation": "Other",
-        "Date of death precedes DOS": "Other",
-        "Duplicate claim": "Other",
-        "Exceeds clinical guidelines": "Other",
-        "Invalid redetermination": "Other",
-        "Managed care withholding": "Other",
-        "Not met residency requirement": "Other",
-        "Other": "Other",
-        "Participating Provider Discount": "Other",
-        "Patient in Hospice": "Other",
-        "Patient incarcerated": "Other",
-        "Payment made to another provider": "Other",
-        "The qualifying service has not been received": "Other",
-        "Claim Adjustment Due to Resubmission": "Incorrect Billing",
-        "Incorrect Patient Billing": "Incorrect Billing",
-        "Corrected Claim": "Incorrect Billing",
-        "Resubmit the claim": "Incorrect Billing",
-        "Invalid Taxpayer ID": "Incorrect Billing",
-        "Revised claim with new claim number": "Incorrect Billing",
-        "Invalid discharge date": "Incorrect Billing",
-        "Charges exceeded, maximum allowed": "Incorrect Billing",
-        "Negotiated discount": "Bundled service",
-        "Benefit limited": "Bundled service",
-        "Incidental Service": "Bundled service",
-        "Max benefit exceeded": "Bundled service"
-    }
-
     # Map CATEGORY to classification
-    df['CLASSIFICATION'] = df['CATEGORY'].map(classification_map).fillna('Other')
+    df['CLASSIFICATION'] = classify_categories(df['CATEGORY'])
 
-    # Group by classification for pie chart
-    df_grouped = df.groupby("CLASSIFICATION", as_index=False).size().rename(columns={"size": "count"})
+    summary = get_chart_summary(df)
 
     # Prepare HTML tables per CLASSIFICATION (for popup)
-    table_data = {}
-    for cls in df["CLASSIFICATION"].unique():
-        # Include Category column and ROLE_ID, sort by Clinic name alphabetically
-        subset = df[df["CLASSIFICATION"] == cls][["Clinic","Pt Name","MRN","DOB","DOS","Payer", "CPT", "Reason", "CATEGORY", "Denial Date", "User", "ROLE_ID"]].copy()
-        
-        # Sort by Clinic name alphabetically
-        subset = subset.sort_values(by="Clinic", ascending=True)
-        
-        # Create Biller Role Type column based on ROLE_ID
-        def get_biller_role_type(role_id):
-            if pd.isna(role_id):
-                return ''
-            try:
-                role_id_int = int(role_id)
-                if role_id_int == 6:
-                    return 'Biller'
-                elif role_id_int == 14:
-                    return 'AR Biller'
-                else:
-                    return ''
-            except (ValueError, TypeError):
-                return ''
-        
-        subset['Biller Role Type'] = subset['ROLE_ID'].apply(get_biller_role_type)
-        
-        # Rename CATEGORY to Category for display
-        subset.rename(columns={"CATEGORY": "Category"}, inplace=True)
-        
-        # Select final columns including Biller Role Type
-        subset = subset[["Clinic","Pt Name","MRN","DOB","DOS","Payer", "CPT", "Reason", "Category", "Denial Date", "User", "Biller Role Type"]]
-        
-        # Format date columns to mm/dd/yyyy
-        date_columns = ["DOB", "DOS", "Denial Date"]
-        for col in date_columns:
-            if col in subset.columns:
-                # Convert to datetime if not already, handling errors
-                subset[col] = pd.to_datetime(subset[col], errors='coerce')
-                # Format to mm/dd/yyyy, replacing NaT with empty string
-                subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
-        
-        table_data[cls] = subset.to_html(index=False, border=1)
-
-    # Create labels with counts in brackets for legend
-    labels_with_counts = [f"{cat} ({count})" for cat, count in zip(df_grouped["CLASSIFICATION"], df_grouped["count"])]
+    table_data, table_cursors = build_chart_tables(df, table_key, start, max_rows, table_format, date_format)
 
     # Serialize data safely for embedding into JS
-    js_categories = json.dumps(list(df_grouped["CLASSIFICATION"]))
-    js_counts = json.dumps(list(df_grouped["count"]))
-    js_labels_with_counts = json.dumps(labels_with_counts)
+    js_categories = json.dumps(summary["categories"])
+    js_counts = json.dumps(summary["counts"])
+    js_labels_with_counts = json.dumps(summary["labels_with_counts"])
     js_table_data = json.dumps(table_data)
+    js_table_cursors = json.dumps(table_cursors)
 
-    return js_categories, js_counts, js_labels_with_counts, js_table_data
+    return js_categories, js_counts, js_labels_with_counts, js_table_data, js_table_cursors
 
 
 @app.get("/button-data")
-def button_data(request: Request):
+def button_data(request: Request, max_rows: int = None, cursor: str = None, format: str = "html", date_format: str = "iso"):
     """API endpoint to get denial chart data as JSON"""
     # Check if user is authenticated
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
-    
+    if (format not in TABLE_FORMATS and not wants_arrow(request)) or date_format not in DATE_FORMATS:
+        return JSONResponse(content={"error": "Invalid table format."}, status_code=400)
     try:
-        js_categories, js_counts, js_labels_with_counts, js_table_data = get_chart_data()
+        if wants_arrow(request):
+            if pa is None:
+                return arrow_unavailable_response()
+            table_data, table_cursors = get_cached_payload("chart_arrow", get_chart_arrow_tables, max_rows, cursor)
+            return arrow_tables_response(table_data, table_cursors)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        js_categories, js_counts, js_labels_with_counts, js_table_data, js_table_cursors = get_cached_payload("chart", get_chart_data, max_rows, cursor, format, date_format)
         
         # Return just the data, not HTML with scripts
-        return JSONResponse(content={
+        return etag_json_response({
             "categories": json.loads(js_categories),
             "counts": json.loads(js_counts),
             "labels_with_counts": json.loads(js_labels_with_counts),
-            "table_data": json.loads(js_table_data)
-        })
+            "table_data": json.loads(js_table_data),
+            "table_cursors": json.loads(js_table_cursors)
+        }, etag)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
 
-@app.get("/button", response_class=HTMLResponse)
-def button(request: Request):
-    """Interactive denials chart from CSV file"""
-    # Check if user is authenticated
-    if not request.session.get("authenticated"):
-        return RedirectResponse(url="/", status_code=status.HTTP_302_FOUND)
-    
-    try:
-        js_categories, js_counts, js_labels_with_counts, js_table_data = get_chart_data()
-        
-        html = f"""
+# Page shell for /button. The chart data and each popup table follow as
+# separate <script> chunks so the browser can render before they are built.
+BUTTON_PAGE_SHELL = """
         <html>
         <head>
             <title>Interactive Denials Chart</title>
-            <script src="https://cdn.plot.ly/plotly-2.26.0.min.js"></script>
-            <script src="https://cdnjs.cloudflare.com/ajax/libs/xlsx/0.18.5/xlsx.full.min.js"></script>
+            <script src="{{PLOTLY_JS}}"></script>
+            <script src="{{XLSX_JS}}"></script>
             <style>
-                body {{
+                body {
                     font-family: Arial, sans-serif;
                     background-color: #f8f9fa;
                     text-align: center;
                     margin: 1px;
-                }}
-                #chart {{
+                }
+                #chart {
                     width: 700px;
                     margin-left: 0;
                     text-align: left;
                     margin-top:-20px;
-                }}
-                #popup {{
+                }
+                #popup {
                     display: none;
                     position: fixed;
                     top: 0;
@@ -3884,8 +2866,8 @@ def button(request: Request):
                     background: white;
                     z-index: 1000;
                     overflow: hidden;
-                }}
-                #popup-header {{
+                }
+                #popup-header {
                     position: sticky;
                     top: 0;
                     background: white;
@@ -3896,17 +2878,17 @@ def button(request: Request):
                     align-items: center;
                     z-index: 1001;
                     box-shadow: 0px 2px 5px rgba(0,0,0,0.1);
-                }}
-                #popup-header h3 {{
+                }
+                #popup-header h3 {
                     margin: 0;
                     color: #1e3a5f;
                     font-size: 24px;
-                }}
-                #popup-buttons {{
+                }
+                #popup-buttons {
                     display: flex;
                     gap: 10px;
-                }}
-                #close, #download {{
+                }
+                #close, #download {
                     background-color: #ff4d4d;
                     color: white;
                     border: none;
@@ -3916,36 +2898,36 @@ def button(request: Request):
                     font-size: 14px;
                     font-weight: bold;
                     transition: background-color 0.3s;
-                }}
-                #close:hover {{
+                }
+                #close:hover {
                     background-color: #ff3333;
-                }}
-                #download {{
+                }
+                #download {
                     background-color: #28a745;
-                }}
-                #download:hover {{
+                }
+                #download:hover {
                     background-color: #218838;
-                }}
-                #popup-content {{
+                }
+                #popup-content {
                     padding: 20px;
                     overflow-y: auto;
                     height: calc(100% - 80px);
-                }}
-                table {{
+                }
+                table {
                     margin-top: 10px;
                     border-collapse: collapse;
                     width: 100%;
-                }}
-                th, td {{
+                }
+                th, td {
                     border: 1px solid #ddd;
                     padding: 8px;
                     text-align: left;
-                }}
-                th {{
+                }
+                th {
                     background-color: #f2f2f2;
                     text-align: left;
-                }}
-                .loading-spinner {{
+                }
+                .loading-spinner {
                     display: inline-block;
                     width: 40px;
                     height: 40px;
@@ -3954,26 +2936,26 @@ def button(request: Request):
                     border-radius: 50%;
                     animation: spin 1s linear infinite;
                     margin: 20px auto;
-                }}
-                @keyframes spin {{
-                    0% {{ transform: rotate(0deg); }}
-                    100% {{ transform: rotate(360deg); }}
-                }}
-                .loading-container {{
+                }
+                @keyframes spin {
+                    0% { transform: rotate(0deg); }
+                    100% { transform: rotate(360deg); }
+                }
+                .loading-container {
                     text-align: center;
                     padding: 40px;
-                }}
-                .loading-container p {{
+                }
+                .loading-container p {
                     color: #2c5282;
                     font-size: 16px;
                     margin-top: 15px;
-                }}
+                }
             </style>
         </head>
         <body>
             <h2>Denials Category Pie Chart</h2>
             <p>Click on a slice to view related denial details.</p>
-            <div id="chart"></div>
+            <div id="chart"><div class="loading-container"><div class="loading-spinner"></div><p>Loading chart data...</p></div></div>
 
             <div id="popup">
                 <div id="popup-header">
@@ -3987,38 +2969,8 @@ def button(request: Request):
             </div>
 
             <script>
-                var categories = {js_categories};
-                var counts = {js_counts};
-                var labelsWithCounts = {js_labels_with_counts};
-                var tableData = {js_table_data};
-
-                var data = [{{
-                    type: "pie",
-                    labels: labelsWithCounts,
-                    values: counts,
-                    textinfo: "label+percent",
-                    hoverinfo: "label+value",
-                    textposition: "outside",
-                    automargin: true,
-                    marker: {{ line: {{ color: "white", width: 2 }} }},
-                    domain: {{ x: [0, 0.6], y: [0.3, 1] }}
-                }}];
-
-                var layout = {{
-                    height: 400,
-                    width: 1000,
-                    margin: {{ l: 0, r: 0, t: 80, b: 0 }},
-                    showlegend: true,
-                    legend: {{
-                        x: 1.05,
-                        y: 1,
-                        xanchor: "left",
-                        yanchor: "top",
-                        font: {{ size: 12 }}
-                    }}
-                }};
-
-                Plotly.newPlot("chart", data, layout);
+                var categories = [];
+                var tableData = {};
 
                 var popup = document.getElementById("popup");
                 var popupContent = document.getElementById("popup-content");
@@ -4028,12 +2980,12 @@ def button(request: Request):
                 var currentCategory = "";
 
                 // Function to download table as Excel
-                function downloadTableAsExcel() {{
+                function downloadTableAsExcel() {
                     var table = popupContent.querySelector('table');
-                    if (!table) {{
+                    if (!table) {
                         alert('No table found to download');
                         return;
-                    }}
+                    }
                     
                     // Convert HTML table to worksheet
                     var wb = XLSX.utils.book_new();
@@ -4041,54 +2993,54 @@ def button(request: Request):
                     
                     // Convert ALL numbers and dates to strings, and left-align everything
                     var range = XLSX.utils.decode_range(ws['!ref']);
-                    for (var R = 0; R <= range.e.r; ++R) {{
-                    for (var C = range.s.c; C <= range.e.c; ++C) {{
-                            var cellAddress = XLSX.utils.encode_cell({{r: R, c: C}});
-                            if (!ws[cellAddress]) {{
-                                ws[cellAddress] = {{}};
-                            }}
+                    for (var R = 0; R <= range.e.r; ++R) {
+                    for (var C = range.s.c; C <= range.e.c; ++C) {
+                            var cellAddress = XLSX.utils.encode_cell({r: R, c: C});
+                            if (!ws[cellAddress]) {
+                                ws[cellAddress] = {};
+                            }
                             
                             var cell = ws[cellAddress];
-                            if (cell && cell.v !== null && cell.v !== undefined) {{
+                            if (cell && cell.v !== null && cell.v !== undefined) {
                                 // Convert everything to string
                                 cell.v = String(cell.v);
                                 cell.t = 's'; // string type
                                 // Remove any date format
-                                if (cell.z) {{
+                                if (cell.z) {
                                     delete cell.z;
-                                }}
-                            }}
+                                }
+                            }
                             
                             // Initialize style for left alignment
-                            if (!cell.s) cell.s = {{}};
-                            if (!cell.s.alignment) cell.s.alignment = {{}};
+                            if (!cell.s) cell.s = {};
+                            if (!cell.s.alignment) cell.s.alignment = {};
                             cell.s.alignment.horizontal = 'left';
                             cell.s.alignment.vertical = 'top';
                             cell.s.alignment.wrapText = false;
-                        }}
-                    }}
+                        }
+                    }
                     
                     if (!ws['!cols']) ws['!cols'] = [];
                     
                     // Calculate and set column widths for all columns to show full data
-                    for (var C = range.s.c; C <= range.e.c; ++C) {{
+                    for (var C = range.s.c; C <= range.e.c; ++C) {
                         var maxWidth = 10; // Minimum width
                         // Check header width
-                        var headerCell = XLSX.utils.encode_cell({{r: 0, c: C}});
-                        if (ws[headerCell] && ws[headerCell].v) {{
+                        var headerCell = XLSX.utils.encode_cell({r: 0, c: C});
+                        if (ws[headerCell] && ws[headerCell].v) {
                             maxWidth = Math.max(maxWidth, String(ws[headerCell].v).length);
-                        }}
+                        }
                         // Check data widths - iterate through all rows
-                        for (var R = 1; R <= range.e.r; ++R) {{
-                            var cellAddress = XLSX.utils.encode_cell({{r: R, c: C}});
-                            if (ws[cellAddress] && ws[cellAddress].v !== null && ws[cellAddress].v !== undefined) {{
+                        for (var R = 1; R <= range.e.r; ++R) {
+                            var cellAddress = XLSX.utils.encode_cell({r: R, c: C});
+                            if (ws[cellAddress] && ws[cellAddress].v !== null && ws[cellAddress].v !== undefined) {
                                 var cellValue = String(ws[cellAddress].v);
                                     maxWidth = Math.max(maxWidth, cellValue.length);
-                            }}
-                        }}
+                            }
+                        }
                         // Set width with padding to ensure full visibility (no cap)
-                        ws['!cols'][C] = {{ wch: maxWidth + 3 }};
-                    }}
+                        ws['!cols'][C] = { wch: maxWidth + 3 };
+                    }
                     
                     XLSX.utils.book_append_sheet(wb, ws, "Data");
                     
@@ -4097,131 +3049,115 @@ def button(request: Request):
                     
                     // Download the file
                     XLSX.writeFile(wb, filename);
-                }}
+                }
 
-                document.getElementById("chart").on('plotly_click', function(evt) {{
-                    var pointIndex = evt.points[0].pointNumber;
-                    var category = categories[pointIndex];
-                    currentCategory = category;
-                    popupTitle.textContent = category;
-                    
-                    // Show popup with loading spinner
-                    popup.style.display = "block";
-                    popupContent.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading table data...</p></div>';
-                    
-                    // Load table data after a brief delay to show spinner
-                    setTimeout(function() {{
-                        popupContent.innerHTML = tableData[category];
-                    }}, 300);
-                }});
+                function showTable(category) {
+                    if (tableData[category] === undefined) {
+                        // Not streamed yet; receiveTable fills it in on arrival
+                        popupContent.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading table data...</p></div>';
+                        return;
+                    }
+                    popupContent.innerHTML = tableData[category];
+                }
+
+                // Called by the streamed chunk that carries the chart data
+                function renderDenialsChart(chart) {
+                    categories = chart.categories;
+                    document.getElementById("chart").innerHTML = "";
+
+                    var data = [{
+                        type: "pie",
+                        labels: chart.labels_with_counts,
+                        values: chart.counts,
+                        textinfo: "label+percent",
+                        hoverinfo: "label+value",
+                        textposition: "outside",
+                        automargin: true,
+                        marker: { line: { color: "white", width: 2 } },
+                        domain: { x: [0, 0.6], y: [0.3, 1] }
+                    }];
+
+                    var layout = {
+                        height: 400,
+                        width: 1000,
+                        margin: { l: 0, r: 0, t: 80, b: 0 },
+                        showlegend: true,
+                        legend: {
+                            x: 1.05,
+                            y: 1,
+                            xanchor: "left",
+                            yanchor: "top",
+                            font: { size: 12 }
+                        }
+                    };
+
+                    Plotly.newPlot("chart", data, layout);
+
+                    document.getElementById("chart").on('plotly_click', function(evt) {
+                        var pointIndex = evt.points[0].pointNumber;
+                        var category = categories[pointIndex];
+                        currentCategory = category;
+                        popupTitle.textContent = category;
+                        
+                        popup.style.display = "block";
+                        showTable(category);
+                    });
+                }
+
+                // Each popup table arrives in its own streamed chunk
+                function receiveTable(category, html) {
+                    tableData[category] = html;
+                    if (popup.style.display === "block" && currentCategory === category) {
+                        showTable(category);
+                    }
+                }
 
-                closeBtn.onclick = function() {{
+                closeBtn.onclick = function() {
                     popup.style.display = "none";
-                }};
+                };
 
-                downloadBtn.onclick = function() {{
+                downloadBtn.onclick = function() {
                     downloadTableAsExcel();
-                }};
+                };
             </script>
-        </body>
-        </html>
-        """
-        return HTMLResponse(content=html)
-    except Exception as e:
+"""
+BUTTON_PAGE_SHELL = BUTTON_PAGE_SHELL.replace("{{PLOTLY_JS}}", vendor_url("plotly")).replace("{{XLSX_JS}}", vendor_url("xlsx"))
+
+def _script_chunk(call: str, *args) -> str:
+    """Wrap a JS call with JSON arguments in a <script> tag safe to stream inline."""
+    js_args = ", ".join(json.dumps(arg).replace("</", "<\\/") for arg in args)
+    return f"<script>{call}({js_args});</script>\n"
+
+def stream_button_page():
+    """Yield the /button page: shell first, then chart data, then one chunk per popup table."""
+    yield BUTTON_PAGE_SHELL
+    try:
+        df = get_denials_dataframe()
+        df['CLASSIFICATION'] = classify_categories(df['CATEGORY'])
+        yield _script_chunk("renderDenialsChart", get_chart_summary(df))
+        for cls in df["CLASSIFICATION"].unique():
+            yield _script_chunk("receiveTable", cls, render_table_html(build_chart_table(df, cls)))
+    except Exception:
         import traceback
-        return HTMLResponse(content=f"<h3>Error in /button:</h3><pre>{traceback.format_exc()}</pre>")
+        yield f"<h3>Error in /button:</h3><pre>{traceback.format_exc()}</pre>"
+    yield "        </body>\n        </html>\n"
+
+@app.get("/button", response_class=HTMLResponse)
+def button(request: Request):
+    """Interactive denials chart from CSV file"""
+    # Check if user is authenticated
+    if not request.session.get("authenticated"):
+        return RedirectResponse(url="/", status_code=status.HTTP_302_FOUND)
+    
+    return StreamingResponse(stream_button_page(), media_type="text/html")
 
 # --------------------------------------------------------------------
 # Comparison endpoint
-def get_comparison_data_by_period(period, date=None, week_end=None):
+def get_comparison_data_by_period(period, date=None, week_end=None, max_rows=None, cursor=None, table_format="html", date_format="iso"):
+    table_key, start = decode_table_cursor(cursor)
     df = get_denials_dataframe()
 
-    classification_map = {
-        "Different insurance as primary": "Inactive or Wrong policy Information",
-        "No active coverage": "Inactive or Wrong policy Information",
-        "Wrong insurance": "Inactive or Wrong policy Information",
-        "Wrong patient info": "Inactive or Wrong policy Information",
-        "Wrong policy information": "Inactive or Wrong policy Information",
-        "Prior to coverage": "Inactive or Wrong policy Information",
-        "Missing/wrong Claim information": "Inactive or Wrong policy Information",
-        "Covered under HMO Plan": "Inactive or Wrong policy Information",
-        "Patient ineligible for this service": "Inactive or Wrong policy Information",
-        "MCR paid more than MCD allowed amt": "Medicare paid more than Medicaid",
-        "Medicare paid more than Medicaid": "Medicare paid more than Medicaid",
-        "Primary paid more than sec allowed amount": "Medicare paid more than Medicaid",
-        "Invalid DOS": "Incorrect/Invalid DOS",
-        "Incorrect DOS": "Incorrect/Invalid DOS",
-        "Timely filing limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal time limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal Not Allowed": "TFL/Appeal time limit expired or not allowed",
-        "Appeal allowed": "TFL/Appeal time limit expired or not allowed",
-        "Invalid CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing main CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong/Incorrect ICD Code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with DX.code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong POS": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Invalid number of units": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with provider speciality": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing Modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "EFT enrollment pending": "Provider enrollment issue",
-        "Provider not eligible": "Provider enrollment issue",
-        "Provider not enrolled": "Provider enrollment issue",
-        "No Medicare credentialing": "Provider enrollment issue",
-        "No Medicaid credentialing": "Provider enrollment issue",
-        "Missing/invalid NPI of Billing provider in field 33a.": "Provider enrollment issue",
-        "Missing/invalid NPI of Rendering Provider in field 24J.": "Provider enrollment issue",
-        "Missing/invalid reffering Provider info": "Provider enrollment issue",
-        "Out of Network": "Out of network",
-        "Provider Out of Network": "Out of network",
-        "no authorization": "Out of network",
-        "Missing prior authorization": "Out of network",
-        "Missing referral information": "Out of network",
-        "Missing medical record": "Need additional information needed",
-        "COB missing": "Need additional information needed",
-        "Missing NDC code": "Need additional information needed",
-        "Missing documentation": "Need additional information needed",
-        "Missing EOB": "Need additional information needed",
-        "Need Add-on-code": "Need additional information needed",
-        "Need W9 form": "Need additional information needed",
-        "Accident Info required": "Need additional information needed",
-        "Missing illness information": "Need additional information needed",
-        "No Medical Necessity": "Need additional information needed",
-        "Pre-existing condition": "Need additional information needed",
-        "Itemized bill needed": "Need additional information needed",
-        "Clinical Review Determination": "Need additional information needed",
-        "Non covered service": "Non covered service",
-        "non covered submitted via paper": "Non covered service",
-        "Charges too high": "Other",
-        "Claim previously paid": "Other",
-        "Contractual obligation": "Other",
-        "Date of death precedes DOS": "Other",
-        "Duplicate claim": "Other",
-        "Exceeds clinical guidelines": "Other",
-        "Invalid redetermination": "Other",
-        "Managed care withholding": "Other",
-        "Not met residency requirement": "Other",
-        "Other": "Other",
-        "Participating Provider Discount": "Other",
-        "Patient in Hospice": "Other",
-        "Patient incarcerated": "Other",
-        "Payment made to another provider": "Other",
-        "The qualifying service has not been received": "Other",
-        "Claim Adjustment Due to Resubmission": "Incorrect Billing",
-        "Incorrect Patient Billing": "Incorrect Billing",
-        "Corrected Claim": "Incorrect Billing",
-        "Resubmit the claim": "Incorrect Billing",
-        "Invalid Taxpayer ID": "Incorrect Billing",
-        "Revised claim with new claim number": "Incorrect Billing",
-        "Invalid discharge date": "Incorrect Billing",
-        "Charges exceeded, maximum allowed": "Incorrect Billing",
-        "Negotiated discount": "Bundled service",
-        "Benefit limited": "Bundled service",
-        "Incidental Service": "Bundled service",
-        "Max benefit exceeded": "Bundled service"
-    }
-
-    df['CLASSIFICATION'] = df['CATEGORY'].map(classification_map).fillna('Other')
+    df['CLASSIFICATION'] = classify_categories(df['CATEGORY'])
     df['Denial Date'] = pd.to_datetime(df['Denial Date'].astype(str).str.strip(), errors='coerce')
 
     df = df.dropna(subset=['Denial Date'])
@@ -4231,20 +3167,22 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
     # ============================
     if period == "daily":
         # Get current date and calculate yesterday
-        current_date = pd.Timestamp.now()
+        current_date = dashboard_now()
         # Get yesterday's date
         yesterday = current_date - pd.Timedelta(days=1)
         yesterday_date = yesterday.date()
         
         # Filter to yesterday's data
-        df['Denial Date Date'] = df['Denial Date'].dt.date
-        df = df[df['Denial Date Date'] == yesterday_date]
+        with stage("filter_window"):
+            df['Denial Date Date'] = df['Denial Date'].dt.date
+            df = df[df['Denial Date Date'] == yesterday_date]
         
         # Group by classification for pie chart
         df_grouped = df.groupby("CLASSIFICATION", as_index=False).size().rename(columns={"size": "count"})
         
         # Prepare HTML tables per CLASSIFICATION (for popup) - include Category and Biller Role Type
         table_data = {}
+        table_cursors = {}
         # Include these columns: Clinic, MRN, DOS, Payer, CPT, Reason, CATEGORY, Denial Date, User, ROLE_ID
         columns_to_include = ['Clinic', 'MRN', 'DOS', 'Payer', 'CPT', 'Reason', 'CATEGORY', 'Denial Date', 'User', 'ROLE_ID']
         # Ensure DOS and Denial Date are always in the list if they exist in df
@@ -4255,6 +3193,8 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
         available_columns = [col for col in columns_to_include if col in df.columns]
         
         for cls in df["CLASSIFICATION"].unique():
+            if table_key is not None and cls != table_key:
+                continue
             subset = df[df["CLASSIFICATION"] == cls][available_columns].copy()
             
             # Sort by Clinic name alphabetically
@@ -4301,9 +3241,12 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
             for col in date_columns:
                 if col in subset.columns:
                     subset[col] = pd.to_datetime(subset[col], errors='coerce')
-                    subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
+                    if table_format == "html":
+                        subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
             
-            table_data[cls] = subset.to_html(index=False, border=1)
+            table_data[cls], next_cursor = render_table_page(subset, cls, start, max_rows, table_format, date_format)
+            if next_cursor:
+                table_cursors[cls] = next_cursor
         
         # Create labels with counts in brackets for legend
         labels_with_counts = [f"{cat} ({count})" for cat, count in zip(df_grouped["CLASSIFICATION"], df_grouped["count"])]
@@ -4316,6 +3259,7 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
             "counts": list(df_grouped["count"]),
             "labels_with_counts": labels_with_counts,
             "table_data": table_data,
+            "table_cursors": table_cursors,
             "title": title
         }
 
@@ -4324,7 +3268,7 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
     # ============================
     elif period == "biweekly":
         # Get current date
-        today = pd.Timestamp.now()
+        today = dashboard_now()
         current_day = today.day
         current_month = today.month
         current_year = today.year
@@ -4366,24 +3310,26 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
             target_year = current_year
         
         # Filter to the previous category's date range
-        df['Denial Date Date'] = df['Denial Date'].dt.date
-        df['Denial Date Year'] = df['Denial Date'].dt.year
-        df['Denial Date Month'] = df['Denial Date'].dt.month
-        df['Denial Date Day'] = df['Denial Date'].dt.day
-        
-        # Filter to target month and the selected category range
-        df = df[
-            (df['Denial Date Year'] == target_year) &
-            (df['Denial Date Month'] == target_month) &
-            (df['Denial Date Day'] >= start_day) &
-            (df['Denial Date Day'] <= end_day)
-        ]
+        with stage("filter_window"):
+            df['Denial Date Date'] = df['Denial Date'].dt.date
+            df['Denial Date Year'] = df['Denial Date'].dt.year
+            df['Denial Date Month'] = df['Denial Date'].dt.month
+            df['Denial Date Day'] = df['Denial Date'].dt.day
+            
+            # Filter to target month and the selected category range
+            df = df[
+                (df['Denial Date Year'] == target_year) &
+                (df['Denial Date Month'] == target_month) &
+                (df['Denial Date Day'] >= start_day) &
+                (df['Denial Date Day'] <= end_day)
+            ]
         
         # Group by classification for pie chart
         df_grouped = df.groupby("CLASSIFICATION", as_index=False).size().rename(columns={"size": "count"})
         
         # Prepare HTML tables per CLASSIFICATION (for popup) - include Category and Biller Role Type
         table_data = {}
+        table_cursors = {}
         # Include these columns: Clinic, MRN, DOS, Payer, CPT, Reason, CATEGORY, Denial Date, User, ROLE_ID
         columns_to_include = ['Clinic', 'MRN', 'DOS', 'Payer', 'CPT', 'Reason', 'CATEGORY', 'Denial Date', 'User', 'ROLE_ID']
         # Ensure DOS and Denial Date are always in the list if they exist in df
@@ -4394,6 +3340,8 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
         available_columns = [col for col in columns_to_include if col in df.columns]
         
         for cls in df["CLASSIFICATION"].unique():
+            if table_key is not None and cls != table_key:
+                continue
             subset = df[df["CLASSIFICATION"] == cls][available_columns].copy()
             
             # Sort by Clinic name alphabetically
@@ -4440,9 +3388,12 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
             for col in date_columns:
                 if col in subset.columns:
                     subset[col] = pd.to_datetime(subset[col], errors='coerce')
-                    subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
+                    if table_format == "html":
+                        subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
             
-            table_data[cls] = subset.to_html(index=False, border=1)
+            table_data[cls], next_cursor = render_table_page(subset, cls, start, max_rows, table_format, date_format)
+            if next_cursor:
+                table_cursors[cls] = next_cursor
         
         # Create labels with counts in brackets for legend
         labels_with_counts = [f"{cat} ({count})" for cat, count in zip(df_grouped["CLASSIFICATION"], df_grouped["count"])]
@@ -4457,6 +3408,7 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
             "counts": list(df_grouped["count"]),
             "labels_with_counts": labels_with_counts,
             "table_data": table_data,
+            "table_cursors": table_cursors,
             "title": title
         }
 
@@ -4465,7 +3417,7 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
     # ============================
     elif period == "monthly":
         # Get current date and calculate last month
-        today = pd.Timestamp.now()
+        today = dashboard_now()
         # Get first day of last month
         if today.month == 1:
             last_month = 12
@@ -4489,14 +3441,16 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
                 last_day_last_month = pd.Timestamp(last_month_year, last_month, 28).date()
 
         # Filter to last month's data
-        df['Denial Date Date'] = df['Denial Date'].dt.date
-        df = df[(df['Denial Date Date'] >= first_day_last_month) & (df['Denial Date Date'] <= last_day_last_month)]
+        with stage("filter_window"):
+            df['Denial Date Date'] = df['Denial Date'].dt.date
+            df = df[(df['Denial Date Date'] >= first_day_last_month) & (df['Denial Date Date'] <= last_day_last_month)]
         
         # Group by classification for pie chart
         df_grouped = df.groupby("CLASSIFICATION", as_index=False).size().rename(columns={"size": "count"})
         
         # Prepare HTML tables per CLASSIFICATION (for popup) - include Category and Biller Role Type
         table_data = {}
+        table_cursors = {}
         # Include these columns: Clinic, MRN, DOS, Payer, CPT, Reason, CATEGORY, Denial Date, User, ROLE_ID
         columns_to_include = ['Clinic', 'MRN', 'DOS', 'Payer', 'CPT', 'Reason', 'CATEGORY', 'Denial Date', 'User', 'ROLE_ID']
         # Ensure DOS and Denial Date are always in the list if they exist in df
@@ -4507,6 +3461,8 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
         available_columns = [col for col in columns_to_include if col in df.columns]
         
         for cls in df["CLASSIFICATION"].unique():
+            if table_key is not None and cls != table_key:
+                continue
             subset = df[df["CLASSIFICATION"] == cls][available_columns].copy()
             
             # Sort by Clinic name alphabetically
@@ -4553,9 +3509,12 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
             for col in date_columns:
                 if col in subset.columns:
                     subset[col] = pd.to_datetime(subset[col], errors='coerce')
-                    subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
+                    if table_format == "html":
+                        subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
             
-            table_data[cls] = subset.to_html(index=False, border=1)
+            table_data[cls], next_cursor = render_table_page(subset, cls, start, max_rows, table_format, date_format)
+            if next_cursor:
+                table_cursors[cls] = next_cursor
         
         # Create labels with counts in brackets for legend
         labels_with_counts = [f"{cat} ({count})" for cat, count in zip(df_grouped["CLASSIFICATION"], df_grouped["count"])]
@@ -4568,6 +3527,7 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
             "counts": list(df_grouped["count"]),
             "labels_with_counts": labels_with_counts,
             "table_data": table_data,
+            "table_cursors": table_cursors,
             "title": title
         }
 
@@ -4575,14 +3535,26 @@ def get_comparison_data_by_period(period, date=None, week_end=None):
         raise ValueError("Invalid period")
 
 @app.get("/comparison-data")
-def comparison_data(request: Request, period: str = "daily", date: str = None, week_end: str = None):
+def comparison_data(request: Request, period: str = "daily", date: str = None, week_end: str = None, max_rows: int = None, cursor: str = None, format: str = "html", date_format: str = "iso"):
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
     if period not in ["daily", "biweekly", "monthly"]:
         return JSONResponse(content={"error": "Invalid period."}, status_code=400)
+    if (format not in TABLE_FORMATS and not wants_arrow(request)) or date_format not in DATE_FORMATS:
+        return JSONResponse(content={"error": "Invalid table format."}, status_code=400)
     try:
-        data = get_comparison_data_by_period(period, date=date, week_end=week_end)
-        return JSONResponse(content=data)
+        if wants_arrow(request):
+            if pa is None:
+                return arrow_unavailable_response()
+            data = get_cached_payload("comparison", get_comparison_data_by_period, period, date, week_end, max_rows, cursor, "arrow", date_format)
+            return arrow_tables_response(data["table_data"], data["table_cursors"], {"period": period, "title": data["title"]})
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = get_cached_payload("comparison", get_comparison_data_by_period, period, date, week_end, max_rows, cursor, format, date_format)
+        return etag_json_response(data, etag)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -4622,8 +3594,11 @@ def clarification_grouping_data(request: Request):
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
     try:
-        data = get_clarification_grouping_data()
-        return JSONResponse(content=data)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = get_cached_payload("clarification_grouping", get_clarification_grouping_data)
+        return etag_json_response(data, etag)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -4631,32 +3606,18 @@ def clarification_grouping_data(request: Request):
 # Get all columns from WEEKLY_CLARIFICATION_DETAILS table
 def get_weekly_clarification_columns():
     """Get all column names from WEEKLY_CLARIFICATION_DETAILS table"""
-    conn = get_connection()
     try:
-        cursor = conn.cursor()
-        # Get database name from environment
-        db_name = os.getenv("DB_DATABASE")
-        query = """
-            SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
-            FROM information_schema.COLUMNS 
-            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'WEEKLY_CLARIFICATION_DETAILS'
-            ORDER BY ORDINAL_POSITION
-        """
-        cursor.execute(query, (db_name,))
         columns = []
-        for row in cursor.fetchall():
+        for row in data_source.table_columns("WEEKLY_CLARIFICATION_DETAILS"):
             columns.append({
                 "name": row[0].upper() if row[0] else "",
                 "data_type": row[1].upper() if row[1] else "",
                 "is_nullable": row[2].upper() if row[2] else "",
                 "default": row[3].upper() if row[3] is not None and row[3] else ""
             })
-        cursor.close()
         return {"columns": columns}
     except Exception as exc:
         raise Exception(f"Error fetching column information: {exc}")
-    finally:
-        conn.close()
 
 @app.get("/get-weekly-clarification-columns")
 def get_weekly_clarification_columns_endpoint(request: Request):
@@ -4696,7 +3657,7 @@ if False:
         df = df.dropna(subset=['Clari_Opened_Date'])
         
         # Calculate age in days
-        today = pd.Timestamp.now()
+        today = dashboard_now()
         df['AGE_DAYS'] = (today - df['Clari_Opened_Date']).dt.days
         
         # Categorize by age
@@ -4773,8 +3734,11 @@ def clarification_type_data(request: Request):
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
     try:
-        data = get_clarification_type_data()
-        return JSONResponse(content=data)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = get_cached_payload("clarification_type", get_clarification_type_data)
+        return etag_json_response(data, etag)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -4802,7 +3766,7 @@ if False:
 
     def get_clarification_data():
         df = get_denials_dataframe()
-        today = pd.Timestamp.now()
+        today = dashboard_now()
         df["AGE_DAYS"] = (today - df["DATE"]).dt.days
         def categorize_age(age_days):
             if age_days < 18: return "<0.6months"
@@ -4877,8 +3841,9 @@ def latest_denial(request: Request):
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
 
-def get_denials_comparison_data():
+def get_denials_comparison_data(max_rows=None, cursor=None, table_format="html", date_format="iso"):
     """Get denial comparison data: current month vs previous month grouped by category"""
+    table_key, start = decode_table_cursor(cursor)
     df = get_denials_dataframe()
     
     # Convert Denial Date to datetime
@@ -4890,11 +3855,12 @@ def get_denials_comparison_data():
             "categories": [],
             "current_month_counts": [],
             "previous_month_counts": [],
-            "table_data": {}
+            "table_data": {},
+            "table_cursors": {}
         }
     
     # Get current date
-    current_date = pd.Timestamp.now()
+    current_date = dashboard_now()
     current_year = current_date.year
     current_month = current_date.month
     
@@ -4906,17 +3872,18 @@ def get_denials_comparison_data():
         previous_month = current_month - 1
         previous_year = current_year
     
-    # Filter current month data
-    df_current = df[
-        (df['Denial Date'].dt.year == current_year) &
-        (df['Denial Date'].dt.month == current_month)
-    ]
-    
-    # Filter previous month data
-    df_previous = df[
-        (df['Denial Date'].dt.year == previous_year) &
-        (df['Denial Date'].dt.month == previous_month)
-    ]
+    with stage("filter_window"):
+        # Filter current month data
+        df_current = df[
+            (df['Denial Date'].dt.year == current_year) &
+            (df['Denial Date'].dt.month == current_month)
+        ]
+        
+        # Filter previous month data
+        df_previous = df[
+            (df['Denial Date'].dt.year == previous_year) &
+            (df['Denial Date'].dt.month == previous_month)
+        ]
     
     # Get all unique categories from both months
     all_categories = sorted(set(df['CATEGORY'].unique()))
@@ -4935,17 +3902,23 @@ def get_denials_comparison_data():
     
     # Prepare table data for popups (full records for each category)
     table_data = {}
+    table_cursors = {}
     for cat in all_categories:
+        if table_key is not None and cat != table_key:
+            continue
         # Combine current and previous month data for this category
-        cat_current = df_current[df_current['CATEGORY'] == cat]
-        cat_previous = df_previous[df_previous['CATEGORY'] == cat]
-        cat_all = pd.concat([cat_current, cat_previous], ignore_index=True)
+        with stage("category_concat"):
+            cat_current = df_current[df_current['CATEGORY'] == cat]
+            cat_previous = df_previous[df_previous['CATEGORY'] == cat]
+            cat_all = pd.concat([cat_current, cat_previous], ignore_index=True)
         
         if not cat_all.empty:
             subset = cat_all[["Clinic", "Pt Name", "MRN", "DOB", "DOS", "Payer", "CPT", "Reason", "CATEGORY", "Denial Date", "User", "ROLE_ID"]].copy()
             subset = subset.sort_values(by="Clinic", ascending=True)
-            table_data[cat] = subset.to_html(index=False, border=1)
-        else:
+            table_data[cat], next_cursor = render_table_page(subset, cat, start, max_rows, table_format, date_format)
+            if next_cursor:
+                table_cursors[cat] = next_cursor
+        elif table_format != "arrow":
             table_data[cat] = "<p>No data available for this category</p>"
     
     return {
@@ -4953,18 +3926,36 @@ def get_denials_comparison_data():
         "current_month_counts": current_counts,
         "previous_month_counts": previous_counts,
         "table_data": table_data,
+        "table_cursors": table_cursors,
         "current_month_label": f"{current_date.strftime('%B %Y')}",
         "previous_month_label": f"{pd.Timestamp(previous_year, previous_month, 1).strftime('%B %Y')}"
     }
 
 @app.get("/denials-comparison-data")
-def denials_comparison_data(request: Request):
+def denials_comparison_data(request: Request, max_rows: int = None, cursor: str = None, format: str = "html", date_format: str = "iso"):
     """API endpoint to get denial comparison data"""
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
+    if (format not in TABLE_FORMATS and not wants_arrow(request)) or date_format not in DATE_FORMATS:
+        return JSONResponse(content={"error": "Invalid table format."}, status_code=400)
     try:
-        data = get_denials_comparison_data()
-        return JSONResponse(content=data)
+        if wants_arrow(request):
+            if pa is None:
+                return arrow_unavailable_response()
+            data = get_cached_payload("denials_comparison", get_denials_comparison_data, max_rows, cursor, "arrow", date_format)
+            return arrow_tables_response(data["table_data"], data["table_cursors"], {
+                "current_month_label": data.get("current_month_label", ""),
+                "previous_month_label": data.get("previous_month_label", ""),
+            })
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = serve_payload(request, "denials_comparison", get_denials_comparison_data, max_rows, cursor, format, date_format)
+        if data is None:
+            return Response(status_code=204)
+        return etag_json_response(data, etag)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -4986,7 +3977,7 @@ def get_denials_biweekly_comparison_data():
         }
     
     # Get current date
-    current_date = pd.Timestamp.now()
+    current_date = dashboard_now()
     
     # Get last 3 months
     periods = []
@@ -5052,8 +4043,13 @@ def denials_biweekly_comparison_data(request: Request):
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
     try:
-        data = get_denials_biweekly_comparison_data()
-        return JSONResponse(content=data)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = serve_payload(request, "denials_biweekly_comparison", get_denials_biweekly_comparison_data)
+        if data is None:
+            return Response(status_code=204)
+        return etag_json_response(data, etag)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -5075,7 +4071,7 @@ def get_denials_monthly_comparison_data():
         }
     
     # Get current date
-    current_date = pd.Timestamp.now()
+    current_date = dashboard_now()
     
     # Get last 6 months
     periods = []
@@ -5125,8 +4121,13 @@ def denials_monthly_comparison_data(request: Request):
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
     try:
-        data = get_denials_monthly_comparison_data()
-        return JSONResponse(content=data)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = serve_payload(request, "denials_monthly_comparison", get_denials_monthly_comparison_data)
+        if data is None:
+            return Response(status_code=204)
+        return etag_json_response(data, etag)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -5159,14 +4160,18 @@ def performance_users(request: Request):
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
     try:
-        data = get_users_by_role()
-        return JSONResponse(content=data)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = get_cached_payload("users_by_role", get_users_by_role)
+        return etag_json_response(data, etag)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
 
-def get_user_denials_data(username):
+def get_user_denials_data(username, max_rows=None, cursor=None, table_format="html", date_format="iso"):
     """Get denial data for a specific user, grouped by category"""
+    table_key, start = decode_table_cursor(cursor)
     df = get_denials_dataframe()
     
     # Filter by user
@@ -5177,104 +4182,22 @@ def get_user_denials_data(username):
             "categories": [],
             "counts": [],
             "labels_with_counts": [],
-            "table_data": {}
+            "table_data": {},
+            "table_cursors": {}
         }
     
-    # Use the same classification map as get_chart_data
-    classification_map = {
-        "Different insurance as primary": "Inactive or Wrong policy Information",
-        "No active coverage": "Inactive or Wrong policy Information",
-        "Wrong insurance": "Inactive or Wrong policy Information",
-        "Wrong patient info": "Inactive or Wrong policy Information",
-        "Wrong policy information": "Inactive or Wrong policy Information",
-        "Prior to coverage": "Inactive or Wrong policy Information",
-        "Missing/wrong Claim information": "Inactive or Wrong policy Information",
-        "Covered under HMO Plan": "Inactive or Wrong policy Information",
-        "Patient ineligible for this service": "Inactive or Wrong policy Information",
-        "MCR paid more than MCD allowed amt": "Medicare paid more than Medicaid",
-        "Medicare paid more than Medicaid": "Medicare paid more than Medicaid",
-        "Primary paid more than sec allowed amount": "Medicare paid more than Medicaid",
-        "Invalid DOS": "Incorrect/Invalid DOS",
-        "Incorrect DOS": "Incorrect/Invalid DOS",
-        "Timely filing limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal time limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal Not Allowed": "TFL/Appeal time limit expired or not allowed",
-        "Appeal allowed": "TFL/Appeal time limit expired or not allowed",
-        "Invalid CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing main CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong/Incorrect ICD Code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with DX.code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong POS": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Invalid number of units": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with provider speciality": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing Modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "EFT enrollment pending": "Provider enrollment issue",
-        "Provider not eligible": "Provider enrollment issue",
-        "Provider not enrolled": "Provider enrollment issue",
-        "No Medicare credentialing": "Provider enrollment issue",
-        "No Medicaid credentialing": "Provider enrollment issue",
-        "Missing/invalid NPI of Billing provider in field 33a.": "Provider enrollment issue",
-        "Missing/invalid NPI of Rendering Provider in field 24J.": "Provider enrollment issue",
-        "Missing/invalid reffering Provider info": "Provider enrollment issue",
-        "Out of Network": "Out of network",
-        "Provider Out of Network": "Out of network",
-        "no authorization": "Out of network",
-        "Missing prior authorization": "Out of network",
-        "Missing referral information": "Out of network",
-        "Missing medical record": "Need additional information needed",
-        "COB missing": "Need additional information needed",
-        "Missing NDC code": "Need additional information needed",
-        "Missing documentation": "Need additional information needed",
-        "Missing EOB": "Need additional information needed",
-        "Need Add-on-code": "Need additional information needed",
-        "Need W9 form": "Need additional information needed",
-        "Accident Info required": "Need additional information needed",
-        "Missing illness information": "Need additional information needed",
-        "No Medical Necessity": "Need additional information needed",
-        "Pre-existing condition": "Need additional information needed",
-        "Itemized bill needed": "Need additional information needed",
-        "Clinical Review Determination": "Need additional information needed",
-        "Non covered service": "Non covered service",
-        "non covered submitted via paper": "Non covered service",
-        "Charges too high": "Other",
-        "Claim previously paid": "Other",
-        "Contractual obligation": "Other",
-        "Date of death precedes DOS": "Other",
-        "Duplicate claim": "Other",
-        "Exceeds clinical guidelines": "Other",
-        "Invalid redetermination": "Other",
-        "Managed care withholding": "Other",
-        "Not met residency requirement": "Other",
-        "Other": "Other",
-        "Participating Provider Discount": "Other",
-        "Patient in Hospice": "Other",
-        "Patient incarcerated": "Other",
-        "Payment made to another provider": "Other",
-        "The qualifying service has not been received": "Other",
-        "Claim Adjustment Due to Resubmission": "Incorrect Billing",
-        "Incorrect Patient Billing": "Incorrect Billing",
-        "Corrected Claim": "Incorrect Billing",
-        "Resubmit the claim": "Incorrect Billing",
-        "Invalid Taxpayer ID": "Incorrect Billing",
-        "Revised claim with new claim number": "Incorrect Billing",
-        "Invalid discharge date": "Incorrect Billing",
-        "Charges exceeded, maximum allowed": "Incorrect Billing",
-        "Negotiated discount": "Bundled service",
-        "Benefit limited": "Bundled service",
-        "Incidental Service": "Bundled service",
-        "Max benefit exceeded": "Bundled service"
-    }
-    
     # Map CATEGORY to classification
-    df_user['CLASSIFICATION'] = df_user['CATEGORY'].map(classification_map).fillna('Other')
+    df_user['CLASSIFICATION'] = classify_categories(df_user['CATEGORY'])
     
     # Group by classification for pie chart
     df_grouped = df_user.groupby("CLASSIFICATION", as_index=False).size().rename(columns={"size": "count"})
     
     # Prepare HTML tables per CLASSIFICATION (for popup)
     table_data = {}
+    table_cursors = {}
     for cls in df_user["CLASSIFICATION"].unique():
+        if table_key is not None and cls != table_key:
+            continue
         subset = df_user[df_user["CLASSIFICATION"] == cls][["Clinic", "Pt Name", "MRN", "DOB", "DOS", "Payer", "CPT", "Reason", "CATEGORY", "Denial Date", "User", "ROLE_ID"]].copy()
         subset = subset.sort_values(by="Clinic", ascending=True)
         
@@ -5306,9 +4229,12 @@ def get_user_denials_data(username):
                 # Convert to datetime if not already, handling errors
                 subset[col] = pd.to_datetime(subset[col], errors='coerce')
                 # Format to mm/dd/yyyy, replacing NaT with empty string
-                subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
+                if table_format == "html":
+                    subset[col] = subset[col].dt.strftime('%m/%d/%Y').fillna('')
         
-        table_data[cls] = subset.to_html(index=False, border=1)
+        table_data[cls], next_cursor = render_table_page(subset, cls, start, max_rows, table_format, date_format)
+        if next_cursor:
+            table_cursors[cls] = next_cursor
     
     # Create labels with counts in brackets for legend
     labels_with_counts = [f"{cat} ({count})" for cat, count in zip(df_grouped["CLASSIFICATION"], df_grouped["count"])]
@@ -5323,17 +4249,30 @@ def get_user_denials_data(username):
         "categories": js_categories,
         "counts": js_counts,
         "labels_with_counts": js_labels_with_counts,
-        "table_data": js_table_data
+        "table_data": js_table_data,
+        "table_cursors": table_cursors
     }
 
 @app.get("/user-denials-data")
-def user_denials_data(request: Request, username: str):
+def user_denials_data(request: Request, username: str, max_rows: int = None, cursor: str = None, format: str = "html", date_format: str = "iso"):
     """API endpoint to get denial data for a specific user"""
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
+    if (format not in TABLE_FORMATS and not wants_arrow(request)) or date_format not in DATE_FORMATS:
+        return JSONResponse(content={"error": "Invalid table format."}, status_code=400)
     try:
-        data = get_user_denials_data(username)
-        return JSONResponse(content=data)
+        if wants_arrow(request):
+            if pa is None:
+                return arrow_unavailable_response()
+            data = get_cached_payload("user_denials", get_user_denials_data, username, max_rows, cursor, "arrow", date_format)
+            return arrow_tables_response(data["table_data"], data["table_cursors"], {"username": username})
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = get_cached_payload("user_denials", get_user_denials_data, username, max_rows, cursor, format, date_format)
+        return etag_json_response(data, etag)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -5354,8 +4293,11 @@ def get_biweekly_comparison_data():
             "labels": []
         }
     
+    # Map CATEGORY to classification
+    df['CLASSIFICATION'] = classify_categories(df['CATEGORY'])
+    
     # Get current date
-    current_date = pd.Timestamp.now()
+    current_date = dashboard_now()
     
     # Get last 3 months
     periods = []
@@ -5421,8 +4363,11 @@ def biweekly_comparison_data(request: Request):
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
     try:
-        data = get_biweekly_comparison_data()
-        return JSONResponse(content=data)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = get_cached_payload("biweekly_comparison", get_biweekly_comparison_data)
+        return etag_json_response(data, etag)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -5443,97 +4388,11 @@ def get_monthly_comparison_data():
             "labels": []
         }
     
-    # Use the same classification map as get_chart_data
-    classification_map = {
-        "Different insurance as primary": "Inactive or Wrong policy Information",
-        "No active coverage": "Inactive or Wrong policy Information",
-        "Wrong insurance": "Inactive or Wrong policy Information",
-        "Wrong patient info": "Inactive or Wrong policy Information",
-        "Wrong policy information": "Inactive or Wrong policy Information",
-        "Prior to coverage": "Inactive or Wrong policy Information",
-        "Missing/wrong Claim information": "Inactive or Wrong policy Information",
-        "Covered under HMO Plan": "Inactive or Wrong policy Information",
-        "Patient ineligible for this service": "Inactive or Wrong policy Information",
-        "MCR paid more than MCD allowed amt": "Medicare paid more than Medicaid",
-        "Medicare paid more than Medicaid": "Medicare paid more than Medicaid",
-        "Primary paid more than sec allowed amount": "Medicare paid more than Medicaid",
-        "Invalid DOS": "Incorrect/Invalid DOS",
-        "Incorrect DOS": "Incorrect/Invalid DOS",
-        "Timely filing limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal time limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal Not Allowed": "TFL/Appeal time limit expired or not allowed",
-        "Appeal allowed": "TFL/Appeal time limit expired or not allowed",
-        "Invalid CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing main CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong/Incorrect ICD Code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with DX.code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong POS": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Invalid number of units": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with provider speciality": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing Modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "EFT enrollment pending": "Provider enrollment issue",
-        "Provider not eligible": "Provider enrollment issue",
-        "Provider not enrolled": "Provider enrollment issue",
-        "No Medicare credentialing": "Provider enrollment issue",
-        "No Medicaid credentialing": "Provider enrollment issue",
-        "Missing/invalid NPI of Billing provider in field 33a.": "Provider enrollment issue",
-        "Missing/invalid NPI of Rendering Provider in field 24J.": "Provider enrollment issue",
-        "Missing/invalid reffering Provider info": "Provider enrollment issue",
-        "Out of Network": "Out of network",
-        "Provider Out of Network": "Out of network",
-        "no authorization": "Out of network",
-        "Missing prior authorization": "Out of network",
-        "Missing referral information": "Out of network",
-        "Missing medical record": "Need additional information needed",
-        "COB missing": "Need additional information needed",
-        "Missing NDC code": "Need additional information needed",
-        "Missing documentation": "Need additional information needed",
-        "Missing EOB": "Need additional information needed",
-        "Need Add-on-code": "Need additional information needed",
-        "Need W9 form": "Need additional information needed",
-        "Accident Info required": "Need additional information needed",
-        "Missing illness information": "Need additional information needed",
-        "No Medical Necessity": "Need additional information needed",
-        "Pre-existing condition": "Need additional information needed",
-        "Itemized bill needed": "Need additional information needed",
-        "Clinical Review Determination": "Need additional information needed",
-        "Non covered service": "Non covered service",
-        "non covered submitted via paper": "Non covered service",
-        "Charges too high": "Other",
-        "Claim previously paid": "Other",
-        "Contractual obligation": "Other",
-        "Date of death precedes DOS": "Other",
-        "Duplicate claim": "Other",
-        "Exceeds clinical guidelines": "Other",
-        "Invalid redetermination": "Other",
-        "Managed care withholding": "Other",
-        "Not met residency requirement": "Other",
-        "Other": "Other",
-        "Participating Provider Discount": "Other",
-        "Patient in Hospice": "Other",
-        "Patient incarcerated": "Other",
-        "Payment made to another provider": "Other",
-        "The qualifying service has not been received": "Other",
-        "Claim Adjustment Due to Resubmission": "Incorrect Billing",
-        "Incorrect Patient Billing": "Incorrect Billing",
-        "Corrected Claim": "Incorrect Billing",
-        "Resubmit the claim": "Incorrect Billing",
-        "Invalid Taxpayer ID": "Incorrect Billing",
-        "Revised claim with new claim number": "Incorrect Billing",
-        "Invalid discharge date": "Incorrect Billing",
-        "Charges exceeded, maximum allowed": "Incorrect Billing",
-        "Negotiated discount": "Bundled service",
-        "Benefit limited": "Bundled service",
-        "Incidental Service": "Bundled service",
-        "Max benefit exceeded": "Bundled service"
-    }
-    
     # Map CATEGORY to classification
-    df['CLASSIFICATION'] = df['CATEGORY'].map(classification_map).fillna('Other')
+    df['CLASSIFICATION'] = classify_categories(df['CATEGORY'])
     
     # Get current date
-    current_date = pd.Timestamp.now()
+    current_date = dashboard_now()
     
     # Get last 6 months
     periods = []
@@ -5582,8 +4441,11 @@ def monthly_comparison_data(request: Request):
     if not request.session.get("authenticated"):
         return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
     try:
-        data = get_monthly_comparison_data()
-        return JSONResponse(content=data)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = get_cached_payload("monthly_comparison", get_monthly_comparison_data)
+        return etag_json_response(data, etag)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -5607,97 +4469,11 @@ def get_biweekly_user_comparison_data(username):
             "labels": []
         }
     
-    # Use the same classification map as get_chart_data
-    classification_map = {
-        "Different insurance as primary": "Inactive or Wrong policy Information",
-        "No active coverage": "Inactive or Wrong policy Information",
-        "Wrong insurance": "Inactive or Wrong policy Information",
-        "Wrong patient info": "Inactive or Wrong policy Information",
-        "Wrong policy information": "Inactive or Wrong policy Information",
-        "Prior to coverage": "Inactive or Wrong policy Information",
-        "Missing/wrong Claim information": "Inactive or Wrong policy Information",
-        "Covered under HMO Plan": "Inactive or Wrong policy Information",
-        "Patient ineligible for this service": "Inactive or Wrong policy Information",
-        "MCR paid more than MCD allowed amt": "Medicare paid more than Medicaid",
-        "Medicare paid more than Medicaid": "Medicare paid more than Medicaid",
-        "Primary paid more than sec allowed amount": "Medicare paid more than Medicaid",
-        "Invalid DOS": "Incorrect/Invalid DOS",
-        "Incorrect DOS": "Incorrect/Invalid DOS",
-        "Timely filing limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal time limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal Not Allowed": "TFL/Appeal time limit expired or not allowed",
-        "Appeal allowed": "TFL/Appeal time limit expired or not allowed",
-        "Invalid CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing main CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong/Incorrect ICD Code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with DX.code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong POS": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Invalid number of units": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with provider speciality": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing Modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "EFT enrollment pending": "Provider enrollment issue",
-        "Provider not eligible": "Provider enrollment issue",
-        "Provider not enrolled": "Provider enrollment issue",
-        "No Medicare credentialing": "Provider enrollment issue",
-        "No Medicaid credentialing": "Provider enrollment issue",
-        "Missing/invalid NPI of Billing provider in field 33a.": "Provider enrollment issue",
-        "Missing/invalid NPI of Rendering Provider in field 24J.": "Provider enrollment issue",
-        "Missing/invalid reffering Provider info": "Provider enrollment issue",
-        "Out of Network": "Out of network",
-        "Provider Out of Network": "Out of network",
-        "no authorization": "Out of network",
-        "Missing prior authorization": "Out of network",
-        "Missing referral information": "Out of network",
-        "Missing medical record": "Need additional information needed",
-        "COB missing": "Need additional information needed",
-        "Missing NDC code": "Need additional information needed",
-        "Missing documentation": "Need additional information needed",
-        "Missing EOB": "Need additional information needed",
-        "Need Add-on-code": "Need additional information needed",
-        "Need W9 form": "Need additional information needed",
-        "Accident Info required": "Need additional information needed",
-        "Missing illness information": "Need additional information needed",
-        "No Medical Necessity": "Need additional information needed",
-        "Pre-existing condition": "Need additional information needed",
-        "Itemized bill needed": "Need additional information needed",
-        "Clinical Review Determination": "Need additional information needed",
-        "Non covered service": "Non covered service",
-        "non covered submitted via paper": "Non covered service",
-        "Charges too high": "Other",
-        "Claim previously paid": "Other",
-        "Contractual obligation": "Other",
-        "Date of death precedes DOS": "Other",
-        "Duplicate claim": "Other",
-        "Exceeds clinical guidelines": "Other",
-        "Invalid redetermination": "Other",
-        "Managed care withholding": "Other",
-        "Not met residency requirement": "Other",
-        "Other": "Other",
-        "Participating Provider Discount": "Other",
-        "Patient in Hospice": "Other",
-        "Patient incarcerated": "Other",
-        "Payment made to another provider": "Other",
-        "The qualifying service has not been received": "Other",
-        "Claim Adjustment Due to Resubmission": "Incorrect Billing",
-        "Incorrect Patient Billing": "Incorrect Billing",
-        "Corrected Claim": "Incorrect Billing",
-        "Resubmit the claim": "Incorrect Billing",
-        "Invalid Taxpayer ID": "Incorrect Billing",
-        "Revised claim with new claim number": "Incorrect Billing",
-        "Invalid discharge date": "Incorrect Billing",
-        "Charges exceeded, maximum allowed": "Incorrect Billing",
-        "Negotiated discount": "Bundled service",
-        "Benefit limited": "Bundled service",
-        "Incidental Service": "Bundled service",
-        "Max benefit exceeded": "Bundled service"
-    }
-    
     # Map CATEGORY to classification
-    df['CLASSIFICATION'] = df['CATEGORY'].map(classification_map).fillna('Other')
+    df['CLASSIFICATION'] = classify_categories(df['CATEGORY'])
     
     # Get current date
-    current_date = pd.Timestamp.now()
+    current_date = dashboard_now()
     
     # Get last 3 months
     periods = []
@@ -5766,8 +4542,13 @@ def biweekly_user_comparison_data(request: Request):
         username = request.query_params.get('username')
         if not username:
             return JSONResponse(content={"error": "No user selected"}, status_code=400)
-        data = get_biweekly_user_comparison_data(username)
-        return JSONResponse(content=data)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = serve_payload(request, "biweekly_user_comparison", get_biweekly_user_comparison_data, username)
+        if data is None:
+            return Response(status_code=204)
+        return etag_json_response(data, etag)
     except Exception as e:
         import traceback
         return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
@@ -5791,97 +4572,11 @@ def get_monthly_user_comparison_data(username):
             "labels": []
         }
     
-    # Use the same classification map as get_chart_data
-    classification_map = {
-        "Different insurance as primary": "Inactive or Wrong policy Information",
-        "No active coverage": "Inactive or Wrong policy Information",
-        "Wrong insurance": "Inactive or Wrong policy Information",
-        "Wrong patient info": "Inactive or Wrong policy Information",
-        "Wrong policy information": "Inactive or Wrong policy Information",
-        "Prior to coverage": "Inactive or Wrong policy Information",
-        "Missing/wrong Claim information": "Inactive or Wrong policy Information",
-        "Covered under HMO Plan": "Inactive or Wrong policy Information",
-        "Patient ineligible for this service": "Inactive or Wrong policy Information",
-        "MCR paid more than MCD allowed amt": "Medicare paid more than Medicaid",
-        "Medicare paid more than Medicaid": "Medicare paid more than Medicaid",
-        "Primary paid more than sec allowed amount": "Medicare paid more than Medicaid",
-        "Invalid DOS": "Incorrect/Invalid DOS",
-        "Incorrect DOS": "Incorrect/Invalid DOS",
-        "Timely filing limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal time limit exceeded": "TFL/Appeal time limit expired or not allowed",
-        "Appeal Not Allowed": "TFL/Appeal time limit expired or not allowed",
-        "Appeal allowed": "TFL/Appeal time limit expired or not allowed",
-        "Invalid CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing main CPT code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong/Incorrect ICD Code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with DX.code": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Wrong POS": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Invalid number of units": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "CPT inconsistent with provider speciality": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "Missing Modifier": "Missing or Invalid ICD/CPT code/Modifier/POS",
-        "EFT enrollment pending": "Provider enrollment issue",
-        "Provider not eligible": "Provider enrollment issue",
-        "Provider not enrolled": "Provider enrollment issue",
-        "No Medicare credentialing": "Provider enrollment issue",
-        "No Medicaid credentialing": "Provider enrollment issue",
-        "Missing/invalid NPI of Billing provider in field 33a.": "Provider enrollment issue",
-        "Missing/invalid NPI of Rendering Provider in field 24J.": "Provider enrollment issue",
-        "Missing/invalid reffering Provider info": "Provider enrollment issue",
-        "Out of Network": "Out of network",
-        "Provider Out of Network": "Out of network",
-        "no authorization": "Out of network",
-        "Missing prior authorization": "Out of network",
-        "Missing referral information": "Out of network",
-        "Missing medical record": "Need additional information needed",
-        "COB missing": "Need additional information needed",
-        "Missing NDC code": "Need additional information needed",
-        "Missing documentation": "Need additional information needed",
-        "Missing EOB": "Need additional information needed",
-        "Need Add-on-code": "Need additional information needed",
-        "Need W9 form": "Need additional information needed",
-        "Accident Info required": "Need additional information needed",
-        "Missing illness information": "Need additional information needed",
-        "No Medical Necessity": "Need additional information needed",
-        "Pre-existing condition": "Need additional information needed",
-        "Itemized bill needed": "Need additional information needed",
-        "Clinical Review Determination": "Need additional information needed",
-        "Non covered service": "Non covered service",
-        "non covered submitted via paper": "Non covered service",
-        "Charges too high": "Other",
-        "Claim previously paid": "Other",
-        "Contractual obligation": "Other",
-        "Date of death precedes DOS": "Other",
-        "Duplicate claim": "Other",
-        "Exceeds clinical guidelines": "Other",
-        "Invalid redetermination": "Other",
-        "Managed care withholding": "Other",
-        "Not met residency requirement": "Other",
-        "Other": "Other",
-        "Participating Provider Discount": "Other",
-        "Patient in Hospice": "Other",
-        "Patient incarcerated": "Other",
-        "Payment made to another provider": "Other",
-        "The qualifying service has not been received": "Other",
-        "Claim Adjustment Due to Resubmission": "Incorrect Billing",
-        "Incorrect Patient Billing": "Incorrect Billing",
-        "Corrected Claim": "Incorrect Billing",
-        "Resubmit the claim": "Incorrect Billing",
-        "Invalid Taxpayer ID": "Incorrect Billing",
-        "Revised claim with new claim number": "Incorrect Billing",
-        "Invalid discharge date": "Incorrect Billing",
-        "Charges exceeded, maximum allowed": "Incorrect Billing",
-        "Negotiated discount": "Bundled service",
-        "Benefit limited": "Bundled service",
-        "Incidental Service": "Bundled service",
-        "Max benefit exceeded": "Bundled service"
-    }
-    
     # Map CATEGORY to classification
-    df['CLASSIFICATION'] = df['CATEGORY'].map(classification_map).fillna('Other')
+    df['CLASSIFICATION'] = classify_categories(df['CATEGORY'])
     
     # Get current date
-    current_date = pd.Timestamp.now()
+    current_date = dashboard_now()
     
     # Get last 6 months
     periods = []
@@ -5933,9 +4628,306 @@ def monthly_user_comparison_data(request: Request):
         username = request.query_params.get('username')
         if not username:
             return JSONResponse(content={"error": "No user selected"}, status_code=400)
-        data = get_monthly_user_comparison_data(username)
-        return JSONResponse(content=data)
+        etag = payload_etag(request)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        data = serve_payload(request, "monthly_user_comparison", get_monthly_user_comparison_data, username)
+        if data is None:
+            return Response(status_code=204)
+        return etag_json_response(data, etag)
     except Exception as e:
             import traceback
             return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
 
+
+# --------------------------------------------------------------------
+# Excel export
+# The dashboard builds popup workbooks in a Web Worker. Above
+# EXPORT_WORKER_MAX_ROWS rows it asks /export-table instead, which
+# rebuilds the popup's table with the same builder (restricted to one
+# category by a table cursor), applies the popup's filter and sort, and
+# writes every cell as text like the browser export does.
+EXPORT_WORKER_MAX_ROWS = int(os.getenv("EXPORT_WORKER_MAX_ROWS", "50000"))
+EXCEL_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Data endpoint the popup came from -> builder returning its columnar tables
+EXPORT_SOURCES = {
+    "button-data": lambda params, cursor: json.loads(
+        get_chart_data(None, cursor, "columnar", "iso")[3]
+    ),
+    "comparison-data": lambda params, cursor: get_comparison_data_by_period(
+        params.get("period", "daily"), params.get("date"), params.get("week_end"), None, cursor, "columnar", "iso"
+    )["table_data"],
+    "user-denials-data": lambda params, cursor: get_user_denials_data(
+        params.get("username"), None, cursor, "columnar", "iso"
+    )["table_data"],
+}
+
+def _columnar_values(column):
+    """Raw values of a columnar column, with dictionary codes resolved."""
+    if column["type"] == "dict":
+        values = column["values"]
+        return [None if code < 0 else values[code] for code in column["codes"]]
+    return column["data"]
+
+def _columnar_text(value, column_type):
+    """Cell text as the dashboard shows it (columnarCellText in columnar.js)."""
+    if value is None:
+        return ""
+    if column_type == "date":
+        return f"{value[5:7]}/{value[8:10]}/{value[:4]}"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def build_export_frame(table, sort=None, descending=False, filter_text=None):
+    """Filter and sort a columnar table the way the popup does; all cells as text."""
+    columns = table["columns"]
+    raw = {column["name"]: _columnar_values(column) for column in columns}
+    text = pd.DataFrame({
+        column["name"]: [_columnar_text(value, column["type"]) for value in raw[column["name"]]]
+        for column in columns
+    })
+    order = list(range(table["row_count"]))
+    if sort in raw:
+        keys = raw[sort]
+        present = [i for i in order if keys[i] is not None]
+        missing = [i for i in order if keys[i] is None]
+        # Missing values last in both directions; ties keep their order
+        present.sort(key=lambda i: keys[i], reverse=descending)
+        order = present + missing
+    text = text.iloc[order]
+    if filter_text:
+        needle = filter_text.strip().lower()
+        mask = pd.Series(False, index=text.index)
+        for name in text.columns:
+            mask |= text[name].str.lower().str.contains(needle, regex=False)
+        text = text[mask]
+    return text
+
+def write_excel(frame) -> bytes:
+    """Write frame to an .xlsx sheet named Data with columns sized to their text."""
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        frame.to_excel(writer, sheet_name="Data", index=False)
+        sheet = writer.sheets["Data"]
+        for position, name in enumerate(frame.columns, start=1):
+            width = max([10, len(str(name))] + [len(value) for value in frame[name]])
+            sheet.column_dimensions[get_column_letter(position)].width = width + 3
+    return buffer.getvalue()
+
+@app.get("/export-table")
+def export_table(request: Request, source: str, category: str, sort: str = None, descending: str = "0", filter: str = None, filename: str = None):
+    """Excel download of one popup table, for tables too large to export in the browser."""
+    if not request.session.get("authenticated"):
+        return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
+    if source not in EXPORT_SOURCES:
+        return JSONResponse(content={"error": f"Unknown export source: {source}"}, status_code=400)
+    if get_column_letter is None:
+        return JSONResponse(content={"error": "Excel export requires openpyxl on the server."}, status_code=501)
+    try:
+        tables = EXPORT_SOURCES[source](request.query_params, encode_table_cursor(category, 0))
+        if category not in tables:
+            return JSONResponse(content={"error": f"No table for category: {category}"}, status_code=404)
+        frame = build_export_frame(tables[category], sort, descending == "1", filter)
+        content = write_excel(frame)
+        safe_name = "".join(ch if ch.isalnum() or ch in "._-" else "_" for ch in (filename or f"{category}.xlsx"))
+        return Response(
+            content=content,
+            media_type=EXCEL_MEDIA_TYPE,
+            headers={"Content-Disposition": f'attachment; filename="{safe_name}"'},
+        )
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+    except Exception as e:
+        import traceback
+        return JSONResponse(content={"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
+
+
+# --------------------------------------------------------------------
+# Background refresh scheduler
+# One worker per host holds LEADER_LOCK_FILE and reloads DAILY_DENIALS on a
+# cadence, publishing the snapshot to SNAPSHOT_FILE. Every worker picks up
+# the published snapshot and rebuilds its precomputed chart payloads;
+# between refreshes they also adopt snapshots published after uploads.
+# Without fcntl or pyarrow there is no publishing and every worker reloads
+# on its own. The same cycle also runs just after midnight, when
+# "yesterday" and the 1-15 / 16-end biweekly windows roll over.
+REFRESH_SCHEDULER_ENABLED = os.getenv("REFRESH_SCHEDULER_ENABLED", "1") == "1"
+REFRESH_INTERVAL_SECONDS = int(os.getenv("REFRESH_INTERVAL_SECONDS", "300"))
+REFRESH_JITTER_SECONDS = int(os.getenv("REFRESH_JITTER_SECONDS", "30"))
+BOUNDARY_DELAY_SECONDS = int(os.getenv("BOUNDARY_DELAY_SECONDS", "5"))
+LEADER_LOCK_FILE = os.path.join(SNAPSHOT_DIR, "leader.lock")
+# How often every worker checks SNAPSHOT_FILE for a snapshot published
+# between refreshes (after an upload); 0 leaves that to the refresh cycle
+SNAPSHOT_WATCH_SECONDS = float(os.getenv("SNAPSHOT_WATCH_SECONDS", "5"))
+
+try:
+    import fcntl
+except ImportError:  # Windows: every worker refreshes on its own
+    fcntl = None
+SNAPSHOT_PUBLISHING = fcntl is not None and pa is not None
+
+_scheduler_state = {"tasks": [], "lock_file": None}
+
+# Payloads that do not depend on request parameters, rebuilt after every refresh
+PRECOMPUTED_PAYLOADS = [
+    ("chart", get_chart_data, (None, None, "html", "iso")),
+    ("chart", get_chart_data, (None, None, "columnar", "iso")),
+    ("comparison", get_comparison_data_by_period, ("daily", None, None, None, None, "columnar", "iso")),
+    ("comparison", get_comparison_data_by_period, ("biweekly", None, None, None, None, "columnar", "iso")),
+    ("comparison", get_comparison_data_by_period, ("monthly", None, None, None, None, "columnar", "iso")),
+    ("denials_comparison", get_denials_comparison_data, (None, None, "columnar", "iso")),
+    ("denials_biweekly_comparison", get_denials_biweekly_comparison_data, ()),
+    ("denials_monthly_comparison", get_denials_monthly_comparison_data, ()),
+    ("monthly_comparison", get_monthly_comparison_data, ()),
+    ("clarification_grouping", get_clarification_grouping_data, ()),
+    ("clarification_type", get_clarification_type_data, ()),
+    ("users_by_role", get_users_by_role, ()),
+]
+
+def try_acquire_leadership() -> bool:
+    """Take the cross-worker leader lock without blocking; keep it once held."""
+    if _scheduler_state["lock_file"] is not None:
+        return True
+    if not SNAPSHOT_PUBLISHING:
+        return True
+    ensure_snapshot_dir()
+    lock_file = open(LEADER_LOCK_FILE, "a")
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _scheduler_state["lock_file"] = lock_file
+    return True
+
+def release_leadership():
+    """Release the leader lock so another worker can take over."""
+    lock_file = _scheduler_state["lock_file"]
+    if lock_file is not None:
+        _scheduler_state["lock_file"] = None
+        lock_file.close()
+
+def precompute_payloads():
+    """Build the parameterless chart payloads against the current snapshot."""
+    for name, builder, args in PRECOMPUTED_PAYLOADS:
+        try:
+            get_cached_payload(name, builder, *args)
+        except Exception as exc:
+            print(f"precompute {name}{args} error: {exc}")
+
+def run_refresh_cycle():
+    """Refresh the snapshot (leader) or adopt the published one (followers)."""
+    if try_acquire_leadership():
+        refresh_denials_snapshot(publish=SNAPSHOT_PUBLISHING)
+    else:
+        load_published_snapshot()
+    precompute_payloads()
+
+def adopt_published_snapshot():
+    """Adopt a snapshot another worker published and rebuild the payloads for it."""
+    if load_published_snapshot():
+        precompute_payloads()
+
+def seconds_until_next_boundary(now=None) -> float:
+    """Seconds until the next midnight plus BOUNDARY_DELAY_SECONDS.
+
+    Midnight covers every calendar rollover the dashboard uses: the daily
+    "yesterday" view, the biweekly windows on the 1st and 16th, and months.
+    """
+    now = now or datetime.now()
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (next_midnight - now).total_seconds() + BOUNDARY_DELAY_SECONDS
+
+async def _run_refresh_cycle_safely(reason: str):
+    try:
+        await asyncio.to_thread(run_refresh_cycle)
+    except Exception as exc:
+        print(f"refresh ({reason}) error: {exc}")
+
+async def periodic_refresh_loop():
+    """Refresh on REFRESH_INTERVAL_SECONDS with jitter so workers do not align."""
+    while True:
+        await _run_refresh_cycle_safely("interval")
+        delay = REFRESH_INTERVAL_SECONDS + random.uniform(0, REFRESH_JITTER_SECONDS)
+        await asyncio.sleep(delay)
+
+async def calendar_boundary_loop():
+    """Refresh just after each midnight so date-window payloads roll over."""
+    while True:
+        await asyncio.sleep(seconds_until_next_boundary() + random.uniform(0, REFRESH_JITTER_SECONDS))
+        await _run_refresh_cycle_safely("boundary")
+
+async def snapshot_watch_loop():
+    """Check SNAPSHOT_FILE every SNAPSHOT_WATCH_SECONDS; reading its version is cheap."""
+    while True:
+        await asyncio.sleep(SNAPSHOT_WATCH_SECONDS)
+        try:
+            await asyncio.to_thread(adopt_published_snapshot)
+        except Exception as exc:
+            print(f"snapshot watch error: {exc}")
+
+@app.on_event("startup")
+async def start_refresh_scheduler():
+    """Start the background refresh tasks."""
+    if not REFRESH_SCHEDULER_ENABLED:
+        return
+    _scheduler_state["tasks"] = [
+        asyncio.create_task(periodic_refresh_loop()),
+        asyncio.create_task(calendar_boundary_loop()),
+    ]
+    if SNAPSHOT_PUBLISHING and SNAPSHOT_WATCH_SECONDS > 0:
+        _scheduler_state["tasks"].append(asyncio.create_task(snapshot_watch_loop()))
+
+@app.on_event("startup")
+async def bootstrap_schema_on_startup():
+    """Create the app's tables before serving, so logins run no DDL."""
+    try:
+        await asyncio.to_thread(data_source.bootstrap_schema)
+    except Exception as exc:
+        # Not fatal: the first login retries the bootstrap
+        print(f"bootstrap_schema error: {exc}")
+
+@app.on_event("shutdown")
+async def stop_refresh_scheduler():
+    """Cancel the background refresh tasks and hand over leadership."""
+    for task in _scheduler_state["tasks"]:
+        task.cancel()
+    _scheduler_state["tasks"] = []
+    release_leadership()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Dashboard maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("bootstrap-schema", help="create the users table if it does not exist")
+    users = commands.add_parser("import-users", help="create the accounts in a username,password CSV")
+    users.add_argument("csv_path")
+    migrate = commands.add_parser("migrate-indexes", help="create and verify the DAILY_DENIALS indexes")
+    migrate.add_argument("--check", action="store_true", help="only report; do not create missing indexes")
+    args = parser.parse_args()
+    if args.command == "bootstrap-schema":
+        data_source.bootstrap_schema()
+        print(f"schema verified ({type(data_source).__name__})")
+    elif args.command == "import-users":
+        with open(args.csv_path, "rb") as handle:
+            result = import_users(read_user_import(handle.read()))
+        print(f"created {len(result['created'])}, already existed {len(result['existing'])}, "
+              f"invalid {len(result['invalid'])}")
+        for name in result["existing"]:
+            print(f"  exists: {name}")
+        for entry in result["invalid"]:
+            print(f"  invalid: {entry['username']!r}: {entry['error']}")
+        raise SystemExit(1 if result["invalid"] else 0)
+    elif args.command == "migrate-indexes":
+        report = migrate_denials_indexes(apply=not args.check)
+        for entry in report:
+            print(f"{entry['index']:<28} ({', '.join(entry['columns'])}): {entry['status']}; "
+                  f"{'used' if entry['used_by_query'] else 'NOT used'} by its sample query "
+                  f"(plan reads {', '.join(entry['plan_indexes']) or 'no index'})")
+        print("These indexes serve external and ad-hoc queries on DAILY_DENIALS; the dashboard "
+              "loads the full table into its snapshot and does not use them.")
+        problems = [entry for entry in report
+                    if entry["status"] not in ("present", "created") or not entry["used_by_query"]]
+        raise SystemExit(1 if problems else 0)
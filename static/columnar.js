@@ -0,0 +1,33 @@
+// Cell text for columnar popup tables. Loaded by the dashboard page and
+// by excel-worker.js, so it must not touch the DOM.
+function formatColumnarDate(value, unit) {
+    if (value === null || value === undefined) {
+        return '';
+    }
+    var d = unit === 'ms' ? new Date(value) : null;
+    var y, m, day;
+    if (d) {
+        y = d.getUTCFullYear();
+        m = d.getUTCMonth() + 1;
+        day = d.getUTCDate();
+    } else {
+        y = value.substring(0, 4);
+        m = value.substring(5, 7);
+        day = value.substring(8, 10);
+    }
+    return ('0' + m).slice(-2) + '/' + ('0' + day).slice(-2) + '/' + y;
+}
+
+function columnarCellText(column, rowIndex) {
+    var value;
+    if (column.type === 'dict') {
+        var code = column.codes[rowIndex];
+        value = code < 0 ? null : column.values[code];
+    } else {
+        value = column.data[rowIndex];
+    }
+    if (column.type === 'date') {
+        return formatColumnarDate(value, column.unit);
+    }
+    return value === null || value === undefined ? '' : String(value);
+}
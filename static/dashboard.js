@@ -0,0 +1,3369 @@
+// Plotly is loaded on first use and xlsx only inside the Excel worker;
+// their URLs come from the data-* attributes on this script's tag.
+// Hovering a menu adds a preload hint so the bundle is usually in the
+// cache by the time it is needed.
+var dashboardScript = document.currentScript;
+var vendorScripts = {};
+
+function scriptData(name) {
+    return dashboardScript ? dashboardScript.getAttribute('data-' + name) : null;
+}
+
+function loadVendorScript(name, globalName) {
+    if (window[globalName]) {
+        return Promise.resolve(window[globalName]);
+    }
+    if (!vendorScripts[name]) {
+        vendorScripts[name] = new Promise(function(resolve, reject) {
+            var script = document.createElement('script');
+            script.src = scriptData(name);
+            script.onload = function() {
+                performance.mark(name + '-loaded');
+                resolve(window[globalName]);
+            };
+            script.onerror = function() {
+                delete vendorScripts[name];
+                reject(new Error('Failed to load ' + name));
+            };
+            document.head.appendChild(script);
+        });
+    }
+    return vendorScripts[name];
+}
+
+function loadPlotly() {
+    return loadVendorScript('plotly', 'Plotly');
+}
+
+var preloadedBundles = {};
+function preloadVendorScript(name) {
+    if (preloadedBundles[name] || vendorScripts[name]) {
+        return;
+    }
+    preloadedBundles[name] = true;
+    var link = document.createElement('link');
+    link.rel = 'preload';
+    link.as = 'script';
+    link.href = scriptData(name);
+    document.head.appendChild(link);
+}
+
+// Chart datasets are cached per URL (endpoint plus query string) together
+// with the ETag the server sent. Within CHART_DATA_FRESH_MS a cached
+// dataset is reused without a request; after that it is revalidated with
+// If-None-Match and reused when the server answers 304.
+//
+// Behind the in-memory cache, datasets persist in IndexedDB keyed by URL
+// and stamped with the server's data version (X-Data-Version). When the
+// /data-version probe reports the same version, a persisted dataset is
+// shown at once and revalidated in the background. Records are stamped
+// with the signed-in analyst (data-dataset-owner): another analyst's
+// records are never read and are pruned on load, and a 401 from any
+// request (an expired session) clears the store and returns to login.
+var CHART_DATA_FRESH_MS = 60000;
+var CHART_DATA_CACHE_SIZE = 50;
+var DATA_VERSION_TTL_MS = 30000;
+var DATASET_DB_NAME = 'dashboard-datasets';
+var DATASET_MAX_AGE_MS = 7 * 24 * 60 * 60 * 1000;
+var chartDataCache = new Map();
+var dataVersionProbe = null;
+var datasetDb = null;
+var datasetOwner = scriptData('dataset-owner') || '';
+
+function hasChartData(url) {
+    return chartDataCache.has(url);
+}
+
+function rememberChartData(url, record) {
+    chartDataCache.delete(url);
+    chartDataCache.set(url, record);
+    if (chartDataCache.size > CHART_DATA_CACHE_SIZE) {
+        chartDataCache.delete(chartDataCache.keys().next().value);
+    }
+}
+
+function getDataVersion() {
+    if (!dataVersionProbe || Date.now() - dataVersionProbe.probedAt > DATA_VERSION_TTL_MS) {
+        dataVersionProbe = {
+            probedAt: Date.now(),
+            version: dashboardFetch('/data-version', { cache: 'no-store' })
+                .then(response => response.ok ? response.json() : {})
+                .then(body => body.version || null)
+                .catch(() => null)
+        };
+    }
+    return dataVersionProbe.version;
+}
+
+// IndexedDB is optional (private windows, old browsers): every helper
+// resolves to null or does nothing when it is unavailable.
+function openDatasetDb() {
+    if (!datasetDb) {
+        datasetDb = new Promise(function(resolve) {
+            if (!window.indexedDB) {
+                resolve(null);
+                return;
+            }
+            var request = indexedDB.open(DATASET_DB_NAME, 1);
+            request.onupgradeneeded = function() {
+                request.result.createObjectStore('datasets', { keyPath: 'url' });
+            };
+            request.onsuccess = function() {
+                resolve(request.result);
+            };
+            request.onerror = function() {
+                resolve(null);
+            };
+        });
+    }
+    return datasetDb;
+}
+
+function readDataset(url) {
+    return openDatasetDb().then(function(db) {
+        if (!db) {
+            return null;
+        }
+        return new Promise(function(resolve) {
+            var request = db.transaction('datasets').objectStore('datasets').get(url);
+            request.onsuccess = function() {
+                var stored = request.result;
+                resolve(stored && stored.owner === datasetOwner ? stored : null);
+            };
+            request.onerror = function() {
+                resolve(null);
+            };
+        });
+    }).catch(() => null);
+}
+
+function persistDataset(url, record) {
+    openDatasetDb().then(function(db) {
+        if (db) {
+            db.transaction('datasets', 'readwrite').objectStore('datasets').put({
+                url: url,
+                owner: datasetOwner,
+                etag: record.etag,
+                version: record.version,
+                data: record.data,
+                storedAt: Date.now()
+            });
+        }
+    }).catch(function(error) {
+        console.warn('Could not persist dataset:', error);
+    });
+}
+
+function pruneDatasets() {
+    openDatasetDb().then(function(db) {
+        if (!db) {
+            return;
+        }
+        var cutoff = Date.now() - DATASET_MAX_AGE_MS;
+        var request = db.transaction('datasets', 'readwrite').objectStore('datasets').openCursor();
+        request.onsuccess = function() {
+            var cursor = request.result;
+            if (cursor) {
+                if (cursor.value.storedAt < cutoff || cursor.value.owner !== datasetOwner) {
+                    cursor.delete();
+                }
+                cursor.continue();
+            }
+        };
+    }).catch(function() {});
+}
+
+// Datasets contain patient details, so they do not outlive the session.
+function clearDatasets() {
+    if (datasetDb) {
+        datasetDb.then(function(db) {
+            if (db) {
+                db.close();
+            }
+        });
+        datasetDb = null;
+    }
+    if (window.indexedDB) {
+        indexedDB.deleteDatabase(DATASET_DB_NAME);
+    }
+}
+
+// fetch() for the dashboard's own endpoints. A 401 means the session
+// expired, so cached datasets are dropped before going back to login.
+function dashboardFetch(url, options) {
+    return fetch(url, options).then(function(response) {
+        if (response.status === 401) {
+            chartDataCache.clear();
+            clearDatasets();
+            window.location.href = '/';
+        }
+        return response;
+    });
+}
+
+function fetchChartDataset(url, cached) {
+    var headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+    return dashboardFetch(url, { headers: headers }).then(function(response) {
+        if (response.status === 304 && cached) {
+            cached.fetchedAt = Date.now();
+            rememberChartData(url, cached);
+            return cached.data;
+        }
+        return response.json().then(function(data) {
+            var etag = response.headers.get('ETag');
+            chartDataCache.delete(url);
+            if (response.ok && etag) {
+                var record = {
+                    etag: etag,
+                    version: response.headers.get('X-Data-Version'),
+                    data: data,
+                    fetchedAt: Date.now()
+                };
+                rememberChartData(url, record);
+                persistDataset(url, record);
+            }
+            return data;
+        });
+    });
+}
+
+function requestChartData(url) {
+    if (pendingPrefetches.has(url)) {
+        // Let the prefetch land rather than fetching the same URL twice
+        return pendingPrefetches.get(url).then(function() {
+            return requestChartData(url);
+        });
+    }
+    var cached = chartDataCache.get(url);
+    notePrefetchHit(cached);
+    if (cached && Date.now() - cached.fetchedAt < CHART_DATA_FRESH_MS) {
+        return Promise.resolve(cached.data);
+    }
+    if (cached) {
+        return fetchChartDataset(url, cached);
+    }
+    return Promise.all([readDataset(url), getDataVersion()]).then(function(results) {
+        var stored = results[0];
+        var version = results[1];
+        if (!stored) {
+            return fetchChartDataset(url, null);
+        }
+        var record = { etag: stored.etag, version: stored.version, data: stored.data, fetchedAt: 0 };
+        if (version && stored.version === version) {
+            rememberChartData(url, record);
+            fetchChartDataset(url, record).catch(function(error) {
+                console.warn('Background revalidation failed:', error);
+            });
+            return stored.data;
+        }
+        return fetchChartDataset(url, record);
+    });
+}
+
+// Predictive prefetch. After a dataset is shown, the datasets people
+// usually open next are fetched at low priority while the browser is
+// idle, so the next click is served from chartDataCache. Prefetch
+// requests carry "X-Prefetch: 1"; the server answers 204 instead
+// of building a payload it does not have yet (it warms it in the
+// background), and those responses are simply not cached.
+var PREFETCH_NEXT = [
+    { after: /^\/button-data\b/, next: function() {
+        return ['/denials-comparison-data?format=columnar'];
+    } },
+    { after: /^\/denials-comparison-data\b/, next: function() {
+        return ['/denials-biweekly-comparison-data', '/denials-monthly-comparison-data'];
+    } },
+    { after: /^\/user-denials-data\?username=([^&]*)/, next: function(match) {
+        return [
+            '/biweekly-user-comparison-data?username=' + match[1],
+            '/monthly-user-comparison-data?username=' + match[1]
+        ];
+    } }
+];
+var prefetchStats = { issued: 0, hits: 0, reported: { issued: 0, hits: 0 } };
+var pendingPrefetches = new Map();
+
+function whenIdle(callback) {
+    if (window.requestIdleCallback) {
+        requestIdleCallback(callback, { timeout: 2000 });
+    } else {
+        setTimeout(callback, 0);
+    }
+}
+
+function prefetchChartData(url) {
+    if (chartDataCache.has(url) || pendingPrefetches.has(url)) {
+        return;
+    }
+    prefetchStats.issued++;
+    var prefetch = dashboardFetch(url, { priority: 'low', headers: { 'X-Prefetch': '1' } })
+        .then(function(response) {
+            var etag = response.headers.get('ETag');
+            if (response.status !== 200 || !etag) {
+                return;
+            }
+            return response.json().then(function(data) {
+                var record = {
+                    etag: etag,
+                    version: response.headers.get('X-Data-Version'),
+                    data: data,
+                    fetchedAt: Date.now(),
+                    prefetched: true
+                };
+                rememberChartData(url, record);
+                persistDataset(url, record);
+            });
+        })
+        .catch(function() {})
+        .then(function() {
+            pendingPrefetches.delete(url);
+        });
+    pendingPrefetches.set(url, prefetch);
+}
+
+function prefetchLikelyNext(url) {
+    PREFETCH_NEXT.forEach(function(rule) {
+        var match = url.match(rule.after);
+        if (match) {
+            whenIdle(function() {
+                rule.next(match).forEach(prefetchChartData);
+            });
+        }
+    });
+}
+
+function notePrefetchHit(record) {
+    if (record && record.prefetched) {
+        record.prefetched = false;
+        prefetchStats.hits++;
+    }
+}
+
+function reportPrefetchStats() {
+    var report = {
+        prefetch_issued: prefetchStats.issued - prefetchStats.reported.issued,
+        prefetch_hits: prefetchStats.hits - prefetchStats.reported.hits
+    };
+    if (report.prefetch_issued > 0 && navigator.sendBeacon) {
+        navigator.sendBeacon('/cache-stats', new Blob([JSON.stringify(report)], { type: 'application/json' }));
+        prefetchStats.reported = { issued: prefetchStats.issued, hits: prefetchStats.hits };
+    }
+}
+
+// Fetch a chart endpoint's JSON while Plotly loads in parallel.
+function fetchChartData(url) {
+    return Promise.all([
+        requestChartData(url),
+        loadPlotly()
+    ]).then(function(results) {
+        prefetchLikelyNext(url);
+        return results[0];
+    });
+}
+
+// Chart manager: a #chart div that already holds a plot is updated in
+// place with Plotly.react instead of being torn down and redrawn.
+var PLOT_EVENTS = ['plotly_click', 'plotly_hover', 'plotly_unhover'];
+
+function isLivePlot(chartDiv) {
+    return !!(chartDiv && chartDiv._fullLayout && chartDiv.querySelector('.main-svg'));
+}
+
+function plotChart(target, traces, layout, config) {
+    var chartDiv = typeof target === 'string' ? document.getElementById(target) : target;
+    if (isLivePlot(chartDiv)) {
+        // Render functions attach their handlers again after every plot
+        PLOT_EVENTS.forEach(function(name) {
+            chartDiv.removeAllListeners(name);
+        });
+        return Plotly.react(chartDiv, traces, layout, config);
+    }
+    return Plotly.newPlot(chartDiv, traces, layout, config);
+}
+
+// Show a spinner in chartDiv unless url's data is already cached, in
+// which case the current plot stays up until it is reacted to new data.
+function showChartLoading(chartDiv, url, message) {
+    if (hasChartData(url) && isLivePlot(chartDiv)) {
+        return;
+    }
+    if (chartDiv._fullLayout) {
+        Plotly.purge(chartDiv);
+    }
+    chartDiv.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>' + message + '</p></div>';
+}
+
+// Remove a spinner or message from chartDiv but keep a live plot.
+function clearChartMessage(chartDiv) {
+    if (!isLivePlot(chartDiv)) {
+        chartDiv.innerHTML = '';
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('.menu-item').forEach(function(item) {
+        item.addEventListener('mouseenter', function() {
+            preloadVendorScript('plotly');
+        });
+    });
+    // Popups are rebuilt per chart, so watch for the download button by delegation
+    document.addEventListener('mouseover', function(event) {
+        if (event.target.id === 'download') {
+            preloadVendorScript('xlsx');
+        }
+    });
+    var logoutForm = document.querySelector('.logout-link form');
+    if (logoutForm) {
+        logoutForm.addEventListener('submit', clearDatasets);
+    }
+    pruneDatasets();
+    document.addEventListener('visibilitychange', function() {
+        if (document.visibilityState === 'hidden') {
+            reportPrefetchStats();
+        } else {
+            // Notice a session that expired while the tab was in the background
+            getDataVersion();
+        }
+    });
+    performance.mark('dashboard-interactive');
+    console.info('dashboard interactive after ' + Math.round(performance.now()) + ' ms');
+});
+
+// Popup tables arrive either as HTML strings or, when requested with
+// format=columnar, as {columns: [...]} with dictionary-encoded text
+// columns and ISO dates. Both render to the same table markup; cell text
+// for columnar tables comes from columnar.js, shared with the Excel worker.
+function escapeCellHtml(value) {
+    return String(value).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+}
+
+function renderColumnarTable(table, rowOrder) {
+    var columns = table.columns || [];
+    var parts = ['<table border="1" class="dataframe"><thead><tr style="text-align: right;">'];
+    columns.forEach(function(column) {
+        parts.push('<th>' + escapeCellHtml(column.name) + '</th>');
+    });
+    parts.push('</tr></thead><tbody>');
+    for (var r = 0; r < table.row_count; r++) {
+        parts.push('<tr>');
+        var rowIndex = rowOrder ? rowOrder[r] : r;
+        for (var c = 0; c < columns.length; c++) {
+            parts.push('<td>' + escapeCellHtml(columnarCellText(columns[c], rowIndex)) + '</td>');
+        }
+        parts.push('</tr>');
+    }
+    parts.push('</tbody></table>');
+    return parts.join('');
+}
+
+function renderPopupTable(table) {
+    if (!table) {
+        return '<p>No data available for this category</p>';
+    }
+    if (typeof table === 'string') {
+        return table;
+    }
+    return renderColumnarTable(table);
+}
+
+// Virtualized popup tables. A columnar table is kept as a data array and
+// only the rows inside the scroll viewport (plus POPUP_TABLE_OVERSCAN
+// above and below) are in the DOM; spacer rows stand in for the rest.
+// Sorting and filtering reorder an array of row indices.
+var POPUP_ROW_HEIGHT = 33;
+var POPUP_TABLE_OVERSCAN = 10;
+var popupFrameTimes = [];
+
+function columnSortKey(column, rowIndex) {
+    if (column.type === 'dict') {
+        return column.codes[rowIndex] < 0 ? null : column.values[column.codes[rowIndex]];
+    }
+    return column.data[rowIndex];
+}
+
+function compareSortKeys(a, b) {
+    if (a === b) {
+        return 0;
+    }
+    // Missing values sort last in both directions
+    if (a === null || a === undefined) {
+        return 1;
+    }
+    if (b === null || b === undefined) {
+        return -1;
+    }
+    return a < b ? -1 : 1;
+}
+
+function estimateColumnWidths(table) {
+    var sampleRows = Math.min(table.row_count, 200);
+    return table.columns.map(function(column) {
+        var longest = String(column.name).length;
+        for (var r = 0; r < sampleRows; r++) {
+            longest = Math.max(longest, columnarCellText(column, r).length);
+        }
+        return Math.min(Math.max(longest, 6), 40) + 3;
+    });
+}
+
+// exportSource holds the data endpoint and query parameters the table
+// came from, so large exports can be rebuilt by /export-table.
+function mountPopupTable(container, table, exportSource) {
+    container.exportSource = exportSource || null;
+    if (!table || typeof table === 'string' || !table.columns) {
+        container.popupTable = null;
+        container.innerHTML = renderPopupTable(table);
+        return;
+    }
+    var columns = table.columns;
+    var state = {
+        table: table,
+        rows: [],
+        allRows: [],
+        sortColumn: -1,
+        sortDescending: false,
+        filterText: '',
+        rendered: null,
+        pendingFrame: 0,
+        rowHeight: POPUP_ROW_HEIGHT
+    };
+    for (var r = 0; r < table.row_count; r++) {
+        state.allRows.push(r);
+    }
+    state.rows = state.allRows;
+    container.popupTable = state;
+
+    var widths = estimateColumnWidths(table);
+    var head = ['<table border="1" class="dataframe popup-virtual-table"><colgroup>'];
+    widths.forEach(function(width) {
+        head.push('<col style="width: ' + width + 'ch;">');
+    });
+    head.push('</colgroup><thead><tr style="text-align: right;">');
+    columns.forEach(function(column, index) {
+        head.push('<th data-column="' + index + '">' + escapeCellHtml(column.name) + '<span class="sort-indicator"></span></th>');
+    });
+    head.push('</tr></thead><tbody></tbody></table>');
+    container.innerHTML = '<div class="popup-table-toolbar"><input type="search" class="popup-table-filter" placeholder="Filter rows..."><span class="popup-table-count"></span></div>'
+        + '<div class="popup-table-viewport">' + head.join('') + '</div>';
+
+    state.viewport = container.querySelector('.popup-table-viewport');
+    state.body = container.querySelector('tbody');
+    state.count = container.querySelector('.popup-table-count');
+    state.viewport.addEventListener('scroll', function() {
+        schedulePopupTableRender(state);
+    });
+    container.querySelector('thead').addEventListener('click', function(event) {
+        var th = event.target.closest('th');
+        if (th) {
+            sortPopupTable(container, Number(th.getAttribute('data-column')));
+        }
+    });
+    container.querySelector('.popup-table-filter').addEventListener('input', function(event) {
+        filterPopupTable(container, event.target.value);
+    });
+    renderPopupTableWindow(state);
+    // Spacer heights assume a fixed row height; use the rendered one
+    var firstRow = state.body.querySelector('tr:not(.popup-table-spacer)');
+    if (firstRow && firstRow.offsetHeight && firstRow.offsetHeight !== state.rowHeight) {
+        state.rowHeight = firstRow.offsetHeight;
+        state.rendered = null;
+        renderPopupTableWindow(state);
+    }
+}
+
+function schedulePopupTableRender(state) {
+    if (!state.pendingFrame) {
+        state.pendingFrame = requestAnimationFrame(function() {
+            state.pendingFrame = 0;
+            renderPopupTableWindow(state);
+        });
+    }
+}
+
+function renderPopupTableWindow(state) {
+    var started = performance.now();
+    var total = state.rows.length;
+    var visible = Math.ceil(state.viewport.clientHeight / state.rowHeight) || 30;
+    var first = Math.max(0, Math.min(Math.floor(state.viewport.scrollTop / state.rowHeight), total - visible) - POPUP_TABLE_OVERSCAN);
+    var last = Math.min(total, first + visible + 2 * POPUP_TABLE_OVERSCAN);
+    if (state.rendered && state.rendered.first === first && state.rendered.last === last && state.rendered.rows === state.rows) {
+        return;
+    }
+    state.rendered = { first: first, last: last, rows: state.rows };
+
+    var columns = state.table.columns;
+    var parts = [];
+    if (first > 0) {
+        parts.push('<tr class="popup-table-spacer" style="height: ' + (first * state.rowHeight) + 'px;"></tr>');
+    }
+    for (var i = first; i < last; i++) {
+        var rowIndex = state.rows[i];
+        parts.push('<tr>');
+        for (var c = 0; c < columns.length; c++) {
+            parts.push('<td>' + escapeCellHtml(columnarCellText(columns[c], rowIndex)) + '</td>');
+        }
+        parts.push('</tr>');
+    }
+    if (last < total) {
+        parts.push('<tr class="popup-table-spacer" style="height: ' + ((total - last) * state.rowHeight) + 'px;"></tr>');
+    }
+    state.body.innerHTML = parts.join('');
+    state.count.textContent = total === state.table.row_count
+        ? total + ' rows'
+        : total + ' of ' + state.table.row_count + ' rows';
+    popupFrameTimes.push(performance.now() - started);
+    if (popupFrameTimes.length > 500) {
+        popupFrameTimes.shift();
+    }
+}
+
+function sortPopupTable(container, columnIndex) {
+    var state = container.popupTable;
+    var column = state.table.columns[columnIndex];
+    state.sortDescending = state.sortColumn === columnIndex ? !state.sortDescending : false;
+    state.sortColumn = columnIndex;
+    var direction = state.sortDescending ? -1 : 1;
+    var keys = new Array(state.table.row_count);
+    state.allRows.forEach(function(rowIndex) {
+        keys[rowIndex] = columnSortKey(column, rowIndex);
+    });
+    state.allRows = state.allRows.slice().sort(function(a, b) {
+        var ka = keys[a], kb = keys[b];
+        if (ka === null || ka === undefined || kb === null || kb === undefined) {
+            return compareSortKeys(ka, kb) || a - b;
+        }
+        return direction * compareSortKeys(ka, kb) || a - b;
+    });
+    container.querySelectorAll('.sort-indicator').forEach(function(indicator, index) {
+        indicator.textContent = index === columnIndex ? (state.sortDescending ? ' \u25BC' : ' \u25B2') : '';
+    });
+    applyPopupTableFilter(state);
+}
+
+function filterPopupTable(container, text) {
+    var state = container.popupTable;
+    state.filterText = text.trim().toLowerCase();
+    applyPopupTableFilter(state);
+}
+
+function applyPopupTableFilter(state) {
+    var needle = state.filterText;
+    if (!needle) {
+        state.rows = state.allRows;
+    } else {
+        var columns = state.table.columns;
+        state.rows = state.allRows.filter(function(rowIndex) {
+            for (var c = 0; c < columns.length; c++) {
+                if (columnarCellText(columns[c], rowIndex).toLowerCase().indexOf(needle) !== -1) {
+                    return true;
+                }
+            }
+            return false;
+        });
+    }
+    state.viewport.scrollTop = 0;
+    state.rendered = null;
+    renderPopupTableWindow(state);
+}
+
+// Excel export. Workbooks are built in excel-worker.js from the columnar
+// data in the popup's current filter and sort order, so the page stays
+// responsive. Tables over EXPORT_WORKER_MAX_ROWS rows are exported by the
+// server instead.
+var EXCEL_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet';
+var EXPORT_WORKER_MAX_ROWS = Number(scriptData('export-max-rows')) || 50000;
+
+// HTML popups have no columnar data; read their cells into a string table.
+function tableElementToColumnar(table) {
+    var headers = Array.prototype.map.call(table.querySelectorAll('thead th'), function(th) {
+        return th.textContent;
+    });
+    var columns = headers.map(function(name) {
+        return { name: name, type: 'string', data: [] };
+    });
+    var bodyRows = table.querySelectorAll('tbody tr');
+    Array.prototype.forEach.call(bodyRows, function(tr) {
+        Array.prototype.forEach.call(tr.cells, function(td, c) {
+            if (columns[c]) {
+                columns[c].data.push(td.textContent);
+            }
+        });
+    });
+    return { columns: columns, row_count: bodyRows.length };
+}
+
+function setExportProgress(container, fraction) {
+    var popup = container.closest('#popup');
+    var button = popup ? popup.querySelector('#download') : null;
+    if (!button) {
+        return;
+    }
+    if (fraction === null) {
+        button.disabled = false;
+        button.textContent = 'Download Excel';
+    } else {
+        button.disabled = true;
+        button.textContent = 'Preparing Excel... ' + Math.round(fraction * 100) + '%';
+    }
+}
+
+function saveWorkbook(buffer, filename) {
+    var link = document.createElement('a');
+    link.href = URL.createObjectURL(new Blob([buffer], { type: EXCEL_MEDIA_TYPE }));
+    link.download = filename;
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    URL.revokeObjectURL(link.href);
+}
+
+function serverExportUrl(container, filename) {
+    var state = container.popupTable;
+    var params = new URLSearchParams(container.exportSource);
+    params.set('filename', filename);
+    if (state.sortColumn >= 0) {
+        params.set('sort', state.table.columns[state.sortColumn].name);
+        params.set('descending', state.sortDescending ? '1' : '0');
+    }
+    if (state.filterText) {
+        params.set('filter', state.filterText);
+    }
+    return '/export-table?' + params.toString();
+}
+
+function exportPopupTable(container, filename) {
+    var state = container.popupTable;
+    var table, rowOrder;
+    if (state) {
+        if (state.rows.length > EXPORT_WORKER_MAX_ROWS && container.exportSource) {
+            window.location.href = serverExportUrl(container, filename);
+            return;
+        }
+        table = state.table;
+        rowOrder = state.rows;
+    } else {
+        var element = container.querySelector('table');
+        if (!element) {
+            alert('No table found to download');
+            return;
+        }
+        table = tableElementToColumnar(element);
+        rowOrder = [];
+        for (var r = 0; r < table.row_count; r++) {
+            rowOrder.push(r);
+        }
+    }
+
+    setExportProgress(container, 0);
+    var worker = new Worker(scriptData('excel-worker'));
+    worker.onmessage = function(event) {
+        var message = event.data;
+        if (message.progress !== undefined) {
+            setExportProgress(container, message.progress);
+            return;
+        }
+        worker.terminate();
+        setExportProgress(container, null);
+        if (message.error) {
+            console.error('Error building Excel file:', message.error);
+            alert('Could not build the Excel file. Please try again.');
+        } else {
+            saveWorkbook(message.buffer, filename);
+        }
+    };
+    worker.onerror = function(event) {
+        worker.terminate();
+        setExportProgress(container, null);
+        console.error('Excel worker failed:', event.message);
+        alert('Could not build the Excel file. Please try again.');
+    };
+    worker.postMessage({
+        columnarUrl: scriptData('columnar'),
+        xlsxUrl: scriptData('xlsx'),
+        table: table,
+        rowOrder: rowOrder
+    });
+}
+
+// Scroll the open popup table from top to bottom, one step per animation
+// frame, and log frame intervals and row-window render times. Run from
+// the console with a large category open: measurePopupTableFrames().
+function measurePopupTableFrames(steps) {
+    var state = document.getElementById('popup-content').popupTable;
+    if (!state) {
+        console.warn('Open a popup table first');
+        return;
+    }
+    steps = steps || 300;
+    var maxScroll = state.viewport.scrollHeight - state.viewport.clientHeight;
+    var intervals = [];
+    var last = performance.now();
+    var step = 0;
+    popupFrameTimes = [];
+    function percentile(values, p) {
+        var sorted = values.slice().sort(function(a, b) { return a - b; });
+        return sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))] : 0;
+    }
+    function tick(now) {
+        intervals.push(now - last);
+        last = now;
+        state.viewport.scrollTop = maxScroll * step / steps;
+        if (++step <= steps) {
+            requestAnimationFrame(tick);
+            return;
+        }
+        console.table({
+            'frame interval ms': { p50: percentile(intervals, 0.5), p95: percentile(intervals, 0.95), max: Math.max.apply(null, intervals) },
+            'row window render ms': { p50: percentile(popupFrameTimes, 0.5), p95: percentile(popupFrameTimes, 0.95), max: Math.max.apply(null, popupFrameTimes) }
+        });
+        console.info(state.rows.length + ' rows, ' + state.body.rows.length + ' <tr> in the DOM');
+    }
+    requestAnimationFrame(tick);
+}
+
+// Menu collapse/expand functionality
+function toggleMenu() {
+    var sidebar = document.getElementById('sidebar');
+    var contentArea = document.querySelector('.content-area');
+    var menuToggleBtn = document.getElementById('menuToggleBtn');
+
+    if (sidebar.classList.contains('collapsed')) {
+        // Expand menu
+        sidebar.classList.remove('collapsed');
+        contentArea.classList.remove('expanded');
+        menuToggleBtn.classList.remove('visible');
+    } else {
+        // Collapse menu
+        sidebar.classList.add('collapsed');
+        contentArea.classList.add('expanded');
+        menuToggleBtn.classList.add('visible');
+    }
+
+    // Resize charts if any are active
+    setTimeout(function() {
+        var chartDiv = document.getElementById('chart');
+        if (chartDiv && chartDiv.data) {
+            Plotly.Plots.resize(chartDiv);
+        }
+    }, 350);
+}
+
+function collapseMenu() {
+    var sidebar = document.getElementById('sidebar');
+    var contentArea = document.querySelector('.content-area');
+    var menuToggleBtn = document.getElementById('menuToggleBtn');
+
+    if (!sidebar.classList.contains('collapsed')) {
+        sidebar.classList.add('collapsed');
+        contentArea.classList.add('expanded');
+        menuToggleBtn.classList.add('visible');
+
+        // Resize charts after collapse
+        setTimeout(function() {
+            var chartDiv = document.getElementById('chart');
+            if (chartDiv && chartDiv.data) {
+                Plotly.Plots.resize(chartDiv);
+            }
+        }, 350);
+    }
+}
+
+// Define menu toggle functions first
+function toggleSubmenu() {
+    var submenu = document.getElementById('denialsSubmenu');
+    if (submenu) {
+    submenu.classList.toggle('active');
+    }
+}
+
+function toggleComparisonSubmenu() {
+    var submenu = document.getElementById('comparisonSubmenu');
+    if (submenu) {
+    submenu.classList.toggle('active');
+    }
+}
+
+function toggleClarificationSubmenu() {
+    var submenu = document.getElementById('clarificationSubmenu');
+    if (submenu) {
+        submenu.classList.toggle('active');
+    }
+}
+
+function togglePerformanceSubmenu() {
+    var submenu = document.getElementById('performanceSubmenu');
+    if (submenu) {
+        submenu.classList.toggle('active');
+    }
+}
+
+function loadComparison(period) {
+    // Remove active class from all submenu items and menu headers
+    var items = document.querySelectorAll('.submenu-item, .menu-header');
+    items.forEach(item => item.classList.remove('active'));
+    // Add active class to clicked item
+    event.target.classList.add('active');
+    // Add active class to Comparison menu header
+    event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
+
+    // Collapse menu
+    collapseMenu();
+
+    // Hide placeholder and show chart container
+    document.getElementById('placeholder').style.display = 'none';
+    var chartContainer = document.getElementById('chart-container');
+    chartContainer.classList.add('active');
+
+    // Show selector UI
+    showComparisonSelector(period, chartContainer);
+}
+
+function showComparisonSelector(period, chartContainer) {
+    var periodLabel = period.charAt(0).toUpperCase() + period.slice(1);
+    var selectorHtml = '';
+
+    if (period === 'daily') {
+        // Daily shows yesterday's data - no selector needed, just load button
+        selectorHtml = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">' + periodLabel + ' Comparison</h2><p style="color: #2c5282; font-size: 16px; margin-bottom: 20px;">Showing yesterdays denial data</p><button id="loadDailyBtn" data-period="' + period + '" style="padding: 10px 20px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer;">Load Chart</button></div>';
+    } else if (period === 'biweekly') {
+        // Biweekly shows data for the other half of current month
+        selectorHtml = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">' + periodLabel + ' Comparison</h2><p style="color: #2c5282; font-size: 16px; margin-bottom: 20px;">Showing data for the other half of current month</p><button id="loadBiweeklyBtn" data-period="' + period + '" style="padding: 10px 20px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer;">Load Chart</button></div>';
+    } else if (period === 'monthly') {
+        // Monthly shows last month's data - no selector needed, just load button
+        selectorHtml = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">' + periodLabel + ' Comparison</h2><p style="color: #2c5282; font-size: 16px; margin-bottom: 20px;">Showing last months denial data</p><button id="loadMonthlyBtn" data-period="' + period + '" style="padding: 10px 20px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer;">Load Chart</button></div>';
+    }
+    chartContainer.innerHTML = selectorHtml + '<div id="chart"></div><div id="popup"><div id="popup-header"><h3 id="popup-title"></h3><div id="popup-buttons"><button id="download">Download Excel</button><button id="close">Close</button></div></div><div id="popup-content"></div></div>';
+
+    // Attach event listeners to buttons
+    setTimeout(function() {
+        var btn = document.getElementById('loadDailyBtn') || document.getElementById('loadMonthlyBtn') || document.getElementById('loadBiweeklyBtn');
+        if (btn) {
+            btn.addEventListener('click', function() {
+                fetchComparisonData(period);
+            });
+        }
+    }, 100);
+}
+
+function fetchComparisonData(period) {
+    var chartContainer = document.getElementById('chart-container');
+    if (!chartContainer) {
+        console.error('Chart container not found');
+        return;
+    }
+
+    // Disable the load button
+    var btn = document.getElementById('loadDailyBtn') || document.getElementById('loadMonthlyBtn') || document.getElementById('loadBiweeklyBtn');
+    if (btn) {
+        btn.disabled = true;
+        btn.style.opacity = '0.6';
+        btn.style.cursor = 'not-allowed';
+    }
+
+    // Show loading spinner in chart div
+    var chartDiv = document.getElementById('chart');
+    if (chartDiv) {
+        chartDiv.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading chart data...</p></div>';
+    } else {
+        // If chart div doesn't exist yet, preserve existing structure and add loading
+        var selectorDiv = chartContainer.querySelector('div[style*="text-align"]');
+        if (selectorDiv) {
+            chartContainer.innerHTML = selectorDiv.outerHTML + '<div id="chart"><div class="loading-container"><div class="loading-spinner"></div><p>Loading chart data...</p></div></div><div id="popup"><div id="popup-header"><h3 id="popup-title"></h3><div id="popup-buttons"><button id="download">Download Excel</button><button id="close">Close</button></div></div><div id="popup-content"></div></div>';
+        }
+    }
+
+    var url = '/comparison-data?period=' + encodeURIComponent(period) + '&format=columnar';
+    Promise.all([
+        dashboardFetch(url).then(function(response) {
+            if (!response.ok) {
+                throw new Error('Network response was not ok');
+            }
+            return response.json();
+        }),
+        loadPlotly()
+    ])
+        .then(function(results) { return results[0]; })
+        .then(function(data) {
+            // Re-enable the button
+            if (btn) {
+                btn.disabled = false;
+                btn.style.opacity = '1';
+                btn.style.cursor = 'pointer';
+            }
+
+            if (data.error) {
+                var errorDiv = document.getElementById('chart');
+                if (errorDiv) {
+                    errorDiv.innerHTML = '<p style="color: red; text-align: center; padding: 20px;">Error: ' + data.error + '</p>';
+                } else {
+                    chartContainer.innerHTML = '<p style="color: red; text-align: center; padding: 20px;">Error: ' + data.error + '</p>';
+                }
+            } else {
+                renderComparisonChart(data, period);
+            }
+        })
+        .catch(function(error) {
+            // Re-enable the button
+            if (btn) {
+                btn.disabled = false;
+                btn.style.opacity = '1';
+                btn.style.cursor = 'pointer';
+            }
+
+            console.error('Error loading comparison chart:', error);
+            var errorDiv = document.getElementById('chart');
+            if (errorDiv) {
+                errorDiv.innerHTML = '<p style="color: red; text-align: center; padding: 20px;">Error loading comparison chart data: ' + error.message + '</p>';
+            } else {
+                chartContainer.innerHTML = '<p style="color: red; text-align: center; padding: 20px;">Error loading comparison chart data: ' + error.message + '</p>';
+            }
+    });
+}
+
+function loadDenialChart() {
+    // Remove active class from all submenu items and menu headers
+    var items = document.querySelectorAll('.submenu-item, .menu-header');
+    items.forEach(item => item.classList.remove('active'));
+    // Add active class to clicked item
+    event.target.classList.add('active');
+
+    // Collapse menu
+    collapseMenu();
+
+    // Hide placeholder and show chart container
+    document.getElementById('placeholder').style.display = 'none';
+    var chartContainer = document.getElementById('chart-container');
+    chartContainer.classList.add('active');
+
+    // Show loading spinner
+    chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading denial chart data...</p></div>';
+
+    // Always reload the chart
+    fetchChartData('/button-data?format=columnar')
+        .then(data => {
+            if (data.error) {
+                chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderChart(data);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading chart:', error);
+            chartContainer.innerHTML = '<p style="color: red;">Error loading chart data</p>';
+        });
+}
+
+function loadDenialsComparison() {
+    // Remove active class from all submenu items and menu headers
+    var items = document.querySelectorAll('.submenu-item, .menu-header');
+    items.forEach(item => item.classList.remove('active'));
+    // Add active class to clicked item
+    event.target.classList.add('active');
+    // Add active class to Denials menu header
+    event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
+
+    // Collapse menu
+    collapseMenu();
+
+    // Hide placeholder and show chart container
+    document.getElementById('placeholder').style.display = 'none';
+    var chartContainer = document.getElementById('chart-container');
+    chartContainer.classList.add('active');
+
+    // Show buttons for different comparison options
+    chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 20px; font-weight: 600;">Denials Comparison</h2><div style="display: flex; gap: 15px; justify-content: center; margin-bottom: 20px;"><button id="denialsCurrentPrevBtn" style="background-color: #2c5282; color: white; border: none; padding: 12px 24px; border-radius: 8px; cursor: pointer; font-size: 16px; font-weight: bold; transition: background-color 0.3s;">Current vs Previous Month</button><button id="denialsBiweeklyBtn" style="background-color: #2c5282; color: white; border: none; padding: 12px 24px; border-radius: 8px; cursor: pointer; font-size: 16px; font-weight: bold; transition: background-color 0.3s;">Biweekly for 3 Months</button><button id="denialsMonthlyBtn" style="background-color: #2c5282; color: white; border: none; padding: 12px 24px; border-radius: 8px; cursor: pointer; font-size: 16px; font-weight: bold; transition: background-color 0.3s;">Monthly for 6 Months</button></div><div id="chart"></div></div>';
+
+    // Add event listeners
+    var currentPrevBtn = document.getElementById('denialsCurrentPrevBtn');
+    var biweeklyBtn = document.getElementById('denialsBiweeklyBtn');
+    var monthlyBtn = document.getElementById('denialsMonthlyBtn');
+
+    if (currentPrevBtn) {
+        currentPrevBtn.onclick = function() {
+            loadDenialsCurrentPreviousComparison();
+        };
+        currentPrevBtn.onmouseover = function() {
+            this.style.backgroundColor = '#1e3a5f';
+        };
+        currentPrevBtn.onmouseout = function() {
+            this.style.backgroundColor = '#2c5282';
+        };
+    }
+
+    if (biweeklyBtn) {
+        biweeklyBtn.onclick = function() {
+            loadDenialsBiweeklyComparison();
+        };
+        biweeklyBtn.onmouseover = function() {
+            this.style.backgroundColor = '#1e3a5f';
+        };
+        biweeklyBtn.onmouseout = function() {
+            this.style.backgroundColor = '#2c5282';
+        };
+    }
+
+    if (monthlyBtn) {
+        monthlyBtn.onclick = function() {
+            loadDenialsMonthlyComparison();
+        };
+        monthlyBtn.onmouseover = function() {
+            this.style.backgroundColor = '#1e3a5f';
+        };
+        monthlyBtn.onmouseout = function() {
+            this.style.backgroundColor = '#2c5282';
+        };
+    }
+}
+
+function loadDenialsCurrentPreviousComparison() {
+    var chartContainer = document.getElementById('chart-container');
+    var chartDiv = document.getElementById('chart');
+    if (!chartDiv) {
+        // If chart div doesn't exist, preserve the buttons structure
+        var buttonsDiv = chartContainer.querySelector('div[style*="display: flex"]');
+        chartContainer.innerHTML = (buttonsDiv ? buttonsDiv.outerHTML : '') + '<div id="chart"></div>';
+        chartDiv = document.getElementById('chart');
+    }
+    var url = '/denials-comparison-data?format=columnar';
+    showChartLoading(chartDiv, url, 'Loading denials comparison data...');
+
+    fetchChartData(url)
+        .then(data => {
+            if (data.error) {
+                chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderDenialsComparisonChart(data);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading denials comparison:', error);
+            chartDiv.innerHTML = '<p style="color: red;">Error loading denials comparison data</p>';
+        });
+}
+
+function loadDenialsBiweeklyComparison() {
+    var chartContainer = document.getElementById('chart-container');
+    var chartDiv = document.getElementById('chart');
+    if (!chartDiv) {
+        var buttonsDiv = chartContainer.querySelector('div[style*="display: flex"]');
+        chartContainer.innerHTML = (buttonsDiv ? buttonsDiv.outerHTML : '') + '<div id="chart"></div>';
+        chartDiv = document.getElementById('chart');
+    }
+    var url = '/denials-biweekly-comparison-data';
+    showChartLoading(chartDiv, url, 'Loading biweekly comparison data...');
+
+    fetchChartData(url)
+        .then(data => {
+            if (data.error) {
+                chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderDenialsBiweeklyComparisonChart(data);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading biweekly comparison:', error);
+            chartDiv.innerHTML = '<p style="color: red;">Error loading biweekly comparison data</p>';
+        });
+}
+
+function loadDenialsMonthlyComparison() {
+    var chartContainer = document.getElementById('chart-container');
+    var chartDiv = document.getElementById('chart');
+    if (!chartDiv) {
+        var buttonsDiv = chartContainer.querySelector('div[style*="display: flex"]');
+        chartContainer.innerHTML = (buttonsDiv ? buttonsDiv.outerHTML : '') + '<div id="chart"></div>';
+        chartDiv = document.getElementById('chart');
+    }
+    var url = '/denials-monthly-comparison-data';
+    showChartLoading(chartDiv, url, 'Loading monthly comparison data...');
+
+    fetchChartData(url)
+        .then(data => {
+            if (data.error) {
+                chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderDenialsMonthlyComparisonChart(data);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading monthly comparison:', error);
+            chartDiv.innerHTML = '<p style="color: red;">Error loading monthly comparison data</p>';
+        });
+}
+
+function loadClarificationByAging() {
+    // Remove active class from all submenu items and menu headers
+    var items = document.querySelectorAll('.submenu-item, .menu-header');
+    items.forEach(item => item.classList.remove('active'));
+    // Add active class to clicked item
+    event.target.classList.add('active');
+    // Add active class to Clarification menu header
+    event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
+
+    // Hide placeholder and show chart container
+    document.getElementById('placeholder').style.display = 'none';
+    var chartContainer = document.getElementById('chart-container');
+    chartContainer.classList.add('active');
+
+    // Show loading spinner
+    chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading clarification grouping data...</p></div>';
+
+    // Fetch clarification grouping data (same as Clarification Grouping button)
+    fetchChartData('/clarification-grouping-data')
+        .then(data => {
+            if (data.error) {
+                chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderClarificationChart(data);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading clarification grouping:', error);
+            chartContainer.innerHTML = '<p style="color: red;">Error loading clarification grouping data</p>';
+        });
+}
+
+/*
+// COMMENTED OUT - Original clarification by aging function
+*/
+
+function loadClarificationType() {
+    // Remove active class from all submenu items and menu headers
+    var items = document.querySelectorAll('.submenu-item, .menu-header');
+    items.forEach(item => item.classList.remove('active'));
+    // Add active class to clicked item
+    event.target.classList.add('active');
+    // Add active class to Clarification menu header
+    event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
+
+    // Collapse menu
+    collapseMenu();
+
+    // Hide placeholder and show chart container
+    document.getElementById('placeholder').style.display = 'none';
+    var chartContainer = document.getElementById('chart-container');
+    chartContainer.classList.add('active');
+
+    // Show loading spinner
+    chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading clarification type data...</p></div>';
+
+    // Fetch clarification type data
+    fetchChartData('/clarification-type-data')
+        .then(data => {
+            if (data.error) {
+                chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderClarificationTypeChart(data);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading clarification type:', error);
+            chartContainer.innerHTML = '<p style="color: red;">Error loading clarification type data</p>';
+        });
+}
+
+function loadPerformanceAnalysis() {
+    // Remove active class from all submenu items and menu headers
+    var items = document.querySelectorAll('.submenu-item, .menu-header');
+    items.forEach(item => item.classList.remove('active'));
+    // Add active class to clicked item
+    event.target.classList.add('active');
+    // Add active class to Performance Analysis menu header
+    event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
+
+    // Collapse menu
+    collapseMenu();
+
+    // Hide placeholder and show chart container
+    document.getElementById('placeholder').style.display = 'none';
+    var chartContainer = document.getElementById('chart-container');
+    chartContainer.classList.add('active');
+
+    // Show loading spinner
+    chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading performance analysis data...</p></div>';
+
+    // Fetch users by role
+    dashboardFetch('/performance-users')
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderPerformanceAnalysis(data, chartContainer);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading performance analysis:', error);
+            chartContainer.innerHTML = '<p style="color: red;">Error loading performance analysis data</p>';
+        });
+}
+
+function renderPerformanceAnalysis(usersData, chartContainer) {
+    var billingTeam = usersData.billing_team || [];
+    var arTeam = usersData.ar_team || [];
+
+    // Create HTML with two buttons and dropdowns
+    var html = '<div style="text-align: center; margin-bottom: 30px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 20px; font-weight: 600;">Performance Analysis</h2>';
+    html += '<div style="display: flex; gap: 30px; justify-content: center; margin-bottom: 30px;">';
+
+    // Billing Team button and dropdown
+    html += '<div style="position: relative; display: inline-block;">';
+    html += '<button id="billingTeamBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">Billing Team ▼</button>';
+    html += '<div id="billingDropdown" style="display: none; position: absolute; background: white; min-width: 200px; box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2); z-index: 1000; border-radius: 5px; margin-top: 5px; max-height: 300px; overflow-y: auto;">';
+    if (billingTeam.length === 0) {
+        html += '<div style="padding: 10px; color: #666;">No members found</div>';
+    } else {
+        billingTeam.forEach(function(member) {
+            html += '<div class="dropdown-item" data-team="billing" data-username="' + member.replace(/"/g, '&quot;') + '" style="padding: 12px 16px; cursor: pointer; border-bottom: 1px solid #eee; color: #1e3a5f;">' + member + '</div>';
+        });
+    }
+    html += '</div></div>';
+
+    // A R Team button and dropdown
+    html += '<div style="position: relative; display: inline-block;">';
+    html += '<button id="arTeamBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">A R Team ▼</button>';
+    html += '<div id="arDropdown" style="display: none; position: absolute; background: white; min-width: 200px; box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2); z-index: 1000; border-radius: 5px; margin-top: 5px; max-height: 300px; overflow-y: auto;">';
+    if (arTeam.length === 0) {
+        html += '<div style="padding: 10px; color: #666;">No members found</div>';
+    } else {
+        arTeam.forEach(function(member) {
+            html += '<div class="dropdown-item" data-team="ar" data-username="' + member.replace(/"/g, '&quot;') + '" style="padding: 12px 16px; cursor: pointer; border-bottom: 1px solid #eee; color: #1e3a5f;">' + member + '</div>';
+        });
+    }
+    html += '</div></div>';
+
+    html += '</div></div>';
+    html += '<div id="chart"></div>';
+    html += '<div id="popup"><div id="popup-header"><h3 id="popup-title"></h3><div id="popup-buttons"><button id="download">Download Excel</button><button id="close">Close</button></div></div><div id="popup-content"></div></div>';
+
+    chartContainer.innerHTML = html;
+
+    // Setup dropdown toggle functionality
+    var billingBtn = document.getElementById('billingTeamBtn');
+    var arBtn = document.getElementById('arTeamBtn');
+    var billingDropdown = document.getElementById('billingDropdown');
+    var arDropdown = document.getElementById('arDropdown');
+
+    billingBtn.onclick = function(e) {
+        e.stopPropagation();
+        arDropdown.style.display = 'none';
+        billingDropdown.style.display = billingDropdown.style.display === 'none' ? 'block' : 'none';
+    };
+
+    arBtn.onclick = function(e) {
+        e.stopPropagation();
+        billingDropdown.style.display = 'none';
+        arDropdown.style.display = arDropdown.style.display === 'none' ? 'block' : 'none';
+    };
+
+    // Close dropdowns when clicking outside
+    document.addEventListener('click', function(e) {
+        if (!billingBtn.contains(e.target) && !billingDropdown.contains(e.target)) {
+            billingDropdown.style.display = 'none';
+        }
+        if (!arBtn.contains(e.target) && !arDropdown.contains(e.target)) {
+            arDropdown.style.display = 'none';
+        }
+    });
+
+    // Handle member selection
+    var dropdownItems = document.querySelectorAll('.dropdown-item');
+    dropdownItems.forEach(function(item) {
+        item.onclick = function() {
+            var username = this.getAttribute('data-username');
+            billingDropdown.style.display = 'none';
+            arDropdown.style.display = 'none';
+            loadUserDenialsChart(username);
+        };
+        // Add hover effect using JavaScript instead of inline handlers
+        item.onmouseover = function() {
+            this.style.backgroundColor = '#f0f4f8';
+        };
+        item.onmouseout = function() {
+            this.style.backgroundColor = 'white';
+        };
+    });
+}
+
+function loadUserDenialsChart(username) {
+    var chartContainer = document.getElementById('chart-container');
+    var chartDiv = document.getElementById('chart');
+
+    // Show loading spinner
+    var url = '/user-denials-data?username=' + encodeURIComponent(username) + '&format=columnar';
+    showChartLoading(chartDiv, url, 'Loading denial data for ' + username + '...');
+
+    // Fetch user denial data
+    fetchChartData(url)
+        .then(data => {
+            if (data.error) {
+                chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderUserDenialsChart(data, username);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading user denials:', error);
+            chartDiv.innerHTML = '<p style="color: red;">Error loading user denial data</p>';
+        });
+}
+
+function renderUserDenialsChart(data, username) {
+    var chartContainer = document.getElementById('chart-container');
+    var chartDiv = document.getElementById('chart');
+
+    // Wait for Plotly to be available
+    if (typeof Plotly === 'undefined') {
+        setTimeout(function() {
+            renderUserDenialsChart(data, username);
+        }, 100);
+        return;
+    }
+
+    // Clear chart div
+    clearChartMessage(chartDiv);
+
+    // Extract data
+    var categories = data.categories || [];
+    var counts = data.counts || [];
+    var labelsWithCounts = data.labels_with_counts || [];
+    var tableData = data.table_data || {};
+
+    if (categories.length === 0) {
+        chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No denial data available for ' + username + '.</p>';
+        return;
+    }
+
+    // Create color map (same as denials chart)
+    var colorMap = {
+        "Inactive or Wrong policy Information": "#dd7e6b",
+        "Medicare paid more than Medicaid": "#f9cb9c",
+        "Incorrect/Invalid DOS": "#ffe599",
+        "TFL/Appeal time limit expired or not allowed": "#e1cfca",
+        "Missing or Invalid ICD/CPT code/Modifier/POS": "#a2c4c9",
+        "Provider enrollment issue": "#a4c2f4",
+        "Out of network": "#b4a7d6",
+        "Need additional information needed": "#d5a6bd",
+        "Non covered service": "#ea9999",
+        "Incorrect Billing": "#dbe098",
+        "Bundled service": "#bcc07b",
+        "Other": "#808080"
+    };
+
+    // Create color array based on classification order
+    var vibrantColors = categories.map(function(cat) {
+        return colorMap[cat.trim()] || '#808080';
+    });
+
+    var chartData = [{
+        type: "pie",
+        labels: labelsWithCounts,
+        values: counts,
+        textinfo: "label+percent",
+        hoverinfo: "label+value",
+        textposition: "outside",
+        automargin: true,
+        marker: { 
+            colors: vibrantColors,
+            line: { color: "#ffffff", width: 2 }
+        },
+        domain: { x: [0, 0.6], y: [0.3, 1] },
+        name: ""
+    }];
+
+    var layout = {
+        height: 700,
+        width: 1300,
+        margin: { l: 0, r: 0, t: 80, b: 0 },
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: { 
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 14
+        },
+        showlegend: true,
+        legend: {
+            x: 0.75,
+            y: 1,
+            xanchor: "left",
+            yanchor: "top",
+            font: { 
+                size: 16,
+                color: '#1e3a5f',
+                family: 'Arial, sans-serif'
+            },
+            traceorder: "normal",
+            bgcolor: 'rgba(255,255,255,0.8)',
+            bordercolor: '#2c5282',
+            borderwidth: 1
+        },
+        title: {
+            text: 'Denials by Category - ' + username,
+            font: {
+                size: 20,
+                color: '#1e3a5f'
+            }
+        }
+    };
+
+    // Render the chart
+    plotChart("chart", chartData, layout);
+
+    // Setup popup functionality (same as denials chart)
+    var popup = document.getElementById("popup");
+    var popupContent = document.getElementById("popup-content");
+    var popupTitle = document.getElementById("popup-title");
+    var closeBtn = document.getElementById("close");
+    var downloadBtn = document.getElementById("download");
+    var currentCategory = "";
+
+    // Function to download table as Excel (same as denials chart)
+    function downloadTableAsExcel() {
+        var filename = username.replace(/[^a-z0-9]/gi, '_') + '_' + currentCategory.replace(/[^a-z0-9]/gi, '_') + '_' + new Date().toISOString().split('T')[0] + '.xlsx';
+        exportPopupTable(popupContent, filename);
+    }
+
+    // Click handler for pie chart slices
+    document.getElementById("chart").on('plotly_click', function(evt) {
+        var pointIndex = evt.points[0].pointNumber;
+        var category = categories[pointIndex];
+        currentCategory = category;
+        popupTitle.textContent = category + ' - ' + username;
+
+        popup.style.display = "block";
+        mountPopupTable(popupContent, tableData[category], { source: 'user-denials-data', username: username, category: category });
+    });
+
+    closeBtn.onclick = function() {
+        popup.style.display = "none";
+    };
+
+    downloadBtn.onclick = function() {
+        downloadTableAsExcel();
+    };
+}
+
+function loadCountComparison() {
+    // Remove active class from all submenu items and menu headers
+    var items = document.querySelectorAll('.submenu-item, .menu-header');
+    items.forEach(item => item.classList.remove('active'));
+    // Add active class to clicked item
+    event.target.classList.add('active');
+    // Add active class to Performance Analysis menu header
+    event.target.closest('.menu-item').querySelector('.menu-header').classList.add('active');
+
+    // Collapse menu
+    collapseMenu();
+
+    // Hide placeholder and show chart container
+    document.getElementById('placeholder').style.display = 'none';
+    var chartContainer = document.getElementById('chart-container');
+    chartContainer.classList.add('active');
+
+    // Show loading spinner
+    chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading count comparison data...</p></div>';
+
+    // Fetch users by role
+    dashboardFetch('/performance-users')
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderCountComparison(data, chartContainer);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading count comparison:', error);
+            chartContainer.innerHTML = '<p style="color: red;">Error loading count comparison data</p>';
+        });
+}
+
+function renderCountComparison(usersData, chartContainer) {
+    var billingTeam = usersData.billing_team || [];
+    var arTeam = usersData.ar_team || [];
+
+    // Create HTML with two buttons and dropdowns
+    var html = '<div style="text-align: center; margin-bottom: 30px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 20px; font-weight: 600;">Count Comparison</h2>';
+    html += '<div style="display: flex; gap: 30px; justify-content: center; margin-bottom: 30px;">';
+
+    // Billing Team button and dropdown
+    html += '<div style="position: relative; display: inline-block;">';
+    html += '<button id="billingTeamBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">Billing Team ▼</button>';
+    html += '<div id="billingDropdown" style="display: none; position: absolute; background: white; min-width: 200px; box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2); z-index: 1000; border-radius: 5px; margin-top: 5px; max-height: 300px; overflow-y: auto;">';
+    if (billingTeam.length === 0) {
+        html += '<div style="padding: 10px; color: #666;">No members found</div>';
+    } else {
+        billingTeam.forEach(function(member) {
+            html += '<div class="dropdown-item" data-team="billing" data-username="' + member.replace(/"/g, '&quot;') + '" style="padding: 12px 16px; cursor: pointer; border-bottom: 1px solid #eee; color: #1e3a5f;">' + member + '</div>';
+        });
+    }
+    html += '</div></div>';
+
+    // A R Team button and dropdown
+    html += '<div style="position: relative; display: inline-block;">';
+    html += '<button id="arTeamBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">A R Team ▼</button>';
+    html += '<div id="arDropdown" style="display: none; position: absolute; background: white; min-width: 200px; box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2); z-index: 1000; border-radius: 5px; margin-top: 5px; max-height: 300px; overflow-y: auto;">';
+    if (arTeam.length === 0) {
+        html += '<div style="padding: 10px; color: #666;">No members found</div>';
+    } else {
+        arTeam.forEach(function(member) {
+            html += '<div class="dropdown-item" data-team="ar" data-username="' + member.replace(/"/g, '&quot;') + '" style="padding: 12px 16px; cursor: pointer; border-bottom: 1px solid #eee; color: #1e3a5f;">' + member + '</div>';
+        });
+    }
+    html += '</div></div>';
+
+    html += '</div></div>';
+    html += '<div id="periodButtons" style="display: none; gap: 30px; justify-content: center; margin-bottom: 30px;">';
+    html += '<button id="biweeklyBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">Biweekly for Last 3 Months</button>';
+    html += '<button id="monthlyBtn" style="padding: 12px 24px; background: #1e3a5f; color: white; border: none; border-radius: 5px; font-size: 16px; cursor: pointer; font-weight: bold;">Last 6 Months</button>';
+    html += '</div>';
+    html += '<div id="chart"></div>';
+
+    chartContainer.innerHTML = html;
+
+    // Store selected user (single user selection)
+    window.selectedUser = null;
+
+    // Setup dropdown toggle functionality
+    var billingBtn = document.getElementById('billingTeamBtn');
+    var arBtn = document.getElementById('arTeamBtn');
+    var billingDropdown = document.getElementById('billingDropdown');
+    var arDropdown = document.getElementById('arDropdown');
+
+    billingBtn.onclick = function(e) {
+        e.stopPropagation();
+        arDropdown.style.display = 'none';
+        billingDropdown.style.display = billingDropdown.style.display === 'none' ? 'block' : 'none';
+    };
+
+    arBtn.onclick = function(e) {
+        e.stopPropagation();
+        billingDropdown.style.display = 'none';
+        arDropdown.style.display = arDropdown.style.display === 'none' ? 'block' : 'none';
+    };
+
+    // Close dropdowns when clicking outside
+    document.addEventListener('click', function(e) {
+        if (!billingBtn.contains(e.target) && !billingDropdown.contains(e.target)) {
+            billingDropdown.style.display = 'none';
+        }
+        if (!arBtn.contains(e.target) && !arDropdown.contains(e.target)) {
+            arDropdown.style.display = 'none';
+        }
+    });
+
+    // Handle member selection (single user)
+    var dropdownItems = document.querySelectorAll('.dropdown-item');
+    var periodButtons = document.getElementById('periodButtons');
+
+    dropdownItems.forEach(function(item) {
+        item.onclick = function() {
+            var username = this.getAttribute('data-username');
+            billingDropdown.style.display = 'none';
+            arDropdown.style.display = 'none';
+
+            // Clear previous selection
+            dropdownItems.forEach(function(i) {
+                i.style.backgroundColor = 'white';
+            });
+
+            // Select this user
+            window.selectedUser = username;
+            this.style.backgroundColor = '#d4e6f1';
+
+            // Show period buttons
+            var periodButtonsDiv = document.getElementById('periodButtons');
+            if (periodButtonsDiv) {
+                periodButtonsDiv.style.display = 'flex';
+            }
+        };
+        // Add hover effect
+        item.onmouseover = function() {
+            if (window.selectedUser !== this.getAttribute('data-username')) {
+                this.style.backgroundColor = '#f0f4f8';
+            }
+        };
+        item.onmouseout = function() {
+            if (window.selectedUser !== this.getAttribute('data-username')) {
+                this.style.backgroundColor = 'white';
+            }
+        };
+    });
+
+    // Setup button handlers
+    document.getElementById('biweeklyBtn').onclick = function() {
+        if (!window.selectedUser) {
+            alert('Please select a user from the dropdowns');
+            return;
+        }
+        loadBiweeklyUserComparison(window.selectedUser);
+    };
+
+    document.getElementById('monthlyBtn').onclick = function() {
+        if (!window.selectedUser) {
+            alert('Please select a user from the dropdowns');
+            return;
+        }
+        loadMonthlyUserComparison(window.selectedUser);
+    };
+}
+
+function loadBiweeklyUserComparison(username) {
+    var chartDiv = document.getElementById('chart');
+
+    // Show loading spinner
+    var url = '/biweekly-user-comparison-data?username=' + encodeURIComponent(username);
+    showChartLoading(chartDiv, url, 'Loading biweekly comparison data...');
+
+    // Fetch biweekly comparison data for selected user
+    fetchChartData(url)
+        .then(data => {
+            if (data.error) {
+                chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderBiweeklyUserComparisonChart(data);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading biweekly comparison:', error);
+            chartDiv.innerHTML = '<p style="color: red;">Error loading biweekly comparison data</p>';
+        });
+}
+
+function loadMonthlyUserComparison(username) {
+    var chartDiv = document.getElementById('chart');
+
+    // Show loading spinner
+    var url = '/monthly-user-comparison-data?username=' + encodeURIComponent(username);
+    showChartLoading(chartDiv, url, 'Loading monthly comparison data...');
+
+    // Fetch monthly comparison data for selected user
+    fetchChartData(url)
+        .then(data => {
+            if (data.error) {
+                chartDiv.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderMonthlyUserComparisonChart(data);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading monthly comparison:', error);
+            chartDiv.innerHTML = '<p style="color: red;">Error loading monthly comparison data</p>';
+        });
+}
+
+function renderBiweeklyUserComparisonChart(data) {
+    var chartDiv = document.getElementById('chart');
+
+    if (typeof Plotly === 'undefined') {
+        chartDiv.innerHTML = '<p style="color: red;">Plotly library not loaded. Please refresh the page.</p>';
+        return;
+    }
+
+    // Clear loading message
+    clearChartMessage(chartDiv);
+
+    var categories = data.categories || [];
+    var periods = data.labels || [];
+    var periodData = data.data || {};
+
+    if (categories.length === 0 || periods.length === 0) {
+        chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for biweekly comparison.</p>';
+        return;
+    }
+
+    // Create abbreviated category names (first letter of each word) - same as denials comparison
+    function getAbbreviation(categoryName) {
+        return categoryName.split(' ').map(function(word) {
+            return word.charAt(0).toUpperCase();
+        }).join('');
+    }
+
+    var abbreviatedCategories = categories.map(getAbbreviation);
+
+    // Convert counts from thousands to actual numbers for display (same format as denials comparison)
+    var expandedPeriodData = {};
+    periods.forEach(function(period) {
+        var counts = periodData[period] || [];
+        expandedPeriodData[period] = counts.map(function(count) {
+            return count * 1000; // Convert back from thousands
+        });
+    });
+
+    // Create traces for each period
+    var traces = [];
+    var colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'];
+
+    periods.forEach(function(period, index) {
+        var counts = expandedPeriodData[period] || [];
+        // Create text labels for count values on top of data points
+        var textLabels = counts.map(function(count) {
+            return count > 0 ? Math.round(count).toLocaleString() : '';
+        });
+
+        traces.push({
+            x: abbreviatedCategories,
+            y: counts,
+            type: 'scatter',
+            mode: 'lines+markers+text',
+            name: period,
+            text: textLabels,
+            textposition: 'top',
+            textfont: {
+                size: 10,
+                color: colors[index % colors.length]
+            },
+            line: {
+                color: colors[index % colors.length],
+                width: 2
+            },
+            marker: {
+                size: 8,
+                color: colors[index % colors.length]
+            },
+            hovertemplate: '<b>%{fullData.name}</b><br>' +
+                           'Category: %{customdata}<br>' +
+                           'Count: %{y:,.0f}<extra></extra>',
+            customdata: categories
+        });
+    });
+
+    var layout = {
+        xaxis: {
+            title: 'Category',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            type: 'category'
+        },
+        yaxis: {
+            title: 'Count',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            tickmode: 'linear',
+            tickformat: ',.0f', // Expanded thousands format (1,000, 2,000, etc.) - same as denials comparison
+            dtick: 1000, // Tick every 1000
+            showticklabels: true, // Show y-axis values
+            showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)',
+            gridwidth: 1
+        },
+        xaxis: {
+            showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)',
+            gridwidth: 1
+        },
+        height: 600,
+        width: null, // Auto width to fill container
+        autosize: true,
+        margin: { l: 80, r: 200, t: 50, b: 60 },
+        showlegend: true,
+        legend: {
+            x: 1.05,
+            y: 1,
+            xanchor: 'left',
+            yanchor: 'top',
+            font: {
+                size: 12,
+                color: '#1e3a5f',
+                family: 'Arial, sans-serif'
+            }
+        },
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: {
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 12
+        }
+    };
+
+    plotChart('chart', traces, layout, {responsive: true});
+}
+
+function renderMonthlyUserComparisonChart(data) {
+    var chartDiv = document.getElementById('chart');
+
+    if (typeof Plotly === 'undefined') {
+        chartDiv.innerHTML = '<p style="color: red;">Plotly library not loaded. Please refresh the page.</p>';
+        return;
+    }
+
+    // Clear loading message
+    clearChartMessage(chartDiv);
+
+    var categories = data.categories || [];
+    var periods = data.labels || [];
+    var periodData = data.data || {};
+
+    if (categories.length === 0 || periods.length === 0) {
+        chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for monthly comparison.</p>';
+        return;
+    }
+
+    // Create abbreviated category names (first letter of each word) - same as denials comparison
+    function getAbbreviation(categoryName) {
+        return categoryName.split(' ').map(function(word) {
+            return word.charAt(0).toUpperCase();
+        }).join('');
+    }
+
+    var abbreviatedCategories = categories.map(getAbbreviation);
+
+    // Convert counts from thousands to actual numbers for display (same format as denials comparison)
+    var expandedPeriodData = {};
+    periods.forEach(function(period) {
+        var counts = periodData[period] || [];
+        expandedPeriodData[period] = counts.map(function(count) {
+            return count * 1000; // Convert back from thousands
+        });
+    });
+
+    // Create traces for each period
+    var traces = [];
+    var colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'];
+
+    periods.forEach(function(period, index) {
+        var counts = expandedPeriodData[period] || [];
+        // Create text labels for count values on top of data points
+        var textLabels = counts.map(function(count) {
+            return count > 0 ? Math.round(count).toLocaleString() : '';
+        });
+
+        traces.push({
+            x: abbreviatedCategories,
+            y: counts,
+            type: 'scatter',
+            mode: 'lines+markers+text',
+            name: period,
+            text: textLabels,
+            textposition: 'top',
+            textfont: {
+                size: 10,
+                color: colors[index % colors.length]
+            },
+            line: {
+                color: colors[index % colors.length],
+                width: 2
+            },
+            marker: {
+                size: 8,
+                color: colors[index % colors.length]
+            },
+            hovertemplate: '<b>%{fullData.name}</b><br>' +
+                           'Category: %{customdata}<br>' +
+                           'Count: %{y:,.0f}<extra></extra>',
+            customdata: categories
+        });
+    });
+
+    var layout = {
+        xaxis: {
+            title: 'Category',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            type: 'category'
+        },
+        yaxis: {
+            title: 'Count',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            tickmode: 'linear',
+            tickformat: ',.0f', // Expanded thousands format (1,000, 2,000, etc.) - same as denials comparison
+            dtick: 1000, // Tick every 1000
+            showticklabels: true, // Show y-axis values
+            showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)',
+            gridwidth: 1
+        },
+        xaxis: {
+            showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)',
+            gridwidth: 1
+        },
+        height: 600,
+        width: null, // Auto width to fill container
+        autosize: true,
+        margin: { l: 80, r: 200, t: 50, b: 60 },
+        showlegend: true,
+        legend: {
+            x: 1.05,
+            y: 1,
+            xanchor: 'left',
+            yanchor: 'top',
+            font: {
+                size: 12,
+                color: '#1e3a5f',
+                family: 'Arial, sans-serif'
+            }
+        },
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: {
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 12
+        }
+    };
+
+    plotChart('chart', traces, layout, {responsive: true});
+}
+
+function renderDenialsBiweeklyComparisonChart(data) {
+    var chartDiv = document.getElementById('chart');
+
+    if (typeof Plotly === 'undefined') {
+        chartDiv.innerHTML = '<p style="color: red;">Plotly library not loaded. Please refresh the page.</p>';
+        return;
+    }
+
+    // Clear loading message
+    clearChartMessage(chartDiv);
+
+    var categories = data.categories || [];
+    var periods = data.labels || [];
+    var periodData = data.data || {};
+
+    if (categories.length === 0 || periods.length === 0) {
+        chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for biweekly comparison.</p>';
+        return;
+    }
+
+    // Create abbreviated category names (first letter of each word)
+    function getAbbreviation(categoryName) {
+        return categoryName.split(' ').map(function(word) {
+            return word.charAt(0).toUpperCase();
+        }).join('');
+    }
+
+    var abbreviatedCategories = categories.map(getAbbreviation);
+
+    // Convert counts from thousands to actual numbers for display
+    var expandedPeriodData = {};
+    periods.forEach(function(period) {
+        var counts = periodData[period] || [];
+        expandedPeriodData[period] = counts.map(function(count) {
+            return count * 1000; // Convert back from thousands
+        });
+    });
+
+    // Create traces for each period
+    var traces = [];
+    var colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'];
+
+    periods.forEach(function(period, index) {
+        var counts = expandedPeriodData[period] || [];
+        // Create text labels for count values on top of data points
+        var textLabels = counts.map(function(count) {
+            return count > 0 ? Math.round(count).toLocaleString() : '';
+        });
+
+        traces.push({
+            x: abbreviatedCategories,
+            y: counts,
+            type: 'scatter',
+            mode: 'lines+markers+text',
+            name: period,
+            text: textLabels,
+            textposition: 'top',
+            textfont: {
+                size: 10,
+                color: colors[index % colors.length]
+            },
+            line: {
+                color: colors[index % colors.length],
+                width: 2
+            },
+            marker: {
+                size: 8,
+                color: colors[index % colors.length]
+            },
+            hovertemplate: '<b>%{fullData.name}</b><br>' +
+                           'Category: %{customdata}<br>' +
+                           'Count: %{y:,.0f}<extra></extra>',
+            customdata: categories
+        });
+    });
+
+    var layout = {
+        xaxis: {
+            title: 'Category',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            type: 'category'
+        },
+        yaxis: {
+            title: 'Count',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            tickmode: 'linear',
+            tickformat: ',.0f',
+            dtick: 1000,
+            showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)'
+        },
+        height: 600,
+        width: null,
+        autosize: true,
+        margin: { l: 80, r: 200, t: 50, b: 60 },
+        showlegend: true,
+        legend: {
+            x: 1.05,
+            y: 1,
+            xanchor: 'left',
+            yanchor: 'top',
+            font: {
+                size: 12,
+                color: '#1e3a5f',
+                family: 'Arial, sans-serif'
+            }
+        },
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: {
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 12
+        }
+    };
+
+    plotChart('chart', traces, layout, {responsive: true});
+}
+
+function renderDenialsMonthlyComparisonChart(data) {
+    var chartDiv = document.getElementById('chart');
+
+    if (typeof Plotly === 'undefined') {
+        chartDiv.innerHTML = '<p style="color: red;">Plotly library not loaded. Please refresh the page.</p>';
+        return;
+    }
+
+    // Clear loading message
+    clearChartMessage(chartDiv);
+
+    var categories = data.categories || [];
+    var periods = data.labels || [];
+    var periodData = data.data || {};
+
+    if (categories.length === 0 || periods.length === 0) {
+        chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for monthly comparison.</p>';
+        return;
+    }
+
+    // Create abbreviated category names (first letter of each word)
+    function getAbbreviation(categoryName) {
+        return categoryName.split(' ').map(function(word) {
+            return word.charAt(0).toUpperCase();
+        }).join('');
+    }
+
+    var abbreviatedCategories = categories.map(getAbbreviation);
+
+    // Convert counts from thousands to actual numbers for display
+    var expandedPeriodData = {};
+    periods.forEach(function(period) {
+        var counts = periodData[period] || [];
+        expandedPeriodData[period] = counts.map(function(count) {
+            return count * 1000; // Convert back from thousands
+        });
+    });
+
+    // Create traces for each period
+    var traces = [];
+    var colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'];
+
+    periods.forEach(function(period, index) {
+        var counts = expandedPeriodData[period] || [];
+        // Create text labels for count values on top of data points
+        var textLabels = counts.map(function(count) {
+            return count > 0 ? Math.round(count).toLocaleString() : '';
+        });
+
+        traces.push({
+            x: abbreviatedCategories,
+            y: counts,
+            type: 'scatter',
+            mode: 'lines+markers+text',
+            name: period,
+            text: textLabels,
+            textposition: 'top',
+            textfont: {
+                size: 10,
+                color: colors[index % colors.length]
+            },
+            line: {
+                color: colors[index % colors.length],
+                width: 2
+            },
+            marker: {
+                size: 8,
+                color: colors[index % colors.length]
+            },
+            hovertemplate: '<b>%{fullData.name}</b><br>' +
+                           'Category: %{customdata}<br>' +
+                           'Count: %{y:,.0f}<extra></extra>',
+            customdata: categories
+        });
+    });
+
+    var layout = {
+        xaxis: {
+            title: 'Category',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            type: 'category'
+        },
+        yaxis: {
+            title: 'Count',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            tickmode: 'linear',
+            tickformat: ',.0f',
+            dtick: 1000,
+            showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)'
+        },
+        height: 600,
+        width: null,
+        autosize: true,
+        margin: { l: 80, r: 200, t: 50, b: 60 },
+        showlegend: true,
+        legend: {
+            x: 1.05,
+            y: 1,
+            xanchor: 'left',
+            yanchor: 'top',
+            font: {
+                size: 12,
+                color: '#1e3a5f',
+                family: 'Arial, sans-serif'
+            }
+        },
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: {
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 12
+        }
+    };
+
+    plotChart('chart', traces, layout, {responsive: true});
+}
+
+function loadClarificationGrouping() {
+    // Remove active class from all submenu items and menu headers
+    var items = document.querySelectorAll('.submenu-item, .menu-header');
+    items.forEach(item => item.classList.remove('active'));
+    // Add active class to clicked item
+    event.target.classList.add('active');
+
+    // Hide placeholder and show chart container
+    document.getElementById('placeholder').style.display = 'none';
+    var chartContainer = document.getElementById('chart-container');
+    chartContainer.classList.add('active');
+
+    // Show loading spinner
+    chartContainer.innerHTML = '<div class="loading-container"><div class="loading-spinner"></div><p>Loading clarification grouping data...</p></div>';
+
+    // Fetch clarification grouping data
+    fetchChartData('/clarification-grouping-data')
+        .then(data => {
+            if (data.error) {
+                chartContainer.innerHTML = '<p style="color: red;">Error: ' + data.error + '</p>';
+            } else {
+                renderClarificationChart(data);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading clarification grouping:', error);
+            chartContainer.innerHTML = '<p style="color: red;">Error loading clarification grouping data</p>';
+        });
+}
+
+
+function renderChart(data) {
+    var chartContainer = document.getElementById('chart-container');
+
+    // Wait for Plotly to be available
+    if (typeof Plotly === 'undefined') {
+        setTimeout(function() {
+            renderChart(data);
+        }, 100);
+        return;
+    }
+
+    // Determine if this is for denials or rejections based on the active menu item
+    var activeItem = document.querySelector('.submenu-item.active');
+    var isRejection = activeItem && activeItem.textContent.trim() === 'Rejection';
+    var chartTitle = isRejection ? 'Rejections Category Pie Chart' : 'Denials Category Pie Chart';
+    var chartSubtitle = isRejection ? 'Click on a slice to view related rejection details' : 'Click on a slice to view related denial details';
+
+    // Clear previous content and create chart HTML structure
+    chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">' + chartTitle + '</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">' + chartSubtitle + '</p></div><div id="chart"></div><div id="popup"><div id="popup-header"><h3 id="popup-title"></h3><div id="popup-buttons"><button id="download">Download Excel</button><button id="close">Close</button></div></div><div id="popup-content"></div></div>';
+
+    // Extract data
+    var categories = data.categories;
+    var counts = data.counts;
+    var labelsWithCounts = data.labels_with_counts;
+    var tableData = data.table_data;
+
+    // Create chart data with distinct vibrant colors
+    // Map specific colors to classifications
+    var colorMap = {
+        "Inactive or Wrong policy Information": "#dd7e6b",
+        "Medicare paid more than Medicaid": "#f9cb9c",
+        "Incorrect/Invalid DOS": "#ffe599",
+        "TFL/Appeal time limit expired or not allowed": "#e1cfca",
+        "Missing or Invalid ICD/CPT code/Modifier/POS": "#a2c4c9",
+        "Provider enrollment issue": "#a4c2f4",
+        "Out of network": "#b4a7d6",
+        "Need additional information needed": "#d5a6bd",
+        "Non covered service": "#ea9999",
+        "Incorrect Billing": "#dbe098",
+        "Bundled service": "#bcc07b",
+        "Other": "#808080"
+    };
+
+    // Create color array based on classification order
+    var vibrantColors = categories.map(function(cat) {
+        return colorMap[cat.trim()] || '#808080'; // Default gray if classification not in map
+    });
+
+    var chartData = [{
+        type: "pie",
+        labels: labelsWithCounts,  // These labels (with counts) will appear in the legend
+        values: counts,
+        textinfo: "label+percent",
+        hoverinfo: "label+value",
+        textposition: "outside",
+        automargin: true,
+        marker: { 
+            colors: vibrantColors,
+            line: { color: "#ffffff", width: 2 }
+        },
+        domain: { x: [0, 0.6], y: [0.3, 1] },
+        name: ""  // Empty name so legend shows the labels directly
+    }];
+
+    // Create layout with dark blue formal theme
+    var layout = {
+        height: 700,
+        width: 1300,
+        margin: { l: 0, r: 0, t: 80, b: 0 },
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: { 
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 14
+        },
+        showlegend: true,
+        legend: {
+            x: 0.75,
+            y: 1,
+            xanchor: "left",
+            yanchor: "top",
+            font: { 
+                size: 16,
+                color: '#1e3a5f',
+                family: 'Arial, sans-serif'
+            },
+            traceorder: "normal",
+            bgcolor: 'rgba(255,255,255,0.8)',
+            bordercolor: '#2c5282',
+            borderwidth: 1
+        }
+    };
+
+    // Render the chart
+    plotChart("chart", chartData, layout);
+
+    // Setup popup functionality
+    var popup = document.getElementById("popup");
+    var popupContent = document.getElementById("popup-content");
+    var popupTitle = document.getElementById("popup-title");
+    var closeBtn = document.getElementById("close");
+    var downloadBtn = document.getElementById("download");
+    var currentCategory = "";
+
+    // Function to download table as Excel
+    function downloadTableAsExcel() {
+        var filename = currentCategory.replace(/[^a-z0-9]/gi, '_') + '_' + new Date().toISOString().split('T')[0] + '.xlsx';
+        exportPopupTable(popupContent, filename);
+    }
+
+
+    document.getElementById("chart").on('plotly_click', function(evt) {
+        var pointIndex = evt.points[0].pointNumber;
+        var category = categories[pointIndex];
+        currentCategory = category;
+        popupTitle.textContent = category;
+
+        popup.style.display = "block";
+        mountPopupTable(popupContent, tableData[category], { source: 'button-data', category: category });
+    });
+
+    closeBtn.onclick = function() {
+        popup.style.display = "none";
+    };
+
+    downloadBtn.onclick = function() {
+        downloadTableAsExcel();
+    };
+}
+
+function renderComparisonChart(data, period) {
+    var chartContainer = document.getElementById('chart-container');
+
+    // Wait for Plotly to be available
+    if (typeof Plotly === 'undefined') {
+        setTimeout(function() {
+            renderComparisonChart(data, period);
+        }, 100);
+        return;
+    }
+
+    // Handle biweekly - now shows data
+    // (no early return, let it process normally)
+
+    // Get chart div and update title
+    var chartDiv = document.getElementById('chart');
+    var selectorDiv = chartContainer.querySelector('div[style*="text-align"]');
+        if (selectorDiv) {
+        // Update title with date
+        var titleElement = selectorDiv.querySelector('h2');
+        if (titleElement && data.title) {
+            titleElement.textContent = data.title;
+        }
+    }
+
+    if (!chartDiv) {
+            chartDiv = document.createElement('div');
+            chartDiv.id = 'chart';
+            chartContainer.appendChild(chartDiv);
+        } else {
+        chartDiv.innerHTML = '';
+    }
+
+    // Extract pie chart data
+    var categories = data.categories || [];
+    var counts = data.counts || [];
+    var labelsWithCounts = data.labels_with_counts || [];
+    var tableData = data.table_data || {};
+
+    // Check if we have data to display
+    if (!categories || categories.length === 0 || !counts || counts.length === 0) {
+        chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for the selected period.</p>';
+        return;
+    }
+
+    // Color mapping for classifications
+    var colorMap = {
+        "Inactive or Wrong policy Information": "#dd7e6b",
+        "Medicare paid more than Medicaid": "#f9cb9c",
+        "Incorrect/Invalid DOS": "#ffe599",
+        "TFL/Appeal time limit expired or not allowed": "#e1cfca",
+        "Missing or Invalid ICD/CPT code/Modifier/POS": "#a2c4c9",
+        "Provider enrollment issue": "#a4c2f4",
+        "Out of network": "#b4a7d6",
+        "Need additional information needed": "#d5a6bd",
+        "Non covered service": "#ea9999",
+        "Incorrect Billing": "#dbe098",
+        "Bundled service": "#bcc07b",
+        "Other": "#808080"
+    };
+
+    // Create color array based on category order
+    var vibrantColors = categories.map(function(cat) {
+        if (cat && typeof cat === 'string') {
+            return colorMap[cat.trim()] || '#808080';
+        }
+        return '#808080';
+    });
+
+    // Create pie chart data
+    var chartData = [{
+        type: "pie",
+        labels: labelsWithCounts,
+        values: counts,
+        textinfo: "label+percent",
+        hoverinfo: "label+value",
+        textposition: "outside",
+        automargin: true,
+        marker: { 
+            colors: vibrantColors,
+            line: { color: "#ffffff", width: 2 }
+        },
+        domain: { x: [0, 0.6], y: [0.3, 1] },
+        name: ""
+    }];
+
+    // Create layout
+    var layout = {
+        height: 700,
+        width: 1300,
+        margin: { l: 0, r: 0, t: 80, b: 0 },
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: { 
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 14
+        },
+        showlegend: true,
+        legend: {
+            x: 0.75,
+            y: 1,
+            xanchor: "left",
+            yanchor: "top",
+            font: { 
+                size: 16,
+                color: '#1e3a5f',
+                family: 'Arial, sans-serif'
+            },
+            traceorder: "normal",
+            bgcolor: 'rgba(255,255,255,0.8)',
+            bordercolor: '#2c5282',
+            borderwidth: 1
+        }
+    };
+
+    // Render the chart
+    plotChart("chart", chartData, layout);
+
+    // Setup popup functionality
+    var popup = document.getElementById("popup");
+    var popupContent = document.getElementById("popup-content");
+    var popupTitle = document.getElementById("popup-title");
+    var closeBtn = document.getElementById("close");
+    var downloadBtn = document.getElementById("download");
+    var currentCategory = "";
+
+    // Function to download table as Excel
+    function downloadTableAsExcel() {
+        var filename = currentCategory.replace(/[^a-z0-9]/gi, '_') + '_' + new Date().toISOString().split('T')[0] + '.xlsx';
+        exportPopupTable(popupContent, filename);
+    }
+
+    // Click handler for pie chart slices
+    document.getElementById("chart").on('plotly_click', function(evt) {
+        var pointIndex = evt.points[0].pointNumber;
+        var category = categories[pointIndex];
+        currentCategory = category;
+        popupTitle.textContent = category;
+
+        popup.style.display = "block";
+        mountPopupTable(popupContent, tableData[category], { source: 'comparison-data', period: period, category: category });
+    });
+
+    if (closeBtn) {
+        closeBtn.onclick = function() {
+            popup.style.display = "none";
+        };
+    }
+
+    if (downloadBtn) {
+        downloadBtn.onclick = function() {
+            downloadTableAsExcel();
+        };
+    }
+}
+
+function renderDenialsComparisonChart(data) {
+    var chartContainer = document.getElementById('chart-container');
+
+    // Wait for Plotly to be available
+    if (typeof Plotly === 'undefined') {
+        setTimeout(function() {
+            renderDenialsComparisonChart(data);
+        }, 100);
+        return;
+    }
+
+    // Check if we have data to display
+    if (!data.categories || data.categories.length === 0) {
+        var chartDiv = document.getElementById('chart');
+        if (chartDiv) {
+            chartDiv.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for comparison.</p>';
+        } else {
+            chartContainer.innerHTML = '<p style="text-align: center; color: #2c5282; font-size: 16px; padding: 20px;">No data available for comparison.</p>';
+        }
+        return;
+    }
+
+    // Preserve buttons if they exist
+    var buttonsDiv = chartContainer.querySelector('div[style*="display: flex"]');
+    var headerDiv = chartContainer.querySelector('h2');
+
+    // Get or create chart div
+    var chartDiv = document.getElementById('chart');
+    if (!chartDiv) {
+        chartDiv = document.createElement('div');
+        chartDiv.id = 'chart';
+        chartContainer.appendChild(chartDiv);
+    }
+
+    // Create hover tooltip div if it doesn't exist
+    var hoverPopup = document.getElementById('category-popup');
+    if (!hoverPopup) {
+        hoverPopup = document.createElement('div');
+        hoverPopup.id = 'category-popup';
+        hoverPopup.style.cssText = 'display: none; position: fixed; background: white; padding: 15px 20px; border: 1px solid #ccc; border-radius: 5px; box-shadow: 0 2px 8px rgba(0,0,0,0.2); z-index: 10000; pointer-events: none;';
+        hoverPopup.innerHTML = '<div id="category-full-name" style="color: black; font-size: 14px; font-weight: bold; margin: 0 0 5px 0;"></div><div id="current-month-count" style="color: black; font-size: 14px; margin: 0 0 3px 0;"></div><div id="previous-month-count" style="color: black; font-size: 14px; margin: 0;"></div>';
+        document.body.appendChild(hoverPopup);
+    }
+
+    // Clear only the chart div, preserve buttons
+    clearChartMessage(chartDiv);
+
+    // Extract data
+    var categories = data.categories || [];
+    var currentCounts = data.current_month_counts || [];
+    var previousCounts = data.previous_month_counts || [];
+    var tableData = data.table_data || {};
+    var currentLabel = data.current_month_label || 'Current Month';
+    var previousLabel = data.previous_month_label || 'Previous Month';
+
+    // Create abbreviated category names (first letter of each word) - same as clarification
+    function getAbbreviation(categoryName) {
+        return categoryName.split(' ').map(function(word) {
+            return word.charAt(0).toUpperCase();
+        }).join('');
+    }
+
+    var abbreviatedCategories = categories.map(getAbbreviation);
+
+    // Convert counts from thousands back to actual numbers for display (in expanded 1000s format)
+    var currentCountsExpanded = currentCounts.map(function(count) {
+        return count * 1000; // Convert back from thousands
+    });
+    var previousCountsExpanded = previousCounts.map(function(count) {
+        return count * 1000; // Convert back from thousands
+    });
+
+    // Create text labels for count values on top of data points
+    var currentTextLabels = currentCountsExpanded.map(function(count) {
+        return count > 0 ? Math.round(count).toLocaleString() : '';
+    });
+    var previousTextLabels = previousCountsExpanded.map(function(count) {
+        return count > 0 ? Math.round(count).toLocaleString() : '';
+    });
+
+    // Create traces for line chart with text labels
+    var trace1 = {
+        x: abbreviatedCategories,
+        y: currentCountsExpanded,
+        type: 'scatter',
+        mode: 'lines+markers+text',
+        name: currentLabel,
+        text: currentTextLabels,
+        textposition: 'top',
+        textfont: {
+            size: 10,
+            color: '#FF0000'
+        },
+        line: {
+            color: '#FF0000', // Red for current month
+            width: 2
+        },
+        marker: {
+            size: 8,
+            color: '#FF0000'
+        },
+        hovertemplate: '<b>%{fullData.name}</b><br>' +
+                       'Category: %{customdata}<br>' +
+                       'Count: %{y:,.0f}<extra></extra>',
+        customdata: categories
+    };
+
+    var trace2 = {
+        x: abbreviatedCategories,
+        y: previousCountsExpanded,
+        type: 'scatter',
+        mode: 'lines+markers+text',
+        name: previousLabel,
+        text: previousTextLabels,
+        textposition: 'top',
+        textfont: {
+            size: 10,
+            color: '#0000FF'
+        },
+        line: {
+            color: '#0000FF', // Blue for previous month
+            width: 2
+        },
+        marker: {
+            size: 8,
+            color: '#0000FF'
+        },
+        hovertemplate: '<b>%{fullData.name}</b><br>' +
+                       'Category: %{customdata}<br>' +
+                       'Count: %{y:,.0f}<extra></extra>',
+        customdata: categories
+    };
+
+    var layout = {
+        xaxis: {
+            title: 'Category',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            type: 'category'
+        },
+        yaxis: {
+            title: 'Count',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            tickmode: 'linear',
+            tickformat: ',.0f', // Expanded thousands format (1,000, 2,000, etc.)
+            dtick: 1000, // Tick every 1000
+            showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)'
+        },
+        height: 600,
+        width: null, // Auto width to fill container
+        autosize: true,
+        margin: { l: 80, r: 200, t: 50, b: 60 },
+        showlegend: true,
+        legend: {
+            x: 1.05,
+            y: 1,
+            xanchor: 'left',
+            yanchor: 'top',
+            font: {
+                size: 12,
+                color: '#1e3a5f',
+                family: 'Arial, sans-serif'
+            }
+        },
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: {
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 12
+        }
+    };
+
+    // Render the line chart
+    plotChart("chart", [trace1, trace2], layout, {responsive: true});
+
+    // Setup hover tooltip for points
+    setTimeout(function() {
+        var chartDiv = document.getElementById('chart');
+        var hoverPopup = document.getElementById('category-popup');
+        var popupName = document.getElementById('category-full-name');
+        var popupCount = document.getElementById('category-count');
+
+        if (chartDiv && hoverPopup && popupName) {
+            var currentMonthCountDiv = document.getElementById('current-month-count');
+            var previousMonthCountDiv = document.getElementById('previous-month-count');
+
+            // Listen for hover events on the chart
+            chartDiv.on('plotly_hover', function(hoverData) {
+                if (hoverData && hoverData.points && hoverData.points.length > 0) {
+                    var point = hoverData.points[0];
+                    var pointIndex = point.pointNumber;
+
+                    if (pointIndex >= 0 && pointIndex < categories.length) {
+                        var fullCategoryName = categories[pointIndex];
+
+                        // Get counts for both months for this category
+                        var currentCount = currentCountsExpanded[pointIndex] || 0;
+                        var previousCount = previousCountsExpanded[pointIndex] || 0;
+
+                        // Update popup content
+                        popupName.textContent = fullCategoryName;
+                        currentMonthCountDiv.textContent = currentLabel + ' - ' + Math.round(currentCount).toLocaleString();
+                        previousMonthCountDiv.textContent = previousLabel + ' - ' + Math.round(previousCount).toLocaleString();
+
+                        // Position popup near cursor
+                        if (hoverData.event) {
+                            var x = hoverData.event.clientX;
+                            var y = hoverData.event.clientY;
+                            hoverPopup.style.left = (x + 10) + 'px';
+                            hoverPopup.style.top = (y - 10) + 'px';
+                        }
+                        hoverPopup.style.display = 'block';
+                    }
+                }
+            });
+
+            // Hide popup when mouse leaves
+            chartDiv.on('plotly_unhover', function() {
+                if (hoverPopup) {
+                    hoverPopup.style.display = 'none';
+                }
+            });
+        }
+    }, 500);
+}
+
+function renderEmailComparisonChart(data, type) {
+    var chartContainer = document.getElementById('chart-container');
+
+    // Wait for Plotly to be available
+    if (typeof Plotly === 'undefined') {
+        setTimeout(function() {
+            renderEmailComparisonChart(data, type);
+        }, 100);
+        return;
+    }
+
+    // Capitalize first letter of type
+    var typeLabel = type.charAt(0).toUpperCase() + type.slice(1);
+
+    // Clear previous content and create chart HTML structure
+    chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">Email Comparison - ' + typeLabel + '</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">Showing total ' + type + ' email counts</p></div><div id="chart"></div>';
+
+    // Extract data and calculate total counts for each category
+    var categories = ['A', 'B', 'C', 'D', 'E'];
+
+    // Calculate total count for each category (sum across all periods)
+    var categoryCounts = categories.map(function(cat) {
+        var values = data[cat] || [];
+        return values.reduce(function(sum, val) { return sum + (parseInt(val) || 0); }, 0);
+    });
+
+    // Color mapping for categories
+    var colorMap = {
+        'A': '#FF0000', // Bright Red
+        'B': '#1e3a5f', // Dark Blue
+        'C': '#FF8000', // Orange
+        'D': '#FFFF00', // Yellow
+        'E': '#006400', // Dark Green
+    };
+
+    // Create bar chart trace
+    var trace = {
+        x: categories,
+        y: categoryCounts,
+        type: 'bar',
+        marker: {
+            color: categories.map(function(cat) { return colorMap[cat]; }),
+            line: {
+                color: '#ffffff',
+                width: 1
+            }
+        },
+        text: categoryCounts,
+        textposition: 'outside',
+        textfont: {
+            size: 12,
+            color: '#1e3a5f'
+        }
+    };
+
+    var layout = {
+            xaxis: {
+            title: 'Category',
+                titlefont: {
+                    size: 14,
+                    color: '#1e3a5f'
+                },
+                tickfont: {
+                    size: 12,
+                    color: '#1e3a5f'
+                },
+            type: 'category'
+            },
+            yaxis: {
+                title: 'Count',
+                titlefont: {
+                    size: 14,
+                    color: '#1e3a5f'
+                },
+                tickfont: {
+                    size: 12,
+                    color: '#1e3a5f'
+                },
+                tickmode: 'linear',
+                tickformat: 'd',
+            dtick: 10,
+                showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)'
+            },
+            height: 600,
+            width: 1000,
+            margin: { l: 80, r: 40, t: 20, b: 60 },
+        showlegend: false,
+            paper_bgcolor: 'rgba(0,0,0,0)',
+            plot_bgcolor: 'rgba(0,0,0,0)',
+            font: {
+                family: 'Arial, sans-serif',
+                color: '#1e3a5f',
+                size: 12
+            }
+        };
+
+    // Render the bar chart
+    plotChart("chart", [trace], layout);
+}
+
+/*
+// COMMENTED OUT - Original clarification chart render functions
+function renderClarificationByAgingChart(data) {
+    var chartContainer = document.getElementById('chart-container');
+
+    // Wait for Plotly to be available
+    if (typeof Plotly === 'undefined') {
+        setTimeout(function() {
+            renderClarificationByAgingChart(data);
+        }, 100);
+        return;
+    }
+
+    // Clear previous content and create chart HTML structure
+    chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">Clarification type by Aging</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">Showing counts by category across time periods</p></div><div id="chart"></div>';
+
+    // Extract data
+    var categories = data.categories || [];
+    var timePeriods = data.time_periods || ['0-6m', '6m-1y', '1-1.5y', '>1.5y'];
+        var seriesData = data.series || {};
+
+    // Color palette for categories
+    var colors = ['#dd7e6b', '#f9cb9c', '#ffe599', '#b6d7a8', '#a2c4c9', '#a4c2f4', '#b4a7d6', '#d5a6bd', '#ea9999', '#808080'];
+
+    // Create traces for each category
+    var traces = categories.map(function(cat, idx) {
+        return {
+            x: timePeriods,
+            y: (seriesData[cat] || []).map(function(val) { return (val || 0) / 1000; }), // Convert to thousands
+                type: 'scatter',
+                mode: 'lines+markers',
+            name: cat,
+                line: {
+                width: 2,
+                color: colors[idx % colors.length]
+                },
+                marker: {
+                    size: 8,
+                color: colors[idx % colors.length]
+                }
+        };
+        });
+
+    var layout = {
+            xaxis: {
+            title: 'Time Period',
+                titlefont: {
+                    size: 14,
+                    color: '#1e3a5f'
+                },
+                tickfont: {
+                    size: 12,
+                    color: '#1e3a5f'
+                },
+            type: 'category'
+            },
+            yaxis: {
+            title: 'Count (in thousands)',
+                titlefont: {
+                    size: 14,
+                    color: '#1e3a5f'
+                },
+                tickfont: {
+                    size: 12,
+                    color: '#1e3a5f'
+                },
+                tickmode: 'linear',
+            tickformat: ',.1f',
+                showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)'
+            },
+            height: 600,
+            width: 1000,
+            margin: { l: 80, r: 40, t: 20, b: 60 },
+            showlegend: true,
+            legend: {
+                x: 1.05,
+                y: 1,
+                xanchor: 'left',
+                yanchor: 'top',
+                font: {
+                    size: 12,
+                    color: '#1e3a5f'
+                }
+            },
+            paper_bgcolor: 'rgba(0,0,0,0)',
+            plot_bgcolor: 'rgba(0,0,0,0)',
+            font: {
+                family: 'Arial, sans-serif',
+                color: '#1e3a5f',
+                size: 12
+            }
+        };
+
+    // Render the line chart
+    plotChart("chart", traces, layout);
+}
+*/
+
+function renderClarificationTypeChart(data) {
+    var chartContainer = document.getElementById('chart-container');
+
+    // Wait for Plotly to be available
+    if (typeof Plotly === 'undefined') {
+        setTimeout(function() {
+            renderClarificationTypeChart(data);
+        }, 100);
+        return;
+    }
+
+    // Clear previous content and create chart HTML structure with hover tooltip
+    chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">Clarification Type</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">Showing counts by category</p></div><div id="chart"></div><div id="category-popup" style="display: none; position: fixed; background: white; padding: 15px 20px; border: 1px solid #ccc; border-radius: 5px; box-shadow: 0 2px 8px rgba(0,0,0,0.2); z-index: 10000; pointer-events: none;"><div id="category-full-name" style="color: black; font-size: 14px; font-weight: bold; margin: 0 0 5px 0;"></div><div id="category-count" style="color: black; font-size: 14px; margin: 0;"></div></div>';
+
+    // Extract data (same structure as clarification grouping)
+    var categories = data.categories || [];
+    var counts = data.counts || [];
+
+    // Create abbreviated category names (first letter of each word) - same as clarification grouping
+    function getAbbreviation(categoryName) {
+        return categoryName.split(' ').map(function(word) {
+            return word.charAt(0).toUpperCase();
+        }).join('');
+    }
+
+    var abbreviatedCategories = categories.map(getAbbreviation);
+
+    // Create mapping for legend (abbreviation -> full name)
+    var categoryMapping = {};
+    categories.forEach(function(cat, index) {
+        categoryMapping[abbreviatedCategories[index]] = cat;
+    });
+
+    // Create bar chart trace (bar chart instead of line chart since no time ranges)
+    var trace = {
+        x: abbreviatedCategories,
+        y: counts,
+        type: 'bar',
+        marker: {
+            color: '#1e3a5f',
+            line: {
+                color: '#ffffff',
+                width: 1
+            }
+        },
+        text: counts,
+        textposition: 'outside',
+        textfont: {
+            size: 12,
+            color: '#1e3a5f'
+        },
+        hoverinfo: 'none'
+    };
+
+    var layout = {
+        xaxis: {
+            title: 'Category',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            type: 'category'
+        },
+        yaxis: {
+            title: 'Count',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            tickmode: 'linear',
+            tickformat: ',.0f',
+            dtick: 1000,
+            showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)'
+        },
+        height: 600,
+        width: 1000,
+        margin: { l: 80, r: 40, t: 20, b: 60 },
+        showlegend: false,
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: {
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 12
+        }
+    };
+
+    // Render the bar chart
+    plotChart("chart", [trace], layout);
+
+    // Setup hover tooltip for bars
+    setTimeout(function() {
+        var chartDiv = document.getElementById('chart');
+        var popup = document.getElementById('category-popup');
+        var popupName = document.getElementById('category-full-name');
+        var popupCount = document.getElementById('category-count');
+
+        if (chartDiv && popup && popupName && popupCount) {
+            // Listen for hover events on the chart
+            chartDiv.on('plotly_hover', function(hoverData) {
+                if (hoverData && hoverData.points && hoverData.points.length > 0) {
+                    var point = hoverData.points[0];
+                    var pointIndex = point.pointNumber;
+                    if (pointIndex >= 0 && pointIndex < categories.length) {
+                        var fullCategoryName = categories[pointIndex];
+                        var count = counts[pointIndex];
+                        // Remove commas from count
+                        var countWithoutCommas = String(count).replace(/,/g, '');
+
+                        // Update popup content - category name first, then count below
+                        popupName.textContent = fullCategoryName;
+                        popupCount.textContent = countWithoutCommas;
+
+                        // Position popup near cursor
+                        if (hoverData.event) {
+                            var x = hoverData.event.clientX;
+                            var y = hoverData.event.clientY;
+                            popup.style.left = (x + 10) + 'px';
+                            popup.style.top = (y - 10) + 'px';
+                        }
+                        popup.style.display = 'block';
+                    }
+                }
+            });
+
+            // Hide popup when mouse leaves
+            chartDiv.on('plotly_unhover', function() {
+                if (popup) {
+                    popup.style.display = 'none';
+                }
+            });
+        }
+    }, 500);
+}
+
+function renderClarificationChart(data) {
+    var chartContainer = document.getElementById('chart-container');
+
+    // Wait for Plotly to be available
+    if (typeof Plotly === 'undefined') {
+        setTimeout(function() {
+            renderClarificationChart(data);
+        }, 100);
+        return;
+    }
+
+    // Clear previous content and create chart HTML structure
+    chartContainer.innerHTML = '<div style="text-align: center; margin-bottom: 20px;"><h2 style="color: #1e3a5f; font-size: 28px; margin-bottom: 10px; font-weight: 600;">Clarification by Time Range</h2><p style="color: #2c5282; font-size: 16px; margin: 0;">Showing counts for different time ranges</p></div><div id="chart"></div><div id="category-popup" style="display: none; position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); background: white; padding: 20px; border: 2px solid #1e3a5f; border-radius: 8px; box-shadow: 0 4px 6px rgba(0,0,0,0.3); z-index: 10000;"><div style="text-align: center;"><h3 style="color: #1e3a5f; margin: 0 0 10px 0;">Category Name</h3><p id="category-full-name" style="color: #2c5282; font-size: 16px; margin: 0 0 15px 0;"></p><button id="close-category-popup" style="padding: 8px 20px; background: #1e3a5f; color: white; border: none; border-radius: 5px; cursor: pointer; font-size: 14px;">Close</button></div></div>';
+
+    // Extract data
+    var categories = data.categories;
+    var timeRanges = ['<0.6months', '0.6month-1yr', '1-1.5yr', '>1.5yr'];
+
+    // Create abbreviated category names (first letter of each word)
+    function getAbbreviation(categoryName) {
+        return categoryName.split(' ').map(function(word) {
+            return word.charAt(0).toUpperCase();
+        }).join('');
+    }
+
+    var abbreviatedCategories = categories.map(getAbbreviation);
+
+    // Create mapping for legend (abbreviation -> full name)
+    var categoryMapping = {};
+    categories.forEach(function(cat, index) {
+        categoryMapping[abbreviatedCategories[index]] = cat;
+    });
+
+    // Color mapping for time ranges
+    var rangeColors = {
+        '<0.6months': '#FF0000',      // Red
+        '0.6month-1yr': '#1e3a5f',    // Dark Blue
+        '1-1.5yr': '#FF8000',         // Orange
+        '>1.5yr': '#006400'           // Dark Green
+    };
+
+    // Create traces for each time range
+    var traces = timeRanges.map(function(range) {
+        return {
+            x: abbreviatedCategories,
+            y: data[range] || [],
+            type: 'scatter',
+            mode: 'lines+markers',
+            name: range,
+            line: {
+                color: rangeColors[range],
+                width: 2
+            },
+            marker: {
+                size: 8,
+                color: rangeColors[range]
+            }
+        };
+    });
+
+    var layout = {
+        xaxis: {
+            title: 'Category',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            type: 'category'
+        },
+        yaxis: {
+            title: 'Count',
+            titlefont: {
+                size: 14,
+                color: '#1e3a5f'
+            },
+            tickfont: {
+                size: 12,
+                color: '#1e3a5f'
+            },
+            tickmode: 'linear',
+            tickformat: ',.0f',
+            dtick: 1000,
+            showgrid: true,
+            gridcolor: 'rgba(128, 128, 128, 0.2)'
+        },
+        height: 600,
+        width: 1000,
+        margin: { l: 80, r: 40, t: 20, b: 60 },
+        showlegend: true,
+        legend: {
+            x: 1.05,
+            y: 1,
+            xanchor: 'left',
+            yanchor: 'top',
+            font: {
+                size: 12,
+                color: '#1e3a5f'
+            }
+        },
+        paper_bgcolor: 'rgba(0,0,0,0)',
+        plot_bgcolor: 'rgba(0,0,0,0)',
+        font: {
+            family: 'Arial, sans-serif',
+            color: '#1e3a5f',
+            size: 12
+        }
+    };
+
+    // Render the line chart
+    plotChart("chart", traces, layout);
+
+    // Setup close button for category popup
+    var closeCategoryPopupBtn = document.getElementById('close-category-popup');
+    if (closeCategoryPopupBtn) {
+        closeCategoryPopupBtn.onclick = function() {
+            document.getElementById('category-popup').style.display = 'none';
+        };
+    }
+
+    // Add click handler for x-axis labels to show popup with full category name
+    setTimeout(function() {
+        var chartDiv = document.getElementById('chart');
+        if (chartDiv) {
+            // Listen for click events on the chart
+            chartDiv.on('plotly_click', function(data) {
+                if (data && data.points && data.points.length > 0) {
+                    var pointIndex = data.points[0].pointNumber;
+                    if (pointIndex >= 0 && pointIndex < categories.length) {
+                        var fullCategoryName = categories[pointIndex];
+                        var popup = document.getElementById('category-popup');
+                        var popupText = document.getElementById('category-full-name');
+                        if (popup && popupText) {
+                            popupText.textContent = fullCategoryName;
+                            popup.style.display = 'block';
+                        }
+                    }
+                }
+            });
+
+            // Also add click handler for x-axis tick labels
+            var xAxisLabels = chartDiv.querySelectorAll('.xtick text');
+            xAxisLabels.forEach(function(label, index) {
+                if (index < abbreviatedCategories.length) {
+                    label.style.cursor = 'pointer';
+                    label.onclick = function(e) {
+                        e.stopPropagation();
+                        var fullCategoryName = categories[index];
+                        var popup = document.getElementById('category-popup');
+                        var popupText = document.getElementById('category-full-name');
+                        if (popup && popupText) {
+                            popupText.textContent = fullCategoryName;
+                            popup.style.display = 'block';
+                        }
+                    };
+                }
+            });
+        }
+    }, 500);
+}
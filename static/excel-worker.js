@@ -0,0 +1,45 @@
+// Builds a popup table workbook off the main thread. The dashboard posts
+// {columnarUrl, xlsxUrl, table, rowOrder}; the worker answers with
+// {progress} messages while it converts rows, then {buffer} holding the
+// .xlsx bytes, or {error}. Every cell is written as text, as the old
+// main-thread export did, and columns are sized to their longest value.
+var PROGRESS_STEPS = 50;
+
+self.onmessage = function(event) {
+    var job = event.data;
+    try {
+        importScripts(job.columnarUrl, job.xlsxUrl);
+        var columns = job.table.columns;
+        var rowOrder = job.rowOrder;
+        var header = columns.map(function(column) { return String(column.name); });
+        var widths = header.map(function(name) { return Math.max(10, name.length); });
+        var rows = [header];
+        var step = Math.max(1, Math.floor(rowOrder.length / PROGRESS_STEPS));
+
+        for (var i = 0; i < rowOrder.length; i++) {
+            var row = new Array(columns.length);
+            for (var c = 0; c < columns.length; c++) {
+                var text = columnarCellText(columns[c], rowOrder[i]);
+                row[c] = text;
+                if (text.length > widths[c]) {
+                    widths[c] = text.length;
+                }
+            }
+            rows.push(row);
+            if (i % step === 0) {
+                // Row conversion is most of the work; writing the zip is the rest
+                self.postMessage({ progress: 0.8 * i / rowOrder.length });
+            }
+        }
+
+        var ws = XLSX.utils.aoa_to_sheet(rows);
+        ws['!cols'] = widths.map(function(width) { return { wch: width + 3 }; });
+        var wb = XLSX.utils.book_new();
+        XLSX.utils.book_append_sheet(wb, ws, 'Data');
+        self.postMessage({ progress: 0.9 });
+        var buffer = XLSX.write(wb, { bookType: 'xlsx', type: 'array' });
+        self.postMessage({ buffer: buffer }, [buffer]);
+    } catch (error) {
+        self.postMessage({ error: String(error && error.message || error) });
+    }
+};